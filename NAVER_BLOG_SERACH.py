@@ -4,6 +4,7 @@ import json
 import os
 import time
 from openai import OpenAI
+import llm_client
 
 def load_env_variables():
     """
@@ -229,7 +230,9 @@ def analyze_with_gpt(titles, query, openai_api_key, analysis_type="comprehensive
         
         print("GPT-4o로 블로그 제목 분석 중...")
         
-        response = client.chat.completions.create(
+        response = llm_client.create_chat_completion(
+            client,
+            'analysis',
             model="gpt-4o",
             messages=[
                 {
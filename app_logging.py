@@ -0,0 +1,197 @@
+"""
+구조화 로그 (레벨 / 요청 ID / DEBUG 샘플링 / 비동기 기록)
+
+모듈은 표준 logging을 그대로 사용합니다 (logger = logging.getLogger(__name__)).
+configure_logging()은 루트 로거에 큐 핸들러를 달아, 요청 스레드는 레코드를 큐에 넣기만 하고
+문자열 포맷과 stdout 쓰기는 프로세스별 기록 스레드가 처리합니다.
+
+- LOG_LEVEL보다 낮은 로그는 레코드도 만들지 않습니다. 메시지는 logger.info("... %s", 값)처럼
+  인자로 넘겨 실제로 기록할 때만 포맷되도록 하세요.
+- DEBUG 로그는 LOG_DEBUG_SAMPLE_RATE 비율만 기록합니다 (요청마다 수십 줄씩 나오는 상세 로그용).
+- 모든 줄에 요청 ID가 붙습니다. X-Request-ID 헤더가 있으면 그 값을, 없으면 새로 만들어
+  응답 헤더로 돌려줍니다. 백그라운드 작업은 작업 ID를 사용합니다.
+- 큐가 가득 차면 기다리지 않고 버립니다 (버린 수는 다음 로그에 경고로 남김).
+
+    LOG_LEVEL=INFO                 # DEBUG | INFO | WARNING | ERROR
+    LOG_FORMAT=text                # text | json (한 줄에 JSON 하나)
+    LOG_DEBUG_SAMPLE_RATE=0.1      # DEBUG 로그 중 기록할 비율 (0~1)
+"""
+
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import uuid
+from datetime import datetime
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text').lower()
+LOG_DEBUG_SAMPLE_RATE = float(os.environ.get('LOG_DEBUG_SAMPLE_RATE', '0.1'))
+# 기록 대기 큐 크기 - 넘치면 버림 (요청 스레드가 stdout을 기다리지 않도록)
+LOG_QUEUE_SIZE = 10000
+# 외부에서 받은 요청 ID 허용 형식 (로그 줄 위조 방지)
+_REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._:-]{1,64}$')
+
+_request_id = contextvars.ContextVar('request_id', default='-')
+
+
+# --- 요청 ID ---
+
+def bind_request_id(request_id=None):
+    """현재 요청(스레드/태스크)의 요청 ID 설정 - 형식이 맞지 않거나 없으면 새로 만들어 반환"""
+    if not request_id or not _REQUEST_ID_PATTERN.match(request_id):
+        request_id = uuid.uuid4().hex[:16]
+    _request_id.set(request_id)
+    return request_id
+
+
+def clear_request_id():
+    _request_id.set('-')
+
+
+def current_request_id():
+    return _request_id.get()
+
+
+# --- 필터 / 포맷 ---
+
+class RequestIdFilter(logging.Filter):
+    """레코드에 요청 ID를 붙임 (큐에 넣기 전, 로그를 남긴 스레드에서 실행)"""
+
+    def filter(self, record):
+        record.request_id = _request_id.get()
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """DEBUG 레코드를 rate 비율만 통과시킴 (INFO 이상은 모두 통과)"""
+
+    def __init__(self, rate=LOG_DEBUG_SAMPLE_RATE):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 JSON 하나 (ts, level, logger, request_id, message, exc)"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'request_id': getattr(record, 'request_id', '-'),
+            'pid': record.process,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s [%(process)d %(request_id)s] %(name)s: %(message)s'
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """포맷하지 않고 레코드를 그대로 넣는 큐 핸들러 (같은 프로세스 안의 큐이므로 직렬화 불필요)"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _DropReporter(logging.Filter):
+    """큐가 넘쳐 버린 로그 수를 다음 레코드 기록 시 경고로 남김 (기록 스레드에서 실행)"""
+
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+
+    def filter(self, record):
+        dropped, self.handler.dropped = self.handler.dropped, 0
+        if dropped:
+            sys.stderr.write(f"⚠️ 로그 큐가 가득 차 {dropped}줄을 버렸습니다\n")
+        return True
+
+
+# --- 설정 ---
+
+_lock = threading.Lock()
+_listener = None
+_output = None
+
+
+def _start_listener():
+    global _listener
+    _listener = logging.handlers.QueueListener(_output['queue'], _output['stream'], respect_handler_level=False)
+    _listener.start()
+
+
+def _restart_after_fork():
+    """fork된 자식 프로세스에는 기록 스레드가 없으므로 새 큐와 함께 다시 시작"""
+    if _output is None:
+        return
+    _output['queue'] = queue.Queue(LOG_QUEUE_SIZE)
+    _output['handler'].queue = _output['queue']
+    _start_listener()
+
+
+def _stop_listener():
+    if _listener is not None:
+        try:
+            _listener.stop()
+        except Exception:
+            pass
+
+
+def configure_logging(level=None, fmt=None, sample_rate=None, stream=None):
+    """루트 로거에 큐 핸들러 연결 (여러 번 호출해도 한 번만 설정)"""
+    global _output
+    with _lock:
+        if _output is not None:
+            return
+        level = logging.getLevelName((level or LOG_LEVEL).upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+
+        stream_handler = logging.StreamHandler(stream or sys.stdout)
+        if (fmt or LOG_FORMAT) == 'json':
+            stream_handler.setFormatter(JsonFormatter())
+        else:
+            stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+        log_queue = queue.Queue(LOG_QUEUE_SIZE)
+        handler = _QueueHandler(log_queue)
+        handler.addFilter(DebugSamplingFilter(LOG_DEBUG_SAMPLE_RATE if sample_rate is None else sample_rate))
+        handler.addFilter(RequestIdFilter())
+        stream_handler.addFilter(_DropReporter(handler))
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(handler)
+
+        _output = {'queue': log_queue, 'handler': handler, 'stream': stream_handler}
+        _start_listener()
+        atexit.register(_stop_listener)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_restart_after_fork)
@@ -0,0 +1,388 @@
+"""
+ASGI 서빙 모드 (uvicorn)
+
+web_app.py의 시간은 대부분 네이버/OpenAI 응답을 기다리는 데 쓰이는데, gunicorn sync 워커에서는
+기다리는 요청 하나가 워커 프로세스 하나를 통째로 차지합니다. 이 모드에서는 외부 API를 기다리는
+라우트(검색 / 분석 / 제목 / 본문 생성 / ZIP 다운로드)를 httpx.AsyncClient와 AsyncOpenAI를 쓰는
+코루틴으로 처리하므로, 프로세스 하나가 수백 개의 외부 호출을 동시에 기다릴 수 있습니다.
+
+요청 검증, 프롬프트 생성, 세션 저장/응답 구성(BlogWebApp의 parse_*_request / save_*), 작업 큐,
+로그인 세션(쿠키)은 web_app의 것을 그대로 사용하고 외부 호출만 코루틴으로 바꿉니다. "async": true 요청은
+Flask 라우트와 같은 작업 큐에 넣고 202로 job_id를 반환합니다 (진행 상황은 /api/jobs/<id>/events).
+여기서 다루지 않는 나머지 라우트(페이지, 이미지 생성, 작업 조회 등)는 Flask 앱으로 넘깁니다.
+
+    pip install starlette uvicorn httpx a2wsgi
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+
+    ASGI_MAX_CONNECTIONS=500   # 외부 API 동시 연결 상한
+"""
+
+import asyncio
+import logging
+import os
+import time
+import urllib.parse
+from contextlib import asynccontextmanager
+
+try:
+    import httpx
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse, StreamingResponse
+    from starlette.routing import Mount, Route
+    from a2wsgi import WSGIMiddleware
+    ASGI_AVAILABLE = True
+except ImportError:
+    ASGI_AVAILABLE = False
+
+try:
+    from openai import AsyncOpenAI
+    ASYNC_OPENAI_AVAILABLE = True
+except ImportError:
+    ASYNC_OPENAI_AVAILABLE = False
+
+import app_logging
+import llm_client
+import web_app
+from web_app import blog_app, ApiError, AUTH_REQUIRED_RESPONSE, is_authenticated, job_accepted
+from export_archive import ZipStreamWriter, summary_entries, archive_filename, EXPORT_FETCH_WORKERS, EXPORT_FETCH_DEADLINE
+from image_store import image_store
+from job_queue import JobQueueFull
+from metrics import metrics
+from session_store import SessionExpired
+
+# 외부 API(네이버/OpenAI/이미지 다운로드) 동시 연결 상한
+ASGI_MAX_CONNECTIONS = int(os.environ.get('ASGI_MAX_CONNECTIONS', '500'))
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+flask_app = web_app.app
+_clients = {}
+logger = logging.getLogger(__name__)
+
+if not ASGI_AVAILABLE:
+    logger.warning("⚠️ ASGI 모드 라이브러리가 설치되지 않았습니다. 'pip install starlette uvicorn httpx a2wsgi' 실행하세요.")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """이벤트 루프마다 연결 풀을 하나씩 만들어 모든 요청이 공유"""
+    limits = httpx.Limits(max_connections=ASGI_MAX_CONNECTIONS, max_keepalive_connections=100)
+    _clients['http'] = httpx.AsyncClient(limits=limits, timeout=30, headers={'User-Agent': USER_AGENT})
+    if ASYNC_OPENAI_AVAILABLE and blog_app.openai_api_key:
+        _clients['openai'] = AsyncOpenAI(
+            api_key=blog_app.openai_api_key,
+            http_client=httpx.AsyncClient(limits=limits, timeout=None)
+        )
+    logger.info("🚀 ASGI 모드 시작 (외부 연결 상한 %d개)", ASGI_MAX_CONNECTIONS)
+    try:
+        yield
+    finally:
+        await _clients.pop('http').aclose()
+        openai_client = _clients.pop('openai', None)
+        if openai_client is not None:
+            await openai_client.close()
+
+
+def _openai_client():
+    client = _clients.get('openai')
+    if client is None:
+        raise Exception("OpenAI API 키가 설정되지 않았거나 OpenAI 라이브러리가 설치되지 않았습니다.")
+    return client
+
+
+async def _sessions(method, *args, **kwargs):
+    """세션 저장소 호출 (SQLite 잠금 대기나 Redis 왕복이 이벤트 루프를 막지 않도록 스레드에서 실행)"""
+    return await asyncio.to_thread(getattr(blog_app.sessions, method), *args, **kwargs)
+
+
+# --- Flask 로그인 세션 쿠키 공유 ---
+
+def _cookie_serializer():
+    return flask_app.session_interface.get_signing_serializer(flask_app)
+
+
+def load_flask_session(request):
+    """Flask가 서명한 세션 쿠키 내용 (없거나 위조/만료면 빈 dict)"""
+    cookie = request.cookies.get(flask_app.config['SESSION_COOKIE_NAME'])
+    if not cookie:
+        return {}
+    try:
+        max_age = int(flask_app.permanent_session_lifetime.total_seconds())
+        return dict(_cookie_serializer().loads(cookie, max_age=max_age))
+    except Exception:
+        return {}
+
+
+def save_flask_session(response, data):
+    """Flask와 같은 형식으로 세션 쿠키 다시 서명"""
+    response.set_cookie(
+        flask_app.config['SESSION_COOKIE_NAME'],
+        _cookie_serializer().dumps(data),
+        httponly=flask_app.config['SESSION_COOKIE_HTTPONLY'],
+        secure=flask_app.config['SESSION_COOKIE_SECURE'],
+        samesite=flask_app.config['SESSION_COOKIE_SAMESITE'] or 'lax',
+        path=flask_app.config['SESSION_COOKIE_PATH'] or '/'
+    )
+
+
+def remember_latest_session(request, response, session_id, *stages):
+    """web_app.remember_latest_session과 같은 쿠키 기록 (레거시 라우트가 읽음)"""
+    data = request.state.flask_session
+    latest = dict(data.get('latest_sessions') or {})
+    for stage in stages:
+        latest[stage] = session_id
+    data['latest_sessions'] = latest
+    save_flask_session(response, data)
+
+
+def require_auth(handler):
+    """web_app.require_auth와 같은 인증 확인"""
+    async def wrapper(request):
+        request_id = app_logging.bind_request_id(request.headers.get('x-request-id'))
+        request.state.flask_session = load_flask_session(request)
+        if not is_authenticated(request.state.flask_session):
+            return JSONResponse(AUTH_REQUIRED_RESPONSE, status_code=401, headers={'X-Request-ID': request_id})
+        # 요청마다 별도 태스크(컨텍스트)로 실행되므로 Flask before_request와 같은 마감시간/요청 ID 적용
+        llm_client.start_request_deadline()
+        started = time.monotonic()
+        status = 500
+        try:
+            response = await handler(request)
+            status = response.status_code
+        except ApiError as e:
+            response = JSONResponse(e.to_dict(), status_code=e.status)
+            status = e.status
+        except SessionExpired as e:
+            response = JSONResponse({'error': str(e)}, status_code=400)
+            status = 400
+        except Exception as e:
+            logger.exception("❌ ASGI 요청 오류 (%s): %s", request.url.path, e)
+            response = JSONResponse({'error': str(e)}, status_code=500)
+        finally:
+            llm_client.clear_request_deadline()
+            # Flask 라우트와 같은 이름(endpoint)으로 기록
+            metrics.observe('blog_http_request_duration_seconds', time.monotonic() - started, route=handler.__name__, method=request.method)
+            metrics.inc('blog_http_requests_total', route=handler.__name__, method=request.method, status=status)
+        response.headers['X-Request-ID'] = request_id
+        return response
+    wrapper.__name__ = handler.__name__
+    wrapper.__doc__ = handler.__doc__
+    return wrapper
+
+
+# --- 외부 API 호출 ---
+
+async def search_naver_blog(query, display=50, sort='date'):
+    """web_app.search_naver_blog의 비동기 버전 (요청/오류 메시지는 BlogWebApp과 공유)"""
+    url, headers = blog_app.build_naver_search_request(query, display, sort)
+
+    with metrics.timed('naver_search'):
+        response = await _clients['http'].get(url, headers=headers)
+        if response.status_code != 200:
+            raise blog_app.naver_search_error(response.status_code, response.text)
+        result = response.json()
+    metrics.add_bytes('naver_search', len(response.content))
+    logger.info("✅ API 호출 성공: %s건 검색됨", result.get('total', 0))
+    return result
+
+
+async def chat(call_type, messages, **kwargs):
+    response = await llm_client.acreate_chat_completion(_openai_client(), call_type, messages=messages, **kwargs)
+    return response.choices[0].message.content
+
+
+async def _blog(method, *args, **kwargs):
+    """BlogWebApp 공통 처리 호출 (세션 저장소를 쓰므로 이벤트 루프를 막지 않도록 스레드에서 실행)"""
+    return await asyncio.to_thread(getattr(blog_app, method), *args, **kwargs)
+
+
+async def run_or_enqueue(request, kind, params, data, run):
+    """web_app.run_or_enqueue의 ASGI 버전 - async: true면 같은 작업 큐에 넣고 202, 아니면 run()의 응답 dict"""
+    if not data.get('async'):
+        return JSONResponse(await run())
+    try:
+        job_id = await asyncio.to_thread(blog_app.jobs.submit, kind, params, params.get('session_id'))
+    except JobQueueFull as e:
+        return JSONResponse({'error': str(e)}, status_code=503)
+    return JSONResponse(job_accepted(job_id, request.scope.get('root_path', '')), status_code=202)
+
+
+# --- 라우트 ---
+
+@require_auth
+async def api_search(request):
+    """네이버 블로그 검색 API"""
+    data = await request.json() or {}
+    keyword, search_count, sort_type = await _blog('parse_search_request', data)
+
+    search_result = await search_naver_blog(keyword, search_count, sort_type)
+    session_id, payload = await _blog('save_search', keyword, search_result)
+
+    response = JSONResponse(payload)
+    remember_latest_session(request, response, session_id, 'search')
+    return response
+
+
+@require_auth
+async def api_analyze(request):
+    """AI 분석 API"""
+    data = await request.json() or {}
+    params = await _blog('parse_analyze_request', data)
+
+    async def run():
+        result_data = await _blog('load_session_fields', params['session_id'], ('keyword', 'search'), required=('search',))
+        search = result_data['search']
+        messages = blog_app.build_analysis_messages(
+            search.titles, search.descriptions, result_data['keyword'], params['analysis_type']
+        )
+        analysis_result = await chat('analysis', messages, max_tokens=4000, temperature=0.7)
+        return await _blog('save_analysis', params['session_id'], params['analysis_type'], analysis_result)
+
+    response = await run_or_enqueue(request, 'analyze', params, data, run)
+    remember_latest_session(request, response, params['session_id'], 'analysis')
+    return response
+
+
+@require_auth
+async def api_generate_titles(request):
+    """새로운 제목 생성 API"""
+    data = await request.json() or {}
+    params, result_data = await _blog('parse_titles_request', data)
+
+    messages = blog_app.build_titles_messages(result_data['analysis'], result_data['keyword'], params['num_titles'])
+    # 짧은 호출이므로 p95를 넘기면 헤징 요청을 함께 보냄
+    generated_titles = await chat('titles', messages, hedge=True, timeout=30, max_tokens=1500, temperature=0.8)
+    return JSONResponse(await _blog(
+        'save_titles', params['session_id'], result_data['keyword'], generated_titles, params['num_titles']
+    ))
+
+
+@require_auth
+async def api_generate_blog(request):
+    """블로그 글 생성 API (본문과 함께 이미지 프롬프트 받기 지원)"""
+    data = await request.json() or {}
+    params = await _blog('parse_blog_request', data)
+
+    async def run():
+        result_data = await _blog('load_session_fields', params['session_id'], ('keyword', 'analysis_result', 'analysis_digest'))
+        keyword = result_data['keyword']
+        analysis_result = result_data.get('analysis_digest') or result_data.get('analysis_result')
+        image_slots = params['num_images'] if params['inline_image_prompts'] else 0
+
+        messages, target_chars = blog_app.build_blog_content_messages(
+            params['title'], keyword, params['prompt_type'], params['additional_prompt'],
+            params['min_chars'], params['max_chars'], analysis_result, image_slots
+        )
+        generated_content = await chat('long_form', messages, max_tokens=15000, temperature=0.7)
+        blog_app.report_blog_content(generated_content, keyword, target_chars, image_slots)
+
+        image_prompts = None
+        blog_content = generated_content
+        if image_slots:
+            blog_content, image_prompts = blog_app.split_image_prompts(
+                generated_content, params['title'], keyword, params['num_images']
+            )
+        return await _blog('save_blog_content', params, keyword, blog_content, image_prompts)
+
+    return await run_or_enqueue(request, 'generate_blog', params, data, run)
+
+
+async def _fetch_images(images, max_workers=EXPORT_FETCH_WORKERS, deadline=EXPORT_FETCH_DEADLINE):
+    """export_archive.fetch_concurrently의 비동기 버전 - 끝나는 순서대로 (index, 데이터, 오류) yield"""
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def load(i, image):
+        try:
+            async with semaphore:
+                # 생성 시 저장해 둔 로컬 이미지가 있으면 다시 내려받지 않음
+                image_data = await asyncio.to_thread(image_store.read_bytes, image.get('hash'))
+                if image_data is None:
+                    with metrics.timed('image_download'):
+                        response = await _clients['http'].get(image['url'])
+                        response.raise_for_status()
+                    image_data = response.content
+                    metrics.add_bytes('image_download', len(image_data))
+            return i, image_data, None
+        except Exception as e:
+            return i, None, str(e)
+
+    tasks = [asyncio.ensure_future(load(i, image)) for i, image in enumerate(images)]
+    finished = set()
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=deadline):
+            i, image_data, error = await next_done
+            finished.add(i)
+            yield i, image_data, error
+    except asyncio.TimeoutError:
+        # 마감시간까지 끝나지 않은 이미지는 실패로 보고하고 나머지로 ZIP 완성
+        for i in range(len(images)):
+            if i not in finished:
+                yield i, None, f'시간 초과 ({deadline:.0f}초)'
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@require_auth
+async def api_download_images(request):
+    """이미지 ZIP 다운로드 API (스트리밍, ?include=article 지원)"""
+    session_id = request.path_params['session_id']
+    result_data = await _sessions('get', session_id, fields=('keyword', 'generated_images', 'blog_content'))
+    if result_data is None:
+        return JSONResponse({'error': '유효하지 않은 세션입니다'}, status_code=400)
+
+    generated_images = list(result_data.get('generated_images', []))
+    include_article = 'article' in request.query_params.get('include', '').split(',')
+    blog_data = result_data.get('blog_content') if include_article else None
+    if not generated_images and not blog_data:
+        return JSONResponse({'error': '다운로드할 이미지가 없습니다. 먼저 이미지를 생성해주세요.'}, status_code=400)
+
+    async def archive():
+        started = time.monotonic()
+        sent = 0
+        writer = ZipStreamWriter()
+        image_files = []
+        failures = []
+        async for i, image_data, error in _fetch_images(generated_images):
+            if error:
+                logger.warning("❌ 이미지 %d 다운로드 오류: %s", i + 1, error)
+                failures.append({'index': i + 1, 'url': generated_images[i].get('url'), 'error': error})
+                continue
+            filename = f"generated_image_{i+1}.png"
+            image_files.append(filename)
+            for chunk in writer.add(filename, image_data, False):
+                sent += len(chunk)
+                yield chunk
+
+        for name, data, compress in summary_entries(result_data.get('keyword'), len(generated_images), image_files, failures, blog_data):
+            for chunk in writer.add(name, data, compress):
+                sent += len(chunk)
+                yield chunk
+        tail = writer.close()
+        if tail:
+            sent += len(tail)
+            yield tail
+        metrics.record_stage('zip_build', time.monotonic() - started)
+        metrics.add_bytes('zip_build', sent, direction='out')
+        logger.info("📦 ZIP 스트리밍 완료: %d개 이미지, 실패 %d개", len(image_files), len(failures))
+
+    filename = archive_filename(result_data.get('keyword', 'images'))
+    return StreamingResponse(archive(), media_type='application/zip', headers={
+        'Content-Disposition': f"attachment; filename=\"generated_images.zip\"; filename*=UTF-8''{urllib.parse.quote(filename)}",
+        'X-Accel-Buffering': 'no'
+    })
+
+
+def create_app():
+    routes = [
+        Route('/api/search', api_search, methods=['POST']),
+        Route('/api/analyze', api_analyze, methods=['POST']),
+        Route('/api/generate_titles', api_generate_titles, methods=['POST']),
+        Route('/api/generate_blog', api_generate_blog, methods=['POST']),
+        Route('/api/download_images/{session_id}', api_download_images, methods=['GET']),
+        # 나머지는 기존 Flask 앱이 스레드 풀에서 처리
+        Mount('/', app=WSGIMiddleware(flask_app)),
+    ]
+    return Starlette(routes=routes, lifespan=lifespan)
+
+
+app = create_app() if ASGI_AVAILABLE else None
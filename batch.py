@@ -0,0 +1,101 @@
+"""
+여러 키워드 일괄 생성 (/api/batch)
+
+키워드 목록을 받아 키워드마다 전체 파이프라인(검색 → 분석 → 제목 → 본문/이미지)을 실행합니다.
+일괄 작업 하나는 작업 큐(job_queue)의 작업 하나로 실행되며, 그 안에서 키워드를 BATCH_PARALLELISM개씩
+동시에 처리합니다. 키워드 안의 단계 병렬 실행, OpenAI 호출 정책, DALL-E 분당 제한, OpenAI 연결 풀은
+단일 파이프라인과 같은 것을 공유하므로 일괄 작업이 제한을 넘겨 호출하지 않습니다.
+
+항목별 진행 상황(queued → running → done / failed, 마지막으로 끝난 단계, 세션 ID)은 작업 진행 상황으로 기록되어
+/api/jobs/<id>, /api/jobs/<id>/events에서 볼 수 있고, 완료된 항목은 세션에 저장되어 하나의 ZIP으로 내려받습니다.
+
+    BATCH_MAX_KEYWORDS=50     # 요청 하나의 최대 키워드 수
+    BATCH_PARALLELISM=2       # 동시에 처리할 키워드 수 (작업 하나 기준)
+    BATCH_MAX_ARTICLES=5      # 키워드당 최대 글 수
+"""
+
+import contextvars
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+BATCH_MAX_KEYWORDS = int(os.environ.get('BATCH_MAX_KEYWORDS', '50'))
+BATCH_PARALLELISM = int(os.environ.get('BATCH_PARALLELISM', '2'))
+BATCH_MAX_ARTICLES = int(os.environ.get('BATCH_MAX_ARTICLES', '5'))
+
+
+def parse_keywords(value):
+    """키워드 리스트 또는 줄바꿈/쉼표로 구분한 문자열을 중복 없는 리스트로 변환 (순서 유지)"""
+    if isinstance(value, str):
+        value = re.split(r'[\n,]', value)
+    keywords = [str(keyword).strip() for keyword in (value or [])]
+    return list(dict.fromkeys(keyword for keyword in keywords if keyword))
+
+
+def folder_name(index, keyword):
+    """ZIP 안의 키워드별 폴더 이름 (01_키워드)"""
+    safe_keyword = "".join(c for c in keyword if c.isalnum() or c in (' ', '-', '_')).strip() or 'keyword'
+    return f"{index + 1:02d}_{safe_keyword}"
+
+
+class BatchProgress:
+    """항목별 진행 상황 (status: queued / running / done / failed)
+
+    값이 바뀔 때마다 on_change(snapshot)를 호출합니다 (작업 진행 상황 저장용).
+    """
+
+    def __init__(self, keywords, on_change=None):
+        self.items = [{'keyword': keyword, 'status': 'queued'} for keyword in keywords]
+        self.on_change = on_change
+        self._lock = threading.Lock()
+
+    def update(self, index, **fields):
+        with self._lock:
+            self.items[index].update(fields)
+            snapshot = self._snapshot()
+        if self.on_change:
+            self.on_change(snapshot)
+
+    def _snapshot(self):
+        counts = {'queued': 0, 'running': 0, 'done': 0, 'failed': 0}
+        for item in self.items:
+            counts[item['status']] += 1
+        return {
+            'total': len(self.items),
+            'completed': counts['done'],
+            'failed': counts['failed'],
+            'running': counts['running'],
+            'items': [dict(item) for item in self.items]
+        }
+
+    def snapshot(self):
+        with self._lock:
+            return self._snapshot()
+
+
+def run_batch(keywords, process, parallelism=BATCH_PARALLELISM, on_change=None):
+    """키워드마다 process(index, keyword, progress)를 동시에 실행하고 최종 진행 상황 반환
+
+    process는 항목 결과 필드(dict)를 반환하며, 예외가 나면 그 항목만 failed로 기록하고 나머지는 계속합니다.
+    항목 스레드는 호출한 스레드의 contextvars(요청 ID 등)를 이어받습니다.
+    """
+    progress = BatchProgress(keywords, on_change)
+
+    def run_one(index, keyword):
+        progress.update(index, status='running')
+        try:
+            fields = process(index, keyword, progress) or {}
+        except Exception as e:
+            progress.update(index, status='failed', stage=None, error=str(e))
+            return
+        progress.update(index, status='done', stage=None, **fields)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(parallelism, len(keywords))), thread_name_prefix='batch') as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, run_one, i, keyword)
+            for i, keyword in enumerate(keywords)
+        ]
+        for future in futures:
+            future.result()
+    return progress.snapshot()
@@ -0,0 +1,223 @@
+"""
+gunicorn(sync 워커) vs uvicorn(ASGI 모드) 동시 처리량 비교
+
+네이버 검색 API와 OpenAI chat completions를 흉내 내는 로컬 대역 서버를 띄우고(응답 지연 설정 가능),
+두 서빙 방식을 각각 실행해 같은 부하(검색 → 분석)를 보낸 뒤 처리량과 지연시간을 비교합니다.
+실제 API 키나 네트워크 없이 실행됩니다.
+
+    pip install gunicorn uvicorn starlette httpx a2wsgi
+    python bench_asgi.py [동시 요청 수] [대역 서버 지연(초)]
+
+    BENCH_MODES=gunicorn,uvicorn   # 비교할 서빙 방식
+"""
+
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_MODES = os.environ.get('BENCH_MODES', 'gunicorn,uvicorn').split(',')
+# web_app.ADMIN_PASSWORD (web_app을 import하면 API 키 확인 로그가 섞이므로 값만 사용)
+BENCH_PASSWORD = os.environ.get('BENCH_PASSWORD', '0225')
+
+SERVE_COMMANDS = {
+    # 현재 Dockerfile과 같은 구성
+    'gunicorn': ['gunicorn', '--bind', '127.0.0.1:{port}', '--workers', '4', '--timeout', '120', 'web_app:app'],
+    # 프로세스 하나로 모든 요청 처리
+    'uvicorn': ['uvicorn', 'asgi_app:app', '--host', '127.0.0.1', '--port', '{port}', '--workers', '1', '--log-level', 'warning'],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+# --- 네이버 / OpenAI 대역 서버 ---
+
+def naver_search_body(query, display):
+    items = [{
+        'title': f"<b>{query}</b> 후기 {i} - 초보도 쉽게 따라하는 방법",
+        'link': f"https://blog.naver.com/bench/{220000000000 + i}",
+        'description': f"{query} 관련 정리와 준비물, 주의할 점을 자세히 소개합니다. {i}번째 글",
+        'bloggername': f"블로거{i % 7}",
+        'bloggerlink': f"blog.naver.com/bench{i % 7}",
+        'postdate': f"202401{i % 28 + 1:02d}",
+    } for i in range(display)]
+    return {'lastBuildDate': 'Mon, 01 Jan 2024 00:00:00 +0900', 'total': 12345,
+            'start': 1, 'display': display, 'items': items}
+
+
+def chat_completion_body(model):
+    return {
+        'id': 'chatcmpl-bench',
+        'object': 'chat.completion',
+        'created': int(time.time()),
+        'model': model,
+        'choices': [{
+            'index': 0,
+            'message': {'role': 'assistant', 'content': '## 분석 결과\n\n1. 제목 패턴: 숫자와 후기 키워드가 많습니다.\n' * 20},
+            'finish_reason': 'stop'
+        }],
+        'usage': {'prompt_tokens': 1200, 'completion_tokens': 600, 'total_tokens': 1800}
+    }
+
+
+class StandInServer:
+    """응답 전에 delay초 기다리는 최소 HTTP/1.1 서버 (별도 스레드의 이벤트 루프에서 실행)"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.port = free_port()
+        self.requests = 0
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self._ready.wait()
+        return self
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, '127.0.0.1', self.port, backlog=2048))
+        self._ready.set()
+        self._loop.run_until_complete(server.serve_forever())
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode().split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode().partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0) or 0))
+
+                self.requests += 1
+                await asyncio.sleep(self.delay)
+                payload = self._respond(method, target, body)
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\nContent-Type: application/json; charset=utf-8\r\n'
+                    + f'Content-Length: {len(data)}\r\n\r\n'.encode() + data)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _respond(method, target, body):
+        path, _, query_string = target.partition('?')
+        if path.endswith('/v1/search/blog.json'):
+            params = dict(part.split('=', 1) for part in query_string.split('&') if '=' in part)
+            return naver_search_body('벤치마크', int(params.get('display', 20)))
+        if path.endswith('/chat/completions'):
+            return chat_completion_body(json.loads(body or b'{}').get('model', 'gpt-4o'))
+        return {'error': f'unknown path {path}'}
+
+
+# --- 부하 발생 ---
+
+def start_server(mode, port, stand_in, store_dir):
+    command = [part.format(port=port) for part in SERVE_COMMANDS[mode]]
+    env = dict(
+        os.environ,
+        NAVER_API_BASE_URL=f'http://127.0.0.1:{stand_in.port}',
+        OPENAI_BASE_URL=f'http://127.0.0.1:{stand_in.port}/v1',
+        OPENAI_API_KEY='bench-key',
+        NAVER_CLIENT_ID='bench-id',
+        NAVER_CLIENT_SECRET_KEY='bench-secret',
+        SESSION_STORE_BACKEND='sqlite',
+        SESSION_STORE_PATH=os.path.join(store_dir, f'{mode}.db'),
+    )
+    process = subprocess.Popen(command, cwd=BASE_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if httpx.get(f'http://127.0.0.1:{port}/login', timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{mode} 서버가 30초 안에 시작되지 않았습니다")
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_load(port, concurrency):
+    """동시 사용자 concurrency명이 각각 검색 → 분석을 한 번씩 실행"""
+    base_url = f'http://127.0.0.1:{port}'
+    limits = httpx.Limits(max_connections=concurrency + 10)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300) as client:
+        await client.post('/login', data={'password': BENCH_PASSWORD})
+        latencies = {'search': [], 'analyze': []}
+        errors = [0]
+
+        async def timed(name, path, body):
+            started = time.monotonic()
+            response = await client.post(path, json=body)
+            latencies[name].append(time.monotonic() - started)
+            if response.status_code != 200:
+                errors[0] += 1
+                return None
+            return response.json()
+
+        async def user(i):
+            result = await timed('search', '/api/search', {'keyword': f'캠핑 {i}', 'search_count': 20})
+            if result and result.get('session_id'):
+                await timed('analyze', '/api/analyze', {'session_id': result['session_id']})
+
+        started = time.monotonic()
+        await asyncio.gather(*(user(i) for i in range(concurrency)))
+        return time.monotonic() - started, latencies, errors[0]
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    stand_in = StandInServer(delay).start()
+
+    print(f"📊 동시 사용자 {concurrency}명 × (검색 + 분석), 대역 서버 응답 지연 {delay:.1f}초\n")
+    print(f"{'':<10}{'소요(초)':>10}{'요청/초':>10}{'p50(초)':>10}{'p95(초)':>10}{'오류':>8}")
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        for mode in BENCH_MODES:
+            port = free_port()
+            process = start_server(mode, port, stand_in, store_dir)
+            try:
+                elapsed, latencies, errors = asyncio.run(run_load(port, concurrency))
+            finally:
+                process.send_signal(signal.SIGTERM)
+                process.wait(timeout=30)
+            all_latencies = latencies['search'] + latencies['analyze']
+            print(f"{mode:<10}{elapsed:>10.1f}{len(all_latencies) / elapsed:>10.1f}"
+                  f"{percentile(all_latencies, 50):>10.2f}{percentile(all_latencies, 95):>10.2f}{errors:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+세션 한 개당 메모리/저장 크기 비교 (기존 dict 구성 vs session_records)
+
+네이버 API 응답과 비슷한 가짜 검색 결과와 본문으로 세션을 만들어
+    - 저장소에 기록되는 직렬화 크기 (SQLite/Redis 세션 크기 계산 기준)
+    - 메모리 세션 저장소에서 차지하는 파이썬 객체 크기 (tracemalloc)
+를 비교합니다. 네트워크나 API 키 없이 실행됩니다.
+
+    python bench_session_memory.py [검색 결과 수] [세션 수]
+"""
+
+import json
+import random
+import re
+import sys
+import tracemalloc
+from datetime import datetime
+
+from session_records import SearchRecord, ArticleRecord
+from session_store import _dumps
+
+WORDS = ['캠핑', '요리', '레시피', '여행', '후기', '추천', '맛집', '가성비', '초보', '방법',
+         '정리', '꿀팁', '비교', '리뷰', '준비물', '일상', '주말', '서울', '제주', '가족']
+BLOGGERS = ['캠핑하는곰', '요리왕', '여행기록', '주말나들이', '살림일기', '맛집탐방러']
+
+
+def clean_html_tags(text):
+    return re.sub(re.compile('<.*?>'), '', text)
+
+
+def fake_sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def fake_search_result(rng, count):
+    """네이버 블로그 검색 응답 형식의 가짜 데이터"""
+    items = []
+    for i in range(count):
+        items.append({
+            'title': f"<b>{rng.choice(WORDS)}</b> {fake_sentence(rng, 6)}",
+            'link': f"https://blog.naver.com/user{rng.randint(1, 999)}/{220000000000 + i}",
+            'description': f"{fake_sentence(rng, 12)} <b>{rng.choice(WORDS)}</b> {fake_sentence(rng, 14)}",
+            'bloggername': rng.choice(BLOGGERS),
+            'bloggerlink': f"blog.naver.com/user{rng.randint(1, 999)}",
+            'postdate': f"2024{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}",
+        })
+    return {
+        'lastBuildDate': 'Mon, 01 Jan 2024 00:00:00 +0900',
+        'total': 123456,
+        'start': 1,
+        'display': count,
+        'items': items,
+    }
+
+
+def fake_article(rng, chars=8000):
+    paragraphs = []
+    length = 0
+    while length < chars:
+        paragraph = f"## {fake_sentence(rng, 4)}\n\n{fake_sentence(rng, 60)}"
+        paragraphs.append(paragraph)
+        length += len(paragraph)
+    return '\n\n'.join(paragraphs)
+
+
+def legacy_session(keyword, search_result, content):
+    """session_records 도입 전 /api/search + /search + /api/generate_blog가 저장하던 형태"""
+    titles = []
+    descriptions = []
+    for item in search_result['items']:
+        title = clean_html_tags(item.get('title', ''))
+        description = clean_html_tags(item.get('description', ''))
+        if title:
+            titles.append(title)
+            descriptions.append(description)
+    results = [{
+        'title': clean_html_tags(item.get('title', '')),
+        'description': clean_html_tags(item.get('description', '')),
+        'link': item.get('link', ''),
+        'postdate': item.get('postdate', '')
+    } for item in search_result['items']]
+    return {
+        'keyword': keyword,
+        'search_result': search_result,
+        'titles': titles,
+        'descriptions': descriptions,
+        'results': results,
+        'timestamp': datetime.now(),
+        'blog_content': {
+            'title': titles[0],
+            'content': content,
+            'prompt_type': 'informative',
+            'additional_prompt': '',
+            'min_chars': 4000,
+            'max_chars': 8000,
+            'image_prompts': None
+        },
+    }
+
+
+def compact_session(keyword, search_result, content):
+    search = SearchRecord.from_naver(keyword, search_result, clean_html_tags)
+    return {
+        'keyword': keyword,
+        'search': search,
+        'timestamp': datetime.now(),
+        'blog_content': ArticleRecord(
+            search.titles[0], content,
+            prompt_type='informative', min_chars=4000, max_chars=8000
+        ),
+    }
+
+
+def stored_size(session):
+    """SQLite/Redis 저장소처럼 필드별로 직렬화했을 때의 합계"""
+    return sum(len(_dumps(value)) for value in session.values())
+
+
+def resident_size(build, payloads):
+    """세션 여러 개를 만들어 둔 상태의 세션당 메모리"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = [build(*payload) for payload in payloads]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(sessions), sessions
+
+
+def deep_size(obj, seen=None):
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif hasattr(obj, '__slots__'):
+        size += sum(deep_size(getattr(obj, name, None), seen) for name in obj.__slots__)
+    return size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    num_sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    rng = random.Random(42)
+
+    payloads = [
+        (f"키워드{i}", fake_search_result(rng, count), fake_article(rng))
+        for i in range(num_sessions)
+    ]
+
+    legacy = legacy_session(*payloads[0])
+    compact = compact_session(*payloads[0])
+
+    # 두 구성이 같은 값을 돌려주는지 먼저 확인
+    assert compact['search'].titles == legacy['titles']
+    assert compact['search'].descriptions == legacy['descriptions']
+    assert compact['search'].results() == legacy['results']
+    assert compact['blog_content']['content'] == legacy['blog_content']['content']
+
+    print(f"📊 검색 결과 {count}개 + 본문 {len(payloads[0][2]):,}자, 세션 {num_sessions}개 기준\n")
+    print(f"{'':<18}{'기존':>14}{'압축 레코드':>14}{'비율':>8}")
+
+    legacy_stored = stored_size(legacy)
+    compact_stored = stored_size(compact)
+    print(f"{'저장 크기':<18}{legacy_stored:>13,}B{compact_stored:>13,}B{compact_stored / legacy_stored:>8.0%}")
+
+    legacy_deep = deep_size(legacy)
+    compact_deep = deep_size(compact)
+    print(f"{'객체 크기':<18}{legacy_deep:>13,}B{compact_deep:>13,}B{compact_deep / legacy_deep:>8.0%}")
+
+    # 기존 구성은 원본 응답을 그대로 붙잡고 있으므로 응답 생성도 측정 안에 포함
+    legacy_rss, _ = resident_size(
+        lambda k, r, c: legacy_session(k, json.loads(json.dumps(r)), c), payloads)
+    compact_rss, _ = resident_size(
+        lambda k, r, c: compact_session(k, json.loads(json.dumps(r)), c), payloads)
+    print(f"{'메모리/세션':<18}{legacy_rss:>13,.0f}B{compact_rss:>13,.0f}B{compact_rss / legacy_rss:>8.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+gunicorn 워커 시작 비용 비교 (web_app import 시간 / RSS)
+
+gunicorn은 --preload 없이 워커마다 web_app을 새로 import하므로, import 시간과 메모리가 곧
+워커 하나의 시작 비용입니다. 새 파이썬 프로세스에서 web_app을 import해
+    - import 시간, import 직후 RSS, 무거운 모듈(openai, pytrends, pandas, requests) 로드 여부
+    - 첫 요청 준비 시간 (웹앱 초기화 + /healthz 한 번)
+을 측정하고, 비교할 git 커밋(기본 HEAD~1)의 트리와 나란히 보여줍니다. API 키나 네트워크 없이 실행됩니다.
+
+    python bench_startup.py [비교할 git 커밋] [반복 횟수]
+"""
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ('openai', 'pytrends', 'pandas', 'requests', 'numpy')
+
+# 새 프로세스에서 실행할 측정 코드 (결과는 마지막 줄 JSON)
+PROBE = r'''
+import json, os, sys, time
+started = time.perf_counter()
+import web_app
+import_seconds = time.perf_counter() - started
+
+def rss_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+import_rss = rss_mb()
+heavy = [name for name in HEAVY if name in sys.modules]
+
+started = time.perf_counter()
+if hasattr(web_app.blog_app, 'get'):
+    web_app.blog_app.get()
+web_app.app.test_client().get('/healthz')
+first_request_seconds = time.perf_counter() - started
+
+print(json.dumps({
+    'import_seconds': import_seconds,
+    'import_rss_mb': import_rss,
+    'first_request_seconds': first_request_seconds,
+    'rss_mb': rss_mb(),
+    'modules': len(sys.modules),
+    'heavy': heavy
+}))
+sys.stdout.flush()
+os._exit(0)
+'''
+
+
+def export_tree(ref, directory):
+    """git 커밋의 트리를 directory에 풀어 놓음"""
+    archive = subprocess.run(['git', 'archive', ref], cwd=BASE_DIR, check=True, capture_output=True).stdout
+    subprocess.run(['tar', '-x', '-C', directory], input=archive, check=True)
+
+
+def measure(tree, runs, scratch):
+    env = dict(
+        os.environ,
+        SESSION_STORE_BACKEND='memory',
+        TREND_SNAPSHOT_PATH=os.path.join(scratch, 'trending_keywords.json'),
+        TREND_REFRESH_INTERVAL='86400',
+        METRICS_DIR=os.path.join(scratch, 'metrics'),
+        IMAGE_STORE_DIR=os.path.join(scratch, 'images'),
+        LOG_LEVEL='WARNING',
+        PYTHONDONTWRITEBYTECODE='1',
+    )
+    code = f"HEAVY = {HEAVY_MODULES!r}\n" + PROBE
+    results = []
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, '-c', code], cwd=tree, env=env,
+                                   capture_output=True, text=True, timeout=120)
+        if completed.returncode != 0:
+            raise RuntimeError(f"{tree}에서 web_app import 실패:\n{completed.stderr[-2000:]}")
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return {
+        'import_seconds': statistics.median(r['import_seconds'] for r in results),
+        'import_rss_mb': statistics.median(r['import_rss_mb'] for r in results),
+        'first_request_seconds': statistics.median(r['first_request_seconds'] for r in results),
+        'rss_mb': statistics.median(r['rss_mb'] for r in results),
+        'modules': results[-1]['modules'],
+        'heavy': results[-1]['heavy'],
+    }
+
+
+def main():
+    ref = sys.argv[1] if len(sys.argv) > 1 else 'HEAD~1'
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    scratch = tempfile.mkdtemp(prefix='bench_startup_')
+    try:
+        before_tree = os.path.join(scratch, 'before')
+        os.makedirs(before_tree)
+        export_tree(ref, before_tree)
+
+        rows = [
+            (ref, measure(before_tree, runs, os.path.join(scratch, 'before-state'))),
+            ('현재', measure(BASE_DIR, runs, os.path.join(scratch, 'current-state'))),
+        ]
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    print(f"📊 web_app import {runs}회 중앙값 (워커 1개 기준)\n")
+    print(f"{'':<12}{'import(초)':>12}{'RSS(MB)':>10}{'첫 요청(초)':>13}{'요청 후 RSS':>12}{'모듈 수':>9}  무거운 모듈")
+    for name, row in rows:
+        print(f"{name:<12}{row['import_seconds']:>12.2f}{row['import_rss_mb']:>10.1f}"
+              f"{row['first_request_seconds']:>13.2f}{row['rss_mb']:>12.1f}{row['modules']:>9}  "
+              f"{', '.join(row['heavy']) or '-'}")
+    workers = 4
+    saved = (rows[0][1]['import_rss_mb'] - rows[1][1]['import_rss_mb']) * workers
+    print(f"\n워커 {workers}개 기준 시작 직후 메모리 차이: {saved:.0f}MB")
+
+
+if __name__ == '__main__':
+    main()
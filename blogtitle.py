@@ -7,6 +7,7 @@ import re
 from collections import Counter
 from openai import OpenAI
 import prompts
+import llm_client
 
 def load_env_variables():
     """
@@ -160,7 +161,9 @@ def analyze_with_gpt(titles, descriptions, query, openai_api_key, analysis_type=
         
         print("GPT-4o로 블로그 제목 심화 분석 중...")
         
-        response = client.chat.completions.create(
+        response = llm_client.create_chat_completion(
+            client,
+            'analysis',
             model="gpt-4o",
             messages=[
                 {
@@ -196,7 +199,9 @@ def generate_new_titles(analysis_result, query, openai_api_key, num_titles=10):
         
         print(f"GPT-4o로 새로운 블로그 제목 {num_titles}개 생성 중...")
         
-        response = client.chat.completions.create(
+        response = llm_client.create_chat_completion(
+            client,
+            'titles',
             model="gpt-4o",
             messages=[
                 {
@@ -56,6 +56,7 @@ pyinstaller \
     --icon=icon.icns \
     --add-data=".env:." \
     --add-data="prompts.py:." \
+    --add-data="data/categories.json:data" \
     --add-data="blog_settings.json:." \
     --hidden-import=PIL \
     --hidden-import=PIL._tkinter_finder \
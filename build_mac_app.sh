@@ -22,6 +22,7 @@ pyinstaller \
     --name "KeiaiLAB_블로그_글생성기_by_혁" \
     --add-data ".env:." \
     --add-data "prompts.py:." \
+    --add-data "data/categories.json:data" \
     --hidden-import customtkinter \
     --hidden-import openai \
     --hidden-import PIL \
@@ -0,0 +1,116 @@
+"""
+키워드 카테고리 카탈로그 (data/categories.json)
+
+웹앱과 데스크톱 앱이 같은 카테고리 파일을 사용합니다. 파일은 한 번만 읽어 두고,
+웹 API 응답용 JSON과 gzip 압축본, ETag를 미리 만들어 두므로 요청마다 직렬화하지 않습니다.
+파일이 바뀌면(mtime) 다음 조회 때 다시 읽습니다. 새 파일이 잘못되었으면 이전 내용을 계속 사용합니다.
+
+    {"version": 1, "categories": {"🔥 트렌드/핫이슈": {"keywords": [...], "description": "...", "color": "..."}}}
+
+    CATEGORY_CATALOG_PATH=/app/data/categories.json
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+# PyInstaller로 묶인 데스크톱 앱은 --add-data로 넣은 파일이 _MEIPASS 아래에 풀림
+_BASE_DIR = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+CATEGORY_CATALOG_PATH = os.environ.get('CATEGORY_CATALOG_PATH', os.path.join(_BASE_DIR, 'data', 'categories.json'))
+# 파일 변경 확인 최소 간격 (초) - 조회할 때마다 stat하지 않도록
+RELOAD_CHECK_INTERVAL = 2.0
+GZIP_LEVEL = 9
+
+logger = logging.getLogger(__name__)
+
+
+class RenderedJSON:
+    """미리 직렬화한 JSON 응답 본문 (원본 / gzip / ETag)"""
+
+    __slots__ = ('body', 'gzip_body', 'etag')
+
+    def __init__(self, payload, version):
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.gzip_body = gzip.compress(self.body, GZIP_LEVEL, mtime=0)
+        self.etag = f"v{version}-{hashlib.sha256(self.body).hexdigest()[:16]}"
+
+
+class CategoryCatalog:
+    """카테고리 파일을 읽어 두고 바뀌면 다시 읽는 카탈로그"""
+
+    def __init__(self, path=CATEGORY_CATALOG_PATH):
+        self.path = path
+        self.version = None
+        self._categories = {}
+        self._rendered = {}
+        self._mtime = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        """파일을 읽어 카테고리와 응답 본문을 다시 만듦 (실패하면 False, 이전 내용 유지)"""
+        try:
+            mtime = os.path.getmtime(self.path)
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            categories = data['categories']
+            version = data.get('version', 0)
+            rendered = {
+                # /api/categories
+                'categories': RenderedJSON({'success': True, 'version': version, 'categories': categories}, version),
+                # /api/category-keywords
+                'category_keywords': RenderedJSON([
+                    {
+                        'name': name,
+                        'icon': name.split()[0],
+                        'description': category['description'],
+                        'keywords': category['keywords']
+                    }
+                    for name, category in categories.items()
+                ], version),
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning("⚠️ 카테고리 파일 읽기 실패 (%s): %s", self.path, e)
+            return False
+
+        with self._lock:
+            self._categories = categories
+            self._rendered = rendered
+            self.version = version
+            self._mtime = mtime
+        logger.info("📚 카테고리 카탈로그 로드: v%s, %d개 카테고리", version, len(categories))
+        return True
+
+    def _check_reload(self):
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            # 잘못된 파일이면 다음 변경 전까지 다시 읽지 않음
+            self._mtime = mtime
+            self.reload()
+
+    def categories(self):
+        """{카테고리 이름: {'keywords', 'description', 'color'}} (공유 객체이므로 수정하지 마세요)"""
+        self._check_reload()
+        return self._categories
+
+    def rendered(self, view):
+        """미리 만든 응답 본문 ('categories' 또는 'category_keywords')"""
+        self._check_reload()
+        return self._rendered[view]
+
+
+# 웹앱과 데스크톱 앱이 공유하는 카탈로그
+category_catalog = CategoryCatalog()
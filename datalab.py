@@ -0,0 +1,190 @@
+"""
+네이버 DataLab 검색어 트렌드 클라이언트 (키워드 수 제한 없음)
+
+DataLab API는 한 번에 키워드 그룹 5개까지만 받고, 결과 ratio는 그 요청 안에서 가장 많이 검색된
+그룹을 100으로 한 상대값입니다. 그래서 키워드가 많으면
+    - 모든 요청에 같은 기준 키워드(anchor)를 넣고 나머지 4칸에 키워드를 나눠 담아
+    - 요청들을 속도 제한 안에서 동시에 보낸 뒤
+    - 각 요청의 ratio를 기준 키워드의 평균 검색량 = 100이 되도록 다시 맞춰
+서로 다른 요청의 결과를 같은 척도로 비교할 수 있게 합니다.
+결과는 날짜별로 공유 저장소('datalab' 네임스페이스)에 캐시하므로 같은 날 다시 조회하면 호출하지 않습니다.
+
+    DATALAB_ANCHOR=날씨          # 기준 키워드 (검색량이 꾸준히 많은 키워드)
+    DATALAB_PARALLELISM=3        # 동시 요청 수
+    DATALAB_PER_MINUTE=60        # 분당 최대 요청 수 (하루 1,000회 제한도 함께 고려)
+    DATALAB_TIMEOUT=10           # 요청 하나의 제한 시간 (초)
+"""
+
+import importlib.util
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+# requests는 첫 요청 때 import (워커 시작 시간 단축)
+REQUESTS_AVAILABLE = importlib.util.find_spec('requests') is not None
+
+from metrics import metrics
+from rate_limiter import SharedRateLimiter
+
+# DataLab 요청 하나에 넣을 수 있는 키워드 그룹 수 (기준 키워드 포함)
+DATALAB_MAX_GROUPS = 5
+DATALAB_ANCHOR = os.environ.get('DATALAB_ANCHOR', '날씨')
+DATALAB_PARALLELISM = int(os.environ.get('DATALAB_PARALLELISM', '3'))
+DATALAB_PER_MINUTE = int(os.environ.get('DATALAB_PER_MINUTE', '60'))
+DATALAB_TIMEOUT = float(os.environ.get('DATALAB_TIMEOUT', '10'))
+# 캐시 보관 시간 (초) - 키에 날짜가 들어가므로 하루가 지나면 새로 조회
+DATALAB_CACHE_TTL = 36 * 3600
+# 최근 점수 계산에 쓰는 마지막 구간 수
+RECENT_POINTS = 3
+
+# 같은 호스트의 모든 워커 프로세스가 공유하는 제한기
+datalab_rate_limiter = SharedRateLimiter('naver_datalab', DATALAB_PER_MINUTE)
+
+logger = logging.getLogger(__name__)
+
+
+def chunk_keywords(keywords, size=DATALAB_MAX_GROUPS - 1):
+    """키워드를 요청 하나에 들어갈 크기로 나눔 (기준 키워드 자리 제외)"""
+    return [keywords[i:i + size] for i in range(0, len(keywords), size)]
+
+
+def normalize_to_anchor(results, anchor):
+    """요청 하나의 결과를 기준 키워드 평균 = 100 척도로 변환 ({키워드: [{'period', 'ratio'}]})
+
+    기준 키워드 검색량이 0이면 다른 요청과 맞출 수 없으므로 ValueError를 발생시킵니다.
+    """
+    series = {group.get('title', ''): group.get('data', []) for group in results}
+    anchor_data = series.pop(anchor, [])
+    anchor_mean = sum(point['ratio'] for point in anchor_data) / len(anchor_data) if anchor_data else 0
+    if anchor_mean <= 0:
+        raise ValueError(f"기준 키워드 '{anchor}'의 검색량이 없어 정규화할 수 없습니다")
+    scale = 100.0 / anchor_mean
+    return {
+        keyword: [{'period': point['period'], 'ratio': round(point['ratio'] * scale, 3)} for point in data]
+        for keyword, data in series.items()
+    }
+
+
+def recent_score(series, points=RECENT_POINTS):
+    """최근 구간 평균 (기준 키워드 = 100 척도)"""
+    recent = series[-points:]
+    return round(sum(point['ratio'] for point in recent) / len(recent), 1) if recent else 0.0
+
+
+def rank_series(series, limit=None):
+    """정규화된 시계열을 최근 검색량 순위 리스트 [{'rank', 'keyword', 'trend_score'}]로 변환"""
+    ranking = sorted(
+        ({'keyword': keyword, 'trend_score': recent_score(data)} for keyword, data in series.items()),
+        key=lambda item: item['trend_score'],
+        reverse=True
+    )
+    ranking = ranking[:limit] if limit else ranking
+    for i, item in enumerate(ranking):
+        item['rank'] = i + 1
+    return ranking
+
+
+class DataLabClient:
+    """키워드 수에 제한 없는 DataLab 검색어 트렌드 조회"""
+
+    def __init__(self, client_id, client_secret, base_url='https://openapi.naver.com', store=None,
+                 anchor=DATALAB_ANCHOR, limiter=None, max_workers=DATALAB_PARALLELISM, timeout=DATALAB_TIMEOUT):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.url = f"{base_url.rstrip('/')}/v1/datalab/search"
+        self.store = store
+        self.anchor = anchor
+        self.limiter = limiter or datalab_rate_limiter
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.requests_total = 0
+
+    def _period(self, days, time_unit):
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+        return start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+
+    def _cache_key(self, start_date, end_date, time_unit):
+        return f"{end_date}:{start_date}:{time_unit}:{self.anchor}"
+
+    def _request(self, keywords, start_date, end_date, time_unit):
+        """기준 키워드 + 키워드 최대 4개 요청 후 정규화된 결과 반환"""
+        if not REQUESTS_AVAILABLE:
+            raise Exception("requests가 설치되지 않았습니다.")
+        import requests
+
+        self.limiter.acquire()
+        self.requests_total += 1
+        with metrics.timed('naver_datalab'):
+            response = requests.post(
+                self.url,
+                headers={
+                    "X-Naver-Client-Id": self.client_id,
+                    "X-Naver-Client-Secret": self.client_secret,
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "startDate": start_date,
+                    "endDate": end_date,
+                    "timeUnit": time_unit,
+                    "keywordGroups": [
+                        {"groupName": keyword, "keywords": [keyword]}
+                        for keyword in [self.anchor] + list(keywords)
+                    ]
+                },
+                timeout=(3, self.timeout)
+            )
+            if response.status_code != 200:
+                raise Exception(f"HTTP {response.status_code}: {response.text[:200]}")
+        metrics.add_bytes('naver_datalab', len(response.content))
+        return normalize_to_anchor(response.json().get('results', []), self.anchor)
+
+    def trends(self, keywords, days=7, time_unit='date'):
+        """키워드별 정규화된 검색량 시계열 조회
+
+        ({키워드: [{'period', 'ratio'}]}, 실패한 키워드 리스트) 반환.
+        ratio는 기준 키워드의 기간 평균 검색량을 100으로 한 값이라 요청이 달라도 비교할 수 있습니다.
+        """
+        if not self.client_id or not self.client_secret:
+            raise Exception("네이버 API 키가 설정되지 않았습니다.")
+
+        keywords = [keyword for keyword in dict.fromkeys(keywords) if keyword and keyword != self.anchor]
+        start_date, end_date = self._period(days, time_unit)
+        cache_key = self._cache_key(start_date, end_date, time_unit)
+
+        results = {}
+        if self.store is not None:
+            results = self.store.get(cache_key, fields=keywords) or {}
+        missing = [keyword for keyword in keywords if keyword not in results]
+        if not missing:
+            return results, []
+
+        chunks = chunk_keywords(missing)
+        logger.info("📊 DataLab 조회: 키워드 %d개 → 요청 %d개 (캐시 %d개)", len(missing), len(chunks), len(results))
+        fetched = {}
+        failed = []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks)), thread_name_prefix='datalab') as executor:
+            futures = {
+                executor.submit(self._request, chunk, start_date, end_date, time_unit): chunk
+                for chunk in chunks
+            }
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    fetched.update(future.result())
+                except Exception as e:
+                    logger.warning("⚠️ DataLab 요청 실패 (%s): %s", ', '.join(chunk), e)
+                    failed.extend(chunk)
+
+        if fetched and self.store is not None:
+            # 캐시 항목이 없거나 만료됐으면 새로 만듦 (update는 없는 항목을 만들지 않음)
+            if not self.store.update(cache_key, fetched):
+                self.store.create(cache_key, fetched)
+        results.update(fetched)
+        return results, failed
+
+    def ranked(self, keywords, days=7, time_unit='date', limit=None):
+        """최근 검색량 순위 리스트 (trend_score는 기준 키워드 = 100)"""
+        series, _ = self.trends(keywords, days, time_unit)
+        return rank_series(series, limit)
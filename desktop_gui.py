@@ -27,6 +27,15 @@ except ImportError:
     PROMPTS_AVAILABLE = False
     print("prompts.py 파일이 없습니다.")
 
+# 공용 모듈(llm_client, 이미지 생성 등)의 로그를 콘솔에 출력
+import app_logging
+app_logging.configure_logging()
+
+import llm_client
+from image_generation import generate_images_concurrently
+import image_derivatives
+from category_catalog import category_catalog
+
 class BlogAnalyzerApp:
     def __init__(self, root):
         self.root = root
@@ -640,7 +649,9 @@ class BlogAnalyzerApp:
             system_prompt = "당신은 블로그 제목 분석 전문가입니다."
             user_prompt = f"다음 키워드 '{query}'에 대한 블로그 제목들을 분석해주세요:\n" + "\n".join([f"{i+1}. {title}" for i, title in enumerate(titles)])
         
-        response = client.chat.completions.create(
+        response = llm_client.create_chat_completion(
+            client,
+            'analysis',
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -675,7 +686,9 @@ class BlogAnalyzerApp:
             system_prompt = "당신은 매력적인 블로그 제목을 생성하는 전문가입니다."
             user_prompt = f"키워드 '{query}'에 대해 {num_titles}개의 매력적인 블로그 제목을 생성해주세요."
         
-        response = client.chat.completions.create(
+        response = llm_client.create_chat_completion(
+            client,
+            'titles',
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -1050,7 +1063,9 @@ class BlogAnalyzerApp:
                 # OpenAI API 호출
                 client = OpenAI(api_key=self.openai_api_key)
                 
-                response = client.chat.completions.create(
+                response = llm_client.create_chat_completion(
+                    client,
+                    'long_form',
                     model="gpt-4o",
                     messages=[
                         {"role": "system", "content": prompt_data['system_prompt']},
@@ -1489,7 +1504,9 @@ class BlogAnalyzerApp:
 4. [프롬프트]
 """
             
-            response = client.chat.completions.create(
+            response = llm_client.create_chat_completion(
+                client,
+                'image_prompts',
                 model="gpt-4o",
                 messages=[
                     {"role": "system", "content": "당신은 DALL-E 이미지 생성을 위한 전문 프롬프트 작성자입니다. 주어진 블로그 내용을 분석하여 시각적으로 매력적이고 내용과 관련된 이미지 프롬프트를 생성합니다."},
@@ -1579,7 +1596,6 @@ class BlogAnalyzerApp:
         """DALL-E를 사용하여 이미지 생성 및 저장"""
         try:
             client = OpenAI(api_key=self.openai_api_key)
-            generated_images = []
             
             # 블로그 폴더 생성
             if self.last_generated_blog:
@@ -1597,10 +1613,9 @@ class BlogAnalyzerApp:
             else:
                 blog_folder = None
             
-            for i, prompt in enumerate(prompts):
-                self.update_status(f"이미지 {i+1}/{len(prompts)} 생성 중...")
-                
-                response = client.images.generate(
+            def generate_one(prompt, index):
+                response = llm_client.generate_image(
+                    client,
                     model="dall-e-3",
                     prompt=prompt,
                     size="1024x1024",
@@ -1616,16 +1631,27 @@ class BlogAnalyzerApp:
                 # 로컬에 이미지 저장
                 local_path = None
                 if blog_folder:
-                    local_path = self.download_and_save_image(image_url, blog_folder, i+1)
+                    local_path = self.download_and_save_image(image_url, blog_folder, index)
+                    # 미리보기 썸네일 / 블로그용 축소본을 별도 프로세스에서 생성
+                    if local_path:
+                        image_derivatives.schedule_variants(local_path)
                 
-                generated_images.append({
+                return {
                     'prompt': prompt,
                     'url': image_url,
                     'local_path': local_path,
-                    'index': i+1
-                })
-                
-                time.sleep(1)  # API 호출 간격 조절
+                    'index': index
+                }
+            
+            def on_progress(event):
+                # 작업 스레드에서 호출되므로 상태바 갱신은 메인 스레드로 넘김
+                done = event['completed'] + event['failed']
+                message = f"이미지 {done}/{event['total']} 완료 (실패 {event['failed']}개)"
+                self.root.after(0, lambda: self.update_status(message))
+                self.root.after(0, lambda: self.update_progress(done / event['total']))
+            
+            self.update_status(f"이미지 {len(prompts)}개 동시 생성 중...")
+            generated_images = generate_images_concurrently(prompts, generate_one, on_progress=on_progress)
             
             # 생성 완료 알림에 폴더 경로 포함
             if blog_folder and generated_images:
@@ -1698,6 +1724,13 @@ class BlogAnalyzerApp:
             prompt_label = ttk.Label(img_frame, text=f"프롬프트: {img['prompt']}", wraplength=900, justify=tk.LEFT)
             prompt_label.pack(anchor=tk.W, pady=(0, 10))
             
+            # 썸네일 미리보기 (Pillow가 있고 로컬에 저장된 경우)
+            thumbnail = self.load_image_thumbnail(img.get('local_path'))
+            if thumbnail:
+                preview_label = ttk.Label(img_frame, image=thumbnail)
+                preview_label.image = thumbnail  # 가비지 컬렉션 방지
+                preview_label.pack(anchor=tk.W, pady=(0, 10))
+            
             # 저장 경로 표시 (있을 경우)
             if img.get('local_path'):
                 path_label = ttk.Label(img_frame, text=f"💾 저장 위치: {img['local_path']}", 
@@ -1739,6 +1772,21 @@ class BlogAnalyzerApp:
             canvas.yview_scroll(int(-1*(event.delta/120)), "units")
         canvas.bind("<MouseWheel>", _on_mousewheel)
 
+    def load_image_thumbnail(self, local_path):
+        """저장된 이미지의 썸네일 파생본을 Tk 이미지로 불러오기 (없으면 None)"""
+        if not local_path or not image_derivatives.PIL_AVAILABLE:
+            return None
+        thumb_path = image_derivatives.ensure_variant(local_path, 'thumb', timeout=10)
+        if not thumb_path:
+            return None
+        try:
+            from PIL import Image, ImageTk
+            with Image.open(thumb_path) as thumb:
+                return ImageTk.PhotoImage(thumb.copy())
+        except Exception as e:
+            print(f"썸네일 불러오기 오류: {str(e)}")
+            return None
+
     def copy_to_clipboard(self, text, description="내용"):
         """텍스트를 클립보드에 복사"""
         try:
@@ -1988,49 +2036,8 @@ class BlogAnalyzerApp:
         close_button.pack(pady=(20, 0))
 
     def get_predefined_categories(self):
-        """미리 정의된 카테고리들 반환"""
-        return {
-            "🔥 트렌드/핫이슈": {
-                "keywords": ["ChatGPT", "인공지능", "메타버스", "NFT", "가상화폐", "전기차", "ESG", "구독경제", "MZ세대", "클린뷰티", "비건", "제로웨이스트"],
-                "description": "최신 화제, 뉴스, 사회적 이슈"
-            },
-            "💰 재테크/투자": {
-                "keywords": ["주식", "부동산", "가상화폐", "비트코인", "투자", "펀드", "적금", "연금", "세금", "절세", "파이어족", "경제독립"],
-                "description": "주식, 부동산, 투자 관련 정보"
-            },
-            "🏃‍♀️ 건강/피트니스": {
-                "keywords": ["다이어트", "홈트레이닝", "요가", "필라테스", "러닝", "헬스", "단백질", "비타민", "수면", "스트레칭", "마라톤", "크로스핏"],
-                "description": "운동, 다이어트, 건강관리"
-            },
-            "🍳 요리/레시피": {
-                "keywords": ["에어프라이어", "홈쿡", "다이어트식단", "간편요리", "베이킹", "비건요리", "키토식단", "도시락", "브런치", "디저트", "발효음식", "한식"],
-                "description": "음식, 요리법, 맛집 정보"
-            },
-            "✈️ 여행/관광": {
-                "keywords": ["제주도", "부산", "강릉", "경주", "전주", "해외여행", "캠핑", "글램핑", "호텔", "펜션", "배낭여행", "패키지여행"],
-                "description": "국내외 여행, 명소, 숙박"
-            },
-            "🎮 취미/엔터": {
-                "keywords": ["독서", "영화", "게임", "드라마", "웹툰", "음악", "그림", "사진", "넷플릭스", "유튜브", "스트리밍", "OTT"],
-                "description": "게임, 영화, 드라마, 음악"
-            },
-            "👔 비즈니스/마케팅": {
-                "keywords": ["창업", "부업", "마케팅", "브랜딩", "SNS마케팅", "유튜브", "블로그", "온라인쇼핑", "이커머스", "스타트업", "프리랜서", "사이드잡"],
-                "description": "창업, 마케팅, 온라인 사업"
-            },
-            "🏠 라이프스타일": {
-                "keywords": ["인테리어", "정리정돈", "미니멀라이프", "가드닝", "반려동물", "육아", "교육", "패션", "뷰티", "스킨케어", "홈데코", "살림"],
-                "description": "인테리어, 패션, 일상"
-            },
-            "📚 교육/학습": {
-                "keywords": ["영어공부", "자격증", "코딩", "프로그래밍", "온라인강의", "독학", "시험", "취업", "이직", "스킬업", "자기계발", "어학연수"],
-                "description": "공부, 자격증, 스킬업"
-            },
-            "💻 IT/기술": {
-                "keywords": ["프로그래밍", "코딩", "웹개발", "앱개발", "AI", "머신러닝", "블록체인", "클라우드", "사이버보안", "빅데이터", "IoT", "5G"],
-                "description": "프로그래밍, AI, 최신 기술"
-            }
-        }
+        """미리 정의된 카테고리들 반환 (data/categories.json, 웹앱과 공유)"""
+        return category_catalog.categories()
     
     def show_category_selection(self):
         """카테고리 선택 창 표시"""
@@ -2269,4 +2276,7 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
+    # 패키징된 앱에서 이미지 파생본 프로세스 풀이 동작하도록 필요
+    import multiprocessing
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
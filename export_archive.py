@@ -0,0 +1,220 @@
+"""
+블로그 결과 ZIP 내보내기 (스트리밍)
+
+ZIP 전체를 메모리에 만든 뒤 보내는 대신, 항목을 하나씩 기록하면서 만들어진 바이트를
+바로 응답으로 흘려보냅니다. 이미 압축된 PNG는 다시 압축하지 않고(ZIP_STORED) 저장하며,
+글 본문(txt)과 HTML 내보내기 파일도 같은 압축 파일에 넣을 수 있습니다.
+"""
+
+import html
+import io
+import json
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+
+# 항목 데이터를 응답으로 내보내는 단위
+STREAM_CHUNK_SIZE = 64 * 1024
+# ZIP 내보내기 시 이미지를 동시에 내려받을 최대 개수
+EXPORT_FETCH_WORKERS = int(os.environ.get('EXPORT_FETCH_WORKERS', '4'))
+# 이미지 내려받기 전체 제한 시간 (초) - 넘으면 받은 것까지만 담음
+EXPORT_FETCH_DEADLINE = float(os.environ.get('EXPORT_FETCH_DEADLINE', '45'))
+
+
+class _StreamBuffer(io.RawIOBase):
+    """zipfile이 기록한 바이트를 모아두었다가 꺼내가는 탐색 불가(unseekable) 스트림"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._offset = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ZipStreamWriter:
+    """항목을 하나씩 추가하며 만들어진 ZIP 바이트 조각을 돌려주는 기록기
+
+    동기 제너레이터(stream_zip)와 ASGI 모드의 비동기 제너레이터가 함께 사용합니다.
+    """
+
+    def __init__(self):
+        self._buffer = _StreamBuffer()
+        self._zip = zipfile.ZipFile(self._buffer, 'w')
+
+    def add(self, name, data, compress):
+        """항목 하나를 기록하며 바이트 조각을 yield (데이터는 bytes 또는 bytes 조각의 iterable)"""
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        chunks = [data] if isinstance(data, (bytes, bytearray)) else data
+        with self._zip.open(info, 'w') as entry:
+            for chunk in chunks:
+                for start in range(0, len(chunk), STREAM_CHUNK_SIZE):
+                    entry.write(chunk[start:start + STREAM_CHUNK_SIZE])
+                    pending = self._buffer.pop()
+                    if pending:
+                        yield pending
+        pending = self._buffer.pop()
+        if pending:
+            yield pending
+
+    def close(self):
+        """중앙 디렉터리를 기록하고 남은 바이트 반환"""
+        self._zip.close()
+        return self._buffer.pop()
+
+
+def stream_zip(entries):
+    """(이름, 데이터, 압축여부) 항목들을 ZIP으로 기록하며 바이트 조각을 yield
+
+    entries는 제너레이터여도 되므로, 항목이 준비되는 대로 넘기면 그때마다 전송됩니다.
+    데이터는 bytes 또는 bytes 조각의 iterable입니다.
+    """
+    writer = ZipStreamWriter()
+    for name, data, compress in entries:
+        yield from writer.add(name, data, compress)
+    pending = writer.close()
+    if pending:
+        yield pending
+
+
+def summary_entries(keyword, total, image_files, failures, blog_data=None):
+    """이미지 뒤에 붙는 manifest.json과 (blog_data가 있으면) 글 본문 txt/html 항목 리스트"""
+    image_files = sorted(image_files, key=lambda name: int(re.search(r'(\d+)', name).group(1)))
+    manifest = {
+        'keyword': keyword,
+        'total': total,
+        'included': image_files,
+        'failed': sorted(failures, key=lambda failure: failure['index'])
+    }
+    entries = [('manifest.json', json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'), True)]
+    if blog_data:
+        title = blog_data.get('title', '')
+        content = blog_data.get('content', '')
+        entries.append(('article.txt', f"{title}\n\n{content}\n".encode('utf-8'), True))
+        entries.append(('article.html', article_to_html(title, content, image_files).encode('utf-8'), True))
+    return entries
+
+
+def archive_filename(keyword):
+    """키워드로 ZIP 파일 이름 생성"""
+    safe_keyword = "".join(c for c in (keyword or 'images') if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    if not safe_keyword:
+        safe_keyword = 'generated_images'
+    return f"{safe_keyword}_images.zip"
+
+
+def fetch_concurrently(items, fetch, max_workers=None, deadline=None):
+    """items를 제한된 스레드로 동시에 가져오며 끝나는 순서대로 (index, 데이터, 오류) yield
+
+    fetch(index, item)은 bytes를 반환해야 합니다. 전체 제한 시간(deadline 초)이 지나면
+    남은 항목은 기다리지 않고 오류 '시간 초과'로 보고합니다.
+    """
+    items = list(items)
+    if not items:
+        return
+    max_workers = max(1, min(max_workers or EXPORT_FETCH_WORKERS, len(items)))
+    deadline = EXPORT_FETCH_DEADLINE if deadline is None else deadline
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='export-fetch')
+    futures = {executor.submit(fetch, i, item): i for i, item in enumerate(items)}
+    pending = set(futures)
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            pending.discard(future)
+            index = futures[future]
+            try:
+                yield index, future.result(), None
+            except Exception as e:
+                yield index, None, str(e)
+    except FuturesTimeoutError:
+        for future in sorted(pending, key=futures.get):
+            future.cancel()
+            yield futures[future], None, f'시간 초과 ({deadline:.0f}초)'
+    finally:
+        # 느린 다운로드가 남아 있어도 응답을 붙잡지 않음
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _inline_markdown(text):
+    """굵게(**) 표시만 HTML로 변환 (나머지는 이스케이프)"""
+    return re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html.escape(text))
+
+
+def article_to_html(title, content, image_files=None):
+    """블로그 글을 단독 HTML 문서로 변환 (image_files는 ZIP 내부 상대 경로 목록)"""
+    body = []
+    paragraph = []
+    in_list = False
+
+    def close_paragraph():
+        if paragraph:
+            body.append(f"<p>{' '.join(paragraph)}</p>")
+            paragraph.clear()
+
+    for raw_line in content.strip().split('\n'):
+        line = raw_line.strip()
+        heading = re.match(r'^(#{1,3})\s+(.*)$', line)
+        bullet = re.match(r'^[-*]\s+(.*)$', line)
+
+        if in_list and not bullet:
+            body.append('</ul>')
+            in_list = False
+
+        if not line:
+            close_paragraph()
+        elif heading:
+            close_paragraph()
+            level = len(heading.group(1)) + 1
+            body.append(f"<h{level}>{_inline_markdown(heading.group(2))}</h{level}>")
+        elif bullet:
+            close_paragraph()
+            if not in_list:
+                body.append('<ul>')
+                in_list = True
+            body.append(f"<li>{_inline_markdown(bullet.group(1))}</li>")
+        else:
+            paragraph.append(_inline_markdown(line))
+
+    close_paragraph()
+    if in_list:
+        body.append('</ul>')
+
+    for image_file in image_files or []:
+        body.append(f'<figure><img src="{html.escape(image_file)}" alt="" style="max-width:100%"></figure>')
+
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>{html.escape(title)}</title>
+<style>
+body {{ font-family: 'Malgun Gothic', Arial, sans-serif; line-height: 1.8; max-width: 800px; margin: 40px auto; padding: 20px; }}
+h1 {{ color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 15px; }}
+h2, h3, h4 {{ color: #34495e; }}
+</style>
+</head>
+<body>
+<h1>{html.escape(title)}</h1>
+{chr(10).join(body)}
+</body>
+</html>
+"""
@@ -0,0 +1,156 @@
+"""
+상태 확인 (/healthz, /readyz)
+
+/healthz 는 프로세스가 요청에 응답하는지만 확인합니다 (템플릿, 저장소, 외부 호출 없음).
+/readyz 는 요청마다 외부를 호출하지 않고, 백그라운드 스레드가 HEALTH_PROBE_INTERVAL마다 확인해 둔
+프로브 결과와 프로세스 내 상태만 모아서 응답합니다.
+모니터는 앱을 만들 때(프로세스마다) 시작하며, critical 프로브는 시작할 때 한 번 바로 실행해 두므로
+새로 뜬(재시작된) 워커의 첫 /readyz 가 '확인 전'으로 503이 되지 않습니다.
+  - 프로브: 세션 저장소 읽기, 네이버/OpenAI API 주소 연결 (HTTP 응답이 오면 연결 가능 - 상태 코드는 보지 않음)
+  - 워커 포화: 작업 큐 대기/실행 중 작업 수
+  - 외부 호출: 단계별 진행 중 호출 수와 최근 오류율 (metrics.stage_status)
+
+이 인스턴스만의 문제(저장소 프로브 실패, 작업 큐 가득 참)면 503 'not_ready'를 반환합니다.
+외부 API 연결 실패나 높은 오류율은 모든 인스턴스가 함께 겪는 문제라 인스턴스를 빼도 나아지지 않으므로
+200과 함께 'degraded'로만 알립니다.
+
+    HEALTH_PROBE_INTERVAL=30     # 프로브 간격 (초)
+    HEALTH_PROBE_TIMEOUT=3       # 프로브 하나의 제한 시간 (초)
+    READY_ERROR_RATE=0.5         # 최근 오류율이 이 값 이상인 외부 단계는 degraded
+"""
+
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from metrics import metrics
+
+HEALTH_PROBE_INTERVAL = float(os.environ.get('HEALTH_PROBE_INTERVAL', '30'))
+HEALTH_PROBE_TIMEOUT = float(os.environ.get('HEALTH_PROBE_TIMEOUT', '3'))
+READY_ERROR_RATE = float(os.environ.get('READY_ERROR_RATE', '0.5'))
+# 오류율을 판단할 최소 최근 호출 수 (한두 번 실패로 degraded가 되지 않도록)
+READY_MIN_CALLS = 5
+
+logger = logging.getLogger(__name__)
+
+
+def http_probe(url, timeout=HEALTH_PROBE_TIMEOUT):
+    """url에 HEAD 요청을 보내는 프로브 (HTTP 오류 응답도 연결 가능으로 봄)"""
+    def probe():
+        request = urllib.request.Request(url, method='HEAD', headers={'User-Agent': 'blog-generator-readyz'})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout):
+                pass
+        except urllib.error.HTTPError:
+            pass
+    return probe
+
+
+class HealthMonitor:
+    """프로브를 주기적으로 실행해 결과를 보관하는 모니터 (프로세스마다 스레드 하나)
+
+    probes는 {이름: (프로브 함수, critical)}이며, 프로브 함수는 실패 시 예외를 발생시켜야 합니다.
+    critical 프로브가 실패하면 not_ready, 아니면 degraded로 판단합니다.
+    """
+
+    def __init__(self, probes, interval=HEALTH_PROBE_INTERVAL):
+        self.probes = probes
+        self.interval = interval
+        self._results = {}
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._pid = None
+
+    def start(self):
+        """이 프로세스의 프로브 스레드 시작 (여러 번 호출해도 한 번만, fork된 워커는 각자 시작)
+
+        critical 프로브는 반환 전에 한 번 실행해 두어, 시작 직후의 /readyz 도 실제 결과로 판단합니다.
+        동시에 호출한 다른 스레드는 이 첫 확인이 끝날 때까지 기다립니다.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            with self._lock:
+                self._results = {}
+            self.run_probes(critical_only=True)
+            self._pid = os.getpid()
+
+        def run():
+            while True:
+                self.run_probes()
+                time.sleep(self.interval)
+
+        threading.Thread(target=run, name='health-probe', daemon=True).start()
+
+    def run_probes(self, critical_only=False):
+        for name, (probe, critical) in self.probes.items():
+            if critical_only and not critical:
+                continue
+            started = time.monotonic()
+            error = None
+            try:
+                probe()
+            except Exception as e:
+                error = str(e)[:200]
+                logger.warning("⚠️ 상태 확인 실패 (%s): %s", name, error)
+            with self._lock:
+                self._results[name] = {
+                    'ok': error is None,
+                    'critical': critical,
+                    'latency_ms': round((time.monotonic() - started) * 1000, 1),
+                    'checked_at': time.time(),
+                    'error': error
+                }
+
+    def results(self):
+        """{이름: 마지막 프로브 결과 + age_seconds} (아직 확인 전이면 ok=None)"""
+        now = time.time()
+        with self._lock:
+            results = {name: dict(result) for name, result in self._results.items()}
+        for name, (_, critical) in self.probes.items():
+            result = results.setdefault(name, {'ok': None, 'critical': critical, 'checked_at': None})
+            checked_at = result.pop('checked_at')
+            result['age_seconds'] = round(now - checked_at, 1) if checked_at else None
+        return results
+
+
+def readiness(monitor, job_stats):
+    """(상태 코드, 응답 dict) - 캐시된 프로브 결과와 프로세스 내 상태만 사용"""
+    monitor.start()
+    probes = monitor.results()
+    upstream = metrics.stage_status()
+    saturated = job_stats['pending'] >= job_stats['max_pending']
+
+    problems = []
+    degraded = []
+    for name, result in probes.items():
+        if result['ok'] is None:
+            (problems if result['critical'] else degraded).append(f"{name}: 확인 전")
+        elif not result['ok']:
+            (problems if result['critical'] else degraded).append(f"{name}: {result['error']}")
+    if saturated:
+        problems.append(f"작업 큐 가득 참 ({job_stats['pending']}/{job_stats['max_pending']})")
+    for stage, status in upstream.items():
+        if status['recent_calls'] >= READY_MIN_CALLS and status['error_rate'] >= READY_ERROR_RATE:
+            degraded.append(f"{stage}: 최근 오류율 {status['error_rate']:.0%}")
+
+    status = 'not_ready' if problems else 'degraded' if degraded else 'ready'
+    return (503 if problems else 200), {
+        'status': status,
+        'pid': os.getpid(),
+        'problems': problems + degraded,
+        'probes': probes,
+        'workers': {
+            'jobs_pending': job_stats['pending'],
+            'jobs_running': job_stats['running'],
+            'job_workers': job_stats['workers'],
+            'max_pending': job_stats['max_pending'],
+            'saturated': saturated
+        },
+        'upstream': upstream
+    }
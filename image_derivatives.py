@@ -0,0 +1,140 @@
+"""
+생성 이미지 파생본(썸네일 / 웹용 WebP·JPEG) 만들기
+
+1024×1024 원본 PNG를 그대로 미리보기에 쓰면 전송과 렌더링이 느리므로,
+생성 직후 Pillow로 크기를 줄인 파생본을 원본 옆에 만들어 둡니다.
+    <원본 이름>_thumb.webp, <원본 이름>_web.webp, <원본 이름>_blog.jpg
+이미지 변환은 CPU 작업이므로 요청 스레드가 아닌 별도 프로세스 풀에서 실행합니다.
+Pillow가 설치되어 있지 않으면 파생본 없이 원본을 그대로 사용합니다.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# 파생본 종류: 최대 변 길이(px), 저장 형식, 확장자, 품질
+VARIANTS = {
+    'thumb': {'size': 320, 'format': 'WEBP', 'ext': '.webp', 'quality': 75},
+    'web': {'size': 768, 'format': 'WEBP', 'ext': '.webp', 'quality': 82},
+    'blog': {'size': 1024, 'format': 'JPEG', 'ext': '.jpg', 'quality': 88},
+}
+
+CONTENT_TYPES = {
+    'WEBP': 'image/webp',
+    'JPEG': 'image/jpeg',
+}
+
+# 파생본 생성 프로세스 수
+IMAGE_DERIVATIVE_WORKERS = int(os.environ.get('IMAGE_DERIVATIVE_WORKERS', '2'))
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+if not PIL_AVAILABLE:
+    logger.warning("⚠️ Pillow가 설치되지 않았습니다. 썸네일 없이 원본 이미지를 사용합니다. 'pip install Pillow' 실행하세요.")
+
+
+def variant_path(source_path, variant):
+    """원본 경로에 대한 파생본 경로"""
+    stem, _ = os.path.splitext(source_path)
+    return f"{stem}_{variant}{VARIANTS[variant]['ext']}"
+
+
+def content_type_for(variant):
+    return CONTENT_TYPES[VARIANTS[variant]['format']]
+
+
+def render_variants(source_path, variants=None):
+    """원본 이미지로 파생본을 만들고 {variant: 경로} 반환 (이미 있는 파생본은 건너뜀)
+
+    프로세스 풀에서 실행되므로 모듈 최상위 함수로 둡니다.
+    """
+    names = [name for name in (variants or VARIANTS) if name in VARIANTS]
+    results = {}
+    todo = []
+    for name in names:
+        path = variant_path(source_path, name)
+        if os.path.exists(path):
+            results[name] = path
+        else:
+            todo.append(name)
+    if not todo:
+        return results
+
+    with Image.open(source_path) as original:
+        original.load()
+        for name in todo:
+            spec = VARIANTS[name]
+            image = original.copy()
+            image.thumbnail((spec['size'], spec['size']), Image.LANCZOS)
+            if spec['format'] == 'JPEG' and image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+
+            path = variant_path(source_path, name)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    image.save(f, format=spec['format'], quality=spec['quality'], optimize=True)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            results[name] = path
+    return results
+
+
+def _get_executor():
+    """프로세스별 파생본 풀 (gunicorn 워커가 fork된 뒤 각자 새로 만듦)"""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            # 요청 스레드가 도는 중에 fork하지 않도록 spawn 방식 사용
+            _executor = ProcessPoolExecutor(
+                max_workers=max(1, IMAGE_DERIVATIVE_WORKERS),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def schedule_variants(source_path, variants=None):
+    """파생본 생성을 프로세스 풀에 맡기고 Future 반환 (Pillow가 없으면 None)"""
+    if not PIL_AVAILABLE or not os.path.exists(source_path):
+        return None
+    try:
+        return _get_executor().submit(render_variants, source_path, variants)
+    except Exception as e:
+        logger.error("이미지 파생본 작업 등록 오류: %s", e)
+        return None
+
+
+def ensure_variant(source_path, variant, timeout=30):
+    """파생본 경로 반환 (없으면 만들 때까지 대기, 만들 수 없으면 None)"""
+    if variant not in VARIANTS:
+        return None
+    path = variant_path(source_path, variant)
+    if os.path.exists(path):
+        return path
+
+    future = schedule_variants(source_path, [variant])
+    if future is None:
+        return None
+    try:
+        future.result(timeout=timeout)
+    except Exception as e:
+        logger.error("이미지 파생본 생성 오류 (%s): %s", variant, e)
+        return None
+    return path if os.path.exists(path) else None
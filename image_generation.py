@@ -0,0 +1,115 @@
+"""
+DALL-E 이미지 동시 생성
+
+이미지를 한 장씩 순서대로 만드는 대신 제한된 개수의 스레드로 동시에 생성하고,
+모든 워커 프로세스가 공유하는 분당 이미지 수 제한기를 지킵니다. 제한기를 기다리는 시간도
+요청 마감시간(deadline) 안으로 제한하므로, 밀린 버킷 때문에 sync 워커가 gunicorn timeout을 넘기지 않습니다.
+이미지가 하나씩 끝날 때마다 진행 상황 콜백을 호출하므로 부분 결과를 바로 표시할 수 있습니다.
+프롬프트가 한꺼번에 없어도 ImageBatch로 준비되는 대로 하나씩 생성을 시작할 수 있습니다.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_client import DeadlineExceeded
+from rate_limiter import SharedRateLimiter
+
+# 동시에 생성할 최대 이미지 수
+IMAGE_PARALLELISM = int(os.environ.get('IMAGE_PARALLELISM', '4'))
+# 분당 최대 이미지 생성 수 (OpenAI 계정 등급별 DALL-E 제한에 맞춰 조정)
+IMAGES_PER_MINUTE = int(os.environ.get('IMAGES_PER_MINUTE', '5'))
+
+# 같은 호스트의 모든 워커 프로세스/요청이 공유하는 제한기
+image_rate_limiter = SharedRateLimiter('dall_e', IMAGES_PER_MINUTE)
+
+
+logger = logging.getLogger(__name__)
+
+
+class ImageBatch:
+    """프롬프트가 준비되는 대로 하나씩 추가하며 동시에 생성하는 이미지 묶음
+
+    본문이 스트리밍되는 중에 이미지 프롬프트가 하나씩 나오면 submit()으로 바로 생성을 시작하고,
+    마지막에 wait()로 전체 결과를 모읍니다. total은 진행 상황 표시에 쓰는 예상 개수입니다.
+    deadline(llm_client.Deadline)을 주면 제한기 대기가 마감시간을 넘길 때 그 이미지는 실패로 처리합니다.
+    """
+
+    def __init__(self, generate_one, total=None, max_workers=None, limiter=None, on_progress=None, deadline=None):
+        self.generate_one = generate_one
+        self.total = total
+        self.limiter = limiter or image_rate_limiter
+        self.deadline = deadline
+        self.on_progress = on_progress
+        self.results = {}
+        self.completed = 0
+        self.failed = 0
+        self._submitted = 0
+        self._futures = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers or IMAGE_PARALLELISM, total or IMAGE_PARALLELISM)),
+            thread_name_prefix='dall-e'
+        )
+
+    def submit(self, prompt):
+        """이미지 하나 생성 시작 후 index(1부터) 반환"""
+        with self._lock:
+            self._submitted += 1
+            index = self._submitted
+        self._futures.append(self._executor.submit(self._run, prompt, index))
+        return index
+
+    def _run(self, prompt, index):
+        image = None
+        error = None
+        try:
+            timeout = max(0, self.deadline.remaining()) if self.deadline is not None else None
+            if not self.limiter.acquire(timeout):
+                raise DeadlineExceeded("분당 이미지 생성 한도를 기다리는 중 마감시간이 지났습니다.")
+            image = self.generate_one(prompt, index)
+        except Exception as e:
+            error = str(e)
+            logger.error("이미지 %s 생성 오류: %s", index, error)
+
+        with self._lock:
+            if image:
+                self.results[index] = image
+                self.completed += 1
+            else:
+                self.failed += 1
+            event = {
+                'index': index,
+                'image': image,
+                'error': error,
+                'completed': self.completed,
+                'failed': self.failed,
+                'total': max(self.total or 0, self._submitted)
+            }
+
+        if self.on_progress:
+            try:
+                self.on_progress(event)
+            except Exception as e:
+                logger.error("이미지 진행 상황 콜백 오류: %s", e)
+
+    def wait(self):
+        """제출된 이미지가 모두 끝날 때까지 기다린 뒤 성공한 이미지를 index 순서로 반환"""
+        self._executor.shutdown(wait=True)
+        return [self.results[index] for index in sorted(self.results)]
+
+
+def generate_images_concurrently(prompts, generate_one, max_workers=None, limiter=None, on_progress=None, deadline=None):
+    """프롬프트별 이미지를 동시에 생성
+
+    generate_one(prompt, index)는 이미지 정보 dict(또는 None)를 반환해야 합니다.
+    on_progress(event)는 이미지가 끝날 때마다 호출되며, event에는 index, image(실패 시 None),
+    error, completed, failed, total이 들어 있습니다.
+    반환값은 성공한 이미지들을 index 순서로 정렬한 리스트입니다.
+    """
+    batch = ImageBatch(generate_one, total=len(prompts), max_workers=max_workers, limiter=limiter,
+                       on_progress=on_progress, deadline=deadline)
+    for prompt in prompts:
+        batch.submit(prompt)
+    return batch.wait()
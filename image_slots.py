@@ -0,0 +1,69 @@
+"""
+본문 생성 응답에 포함된 이미지 프롬프트 슬롯 처리
+
+본문을 다 쓴 뒤 이미지 프롬프트를 따로 요청하지 않도록, 장문 생성 프롬프트에서
+소제목(섹션)마다 [IMAGE_PROMPT: ...] 한 줄을 함께 쓰도록 지시하고(prompts.IMAGE_SLOT_INSTRUCTIONS),
+응답에서 그 줄을 뽑아 DALL-E 프롬프트로 사용한 뒤 본문에서는 지웁니다.
+스트리밍 응답은 ImagePromptStreamParser로 조각을 받는 즉시 완성된 슬롯을 찾아냅니다.
+"""
+
+import logging
+import re
+
+IMAGE_PROMPT_PATTERN = re.compile(r'\[IMAGE_PROMPT:\s*(.+?)\s*\]')
+# 슬롯 줄 전체(앞뒤 공백/줄바꿈 포함)를 본문에서 지우기 위한 패턴
+_SLOT_LINE_PATTERN = re.compile(r'[ \t]*\[IMAGE_PROMPT:[^\]\n]*\][ \t]*\n?')
+# 최소 프롬프트 길이 (너무 짧은 슬롯은 무시)
+MIN_PROMPT_LENGTH = 20
+
+logger = logging.getLogger(__name__)
+
+
+def _valid_prompt(prompt):
+    return len(prompt) >= MIN_PROMPT_LENGTH
+
+
+def strip_image_prompts(content):
+    """본문에서 이미지 프롬프트 슬롯 줄 제거"""
+    return re.sub(r'\n{3,}', '\n\n', _SLOT_LINE_PATTERN.sub('', content)).strip()
+
+
+def extract_image_prompts(content):
+    """(슬롯을 지운 본문, 프롬프트 리스트) 반환"""
+    prompts = [match.group(1) for match in IMAGE_PROMPT_PATTERN.finditer(content)]
+    return strip_image_prompts(content), [prompt for prompt in prompts if _valid_prompt(prompt)]
+
+
+class ImagePromptStreamParser:
+    """스트리밍 응답 조각을 받아 완성된 이미지 프롬프트 슬롯마다 on_prompt(prompt) 호출"""
+
+    def __init__(self, on_prompt=None, limit=None):
+        self.on_prompt = on_prompt
+        self.limit = limit
+        self.prompts = []
+        self._buffer = ''
+
+    def feed(self, text):
+        self._buffer += text
+        while True:
+            match = IMAGE_PROMPT_PATTERN.search(self._buffer)
+            if not match:
+                break
+            self._buffer = self._buffer[match.end():]
+            self._emit(match.group(1))
+
+        # 슬롯이 시작되지 않은 앞부분은 더 볼 필요가 없으므로 버림
+        start = self._buffer.rfind('[')
+        self._buffer = self._buffer[start:] if start != -1 else ''
+
+    def _emit(self, prompt):
+        if not _valid_prompt(prompt):
+            return
+        if self.limit is not None and len(self.prompts) >= self.limit:
+            return
+        self.prompts.append(prompt)
+        if self.on_prompt:
+            try:
+                self.on_prompt(prompt)
+            except Exception as e:
+                logger.error("이미지 프롬프트 콜백 오류: %s", e)
@@ -0,0 +1,194 @@
+"""
+생성된 이미지 로컬 저장소 (콘텐츠 주소 기반)
+
+DALL-E 이미지 URL은 일정 시간이 지나면 만료되므로, 생성 직후 한 번만 내려받아
+내용의 SHA-256 해시를 파일명으로 저장합니다. 같은 이미지는 한 번만 저장되며,
+프롬프트/세션/키워드 등 메타데이터는 같은 이름의 .json 파일에 함께 기록합니다.
+오래된 이미지는 보관 기간과 전체 용량 기준으로 정리(GC)합니다.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import urllib.request
+
+from metrics import metrics
+
+IMAGE_STORE_DIR = os.environ.get(
+    'IMAGE_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'image_store')
+)
+# 보관 기간 (초, 기본 7일)
+IMAGE_STORE_MAX_AGE = int(os.environ.get('IMAGE_STORE_MAX_AGE', str(7 * 24 * 3600)))
+# 전체 최대 용량 (바이트, 기본 2GB)
+IMAGE_STORE_MAX_BYTES = int(os.environ.get('IMAGE_STORE_MAX_BYTES', str(2 * 1024 ** 3)))
+# 자동 정리 최소 간격 (초)
+IMAGE_STORE_GC_INTERVAL = int(os.environ.get('IMAGE_STORE_GC_INTERVAL', '600'))
+
+DOWNLOAD_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+_DIGEST_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+logger = logging.getLogger(__name__)
+
+
+def is_valid_digest(digest):
+    """SHA-256 16진수 문자열인지 확인 (경로 조작 방지)"""
+    return bool(digest) and bool(_DIGEST_PATTERN.match(digest))
+
+
+class ImageStore:
+    """SHA-256 해시로 이미지를 저장/조회하는 파일 저장소"""
+
+    def __init__(self, root=IMAGE_STORE_DIR, max_age=IMAGE_STORE_MAX_AGE, max_bytes=IMAGE_STORE_MAX_BYTES):
+        self.root = root
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._gc_lock = threading.Lock()
+        self._last_gc = 0.0
+
+    def path_for(self, digest, suffix='.png'):
+        """해시에 해당하는 파일 경로 (앞 2글자로 하위 폴더 분산)"""
+        return os.path.join(self.root, digest[:2], digest + suffix)
+
+    def exists(self, digest):
+        return is_valid_digest(digest) and os.path.exists(self.path_for(digest))
+
+    def _write_atomic(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def save_bytes(self, data, metadata=None):
+        """이미지 바이트 저장 후 해시 반환 (이미 있으면 메타데이터만 갱신)"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+        if not os.path.exists(path):
+            self._write_atomic(path, data)
+
+        meta = dict(metadata or {})
+        meta.update({
+            'digest': digest,
+            'size': len(data),
+            'content_type': 'image/png',
+            'created_at': meta.get('created_at') or time.time()
+        })
+        self._write_atomic(self.path_for(digest, '.json'), json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+        self.maybe_collect()
+        return digest
+
+    def save_from_url(self, url, metadata=None, timeout=30):
+        """URL에서 이미지를 한 번 내려받아 저장 후 해시 반환"""
+        request = urllib.request.Request(url)
+        request.add_header('User-Agent', DOWNLOAD_USER_AGENT)
+        with metrics.timed('image_download'):
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                data = response.read()
+        metrics.add_bytes('image_download', len(data))
+        meta = dict(metadata or {})
+        meta.setdefault('source_url', url)
+        return self.save_bytes(data, meta)
+
+    def read_bytes(self, digest):
+        """저장된 이미지 바이트 반환 (없으면 None)"""
+        if not self.exists(digest):
+            return None
+        with open(self.path_for(digest), 'rb') as f:
+            return f.read()
+
+    def get_metadata(self, digest):
+        """저장된 메타데이터 반환 (없으면 None)"""
+        if not is_valid_digest(digest):
+            return None
+        try:
+            with open(self.path_for(digest, '.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _digest_files(self, digest):
+        """해시에 딸린 모든 파일 (원본, 메타데이터, 파생 이미지)"""
+        folder = os.path.join(self.root, digest[:2])
+        try:
+            return [os.path.join(folder, name) for name in os.listdir(folder) if name.startswith(digest)]
+        except OSError:
+            return []
+
+    def garbage_collect(self, now=None):
+        """보관 기간이 지난 이미지를 지우고, 전체 용량이 한도를 넘으면 오래된 것부터 삭제"""
+        now = now or time.time()
+        entries = []
+        if not os.path.isdir(self.root):
+            return {'removed': 0, 'total_bytes': 0, 'images': 0}
+
+        for folder in os.listdir(self.root):
+            folder_path = os.path.join(self.root, folder)
+            if not os.path.isdir(folder_path):
+                continue
+            groups = {}
+            for name in os.listdir(folder_path):
+                digest = name[:64]
+                if not is_valid_digest(digest):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(folder_path, name))
+                except OSError:
+                    continue
+                group = groups.setdefault(digest, {'bytes': 0, 'mtime': 0.0})
+                group['bytes'] += stat.st_size
+                if name == digest + '.png':
+                    group['mtime'] = stat.st_mtime
+            for digest, group in groups.items():
+                entries.append((group['mtime'], digest, group['bytes']))
+
+        removed = 0
+        total_bytes = sum(size for _, _, size in entries)
+        entries.sort()
+        for mtime, digest, size in entries:
+            expired = self.max_age and now - mtime > self.max_age
+            over_size = self.max_bytes and total_bytes > self.max_bytes
+            if not expired and not over_size:
+                continue
+            for path in self._digest_files(digest):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total_bytes -= size
+            removed += 1
+
+        if removed:
+            logger.info("🧹 이미지 저장소 정리: %d개 삭제, 남은 용량 %.1fMB", removed, total_bytes / 1024 / 1024)
+        return {'removed': removed, 'total_bytes': total_bytes, 'images': len(entries) - removed}
+
+    def maybe_collect(self):
+        """마지막 정리 후 IMAGE_STORE_GC_INTERVAL이 지났으면 정리 실행"""
+        now = time.time()
+        if now - self._last_gc < IMAGE_STORE_GC_INTERVAL:
+            return
+        if not self._gc_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_gc = now
+            self.garbage_collect(now)
+        except Exception as e:
+            logger.error("이미지 저장소 정리 오류: %s", e)
+        finally:
+            self._gc_lock.release()
+
+
+image_store = ImageStore()
@@ -0,0 +1,381 @@
+"""
+오래 걸리는 생성 작업(분석 / 본문 / 이미지 / 일괄 생성)용 백그라운드 작업 큐
+
+gunicorn sync 워커 안에서 글 생성처럼 수십 초 걸리는 요청을 그대로 처리하면 워커 4개가
+금방 모두 묶여서 /login 같은 가벼운 요청까지 기다리게 됩니다. 요청은 작업 종류(kind)와 입력값(params)을
+세션과 같은 공유 저장소(session_store, 'jobs' 네임스페이스)에 queued 상태로 기록하고 job_id만 바로 돌려줍니다.
+
+실행기는 저장소에서 대기 작업을 골라 비교 후 갱신(update의 expect)으로 running으로 바꾼 뒤, 작업 종류별로
+등록된 처리 함수 handlers[kind](job, params)로 실행합니다. 작업 하나는 실행기 하나만 가져가며, params(JSON)만으로
+다시 실행할 수 있으므로 작업을 넣은 프로세스와 실행하는 프로세스가 달라도 됩니다.
+
+- JOB_RUNNER=inline (기본): 각 웹 워커 프로세스 안의 작업 스레드가 실행 (단일 컨테이너/개발용)
+- JOB_RUNNER=worker: 웹 프로세스는 작업을 넣기만 하고, 별도 실행기 프로세스(python job_worker.py)가 실행
+  gunicorn 워커 재시작/타임아웃과 무관하게 작업이 돌며, 웹 워커 수와 따로 늘릴 수 있습니다.
+  실행기와 웹 프로세스가 같은 저장소(SQLite 파일 또는 Redis)를 봐야 합니다 (memory 백엔드 불가).
+
+실행 중인 작업은 JOB_HEARTBEAT_INTERVAL마다 heartbeat_at을 갱신합니다. 실행하던 프로세스가 사라진 작업
+(같은 호스트에서 pid가 없거나 heartbeat가 JOB_STALE_AFTER초 넘게 끊김)은 실패로 처리하지 않고 다시 queued로 돌려
+다른 실행기가 처음부터 다시 실행하며, JOB_MAX_ATTEMPTS번 가져가도 끝나지 않은 작업만 failed로 기록합니다.
+처리 함수는 결과를 세션 필드에 덮어쓰므로 다시 실행해도 안전합니다.
+
+끝나지 않은 작업(queued / running)의 ID는 별도 색인 저장소('jobs_active' 공간)에도 기록해, 대기열 확인과
+대기 작업 수 세기는 지금까지 만든 모든 작업이 아니라 색인의 작업만 읽습니다. 대기열 확인은 마지막 사용 시각을
+갱신하지 않고 읽으므로, 끝난 작업(done / failed)은 마지막으로 바뀐 뒤 JOB_RETENTION초가 지나면 스위퍼가 지웁니다.
+
+    JOB_RUNNER=inline             # inline | worker
+    JOB_WORKERS=2                 # 실행기 프로세스당 작업 스레드 수
+    JOB_MAX_PENDING=20            # 전체 대기 작업 최대 수 (넘으면 거절)
+    JOB_TIMEOUT=600               # 작업 하나의 OpenAI 호출 마감시간 (초, HTTP 요청 예산 대신 사용)
+    JOB_POLL_INTERVAL=1           # 대기 작업 확인 간격 (초)
+    JOB_HEARTBEAT_INTERVAL=10     # 실행 중 작업의 heartbeat 기록 간격 (초)
+    JOB_STALE_AFTER=60            # heartbeat가 이만큼 끊긴 작업은 다시 대기열로 (초)
+    JOB_MAX_ATTEMPTS=2            # 작업 하나를 가져갈 수 있는 최대 횟수
+    JOB_RETENTION=21600           # 작업 기록 보관 시간 (마지막 상태 변경 후, 초)
+"""
+
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+import uuid
+
+import app_logging
+import llm_client
+from session_store import MemorySessionStore
+
+# 작업 실행 위치 (inline: 웹 워커 프로세스 안, worker: job_worker.py 프로세스)
+JOB_RUNNER = os.environ.get('JOB_RUNNER', 'inline').lower()
+# 실행기 프로세스당 작업 스레드 수
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+# 전체 대기 작업 최대 수
+JOB_MAX_PENDING = int(os.environ.get('JOB_MAX_PENDING', '20'))
+# 작업 하나의 OpenAI 호출 마감시간 (초)
+JOB_TIMEOUT = float(os.environ.get('JOB_TIMEOUT', '600'))
+# 대기 작업 확인 간격 (초) - 작업을 넣은 프로세스의 실행기는 바로 깨움
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', '1'))
+# 실행 중 작업의 heartbeat 기록 간격 / 끊겼다고 볼 시간 (초)
+JOB_HEARTBEAT_INTERVAL = float(os.environ.get('JOB_HEARTBEAT_INTERVAL', '10'))
+JOB_STALE_AFTER = float(os.environ.get('JOB_STALE_AFTER', '60'))
+# 작업 하나를 가져갈 수 있는 최대 횟수 (실행기가 사라져 다시 대기열에 넣은 경우 포함)
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '2'))
+# 작업 기록 보관 시간 (초) - 작업 저장소의 TTL로 사용 (상태가 바뀌지 않은 채 이만큼 지난 작업은 삭제)
+JOB_RETENTION = int(os.environ.get('JOB_RETENTION', str(6 * 3600)))
+# 진행 상황 저장 최소 간격 (초) - 스트리밍 조각마다 저장소에 쓰지 않도록
+PROGRESS_SAVE_INTERVAL = 0.5
+
+FINISHED_STATUSES = ('done', 'failed')
+# 대기 작업을 고를 때 읽는 필드 (params, result 같은 큰 값은 읽지 않음)
+SCAN_FIELDS = ('status', 'created_at', 'attempts', 'claim', 'heartbeat_at', 'host', 'pid')
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(Exception):
+    """대기 작업이 너무 많아 새 작업을 받을 수 없음"""
+
+
+class Job:
+    """작업 함수에 전달되는 핸들 (진행 상황 보고용)
+
+    저장소 쓰기는 이 실행기가 가져간 작업(claim)일 때만 반영되므로, 다시 대기열에 들어가 다른 실행기가
+    가져간 작업의 상태를 덮어쓰지 않습니다.
+    """
+
+    def __init__(self, job_queue, job_id, claim):
+        self.queue = job_queue
+        self.id = job_id
+        self.claim = claim
+        self._progress = {}
+        self._saved_at = 0
+        self._lock = threading.Lock()
+
+    def progress(self, force=False, **fields):
+        """진행 상황 필드 갱신 (PROGRESS_SAVE_INTERVAL마다 한 번만 저장, force면 즉시 저장)"""
+        with self._lock:
+            self._progress.update(fields)
+            now = time.time()
+            if not force and now - self._saved_at < PROGRESS_SAVE_INTERVAL:
+                return
+            self._saved_at = now
+            snapshot = dict(self._progress)
+        self.queue.store.update(self.id, {'progress': snapshot, 'updated_at': now}, expect={'claim': self.claim})
+
+
+class JobQueue:
+    """공유 저장소 기반 작업 큐 (등록은 어느 프로세스에서나, 실행은 start()한 프로세스의 실행기가)
+
+    index는 끝나지 않은 작업 ID의 색인 저장소입니다 (store와 같은 백엔드, 만료 없음).
+    주지 않으면 프로세스 내 저장소를 사용하므로, 여러 프로세스가 함께 쓸 때는 공유 저장소를 넘겨야 합니다.
+    """
+
+    def __init__(self, store, handlers, workers=JOB_WORKERS, max_pending=JOB_MAX_PENDING, runner=JOB_RUNNER,
+                 index=None):
+        self.store = store
+        self.index = index if index is not None else MemorySessionStore(ttl=0, max_bytes=0)
+        self.handlers = handlers
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.runner = runner
+        self._claimed = None
+        self._active = {}
+        self._pid = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._heartbeat_at = 0
+        self._pending = 0
+        self.submitted_total = 0
+        self.rejected_total = 0
+        self.requeued_total = 0
+
+    def start(self):
+        """이 프로세스에서 실행기 시작 - 대기 작업을 가져오는 스레드 1개 + 작업 스레드 (fork된 뒤에는 새로 만듦)"""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._claimed = queue.Queue()
+            self._active = {}
+            self._stop.clear()
+            threading.Thread(target=self._dispatch, name='job-dispatcher', daemon=True).start()
+            for i in range(self.workers):
+                threading.Thread(target=self._worker, name=f'job-worker-{i}', daemon=True).start()
+            self._pid = os.getpid()
+        logger.info("🛠️ 작업 실행기 시작: 스레드 %d개 (pid %d)", self.workers, os.getpid())
+
+    def stop(self):
+        """새 작업 가져오기를 멈추고, 실행 중이던 작업은 다른 실행기가 바로 가져가도록 대기열로 되돌림"""
+        self._stop.set()
+        self._wake.set()
+        with self._lock:
+            active = dict(self._active) if self._pid == os.getpid() else {}
+        for job_id, claim in active.items():
+            now = time.time()
+            if self.store.update(job_id, {'status': 'queued', 'claim': None, 'updated_at': now},
+                                 expect={'status': 'running', 'claim': claim}):
+                self.requeued_total += 1
+                logger.info("↩️ 실행기 종료로 작업을 대기열에 되돌림 job:%s", job_id[:8])
+
+    def submit(self, kind, params, session_id=None):
+        """작업을 대기열에 넣고 job_id 반환 - handlers[kind](job, params)의 반환값(dict)이 작업 결과가 됨
+
+        params는 JSON으로 저장되며, 다른 프로세스의 실행기도 이 값만으로 작업을 (다시) 실행합니다.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"등록되지 않은 작업 종류입니다: {kind}")
+        if self.runner == 'inline':
+            self.start()
+        self._pending = self._count_queued()
+        if self._pending >= self.max_pending:
+            self.rejected_total += 1
+            raise JobQueueFull(f"대기 중인 작업이 너무 많습니다 ({self.max_pending}개). 잠시 후 다시 시도해주세요.")
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        # 색인을 먼저 기록 (작업 기록 전에 멈춰도 색인 항목은 대기열 확인 때 정리됨)
+        self.index.create(job_id, {'created_at': now})
+        self.store.create(job_id, {
+            'kind': kind,
+            'status': 'queued',
+            'params': params,
+            'session_id': session_id,
+            'progress': {},
+            'attempts': 0,
+            'created_at': now,
+            'updated_at': now
+        })
+        self._pending += 1
+        self.submitted_total += 1
+        self._wake.set()
+        logger.info("📥 작업 등록: %s job:%s (대기 %d개)", kind, job_id[:8], self._pending)
+        return job_id
+
+    def get(self, job_id):
+        """작업 상태 dict 반환 (없으면 None) - 상태 조회는 보관 기간을 늘리지 않음"""
+        return self.store.get(job_id, touch=False) if job_id else None
+
+    # --- 실행기 ---
+
+    def _unfinished(self, fields):
+        """색인에 있는 끝나지 않은 작업의 (job_id, 필드 dict) 리스트
+
+        작업 기록을 읽을 때 마지막 사용 시각을 갱신하지 않으며, 이미 끝났거나 사라진 작업은 색인에서 지웁니다
+        (작업 기록 전이거나 색인 삭제 전에 프로세스가 멈춘 경우).
+        """
+        now = time.time()
+        jobs = []
+        for job_id in self.index.session_ids():
+            job = self.store.get(job_id, fields=fields, touch=False)
+            if job is not None and job.get('status') not in FINISHED_STATUSES:
+                jobs.append((job_id, job))
+                continue
+            if job is None:
+                # 방금 등록 중인 작업은 아직 기록 전일 수 있음
+                created_at = self.index.get_field(job_id, 'created_at') or 0
+                if now - created_at <= JOB_STALE_AFTER:
+                    continue
+            self.index.delete(job_id)
+        return jobs
+
+    def _count_queued(self):
+        return sum(1 for _, job in self._unfinished(('status',)) if job.get('status') == 'queued')
+
+    def _scan(self):
+        """대기 작업 (created_at, job_id, attempts) 리스트를 오래된 순으로 반환 - 멈춘 작업은 먼저 대기열로 되돌림"""
+        now = time.time()
+        queued = []
+        for job_id, job in self._unfinished(SCAN_FIELDS):
+            if job.get('status') == 'running' and self._is_stale(job, now):
+                job = self._recover(job_id, job, now)
+                if job is None:
+                    continue
+            if job.get('status') == 'queued':
+                queued.append((job.get('created_at') or 0, job_id, job.get('attempts') or 0))
+        self._pending = len(queued)
+        return sorted(queued)
+
+    @staticmethod
+    def _is_stale(job, now):
+        """작업을 실행하던 프로세스가 사라졌는지 (같은 호스트면 pid 확인, 아니면 heartbeat 시각으로 판단)"""
+        if job.get('host') == socket.gethostname() and job.get('pid'):
+            try:
+                os.kill(job['pid'], 0)
+            except ProcessLookupError:
+                return True
+            except PermissionError:
+                pass
+        return now - (job.get('heartbeat_at') or 0) > JOB_STALE_AFTER
+
+    def _recover(self, job_id, job, now):
+        """멈춘 작업을 대기열로 되돌림 (시도 횟수를 다 쓴 작업은 실패 처리) - 다른 실행기가 먼저 처리했으면 None"""
+        attempts = job.get('attempts') or 0
+        if attempts >= JOB_MAX_ATTEMPTS:
+            fields = {
+                'status': 'failed',
+                'error': f'작업을 처리하던 실행기가 {attempts}번 모두 중간에 종료되었습니다. 다시 시도해주세요.',
+                'claim': None,
+                'finished_at': now,
+                'updated_at': now
+            }
+        else:
+            fields = {'status': 'queued', 'claim': None, 'updated_at': now}
+        if not self.store.update(job_id, fields, expect={'status': 'running', 'claim': job.get('claim')}):
+            return None
+        if fields['status'] == 'queued':
+            self.requeued_total += 1
+            logger.warning("↩️ 실행기가 사라진 작업을 대기열에 되돌림 job:%s (시도 %d회)", job_id[:8], attempts)
+        else:
+            self.index.delete(job_id)
+            logger.error("❌ 실행기가 사라진 작업을 실패 처리 job:%s (시도 %d회)", job_id[:8], attempts)
+        return dict(job, **fields)
+
+    def _claim(self, job_id, attempts):
+        """대기 작업을 이 실행기가 가져감 - 다른 실행기가 먼저 가져갔으면 None"""
+        claim = uuid.uuid4().hex
+        now = time.time()
+        claimed = self.store.update(job_id, {
+            'status': 'running',
+            'claim': claim,
+            'attempts': attempts + 1,
+            'started_at': now,
+            'heartbeat_at': now,
+            'updated_at': now,
+            'host': socket.gethostname(),
+            'pid': os.getpid()
+        }, expect={'status': 'queued', 'attempts': attempts})
+        return claim if claimed else None
+
+    def _heartbeat(self):
+        now = time.time()
+        if now - self._heartbeat_at < JOB_HEARTBEAT_INTERVAL:
+            return
+        self._heartbeat_at = now
+        with self._lock:
+            active = dict(self._active)
+        for job_id, claim in active.items():
+            self.store.update(job_id, {'heartbeat_at': now}, expect={'claim': claim})
+
+    def _dispatch(self):
+        while not self._stop.is_set():
+            try:
+                self._heartbeat()
+                # 빈 작업 스레드가 있을 때만 대기 작업 확인
+                if len(self._active) < self.workers:
+                    for _, job_id, attempts in self._scan():
+                        if len(self._active) >= self.workers or self._stop.is_set():
+                            break
+                        claim = self._claim(job_id, attempts)
+                        if claim is None:
+                            continue
+                        with self._lock:
+                            self._active[job_id] = claim
+                        self._claimed.put((job_id, claim))
+            except Exception as e:
+                logger.exception("❌ 대기 작업 확인 실패: %s", e)
+            self._wake.wait(JOB_POLL_INTERVAL)
+            self._wake.clear()
+
+    def _worker(self):
+        while True:
+            job_id, claim = self._claimed.get()
+            try:
+                self._run(job_id, claim)
+            finally:
+                with self._lock:
+                    self._active.pop(job_id, None)
+                self._wake.set()
+
+    def _run(self, job_id, claim):
+        job_data = self.store.get(job_id, fields=('kind', 'params'))
+        if job_data is None:
+            logger.warning("⚠️ 가져온 작업이 저장소에 없습니다 job:%s", job_id[:8])
+            return
+        kind = job_data.get('kind')
+        started_at = time.time()
+        job = Job(self, job_id, claim)
+        # 요청 스레드가 아니므로 gunicorn timeout 대신 작업 마감시간을 적용
+        llm_client.start_request_deadline(JOB_TIMEOUT)
+        # 작업 중 남기는 로그에는 작업 ID를 요청 ID로 사용
+        app_logging.bind_request_id(f"job:{job_id[:8]}")
+        try:
+            handler = self.handlers.get(kind)
+            if handler is None:
+                raise Exception(f"등록되지 않은 작업 종류입니다: {kind}")
+            result = handler(job, job_data.get('params') or {})
+        except Exception as e:
+            logger.exception("❌ 작업 실패: %s", e)
+            self._finish(job_id, claim, {'status': 'failed', 'error': str(e)})
+            return
+        finally:
+            llm_client.clear_request_deadline()
+            app_logging.clear_request_id()
+
+        job.progress(force=True)
+        if self._finish(job_id, claim, {'status': 'done', 'result': result}):
+            logger.info("✅ 작업 완료: %s job:%s (%.1f초)", kind, job_id[:8], time.time() - started_at)
+
+    def _finish(self, job_id, claim, fields):
+        finished_at = time.time()
+        fields = dict(fields, claim=None, finished_at=finished_at, updated_at=finished_at)
+        if self.store.update(job_id, fields, expect={'claim': claim}):
+            self.index.delete(job_id)
+            return True
+        logger.warning("⚠️ 다른 실행기가 다시 가져간 작업이라 결과를 기록하지 않습니다 job:%s", job_id[:8])
+        return False
+
+    def stats(self):
+        """대기 작업 수(마지막 확인 기준)와 이 프로세스 실행기의 상태"""
+        local = self._pid == os.getpid()
+        return {
+            'pid': os.getpid(),
+            'runner': self.runner,
+            'workers': self.workers if local else 0,
+            'pending': self._pending,
+            'running': len(self._active) if local else 0,
+            'max_pending': self.max_pending,
+            'submitted_total': self.submitted_total,
+            'rejected_total': self.rejected_total,
+            'requeued_total': self.requeued_total
+        }
@@ -0,0 +1,52 @@
+"""
+작업 큐 전용 실행기 프로세스 (JOB_RUNNER=worker)
+
+웹 프로세스(gunicorn)는 작업을 공유 저장소에 넣기만 하고, 이 프로세스가 대기 작업을 가져와 실행합니다.
+gunicorn 워커가 재시작되거나 요청 타임아웃으로 죽어도 실행 중인 작업에는 영향이 없고, 실행기 수를
+웹 워커 수와 따로 늘릴 수 있습니다 (여러 개를 띄워도 작업 하나는 한 실행기만 가져감).
+
+종료 신호(SIGTERM/SIGINT)를 받으면 새 작업을 더 가져오지 않고, 실행 중이던 작업은 대기열로 되돌려
+다른 실행기(또는 다시 시작한 이 실행기)가 처음부터 실행하게 합니다.
+웹 프로세스와 같은 SESSION_STORE_BACKEND / SESSION_STORE_PATH(또는 SESSION_STORE_URL)를 사용해야 합니다.
+
+    JOB_RUNNER=worker gunicorn --bind 0.0.0.0:5000 --workers 4 web_app:app
+    python job_worker.py
+"""
+
+import logging
+import os
+import signal
+import sys
+import threading
+
+from session_store import SESSION_STORE_BACKEND
+from web_app import blog_app
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    if SESSION_STORE_BACKEND == 'memory':
+        logger.error("❌ memory 저장소는 프로세스 간에 공유되지 않아 별도 실행기를 쓸 수 없습니다 (sqlite 또는 redis 사용)")
+        return 1
+
+    stop = threading.Event()
+
+    def handle_signal(signum, frame):
+        logger.info("🛑 종료 신호 수신 (%s)", signal.Signals(signum).name)
+        stop.set()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    blog_app.jobs.start()
+    logger.info("🛠️ 작업 실행기 프로세스 대기 중 (pid %d, 저장소 %s)", os.getpid(), SESSION_STORE_BACKEND)
+    while not stop.wait(1):
+        pass
+    blog_app.jobs.stop()
+    logger.info("👋 작업 실행기 종료")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,459 @@
+"""
+OpenAI API 호출 래퍼
+
+모든 GPT/DALL-E 호출에 다음 정책을 적용합니다.
+- HTTP 요청 예산(gunicorn timeout)에서 계산한 호출별 마감시간(deadline)
+- 재시도 가능한 오류(타임아웃, 연결 오류, 429, 5xx)에 대한 지터 지수 백오프 재시도
+- 짧은 호출(제목 생성 등)을 위한 선택적 헤징: p95 지연 후 두 번째 요청을 보내고 먼저 온 응답 사용
+  진 요청은 응답만 버릴 뿐 이미 OpenAI에 보낸 요청이므로 비용이 청구됩니다. 스레드 버전은 실행 중인 요청을
+  멈출 수 없어 끝까지 실행되고, 끝나면 토큰 사용량을 집계합니다 (버린 요청 수: blog_llm_hedge_abandoned_total).
+- 호출 유형별 토큰 사용량과 프롬프트 캐시 적중(cached_tokens) 집계
+- 호출 유형별 지연시간/오류/재시도/토큰 지표 (metrics.py, 단계 이름 openai_<call_type>)
+
+ASGI 모드(asgi_app.py)에서는 같은 정책을 코루틴으로 적용하는 acreate_chat_completion을 사용합니다.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import model_router
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_retryable_errors = None
+
+
+def retryable_errors():
+    """재시도할 예외 타입들 - openai는 import 비용이 크므로 처음 필요할 때(첫 오류 시) 확인"""
+    global _retryable_errors
+    if _retryable_errors is None:
+        try:
+            import openai
+            _retryable_errors = (
+                openai.APITimeoutError,
+                openai.APIConnectionError,
+                openai.RateLimitError,
+                openai.InternalServerError,
+            )
+        except ImportError:
+            _retryable_errors = (TimeoutError, ConnectionError)
+    return _retryable_errors
+
+
+# gunicorn --timeout 120 보다 조금 짧게 잡아 워커가 강제 종료되기 전에 오류 응답을 보낼 수 있도록 함
+REQUEST_BUDGET_SECONDS = float(os.environ.get('LLM_REQUEST_BUDGET', '110'))
+# 마감시간 직전에는 새 시도를 시작하지 않도록 남겨두는 여유 시간
+DEADLINE_SAFETY_MARGIN = 2.0
+
+DEFAULT_MAX_RETRIES = 2
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 8.0
+
+# 헤징 지연 계산용 기본값 (관측값이 충분히 쌓이기 전까지 사용)
+DEFAULT_HEDGE_DELAY_SECONDS = 4.0
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+_current_deadline = contextvars.ContextVar('llm_deadline', default=None)
+_hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='llm-hedge')
+
+
+class DeadlineExceeded(Exception):
+    """요청 예산 안에 호출을 끝낼 수 없을 때 발생"""
+
+
+class Deadline:
+    """단조 시계 기준 마감시간"""
+
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        return self.expires_at - time.monotonic()
+
+    def expired(self):
+        return self.remaining() <= 0
+
+
+def start_request_deadline(seconds=None):
+    """현재 요청(컨텍스트)에 마감시간 설정 - Flask before_request에서 호출"""
+    deadline = Deadline(seconds if seconds is not None else REQUEST_BUDGET_SECONDS)
+    _current_deadline.set(deadline)
+    return deadline
+
+
+def clear_request_deadline():
+    """현재 요청의 마감시간 해제"""
+    _current_deadline.set(None)
+
+
+def get_request_deadline():
+    """현재 컨텍스트의 마감시간 반환 (없으면 None)"""
+    return _current_deadline.get()
+
+
+class LatencyTracker:
+    """호출 유형별 최근 지연시간 기록 (헤징 지연 계산용)"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, call_type, seconds):
+        with self._lock:
+            samples = self._samples.setdefault(call_type, deque(maxlen=self.window))
+            samples.append(seconds)
+
+    def percentile(self, call_type, pct):
+        with self._lock:
+            samples = sorted(self._samples.get(call_type, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100.0 * (len(samples) - 1))))
+        return samples[index]
+
+    def count(self, call_type):
+        with self._lock:
+            return len(self._samples.get(call_type, ()))
+
+
+latency_tracker = LatencyTracker()
+
+
+class UsageStats:
+    """호출 유형별 토큰 사용량 및 프롬프트 캐시 적중 집계
+
+    OpenAI 응답의 usage.prompt_tokens_details.cached_tokens 값을 누적하여
+    프롬프트 prefix 캐시가 실제로 적중하는지 확인할 수 있게 합니다.
+    """
+
+    def __init__(self):
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def record(self, call_type, response):
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return None
+        prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+        completion_tokens = getattr(usage, 'completion_tokens', 0) or 0
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = (getattr(details, 'cached_tokens', 0) or 0) if details is not None else 0
+
+        with self._lock:
+            totals = self._totals.setdefault(call_type, {
+                'calls': 0,
+                'prompt_tokens': 0,
+                'cached_tokens': 0,
+                'completion_tokens': 0,
+                'cache_hit_calls': 0
+            })
+            totals['calls'] += 1
+            totals['prompt_tokens'] += prompt_tokens
+            totals['cached_tokens'] += cached_tokens
+            totals['completion_tokens'] += completion_tokens
+            if cached_tokens:
+                totals['cache_hit_calls'] += 1
+
+        metrics.inc('blog_llm_tokens_total', prompt_tokens, call_type=call_type, kind='prompt')
+        metrics.inc('blog_llm_tokens_total', cached_tokens, call_type=call_type, kind='cached')
+        metrics.inc('blog_llm_tokens_total', completion_tokens, call_type=call_type, kind='completion')
+
+        logger.debug("🧮 %s 토큰: 입력 %d (캐시 %d) / 출력 %d", call_type, prompt_tokens, cached_tokens, completion_tokens)
+        return {'prompt_tokens': prompt_tokens, 'cached_tokens': cached_tokens, 'completion_tokens': completion_tokens}
+
+    def snapshot(self):
+        """호출 유형별 누적값과 캐시 적중률, 지연시간 반환"""
+        with self._lock:
+            totals = {call_type: dict(values) for call_type, values in self._totals.items()}
+        for call_type, values in totals.items():
+            prompt_tokens = values['prompt_tokens']
+            values['cached_token_ratio'] = round(values['cached_tokens'] / prompt_tokens, 3) if prompt_tokens else 0.0
+            values['latency_p50'] = latency_tracker.percentile(call_type, 50)
+            values['latency_p95'] = latency_tracker.percentile(call_type, 95)
+        return totals
+
+
+usage_stats = UsageStats()
+
+
+def _hedge_delay(call_type):
+    """관측된 p95 지연을 헤징 지연으로 사용"""
+    if latency_tracker.count(call_type) < HEDGE_MIN_SAMPLES:
+        return DEFAULT_HEDGE_DELAY_SECONDS
+    return latency_tracker.percentile(call_type, 95)
+
+
+def _backoff_seconds(attempt):
+    """Full jitter 지수 백오프"""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+
+def _abandon_hedge(future, call_type):
+    """헤징에서 진 요청 정리 - 시작 전이면 취소하고, 이미 보낸 요청은 결과를 기다리지 않되
+    끝나면 청구된 토큰 사용량만 집계 (응답은 버림)"""
+    if future.cancel():
+        return
+    metrics.inc('blog_llm_hedge_abandoned_total', call_type=call_type)
+
+    def record_usage(done):
+        if done.exception() is None:
+            usage_stats.record(call_type, done.result())
+
+    future.add_done_callback(record_usage)
+
+
+def _run_hedged(fn, call_type, timeout):
+    """첫 요청이 p95 안에 끝나지 않으면 두 번째 요청을 보내고 먼저 성공한 응답 반환
+
+    남은 요청은 _abandon_hedge로 정리하며, 이미 보낸 요청은 취소할 수 없어 비용이 청구됩니다.
+    """
+    first = _hedge_executor.submit(fn, timeout)
+    done, _ = wait([first], timeout=min(_hedge_delay(call_type), timeout))
+    if done:
+        return first.result()
+
+    logger.info("⏱️ %s 호출 지연 - 헤징 요청 전송", call_type)
+    second = _hedge_executor.submit(fn, timeout)
+    pending = {first, second}
+    last_error = None
+    deadline = time.monotonic() + timeout
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=max(0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                last_error = future.exception()
+    finally:
+        for future in pending:
+            _abandon_hedge(future, call_type)
+    if last_error is not None:
+        raise last_error
+    raise DeadlineExceeded(f"{call_type} 호출이 {timeout:.1f}초 안에 끝나지 않았습니다.")
+
+
+async def _arun_hedged(fn, call_type, timeout):
+    """_run_hedged의 코루틴 버전 (진 요청은 취소하지만, 이미 보낸 요청이면 비용은 청구됨)"""
+    first = asyncio.ensure_future(fn(timeout))
+    done, _ = await asyncio.wait({first}, timeout=min(_hedge_delay(call_type), timeout))
+    if done:
+        return first.result()
+
+    logger.info("⏱️ %s 호출 지연 - 헤징 요청 전송", call_type)
+    second = asyncio.ensure_future(fn(timeout))
+    pending = {first, second}
+    last_error = None
+    deadline = time.monotonic() + timeout
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=max(0, deadline - time.monotonic()), return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                last_error = future.exception()
+    finally:
+        for future in pending:
+            future.cancel()
+            metrics.inc('blog_llm_hedge_abandoned_total', call_type=call_type)
+    if last_error is not None:
+        raise last_error
+    raise DeadlineExceeded(f"{call_type} 호출이 {timeout:.1f}초 안에 끝나지 않았습니다.")
+
+
+def _attempt_timeout(call_type, deadline, timeout):
+    """이번 시도에 쓸 타임아웃 (남은 예산이 없으면 DeadlineExceeded)"""
+    if deadline is None:
+        return timeout or REQUEST_BUDGET_SECONDS
+    remaining = deadline.remaining() - DEADLINE_SAFETY_MARGIN
+    if remaining <= 0:
+        raise DeadlineExceeded(f"{call_type} 호출을 위한 요청 시간이 남아있지 않습니다.")
+    return min(timeout, remaining) if timeout else remaining
+
+
+def _retry_delay(call_type, error, attempt, max_retries, deadline):
+    """재시도 전 대기 시간 (재시도하지 않아야 하면 None)"""
+    if attempt >= max_retries:
+        return None
+    sleep_for = _backoff_seconds(attempt)
+    if deadline is not None and deadline.remaining() - DEADLINE_SAFETY_MARGIN <= sleep_for:
+        return None
+    logger.warning("🔁 %s 호출 재시도 %d/%d (%s, %.1f초 대기)", call_type, attempt + 1, max_retries, type(error).__name__, sleep_for)
+    return sleep_for
+
+
+def call_with_policy(fn, call_type, deadline=None, max_retries=DEFAULT_MAX_RETRIES, hedge=False, timeout=None):
+    """fn(timeout)을 마감시간/재시도/헤징 정책으로 실행
+
+    fn은 호출별 타임아웃(초)을 인자로 받아 실제 API 요청을 수행해야 합니다.
+    timeout은 시도 1회당 상한이며, 실제 값은 남은 예산을 넘지 않습니다.
+    """
+    if deadline is None:
+        deadline = get_request_deadline()
+
+    with metrics.timed(f'openai_{call_type}'):
+        attempt = 0
+        while True:
+            attempt_timeout = _attempt_timeout(call_type, deadline, timeout)
+            started = time.monotonic()
+            try:
+                if hedge:
+                    result = _run_hedged(fn, call_type, attempt_timeout)
+                else:
+                    result = fn(attempt_timeout)
+                latency_tracker.record(call_type, time.monotonic() - started)
+                return result
+            except retryable_errors() as e:
+                sleep_for = _retry_delay(call_type, e, attempt, max_retries, deadline)
+                if sleep_for is None:
+                    raise
+                attempt += 1
+                metrics.inc('blog_llm_retries_total', call_type=call_type)
+                time.sleep(sleep_for)
+
+
+async def acall_with_policy(fn, call_type, deadline=None, max_retries=DEFAULT_MAX_RETRIES, hedge=False, timeout=None):
+    """call_with_policy의 코루틴 버전 - fn(timeout)은 코루틴 함수여야 합니다"""
+    if deadline is None:
+        deadline = get_request_deadline()
+
+    with metrics.timed(f'openai_{call_type}'):
+        attempt = 0
+        while True:
+            attempt_timeout = _attempt_timeout(call_type, deadline, timeout)
+            started = time.monotonic()
+            try:
+                if hedge:
+                    result = await _arun_hedged(fn, call_type, attempt_timeout)
+                else:
+                    result = await fn(attempt_timeout)
+                latency_tracker.record(call_type, time.monotonic() - started)
+                return result
+            except retryable_errors() as e:
+                sleep_for = _retry_delay(call_type, e, attempt, max_retries, deadline)
+                if sleep_for is None:
+                    raise
+                attempt += 1
+                metrics.inc('blog_llm_retries_total', call_type=call_type)
+                await asyncio.sleep(sleep_for)
+
+
+def _record_model_call(call_type, model, started, usage=None, error=False):
+    """단계(call_type)/모델별 지연시간과 토큰 기록 (model_router)"""
+    if error:
+        model_router.router.record(call_type, model, time.monotonic() - started, error=True)
+        return
+    model_router.router.record(
+        call_type,
+        model,
+        time.monotonic() - started,
+        prompt_tokens=getattr(usage, 'prompt_tokens', 0) or 0,
+        completion_tokens=getattr(usage, 'completion_tokens', 0) or 0
+    )
+
+
+def create_chat_completion(client, call_type, deadline=None, max_retries=DEFAULT_MAX_RETRIES, hedge=False, timeout=None, model=None, **kwargs):
+    """chat.completions.create를 정책과 함께 호출
+
+    모델은 model_router가 단계(call_type)별 설정과 관측 지연시간으로 고르며,
+    model을 주면 그 단계의 기본 모델로 사용합니다.
+    SDK 자체 재시도는 끄고(max_retries=0) 이 모듈에서 재시도를 관리합니다.
+    """
+    model = model_router.select_model(call_type, primary=model)
+
+    def attempt(attempt_timeout):
+        started = time.monotonic()
+        try:
+            response = client.with_options(timeout=attempt_timeout, max_retries=0).chat.completions.create(model=model, **kwargs)
+        except Exception:
+            _record_model_call(call_type, model, started, error=True)
+            raise
+        _record_model_call(call_type, model, started, getattr(response, 'usage', None))
+        return response
+
+    response = call_with_policy(attempt, call_type, deadline=deadline, max_retries=max_retries, hedge=hedge, timeout=timeout)
+    usage_stats.record(call_type, response)
+    return response
+
+
+async def acreate_chat_completion(client, call_type, deadline=None, max_retries=DEFAULT_MAX_RETRIES, hedge=False, timeout=None, model=None, **kwargs):
+    """create_chat_completion의 코루틴 버전 (client는 AsyncOpenAI)"""
+    model = model_router.select_model(call_type, primary=model)
+
+    async def attempt(attempt_timeout):
+        started = time.monotonic()
+        try:
+            response = await client.with_options(timeout=attempt_timeout, max_retries=0).chat.completions.create(model=model, **kwargs)
+        except Exception:
+            _record_model_call(call_type, model, started, error=True)
+            raise
+        _record_model_call(call_type, model, started, getattr(response, 'usage', None))
+        return response
+
+    response = await acall_with_policy(attempt, call_type, deadline=deadline, max_retries=max_retries, hedge=hedge, timeout=timeout)
+    usage_stats.record(call_type, response)
+    return response
+
+
+def stream_chat_completion(client, call_type, on_delta, deadline=None, max_retries=DEFAULT_MAX_RETRIES, timeout=None, model=None, **kwargs):
+    """chat.completions.create(stream=True)를 정책과 함께 호출하고 전체 응답 텍스트 반환
+
+    응답 조각이 도착할 때마다 on_delta(text)를 호출합니다. 이미 조각을 전달한 뒤의 오류는
+    같은 내용이 두 번 전달되지 않도록 재시도하지 않습니다.
+    """
+    model = model_router.select_model(call_type, primary=model)
+    usage_holder = {}
+
+    def attempt(attempt_timeout):
+        started = time.monotonic()
+        parts = []
+        try:
+            stream = client.with_options(timeout=attempt_timeout, max_retries=0).chat.completions.create(
+                model=model,
+                stream=True,
+                stream_options={'include_usage': True},
+                **kwargs
+            )
+            for chunk in stream:
+                if getattr(chunk, 'usage', None) is not None:
+                    usage_holder['usage'] = chunk.usage
+                if not chunk.choices:
+                    continue
+                text = chunk.choices[0].delta.content
+                if text:
+                    parts.append(text)
+                    on_delta(text)
+        except Exception as e:
+            _record_model_call(call_type, model, started, error=True)
+            if parts:
+                raise RuntimeError(f"{call_type} 스트리밍 중 오류: {e}") from e
+            raise
+        _record_model_call(call_type, model, started, usage_holder.get('usage'))
+        return ''.join(parts)
+
+    content = call_with_policy(attempt, call_type, deadline=deadline, max_retries=max_retries, timeout=timeout)
+    if 'usage' in usage_holder:
+        usage_stats.record(call_type, SimpleNamespace(usage=usage_holder['usage']))
+    return content
+
+
+def generate_image(client, call_type='dall_e', deadline=None, max_retries=DEFAULT_MAX_RETRIES, timeout=None, **kwargs):
+    """images.generate를 정책과 함께 호출 (비용 문제로 헤징하지 않음)"""
+    def attempt(attempt_timeout):
+        return client.with_options(timeout=attempt_timeout, max_retries=0).images.generate(**kwargs)
+
+    return call_with_policy(attempt, call_type, deadline=deadline, max_retries=max_retries, timeout=timeout)
@@ -0,0 +1,301 @@
+"""
+단계별 지연시간 / 호출 수 / 오류 / 토큰 / 전송량 지표 (Prometheus /metrics)
+
+네이버 검색, GPT 호출 유형별, DALL-E, 이미지 다운로드, ZIP 생성, Flask 라우트마다
+지연시간 히스토그램과 성공/실패 카운터를 기록합니다. 오류율은 status 라벨로 계산합니다.
+
+    rate(blog_stage_calls_total{status="error"}[5m]) / rate(blog_stage_calls_total[5m])
+
+gunicorn 워커는 각자 지표를 메모리에 모으고 METRICS_FLUSH_INTERVAL마다 METRICS_DIR의
+프로세스별 파일(metrics-<pid>.json)에 기록합니다. /metrics 요청을 받은 워커는 모든 파일을 합산해
+응답하므로 어느 워커가 받아도 전체 합계가 나옵니다. 종료된 워커의 파일도 합산에 남겨 두어
+카운터가 줄어들지 않습니다 (배포 시 디렉터리를 비우세요).
+
+    METRICS_DIR=/app/var/metrics
+    METRICS_FLUSH_INTERVAL=5
+    METRICS_TOKEN=...      # 설정하면 Authorization: Bearer <토큰> 필요
+"""
+
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+METRICS_DIR = os.environ.get(
+    'METRICS_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'var', 'metrics')
+)
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', '5'))
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# 외부 API 호출과 생성 작업에 맞춘 지연시간 구간 (초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+# /readyz 최근 오류율 계산용 - 단계별로 보관하는 최근 호출 수 / 집계 기간 (초)
+RECENT_CALLS_KEPT = 200
+RECENT_WINDOW_SECONDS = 300
+
+logger = logging.getLogger(__name__)
+
+METRIC_HELP = {
+    'blog_stage_duration_seconds': ('histogram', '단계별 소요 시간'),
+    'blog_stage_calls_total': ('counter', '단계별 호출 수 (status=ok|error)'),
+    'blog_http_request_duration_seconds': ('histogram', 'Flask 라우트별 응답 시간'),
+    'blog_http_requests_total': ('counter', 'Flask 라우트별 요청 수'),
+    'blog_llm_tokens_total': ('counter', 'OpenAI 호출 유형별 토큰 수 (kind=prompt|cached|completion)'),
+    'blog_llm_retries_total': ('counter', 'OpenAI 호출 유형별 재시도 수'),
+    'blog_llm_hedge_abandoned_total': ('counter', '헤징에서 응답을 버린 OpenAI 요청 수 (비용은 청구됨)'),
+    'blog_bytes_total': ('counter', '단계별 전송 바이트 (direction=in|out)'),
+}
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class MetricsRegistry:
+    """프로세스 내 지표 저장소 + 프로세스별 파일 기록/합산"""
+
+    def __init__(self, directory=METRICS_DIR, flush_interval=METRICS_FLUSH_INTERVAL, buckets=LATENCY_BUCKETS):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.buckets = buckets
+        self._counters = {}
+        self._histograms = {}
+        # 프로세스 로컬 상태 (파일에 기록하지 않음): 진행 중 호출 수, 최근 호출 (시각, 오류 여부)
+        self._in_flight = {}
+        self._recent = {}
+        self._lock = threading.Lock()
+        self._pid = None
+        self._flusher = None
+        self.shared = False
+
+    def _ensure_flusher(self):
+        """fork된 프로세스면 물려받은 값을 버리고, 공유 모드면 프로세스별 기록 스레드 시작"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._counters = {}
+            self._histograms = {}
+            self._in_flight = {}
+            self._recent = {}
+            self._pid = os.getpid()
+        if not self.shared:
+            return
+
+        def run():
+            while True:
+                time.sleep(self.flush_interval)
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.warning("⚠️ 지표 기록 실패: %s", e)
+
+        self._flusher = threading.Thread(target=run, name='metrics-flusher', daemon=True)
+        self._flusher.start()
+
+    def start_flusher(self):
+        """프로세스별 파일 기록 시작 (웹앱에서 호출, 데스크톱 앱은 메모리에만 기록)"""
+        self.shared = True
+        if self._pid == os.getpid() and (self._flusher is None or not self._flusher.is_alive()):
+            self._pid = None
+        self._ensure_flusher()
+
+    # --- 기록 ---
+
+    def inc(self, name, value=1, **labels):
+        """카운터 증가"""
+        self._ensure_flusher()
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        """히스토그램에 값 하나 기록"""
+        self._ensure_flusher()
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram['buckets'][i] += 1
+                    break
+            histogram['sum'] += seconds
+            histogram['count'] += 1
+
+    def record_stage(self, stage, seconds, error=False):
+        """단계 하나의 소요 시간과 성공/실패 기록"""
+        self.observe('blog_stage_duration_seconds', seconds, stage=stage)
+        self.inc('blog_stage_calls_total', stage=stage, status='error' if error else 'ok')
+        with self._lock:
+            recent = self._recent.get(stage)
+            if recent is None:
+                recent = self._recent[stage] = deque(maxlen=RECENT_CALLS_KEPT)
+            recent.append((time.monotonic(), error))
+
+    @contextmanager
+    def timed(self, stage):
+        """with 블록 소요 시간을 단계 지표로 기록 (예외가 나면 error), 실행 중에는 진행 중 호출 수에 포함"""
+        self._ensure_flusher()
+        with self._lock:
+            self._in_flight[stage] = self._in_flight.get(stage, 0) + 1
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException:
+            self.record_stage(stage, time.monotonic() - started, error=True)
+            raise
+        else:
+            self.record_stage(stage, time.monotonic() - started)
+        finally:
+            with self._lock:
+                self._in_flight[stage] = max(0, self._in_flight.get(stage, 0) - 1)
+
+    def add_bytes(self, stage, size, direction='in'):
+        if size:
+            self.inc('blog_bytes_total', size, stage=stage, direction=direction)
+
+    def count_stream(self, stage, chunks):
+        """바이트 조각 제너레이터를 감싸 끝까지 전송한 시간과 바이트 수 기록"""
+        started = time.monotonic()
+        total = 0
+        error = False
+        try:
+            for chunk in chunks:
+                total += len(chunk)
+                yield chunk
+        except GeneratorExit:
+            # 클라이언트가 중간에 끊음 - 오류로 세지 않고 전송한 만큼만 기록
+            raise
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record_stage(stage, time.monotonic() - started, error=error)
+            self.add_bytes(stage, total, direction='out')
+
+    def stage_status(self, window=RECENT_WINDOW_SECONDS):
+        """이 프로세스의 단계별 진행 중 호출 수와 최근 window초 호출/오류 수, 오류율"""
+        self._ensure_flusher()
+        since = time.monotonic() - window
+        with self._lock:
+            stages = set(self._in_flight) | set(self._recent)
+            status = {}
+            for stage in sorted(stages):
+                recent = [error for at, error in self._recent.get(stage, ()) if at >= since]
+                errors = sum(1 for error in recent if error)
+                status[stage] = {
+                    'in_flight': self._in_flight.get(stage, 0),
+                    'recent_calls': len(recent),
+                    'recent_errors': errors,
+                    'error_rate': round(errors / len(recent), 3) if recent else 0.0
+                }
+        return status
+
+    # --- 프로세스 간 합산 ---
+
+    def _snapshot(self):
+        with self._lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                'histograms': [
+                    [name, list(labels), list(h['buckets']), h['sum'], h['count']]
+                    for (name, labels), h in self._histograms.items()
+                ]
+            }
+
+    def _path(self, pid=None):
+        return os.path.join(self.directory, f"metrics-{pid or os.getpid()}.json")
+
+    def flush(self):
+        """이 프로세스의 누적 지표를 프로세스별 파일에 기록"""
+        if self._pid != os.getpid():
+            return
+        data = json.dumps(self._snapshot(), ensure_ascii=False)
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def collect(self):
+        """모든 프로세스 파일을 합산 ((counters, histograms) dict 반환, 이 프로세스는 현재 값 사용)"""
+        self._ensure_flusher()
+        snapshots = [self._snapshot()]
+        own_path = self._path()
+        for path in glob.glob(os.path.join(self.directory, 'metrics-*.json')):
+            if path == own_path:
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+
+        counters = {}
+        histograms = {}
+        for snapshot in snapshots:
+            for name, labels, value in snapshot.get('counters', []):
+                key = (name, tuple(tuple(pair) for pair in labels))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, buckets, total, count in snapshot.get('histograms', []):
+                if len(buckets) != len(self.buckets):
+                    continue
+                key = (name, tuple(tuple(pair) for pair in labels))
+                merged = histograms.setdefault(key, {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0})
+                merged['buckets'] = [a + b for a, b in zip(merged['buckets'], buckets)]
+                merged['sum'] += total
+                merged['count'] += count
+        return counters, histograms
+
+    def render(self):
+        """Prometheus 텍스트 형식 (0.0.4)"""
+        counters, histograms = self.collect()
+        lines = []
+        for name, (metric_type, help_text) in METRIC_HELP.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            if metric_type == 'counter':
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            for (metric, labels), h in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets, h['buckets']):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', _format_value(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {h['count']}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(h['sum'])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {h['count']}")
+        return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = []
+    for key, value in labels:
+        value = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{key}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value):
+    if isinstance(value, float) and not value.is_integer():
+        return repr(round(value, 6))
+    return str(int(value))
+
+
+# 프로세스 전체가 공유하는 지표 저장소
+metrics = MetricsRegistry()
@@ -0,0 +1,180 @@
+"""
+파이프라인 단계별 모델 라우터
+
+단계(분석, 제목, 장문 본문, 이미지 프롬프트)마다 사용할 모델을 설정에서 고르고,
+모델별 관측 지연시간(p50/p95)과 출력 토큰 속도(tokens/sec)를 기록합니다.
+기본 모델의 p95 지연이 단계의 지연 예산을 넘으면 더 빠른 대체 모델로 자동 전환합니다.
+지연 예산은 단계별이므로 전환 판단에는 (단계, 모델)별 지연시간을 사용합니다
+(같은 모델이라도 장문 본문 호출의 긴 지연이 제목 단계의 예산을 넘기지 않도록).
+
+설정은 MODEL_ROUTES_FILE 환경변수로 지정한 JSON 파일로 단계별로 덮어쓸 수 있습니다.
+    {"long_form": {"primary": "gpt-4o", "fallback": "gpt-4o-mini", "latency_budget": 60}}
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import deque
+
+# 단계별 기본 설정
+# - latency_budget: 기본 모델의 p95 지연 허용치(초), 넘으면 fallback 사용
+# - cost_budget: 호출 1회당 예상 비용 상한(USD), 통계에서 초과 여부만 표시
+DEFAULT_ROUTES = {
+    'analysis': {'primary': 'gpt-4o-mini', 'fallback': 'gpt-4.1-nano', 'latency_budget': 45, 'cost_budget': 0.01},
+    'titles': {'primary': 'gpt-4o-mini', 'fallback': 'gpt-4.1-nano', 'latency_budget': 10, 'cost_budget': 0.002},
+    'long_form': {'primary': 'gpt-4o-mini', 'fallback': 'gpt-4.1-nano', 'latency_budget': 90, 'cost_budget': 0.02},
+    'image_prompts': {'primary': 'gpt-4o-mini', 'fallback': 'gpt-4.1-nano', 'latency_budget': 15, 'cost_budget': 0.002},
+}
+
+# 1K 토큰당 (입력, 출력) 가격 (USD) - 비용 추정용
+MODEL_PRICES = {
+    'gpt-4o': (0.0025, 0.01),
+    'gpt-4o-mini': (0.00015, 0.0006),
+    'gpt-4.1-nano': (0.0001, 0.0004),
+}
+
+LATENCY_WINDOW = 100
+# p95를 판단하기 위한 최소 표본 수
+MIN_SAMPLES = 10
+# fallback 중에도 기본 모델 상태를 다시 확인하기 위해 N번에 한 번은 기본 모델 사용
+PROBE_EVERY = 10
+
+
+logger = logging.getLogger(__name__)
+
+
+def load_routes():
+    """기본 설정에 MODEL_ROUTES_FILE 내용을 덮어쓴 단계별 설정 반환"""
+    routes = {stage: dict(config) for stage, config in DEFAULT_ROUTES.items()}
+    routes_file = os.environ.get('MODEL_ROUTES_FILE')
+    if routes_file:
+        try:
+            with open(routes_file, 'r', encoding='utf-8') as f:
+                overrides = json.load(f)
+            for stage, config in overrides.items():
+                routes.setdefault(stage, {}).update(config)
+        except (OSError, ValueError) as e:
+            logger.warning("⚠️ 모델 라우팅 설정 파일을 읽을 수 없습니다 (%s): %s", routes_file, e)
+    return routes
+
+
+class ModelStats:
+    """모델 하나의 최근 지연시간 / 토큰 속도 / 비용 기록"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.latencies = deque(maxlen=window)
+        self.tokens_per_sec = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.cost_usd = 0.0
+
+    def percentile(self, pct):
+        samples = sorted(self.latencies)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100.0 * (len(samples) - 1))))
+        return samples[index]
+
+
+class ModelRouter:
+    """단계별 모델 선택 및 모델별 성능 기록"""
+
+    def __init__(self, routes=None):
+        self.routes = routes or load_routes()
+        # 모델별 누적 (호출/오류 수, 토큰 속도, 비용) - 통계 표시용
+        self._stats = {}
+        # (단계, 모델)별 지연시간 - 단계의 지연 예산과 비교하는 모델 선택용
+        self._stage_stats = {}
+        self._stage_calls = {}
+        self._lock = threading.Lock()
+
+    def _model_stats(self, model):
+        if model not in self._stats:
+            self._stats[model] = ModelStats()
+        return self._stats[model]
+
+    def _stage_model_stats(self, stage, model):
+        key = (stage, model)
+        if key not in self._stage_stats:
+            self._stage_stats[key] = ModelStats()
+        return self._stage_stats[key]
+
+    def select_model(self, stage, primary=None):
+        """단계에 사용할 모델 반환
+
+        primary를 주면 설정의 기본 모델 대신 사용합니다(지연 예산/대체 모델은 설정을 따름).
+        """
+        config = self.routes.get(stage, {})
+        primary = primary or config.get('primary', 'gpt-4o-mini')
+        fallback = config.get('fallback')
+        budget = config.get('latency_budget')
+        if not fallback or fallback == primary or not budget:
+            return primary
+
+        with self._lock:
+            stats = self._stage_model_stats(stage, primary)
+            calls = self._stage_calls.get(stage, 0) + 1
+            self._stage_calls[stage] = calls
+            if len(stats.latencies) < MIN_SAMPLES:
+                return primary
+            p95 = stats.percentile(95)
+            if p95 <= budget or calls % PROBE_EVERY == 0:
+                return primary
+
+        logger.info("🔀 %s: %s p95 %.1f초 > 예산 %s초 → %s 사용", stage, primary, p95, budget, fallback)
+        return fallback
+
+    def record(self, stage, model, latency, prompt_tokens=0, completion_tokens=0, error=False):
+        """단계의 호출 결과 기록 (실패/타임아웃도 지연시간으로 기록해 p95에 반영)"""
+        with self._lock:
+            self._stage_model_stats(stage, model).latencies.append(latency)
+            stats = self._model_stats(model)
+            stats.calls += 1
+            stats.latencies.append(latency)
+            if error:
+                stats.errors += 1
+                return
+            if completion_tokens and latency > 0:
+                stats.tokens_per_sec.append(completion_tokens / latency)
+            input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+            stats.cost_usd += prompt_tokens / 1000 * input_price + completion_tokens / 1000 * output_price
+
+    def snapshot(self):
+        """모델별 p50/p95 지연, 평균 tokens/sec, 호출/오류 수, 누적 비용과 단계 설정 반환"""
+        with self._lock:
+            models = {}
+            for model, stats in self._stats.items():
+                tps = list(stats.tokens_per_sec)
+                models[model] = {
+                    'calls': stats.calls,
+                    'errors': stats.errors,
+                    'latency_p50': stats.percentile(50),
+                    'latency_p95': stats.percentile(95),
+                    'tokens_per_sec': round(sum(tps) / len(tps), 1) if tps else None,
+                    'cost_usd': round(stats.cost_usd, 6),
+                    'avg_cost_usd': round(stats.cost_usd / (stats.calls - stats.errors), 6) if stats.calls > stats.errors else None
+                }
+            stage_p95 = {key: stats.percentile(95) for key, stats in self._stage_stats.items()}
+        stages = {}
+        for stage, config in self.routes.items():
+            primary_stats = models.get(config.get('primary'), {})
+            avg_cost = primary_stats.get('avg_cost_usd')
+            p95 = stage_p95.get((stage, config.get('primary')))
+            stages[stage] = dict(config)
+            stages[stage]['latency_p95'] = p95
+            stages[stage]['over_latency_budget'] = bool(
+                p95 and config.get('latency_budget') and p95 > config['latency_budget']
+            )
+            stages[stage]['over_cost_budget'] = bool(
+                avg_cost and config.get('cost_budget') and avg_cost > config['cost_budget']
+            )
+        return {'models': models, 'stages': stages}
+
+
+router = ModelRouter()
+
+
+def select_model(stage, primary=None):
+    """전역 라우터로 단계별 모델 선택"""
+    return router.select_model(stage, primary)
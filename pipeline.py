@@ -0,0 +1,99 @@
+"""
+의존성 그래프(DAG) 기반 파이프라인 실행기
+
+검색 → 분석 → 제목 → 본문/이미지 단계를 의존성에 따라 병렬로 실행합니다.
+의존 단계가 모두 끝난 단계는 즉시 시작되므로, 서로 독립적인 단계(예: 본문 생성과
+이미지 프롬프트/이미지 생성)는 겹쳐서 실행됩니다. 단계별 시작/종료 시각을 기록합니다.
+"""
+
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+logger = logging.getLogger(__name__)
+
+
+class Stage:
+    """파이프라인 단계 - fn(results)는 지금까지 완료된 단계 결과 dict를 받음"""
+
+    def __init__(self, name, fn, deps=()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+
+
+class PipelineRunner:
+    """단계들을 의존성 순서대로 스레드 풀에서 실행"""
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self.stages = {}
+
+    def add(self, name, fn, deps=()):
+        """단계 추가 (의존 단계는 먼저 추가되어 있어야 함)"""
+        for dep in deps:
+            if dep not in self.stages:
+                raise ValueError(f"알 수 없는 의존 단계입니다: {dep}")
+        self.stages[name] = Stage(name, fn, deps)
+        return self
+
+    def run(self, on_stage_done=None):
+        """모든 단계 실행 후 (results, timings, errors) 반환
+
+        실패한 단계에 의존하는 단계는 건너뛰고(skipped), 나머지 단계는 계속 실행합니다.
+        """
+        results = {}
+        errors = {}
+        timings = {}
+        pending = dict(self.stages)
+        running = {}
+        started_at = time.monotonic()
+
+        def elapsed():
+            return round(time.monotonic() - started_at, 3)
+
+        def run_stage(stage, snapshot):
+            timings[stage.name] = {'start': elapsed()}
+            return stage.fn(snapshot)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pipeline') as executor:
+            while pending or running:
+                # 실패한 의존 단계가 있는 단계는 건너뜀
+                for name, stage in list(pending.items()):
+                    failed = [dep for dep in stage.deps if dep in errors]
+                    if failed:
+                        errors[name] = f"의존 단계 실패로 건너뜀: {', '.join(failed)}"
+                        timings[name] = {'status': 'skipped'}
+                        del pending[name]
+
+                # 의존 단계가 모두 끝난 단계 시작 (요청 마감시간 등 컨텍스트 전달)
+                for name, stage in list(pending.items()):
+                    if all(dep in results for dep in stage.deps):
+                        ctx = contextvars.copy_context()
+                        future = executor.submit(ctx.run, run_stage, stage, dict(results))
+                        running[future] = name
+                        del pending[name]
+
+                if not running:
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    timing = timings.setdefault(name, {'start': elapsed()})
+                    timing['end'] = elapsed()
+                    timing['duration'] = round(timing['end'] - timing['start'], 3)
+                    try:
+                        results[name] = future.result()
+                        timing['status'] = 'done'
+                    except Exception as e:
+                        errors[name] = str(e)
+                        timing['status'] = 'error'
+                        logger.error("❌ 파이프라인 단계 '%s' 실패: %s", name, e)
+                    if on_stage_done:
+                        on_stage_done(name, timing)
+
+        timings['total'] = {'duration': elapsed()}
+        return results, timings, errors
@@ -6,6 +6,7 @@
 """
 
 from collections import Counter
+from functools import lru_cache
 import re
 
 # === 시스템 프롬프트 ===
@@ -19,6 +20,82 @@ def get_system_prompt_generation():
 반드시 숫자와 제목만 출력하고, 다른 설명이나 분류는 절대 포함하지 마세요.
 SEO에 최적화되고 클릭률이 높은 제목을 생성하되, 오직 "숫자. 제목" 형식으로만 답변하세요."""
 
+# === 분석 결과 요약(다이제스트) ===
+ANALYSIS_DIGEST_MAX_CHARS = 1000
+
+# 요약 점수 계산에서 제외할 흔한 단어
+_DIGEST_STOPWORDS = {
+    '있습니다', '합니다', '있는', '하는', '그리고', '하지만', '또한', '통해', '위한', '대한',
+    '콘텐츠', '블로그', '분석', '제목', '본문', '내용', '독자', '독자들', '독자들의', '경우'
+}
+
+
+def _split_digest_sentences(text):
+    """줄/문장 단위로 분리 (마크다운 제목은 별도 표시)"""
+    units = []
+    for raw_line in text.split('\n'):
+        line = raw_line.strip()
+        if not line:
+            continue
+        if line.startswith('#') or (line.startswith('**') and line.endswith('**') and len(line) < 60):
+            units.append(('heading', line.lstrip('#').strip().strip('*').strip()))
+            continue
+        line = re.sub(r'^[-*•]\s*|^\d+[.)]\s*', '', line)
+        for sentence in re.split(r'(?<=[.!?])\s+', line):
+            sentence = sentence.strip()
+            if len(sentence) > 5:
+                units.append(('sentence', sentence))
+    return units
+
+
+@lru_cache(maxsize=128)
+def create_analysis_digest(analysis_result, max_chars=ANALYSIS_DIGEST_MAX_CHARS):
+    """분석 결과를 문장 단위로 잘라 핵심 문장만 남긴 요약(추출 요약) 생성
+
+    글자수로 자르면 문장 중간에서 끊기므로, 분석 전체에서 자주 등장하는 단어를 많이 담은
+    문장을 골라 원래 순서대로 max_chars 안에서 이어 붙입니다. 이미 짧은 텍스트(이전에 만든
+    다이제스트 포함)는 그대로 반환하므로 여러 번 적용해도 결과가 같습니다.
+    """
+    if not analysis_result:
+        return ''
+    text = analysis_result.strip()
+    if len(text) <= max_chars:
+        return text
+
+    units = _split_digest_sentences(text)
+    words = re.findall(r'[가-힣A-Za-z]{2,}', text)
+    frequency = Counter(word for word in words if word not in _DIGEST_STOPWORDS)
+
+    scored = []
+    for index, (kind, sentence) in enumerate(units):
+        if kind != 'sentence':
+            continue
+        sentence_words = re.findall(r'[가-힣A-Za-z]{2,}', sentence)
+        if not sentence_words:
+            continue
+        score = sum(frequency.get(word, 0) for word in set(sentence_words)) / (len(sentence_words) ** 0.5)
+        if '**' in sentence:
+            score *= 1.2  # 강조된 문장은 핵심 인사이트인 경우가 많음
+        scored.append((score, index))
+
+    selected = set()
+    seen = set()
+    used = 0
+    for score, index in sorted(scored, key=lambda item: (-item[0], item[1])):
+        sentence = units[index][1].replace('**', '')
+        cost = len(sentence) + 3  # "- " 접두사와 줄바꿈 포함
+        if sentence in seen or used + cost > max_chars + 1:
+            continue
+        selected.add(index)
+        seen.add(sentence)
+        used += cost
+
+    lines = []
+    for index in sorted(selected):
+        lines.append(f"- {units[index][1].replace('**', '')}")
+    return '\n'.join(lines)
+
+
 # === 분석 프롬프트 생성 함수 ===
 def create_advanced_analysis_prompt(query, titles, descriptions, basic_analysis):
     """심화된 블로그 콘텐츠 분석을 위한 프롬프트 생성 - 제목과 본문 종합 분석"""
@@ -30,20 +107,9 @@ def create_advanced_analysis_prompt(query, titles, descriptions, basic_analysis)
     
     top_keywords = [word for word, count in basic_analysis.get('keyword_frequency', {}).most_common(10)]
 
+    # 고정된 분석 지침을 앞에, 검색 결과 데이터를 뒤에 두어 프롬프트 캐시가 적중하도록 구성
     return f"""
-다음은 '{query}' 키워드로 검색한 네이버 블로그 콘텐츠 {len(titles)}개입니다. 제목과 본문을 종합하여 매우 상세하고 심화적으로 분석해주세요.
-
-=== 블로그 콘텐츠 목록 (제목 + 본문) ===
-{chr(10).join(content_list)}
-
-=== 기본 통계 정보 ===
-- 총 콘텐츠 수: {basic_analysis.get('total_count', len(titles))}개
-- 평균 제목 길이: {basic_analysis.get('avg_length', 0):.1f}자
-- 숫자 포함 제목: {basic_analysis.get('has_numbers', 0)}개
-- 물음표 사용: {basic_analysis.get('has_question_mark', 0)}개
-- 느낌표 사용: {basic_analysis.get('has_exclamation', 0)}개
-- 괄호 사용: {basic_analysis.get('has_parentheses', 0)}개
-- 자주 등장하는 키워드: {', '.join(top_keywords[:5]) if top_keywords else '분석 중'}
+아래 [분석 대상]은 특정 키워드로 검색한 네이버 블로그 콘텐츠입니다. 제목과 본문을 종합하여 매우 상세하고 심화적으로 분석해주세요.
 
 === 제목 + 본문 종합 심화 분석 요청 ===
 다음 관점에서 제목과 본문을 종합하여 매우 구체적이고 상세하게 분석해주세요:
@@ -93,6 +159,21 @@ def create_advanced_analysis_prompt(query, titles, descriptions, basic_analysis)
 특히 **본문 내용 분석을 통해 얻은 깊이 있는 통찰**을 강조해주세요.
 분석 결과는 새로운 블로그 글 작성에 실용적으로 활용할 수 있도록 
 구체적인 인사이트와 실행 가능한 가이드라인을 포함해주세요.
+
+[분석 대상]
+검색 키워드: {query}
+
+=== 블로그 콘텐츠 목록 (제목 + 본문, {len(titles)}개) ===
+{chr(10).join(content_list)}
+
+=== 기본 통계 정보 ===
+- 총 콘텐츠 수: {basic_analysis.get('total_count', len(titles))}개
+- 평균 제목 길이: {basic_analysis.get('avg_length', 0):.1f}자
+- 숫자 포함 제목: {basic_analysis.get('has_numbers', 0)}개
+- 물음표 사용: {basic_analysis.get('has_question_mark', 0)}개
+- 느낌표 사용: {basic_analysis.get('has_exclamation', 0)}개
+- 괄호 사용: {basic_analysis.get('has_parentheses', 0)}개
+- 자주 등장하는 키워드: {', '.join(top_keywords[:5]) if top_keywords else '분석 중'}
 """
 
 def create_title_generation_prompt(query, analysis_result, num_titles=10):
@@ -101,7 +182,9 @@ def create_title_generation_prompt(query, analysis_result, num_titles=10):
     current_year = datetime.now().year
     next_year = current_year + 1
 
-    return f"""키워드 '{query}'에 대해 {num_titles}개의 매력적인 블로그 제목을 생성해주세요.
+    # 고정된 규칙/예시를 앞에, 키워드와 분석 결과를 뒤에 두어 프롬프트 캐시가 적중하도록 구성
+    # (예시의 키워드는 [메인 키워드] 자리표시자로 쓰고 맨 뒤 [작성 정보]에서 지정)
+    return f"""아래 [작성 정보]의 키워드로 매력적인 블로그 제목을 생성해주세요.
 
 🕐 **현재 시점 정보 (매우 중요!)**
 - 현재는 {current_year}년입니다
@@ -122,22 +205,24 @@ def create_title_generation_prompt(query, analysis_result, num_titles=10):
 5. **시의성 있는 최신 정보 반영 ({current_year}년 기준)**
 
 ✅ **올바른 예시:**
-1. {query} 초보자를 위한 완벽 가이드
-2. {query} 실전 활용법 총정리
-3. {query}로 성공하는 3가지 방법
-4. {current_year}년 최신 {query} 트렌드 분석
-5. {next_year}년 {query} 전망과 준비사항
+1. [메인 키워드] 초보자를 위한 완벽 가이드
+2. [메인 키워드] 실전 활용법 총정리
+3. [메인 키워드]로 성공하는 3가지 방법
+4. {current_year}년 최신 [메인 키워드] 트렌드 분석
+5. {next_year}년 [메인 키워드] 전망과 준비사항
 
 ❌ **절대 금지 예시:**
-1. {query} 초보자를 위한 완벽 가이드
+1. [메인 키워드] 초보자를 위한 완벽 가이드
 **유형:** 정보 제공형
 **타겟:** 초보자
-2. 2024년 {query} 전망 (과거 연도 사용 금지!)
-3. 2023년 {query} 정리 (과거 연도 사용 금지!)
-
-{f'📊 참고 분석 결과: {analysis_result[:300]}...' if analysis_result else ''}
+2. 2024년 [메인 키워드] 전망 (과거 연도 사용 금지!)
+3. 2023년 [메인 키워드] 정리 (과거 연도 사용 금지!)
 
-지금 바로 {num_titles}개의 제목을 숫자와 제목만으로 생성해주세요."""
+[작성 정보]
+- 메인 키워드: {query}
+- 제목 수: {num_titles}개
+{f'{chr(10)}📊 참고 분석 결과:{chr(10)}{create_analysis_digest(analysis_result, 500)}{chr(10)}' if analysis_result else ''}
+지금 바로 {num_titles}개의 제목을 숫자와 제목만으로 생성해주세요. 예시의 [메인 키워드]는 위 메인 키워드로 바꿔 쓰세요."""
 
 # === 트렌드 분석 프롬프트 ===
 def create_trend_analysis_prompt(query, titles, descriptions, basic_analysis):
@@ -148,16 +233,9 @@ def create_trend_analysis_prompt(query, titles, descriptions, basic_analysis):
     
     top_keywords = [word for word, count in basic_analysis['keyword_frequency'].most_common(10)]
 
+    # 고정된 분석 지침을 앞에, 검색 결과 데이터를 뒤에 두어 프롬프트 캐시가 적중하도록 구성
     return f"""
-'{query}' 키워드로 검색한 네이버 블로그 콘텐츠들을 분석하여 현재 트렌드와 시장 인사이트를 도출해주세요.
-
-=== 블로그 콘텐츠 목록 ===
-{chr(10).join(content_list)}
-
-=== 기본 통계 정보 ===
-- 총 제목 수: {basic_analysis['total_count']}개
-- 평균 길이: {basic_analysis['avg_length']:.1f}자
-- 자주 등장하는 키워드: {', '.join(top_keywords[:10])}
+아래 [분석 대상]은 특정 키워드로 검색한 네이버 블로그 콘텐츠입니다. 이를 분석하여 현재 트렌드와 시장 인사이트를 도출해주세요.
 
 === 트렌드 분석 요청 ===
 다음 관점에서 현재 트렌드와 시장 인사이트를 분석해주세요:
@@ -189,6 +267,17 @@ def create_trend_analysis_prompt(query, titles, descriptions, basic_analysis):
 
 각 분석 항목에 대해 구체적인 예시와 함께 상세하게 설명해주시고,
 실제 제목들을 인용하여 설명해주세요.
+
+[분석 대상]
+검색 키워드: {query}
+
+=== 블로그 콘텐츠 목록 ===
+{chr(10).join(content_list)}
+
+=== 기본 통계 정보 ===
+- 총 제목 수: {basic_analysis['total_count']}개
+- 평균 길이: {basic_analysis['avg_length']:.1f}자
+- 자주 등장하는 키워드: {', '.join(top_keywords[:10])}
 """
 
 def create_seo_analysis_prompt(query, titles, descriptions, basic_analysis):
@@ -199,19 +288,9 @@ def create_seo_analysis_prompt(query, titles, descriptions, basic_analysis):
     
     top_keywords = [word for word, count in basic_analysis['keyword_frequency'].most_common(10)]
 
+    # 고정된 분석 지침을 앞에, 검색 결과 데이터를 뒤에 두어 프롬프트 캐시가 적중하도록 구성
     return f"""
-'{query}' 관련 블로그 콘텐츠들을 SEO와 마케팅 관점에서 분석해주세요.
-
-=== 블로그 콘텐츠 목록 ===
-{chr(10).join(content_list)}
-
-=== 기본 통계 정보 ===
-- 총 제목 수: {basic_analysis['total_count']}개
-- 평균 길이: {basic_analysis['avg_length']:.1f}자
-- 숫자 포함 제목: {basic_analysis['has_numbers']}개
-- 물음표 사용: {basic_analysis['has_question_mark']}개
-- 느낌표 사용: {basic_analysis['has_exclamation']}개
-- 자주 등장하는 키워드: {', '.join(top_keywords[:10])}
+아래 [분석 대상]은 특정 키워드로 검색한 네이버 블로그 콘텐츠입니다. 이를 SEO와 마케팅 관점에서 분석해주세요.
 
 === SEO 분석 요청 ===
 다음 관점에서 SEO와 마케팅 최적화 방안을 분석해주세요:
@@ -243,28 +322,42 @@ def create_seo_analysis_prompt(query, titles, descriptions, basic_analysis):
 
 각 분석 항목에 대해 구체적인 예시와 함께 상세하게 설명해주시고,
 실제 제목들을 인용하여 설명해주세요.
+
+[분석 대상]
+검색 키워드: {query}
+
+=== 블로그 콘텐츠 목록 ===
+{chr(10).join(content_list)}
+
+=== 기본 통계 정보 ===
+- 총 제목 수: {basic_analysis['total_count']}개
+- 평균 길이: {basic_analysis['avg_length']:.1f}자
+- 숫자 포함 제목: {basic_analysis['has_numbers']}개
+- 물음표 사용: {basic_analysis['has_question_mark']}개
+- 느낌표 사용: {basic_analysis['has_exclamation']}개
+- 자주 등장하는 키워드: {', '.join(top_keywords[:10])}
 """
 
 # === 유틸리티 함수 ===
-def create_analysis_prompt(query, titles, analysis_type='comprehensive'):
-    """간단한 분석 프롬프트 생성 (기본 통계 자동 계산)"""
+def create_basic_analysis(titles):
+    """제목 리스트의 기본 통계 (분석 프롬프트의 [분석 대상] 통계 정보)"""
     # 키워드 빈도 계산
     all_text = ' '.join(titles)
     words = re.findall(r'[가-힣]{2,}', all_text)
-    keyword_frequency = Counter(words)
 
-    # 기본 통계 정보 생성
-    basic_analysis = {
+    return {
         'total_count': len(titles),
         'avg_length': sum(len(title) for title in titles) / len(titles) if titles else 0,
         'has_numbers': sum(1 for title in titles if any(char.isdigit() for char in title)),
         'has_question_mark': sum(1 for title in titles if '?' in title),
         'has_exclamation': sum(1 for title in titles if '!' in title),
         'has_parentheses': sum(1 for title in titles if '(' in title or ')' in title),
-        'keyword_frequency': keyword_frequency
+        'keyword_frequency': Counter(words)
     }
 
-    return create_advanced_analysis_prompt(query, titles, [], basic_analysis)
+def create_analysis_prompt(query, titles, analysis_type='comprehensive'):
+    """간단한 분석 프롬프트 생성 (기본 통계 자동 계산)"""
+    return create_advanced_analysis_prompt(query, titles, [''] * len(titles), create_basic_analysis(titles))
 
 # === 블로그 콘텐츠 생성 프롬프트 ===
 BLOG_CONTENT_PROMPTS = {
@@ -282,10 +375,7 @@ BLOG_CONTENT_PROMPTS = {
 - 🚨 매우 중요: 각 문단(도입부, 본문 각 소제목, 결론부)은 반드시 800-1000자로 작성
 - 각 문단 내에서 구체적인 예시, 경험담, 단계별 설명을 풍부하게 포함하여 분량 확보""",
 
-        'content_prompt': """주제: {title}
-키워드: {keyword}
-
-위 주제에 대해 독자의 마음을 움직이는 진정성 있는 블로그 글을 작성해주세요.
+        'content_prompt': """아래 [작성 정보]의 주제에 대해 독자의 마음을 움직이는 진정성 있는 블로그 글을 작성해주세요.
 
 **글쓰기 철학 & SEO 최적화 전략**
 당신은 '헤브론 글쓰기 전문작가 프로젝트'에 소속된 최고 수준의 SEO 전문 블로그 작가입니다. 
@@ -344,7 +434,7 @@ BLOG_CONTENT_PROMPTS = {
 
 🔍 **SEO 최적화 전략 (필수 준수)**
 
-**핵심 키워드 '{keyword}' 배치 전략:**
+**핵심 키워드 [메인 키워드] 배치 전략:**
 1. **제목**: 키워드를 제목 앞쪽 30자 내에 포함 (1회)
 2. **도입부**: 첫 150자 내에 키워드 포함 (1-2회)
 3. **소제목**: 최소 2개 이상의 소제목에 키워드 또는 유사 키워드 포함
@@ -352,7 +442,7 @@ BLOG_CONTENT_PROMPTS = {
 5. **결론부**: 마지막 단락에 키워드 재언급 (1회)
 
 **LSI(관련) 키워드 전략:**
-- 메인 키워드 '{keyword}'와 관련된 15-20개 연관 키워드 자연스럽게 포함
+- [메인 키워드]와 관련된 15-20개 연관 키워드 자연스럽게 포함
 - Long-tail 키워드 3-5개 활용 (예: "키워드 + 방법", "키워드 + 팁", "키워드 + 가이드")
 - 동의어와 유의어를 활용하여 키워드 다양성 확보
 
@@ -439,10 +529,7 @@ BLOG_CONTENT_PROMPTS = {
 - 읽는 재미와 정보 제공의 균형
 - 감정적 몰입감과 실용성의 조화""",
 
-        'content_prompt': """주제: {title}
-키워드: {keyword}
-
-위 주제에 대해 진솔한 경험담을 마치 가까운 친구에게 이야기하듯 써주세요.
+        'content_prompt': """아래 [작성 정보]의 주제에 대해 진솔한 경험담을 마치 가까운 친구에게 이야기하듯 써주세요.
 
 **글쓰기 접근법**
 당신은 '헤브론 글쓰기 전문작가 프로젝트'의 전문 작가입니다. 
@@ -467,13 +554,13 @@ AI가 만든 글이 아니라, 실제 사람이 겪은 생생한 경험을 진
 
 [내용 및 메시지 설계]
 - 모든 문장은 "이 경험을 왜 공유해야 하는가"에 대한 목적의식이 분명해야 함
-- 키워드 '{keyword}'는 경험의 핵심 부분에서 자연스럽게 녹여야 함
+- 키워드 [메인 키워드]는 경험의 핵심 부분에서 자연스럽게 녹여야 함
 - 솔직한 감정 표현과 진솔한 후기로 신뢰감 조성
 - 시행착오와 깨달음의 과정을 통해 독자에게 가치 제공
 - "경험 공유 → 감정 이입 → 교훈 도출 → 실용적 조언"의 4단 구성으로 접근
 
 [SEO 최적화 전략]
-- 핵심 키워드 '{keyword}'를 제목, 소제목, 본문 앞머리에 자연스럽게 배치
+- 핵심 키워드 [메인 키워드]를 제목, 소제목, 본문 앞머리에 자연스럽게 배치
 - 경험 관련 연관 키워드와 감정 표현 키워드도 함께 활용
 - 독자의 검색 의도(후기, 경험담, 팁)에 맞는 내용 구성
 
@@ -512,10 +599,7 @@ AI가 만든 글이 아니라, 실제 사람이 겪은 생생한 경험을 진
 - 독자의 상황에 맞는 맞춤형 추천
 - 데이터와 사실에 기반한 분석""",
 
-        'content_prompt': """주제: {title}
-키워드: {keyword}
-
-위 주제에 대해 독자의 현명한 선택을 돕는 따뜻하면서도 객관적인 글을 써주세요.
+        'content_prompt': """아래 [작성 정보]의 주제에 대해 독자의 현명한 선택을 돕는 따뜻하면서도 객관적인 글을 써주세요.
 
 **글쓰기 철학**
 당신은 '헤브론 글쓰기 전문작가 프로젝트'의 전문 작가입니다. 
@@ -539,13 +623,13 @@ AI가 만든 글이 아니라, 실제 사람이 겪은 생생한 경험을 진
 
 [내용 및 메시지 설계]
 - 모든 비교는 "독자의 최선의 선택"이라는 목적의식이 분명해야 함
-- 키워드 '{keyword}'는 비교 기준과 분석 과정에서 자연스럽게 활용
+- 키워드 [메인 키워드]는 비교 기준과 분석 과정에서 자연스럽게 활용
 - 편향되지 않은 공정한 분석으로 신뢰성 확보
 - 구체적인 근거와 데이터 제시로 설득력 강화
 - "문제 제기 → 비교 분석 → 객관적 평가 → 맞춤 추천"의 4단 구성으로 접근
 
 [SEO 최적화 전략]
-- 핵심 키워드 '{keyword}'를 제목, 소제목, 본문 앞머리에 자연스럽게 배치
+- 핵심 키워드 [메인 키워드]를 제목, 소제목, 본문 앞머리에 자연스럽게 배치
 - 비교 관련 키워드(vs, 차이점, 장단점, 추천)와 함께 활용
 - 독자의 검색 의도(비교, 선택, 추천)에 맞는 내용 구성
 
@@ -584,10 +668,7 @@ AI가 만든 글이 아니라, 실제 사람이 겪은 생생한 경험을 진
 - 중요한 팁과 주의사항 강조
 - 문제 해결 중심의 접근""",
 
-        'content_prompt': """주제: {title}
-키워드: {keyword}
-
-위 주제에 대해 실용 가이드형 블로그 글을 작성해주세요.
+        'content_prompt': """아래 [작성 정보]의 주제에 대해 실용 가이드형 블로그 글을 작성해주세요.
 
 **실용 가이드 특화 글쓰기 기법**
 📋 **/stepbystep + /listicle**: 체계적인 단계별 설명과 리스트 형태 구성
@@ -613,13 +694,13 @@ AI가 만든 글이 아니라, 실제 사람이 겪은 생생한 경험을 진
 
 [내용 및 메시지 설계]
 - 모든 설명은 "독자의 성공적인 실행"이라는 목적의식이 분명해야 함
-- 키워드 '{keyword}'는 핵심 단계와 과정에서 자연스럽게 활용
+- 키워드 [메인 키워드]는 핵심 단계와 과정에서 자연스럽게 활용
 - 실제 실행 가능한 구체적인 방법론 제시
 - 단계별 체크리스트와 실용적인 팁으로 성공률 향상
 - "목표 설정 → 준비 단계 → 실행 과정 → 완성 및 평가"의 4단 구성으로 접근
 
 [SEO 최적화 전략]
-- 핵심 키워드 '{keyword}'를 제목, 소제목, 본문 앞머리에 자연스럽게 배치
+- 핵심 키워드 [메인 키워드]를 제목, 소제목, 본문 앞머리에 자연스럽게 배치
 - How-to 관련 키워드(방법, 가이드, 단계, 팁)와 함께 활용
 - 독자의 검색 의도(실행 방법, 가이드, 튜토리얼)에 맞는 내용 구성
 
@@ -658,10 +739,7 @@ AI가 만든 글이 아니라, 실제 사람이 겪은 생생한 경험을 진
 - 생생한 묘사와 대화
 - 독자의 상상력을 자극하는 표현""",
 
-        'content_prompt': """주제: {title}
-키워드: {keyword}
-
-위 주제에 대해 스토리텔링형 블로그 글을 작성해주세요.
+        'content_prompt': """아래 [작성 정보]의 주제에 대해 스토리텔링형 블로그 글을 작성해주세요.
 
 [글의 구성 방식]
 1. **도입부 (Hook, 3~5문장)**
@@ -681,13 +759,13 @@ AI가 만든 글이 아니라, 실제 사람이 겪은 생생한 경험을 진
 
 [내용 및 메시지 설계]
 - 모든 이야기는 "독자에게 전달하고 싶은 메시지"가 핵심이어야 함
-- 키워드 '{keyword}'는 이야기의 중심 소재나 갈등 요소로 자연스럽게 활용
+- 키워드 [메인 키워드]는 이야기의 중심 소재나 갈등 요소로 자연스럽게 활용
 - 재미와 정보 전달의 균형을 통해 읽는 즐거움과 학습 효과 동시 달성
 - 감정적 몰입을 통해 메시지의 설득력 강화
 - "상황 설정 → 갈등 발생 → 해결 과정 → 교훈 도출"의 4단 구성으로 접근
 
 [SEO 최적화 전략]
-- 핵심 키워드 '{keyword}'를 제목, 소제목, 본문 앞머리에 자연스럽게 배치
+- 핵심 키워드 [메인 키워드]를 제목, 소제목, 본문 앞머리에 자연스럽게 배치
 - 스토리 관련 키워드(이야기, 경험, 사례)와 함께 활용
 - 독자의 검색 의도(재미있는 글, 경험담, 사례)에 맞는 내용 구성
 
@@ -719,19 +797,47 @@ def get_blog_content_prompts():
     """사용 가능한 블로그 컨텐츠 프롬프트 목록 반환"""
     return BLOG_CONTENT_PROMPTS
 
-def create_blog_content_prompt(title, keyword, prompt_type='informative', additional_prompt="", min_chars=4000, max_chars=8000, analysis_result=None):
-    """블로그 컨텐츠 생성을 위한 프롬프트 생성"""
+# 본문과 함께 섹션별 이미지 프롬프트를 받기 위한 고정 지침
+# (프롬프트 캐시 적중을 위해 개수 등 요청별 값은 [작성 정보]에 둠)
+IMAGE_SLOT_INSTRUCTIONS = """
+
+=== 이미지 프롬프트 슬롯 ===
+글을 쓰면서 각 소제목(섹션) 내용이 끝나는 위치에, 그 섹션을 대표하는 사진을 만들기 위한
+DALL-E 프롬프트를 아래 형식으로 정확히 한 줄씩 작성하세요. 개수는 [작성 정보]의 '이미지 프롬프트 수'를 따릅니다.
+[IMAGE_PROMPT: 영어로 작성한 프롬프트]
+
+프롬프트 작성 규칙:
+- 글 내용에 맞게 "인물", "자연", "제품/사물" 중 하나의 사진 유형을 골라 아래 템플릿 구조를 사용
+  [인물]: "Professional photography portrait of ..., natural lighting, soft background blur, Canon EOS R5, 85mm lens, realistic skin texture, high resolution, 4K quality"
+  [자연]: "High-resolution landscape photography of ..., vivid color grading, cinematic lighting, Sony Alpha 7R IV, 24mm lens, realistic environmental textures, ultra-detailed, 4K quality"
+  [제품/사물]: "Professional product photography of ..., minimalist background, subtle studio lighting, Nikon D850, macro lens, sharp details, realistic textures, ultra-detailed, 4K quality"
+- 각 프롬프트는 해당 섹션의 서로 다른 장면을 구체적으로 묘사
+- 한국적 느낌이나 아시아인 특징 반영 (별도 언급 없으면)
+- 슬롯 줄은 본문과 섞지 말고 반드시 한 줄에 하나만 작성"""
+
+def create_blog_content_prompt(title, keyword, prompt_type='informative', additional_prompt="", min_chars=4000, max_chars=8000, analysis_result=None, image_slots=0):
+    """블로그 컨텐츠 생성을 위한 프롬프트 생성
+
+    긴 작성 지침은 요청마다 동일한 앞부분(prefix)으로 두고, 제목/키워드 등 요청별 데이터는
+    맨 뒤에 붙여 OpenAI 프롬프트 캐시가 적중하도록 구성합니다.
+    image_slots가 있으면 섹션마다 [IMAGE_PROMPT: ...] 줄을 함께 쓰도록 지시합니다.
+    """
     if prompt_type not in BLOG_CONTENT_PROMPTS:
         prompt_type = 'informative'
     
     prompt_data = BLOG_CONTENT_PROMPTS[prompt_type]
     system_prompt = prompt_data['system_prompt']
-    user_prompt = prompt_data['content_prompt'].format(
-        title=title,
-        keyword=keyword,
-        min_chars=min_chars,
-        max_chars=max_chars
-    )
+    user_prompt = prompt_data['content_prompt']
+    if image_slots:
+        user_prompt += IMAGE_SLOT_INSTRUCTIONS
+    user_prompt += f"""
+
+[작성 정보]
+주제: {title}
+키워드([메인 키워드]): {keyword}
+목표 분량: {min_chars}~{max_chars}자"""
+    if image_slots:
+        user_prompt += f"\n이미지 프롬프트 수: {image_slots}개"
     
     # 추가 프롬프트가 있으면 추가
     if additional_prompt:
@@ -739,7 +845,7 @@ def create_blog_content_prompt(title, keyword, prompt_type='informative', additi
     
     # 분석 결과가 있으면 추가
     if analysis_result:
-        user_prompt += f"\n\n참고할 분석 결과:\n{analysis_result[:1000]}..."
+        user_prompt += f"\n\n참고할 분석 결과:\n{create_analysis_digest(analysis_result)}"
     
     return {
         'system_prompt': system_prompt,
@@ -766,9 +872,10 @@ def get_system_prompt(analysis_type='comprehensive'):
 
 def create_content_analysis_prompt(query, titles, descriptions, analysis_type='comprehensive'):
     """콘텐츠 분석을 위한 프롬프트 생성"""
+    basic_analysis = create_basic_analysis(titles)
     if analysis_type == 'trend':
-        return create_trend_analysis_prompt(query, titles, descriptions, {'total_count': len(titles), 'avg_length': sum(len(t) for t in titles)/len(titles) if titles else 0, 'keyword_frequency': {}})
+        return create_trend_analysis_prompt(query, titles, descriptions, basic_analysis)
     elif analysis_type == 'seo':
-        return create_seo_analysis_prompt(query, titles, descriptions, {'total_count': len(titles), 'avg_length': sum(len(t) for t in titles)/len(titles) if titles else 0, 'keyword_frequency': {}})
+        return create_seo_analysis_prompt(query, titles, descriptions, basic_analysis)
     else:
-        return create_analysis_prompt(query, titles, analysis_type)
\ No newline at end of file
+        return create_advanced_analysis_prompt(query, titles, descriptions, basic_analysis)
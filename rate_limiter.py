@@ -0,0 +1,129 @@
+"""
+공유 속도 제한기 (토큰 버킷)
+
+DALL-E 이미지 생성, 네이버 API 호출 등 분당 호출 수 제한이 있는 외부 API에 사용합니다.
+
+- RateLimiter: 프로세스 내 버킷 (스레드 간 공유)
+- SharedRateLimiter: 같은 호스트의 모든 워커 프로세스가 함께 쓰는 버킷
+  gunicorn 워커마다 버킷을 따로 두면 실제 한도가 워커 수만큼 늘어나므로, 버킷 상태(남은 토큰, 갱신 시각)를
+  RATE_LIMIT_DIR의 파일에 두고 fcntl 잠금 안에서 읽고 씁니다 (metrics, trend_cache와 같은 방식).
+  여러 호스트로 확장할 때는 호스트 수에 맞춰 분당 한도를 나눠 설정하세요.
+
+    RATE_LIMIT_DIR=/app/var/ratelimit
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+RATE_LIMIT_DIR = os.environ.get(
+    'RATE_LIMIT_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'var', 'ratelimit')
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """분당 최대 호출 수를 지키는 토큰 버킷
+
+    버킷 크기(burst)만큼은 즉시 호출할 수 있고, 이후에는 per_minute 속도로 토큰이 채워집니다.
+    """
+
+    def __init__(self, per_minute, burst=None):
+        self.per_minute = max(1, per_minute)
+        self.capacity = burst if burst is not None else self.per_minute
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refilled(self, tokens, elapsed):
+        return min(self.capacity, tokens + max(0.0, elapsed) * self.per_minute / 60.0)
+
+    def _wait_time(self, tokens):
+        return (1 - tokens) * 60.0 / self.per_minute
+
+    def _take(self):
+        """토큰을 하나 가져오면 0, 부족하면 다음 토큰까지 기다릴 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = self._refilled(self.tokens, now - self.updated_at)
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return self._wait_time(self.tokens)
+
+    def acquire(self, timeout=None):
+        """토큰 하나를 얻을 때까지 대기 (timeout 초과 시 False)"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            wait_for = self._take()
+            if not wait_for:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait_for = min(wait_for, remaining)
+            time.sleep(wait_for)
+
+
+class SharedRateLimiter(RateLimiter):
+    """같은 호스트의 워커 프로세스들이 함께 쓰는 토큰 버킷 (RATE_LIMIT_DIR/<name>.json)
+
+    상태 파일을 쓸 수 없거나 fcntl이 없는 환경(Windows 데스크톱 앱)에서는 프로세스 내 버킷으로 동작합니다.
+    """
+
+    def __init__(self, name, per_minute, burst=None, directory=RATE_LIMIT_DIR):
+        super().__init__(per_minute, burst)
+        self.name = name
+        self.path = os.path.join(directory, f"{name}.json")
+        self._shared = FCNTL_AVAILABLE
+
+    def _take(self):
+        if not self._shared:
+            return super()._take()
+        try:
+            return self._take_shared()
+        except OSError as e:
+            logger.warning("⚠️ 공유 속도 제한 파일을 사용할 수 없어 프로세스 내 제한으로 전환합니다 (%s): %s", self.name, e)
+            self._shared = False
+            return super()._take()
+
+    def _take_shared(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        # 같은 프로세스의 스레드끼리는 먼저 프로세스 잠금으로 줄을 세워 파일 잠금 경쟁을 줄임
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            with os.fdopen(fd, 'r+', encoding='utf-8') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    now = time.time()
+                    try:
+                        state = json.loads(f.read() or '{}')
+                        tokens = float(state['tokens'])
+                        updated_at = float(state['updated_at'])
+                    except (ValueError, KeyError, TypeError):
+                        tokens, updated_at = float(self.capacity), now
+                    tokens = self._refilled(tokens, now - updated_at)
+                    wait_for = 0
+                    if tokens >= 1:
+                        tokens -= 1
+                    else:
+                        wait_for = self._wait_time(tokens)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps({'tokens': tokens, 'updated_at': now}))
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        return wait_for
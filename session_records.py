@@ -0,0 +1,155 @@
+"""
+세션에 저장하는 압축된 레코드
+
+검색 결과는 네이버 원본 JSON, 제목 리스트, 설명 리스트(레거시 /search는 results까지)로
+같은 내용을 여러 번 저장하던 것을 SearchRecord 하나에 열(column) 단위로 한 번만 저장합니다.
+블로그 글 본문은 ArticleRecord에 zlib으로 압축해 저장합니다.
+각 레코드는 기존 라우트가 쓰던 형태(titles, descriptions, results, blog_content dict)를 뷰로 제공합니다.
+저장소에는 to_state()가 반환하는 JSON 호환 dict로 기록하고 from_state()로 되살립니다 (session_store 참고).
+"""
+
+import base64
+import sys
+import zlib
+
+# 이 길이 이상인 본문만 압축
+COMPRESS_MIN_CHARS = 1024
+COMPRESS_LEVEL = 6
+
+
+def _intern_all(values):
+    return tuple(sys.intern(value) for value in values)
+
+
+class SearchRecord:
+    """검색 결과 한 건을 열 단위로 저장하는 레코드
+
+    반복이 많은 값(작성일, 블로거 이름)은 intern해서 같은 문자열을 공유합니다.
+    """
+
+    RECORD_TYPE = 'search'
+
+    __slots__ = ('keyword', 'total', 'item_titles', 'item_descriptions', 'links', 'postdates', 'bloggernames')
+
+    def __init__(self, keyword, total, item_titles, item_descriptions, links, postdates, bloggernames):
+        self.keyword = keyword
+        self.total = total
+        self.item_titles = tuple(item_titles)
+        self.item_descriptions = tuple(item_descriptions)
+        self.links = tuple(links)
+        self.postdates = _intern_all(postdates)
+        self.bloggernames = _intern_all(bloggernames)
+
+    @classmethod
+    def from_naver(cls, keyword, search_result, clean_html):
+        """네이버 블로그 검색 응답에서 필요한 열만 뽑아 생성 (HTML 태그는 한 번만 정리)"""
+        items = (search_result or {}).get('items', [])
+        return cls(
+            keyword,
+            (search_result or {}).get('total', 0),
+            [clean_html(item.get('title', '')) for item in items],
+            [clean_html(item.get('description', '')) for item in items],
+            [item.get('link', '') for item in items],
+            [item.get('postdate', '') for item in items],
+            [item.get('bloggername', '') for item in items]
+        )
+
+    def __len__(self):
+        return len(self.item_titles)
+
+    @property
+    def titles(self):
+        """제목이 있는 항목의 제목 리스트 (/api/search, /api/analyze 용)"""
+        return [title for title in self.item_titles if title]
+
+    @property
+    def descriptions(self):
+        """titles와 같은 순서의 설명 리스트"""
+        return [description for title, description in zip(self.item_titles, self.item_descriptions) if title]
+
+    def results(self):
+        """레거시 /search 응답 형식의 항목 리스트"""
+        return [
+            {'title': title, 'description': description, 'link': link, 'postdate': postdate}
+            for title, description, link, postdate in zip(self.item_titles, self.item_descriptions, self.links, self.postdates)
+        ]
+
+    def to_state(self):
+        """저장소에 기록할 JSON 호환 dict"""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(**{slot: state[slot] for slot in cls.__slots__})
+
+
+class ArticleRecord:
+    """생성된 블로그 글 (본문은 길면 zlib 압축)
+
+    기존 blog_content dict처럼 record['title'], record.get('content')로 읽을 수 있습니다.
+    """
+
+    RECORD_TYPE = 'article'
+
+    __slots__ = ('title', '_content', 'prompt_type', 'additional_prompt', 'min_chars', 'max_chars', 'image_prompts')
+
+    _KEYS = ('title', 'content', 'prompt_type', 'additional_prompt', 'min_chars', 'max_chars', 'image_prompts')
+
+    def __init__(self, title, content, prompt_type=None, additional_prompt='', min_chars=None, max_chars=None, image_prompts=None):
+        self.title = title
+        self.content = content
+        self.prompt_type = prompt_type
+        self.additional_prompt = additional_prompt
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.image_prompts = image_prompts
+
+    @property
+    def content(self):
+        if isinstance(self._content, bytes):
+            return zlib.decompress(self._content).decode('utf-8')
+        return self._content
+
+    @content.setter
+    def content(self, value):
+        value = value or ''
+        if len(value) >= COMPRESS_MIN_CHARS:
+            self._content = zlib.compress(value.encode('utf-8'), COMPRESS_LEVEL)
+        else:
+            self._content = value
+
+    def __getitem__(self, key):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self._KEYS
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in self._KEYS else None
+        return default if value is None else value
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self._KEYS}
+
+    def to_state(self):
+        """저장소에 기록할 JSON 호환 dict (압축된 본문은 다시 풀지 않고 base64로 기록)"""
+        state = {key: getattr(self, key) for key in self._KEYS if key != 'content'}
+        if isinstance(self._content, bytes):
+            state['content_zlib'] = base64.b64encode(self._content).decode('ascii')
+        else:
+            state['content'] = self._content
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        record = cls.__new__(cls)
+        for key in cls._KEYS:
+            if key != 'content':
+                setattr(record, key, state.get(key))
+        if 'content_zlib' in state:
+            record._content = base64.b64decode(state['content_zlib'])
+        else:
+            record._content = state.get('content') or ''
+        return record
@@ -0,0 +1,795 @@
+"""
+세션 상태 저장소 (gunicorn 워커 간 공유)
+
+검색 → 분석 → 제목 → 본문 → 이미지 단계의 중간 결과를 세션 ID별로 저장합니다.
+프로세스별 dict 대신 워커들이 함께 보는 저장소를 사용하므로, 요청이 어느 워커로 가도
+같은 세션을 찾을 수 있습니다.
+
+- sqlite (기본): WAL 모드 SQLite 파일, 필드별 행으로 저장
+- redis: Redis 프로토콜(RESP) 서버 (Redis 또는 호환 서버)
+- memory: 프로세스 내 dict (단일 프로세스 개발/테스트용)
+
+값은 JSON으로 직렬화합니다 (세션 레코드는 to_state/from_state, datetime은 ISO 문자열).
+pickle과 달리 저장소에 값을 쓸 수 있어도 워커에서 코드를 실행시킬 수 없습니다.
+필드 단위 갱신(update)은 원자적으로 처리되며, 없거나 만료된 세션은 되살리지 않고 False를 반환합니다.
+expect를 주면 현재 값이 일치할 때만 쓰는 비교 후 갱신으로 동작합니다 (작업 큐의 작업 가져가기 등).
+세션마다 직렬화된 크기를 기록하고, 마지막 사용 후 SESSION_TTL이 지난 세션은 만료시키며,
+전체 크기가 SESSION_STORE_MAX_BYTES를 넘으면 가장 오래 사용하지 않은 세션부터 지웁니다(LRU).
+정리는 백그라운드 스위퍼 스레드가 SESSION_SWEEP_INTERVAL마다 수행합니다.
+
+    SESSION_STORE_BACKEND=sqlite | redis | memory
+    SESSION_STORE_PATH=/app/var/sessions.db
+    SESSION_STORE_URL=redis://:password@localhost:6379/0
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from datetime import datetime
+
+from session_records import SearchRecord, ArticleRecord
+
+SESSION_STORE_BACKEND = os.environ.get('SESSION_STORE_BACKEND', 'sqlite').lower()
+SESSION_STORE_PATH = os.environ.get(
+    'SESSION_STORE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'var', 'sessions.db')
+)
+SESSION_STORE_URL = os.environ.get('SESSION_STORE_URL', 'redis://localhost:6379/0')
+SESSION_KEY_PREFIX = 'blog:'
+# 마지막 사용 후 세션 보관 시간 (초, 기본 6시간)
+SESSION_TTL = int(os.environ.get('SESSION_TTL', str(6 * 3600)))
+# 전체 세션 최대 크기 (바이트, 기본 256MB)
+SESSION_STORE_MAX_BYTES = int(os.environ.get('SESSION_STORE_MAX_BYTES', str(256 * 1024 ** 2)))
+# 스위퍼 실행 간격 (초)
+SESSION_SWEEP_INTERVAL = int(os.environ.get('SESSION_SWEEP_INTERVAL', '60'))
+# 조회 시 마지막 사용 시각을 갱신하는 최소 간격 (초) - 읽을 때마다 쓰지 않도록
+TOUCH_INTERVAL = 30
+# Redis 갱신이 다른 클라이언트의 쓰기와 겹쳐 취소됐을 때 다시 시도하는 최대 횟수
+REDIS_UPDATE_RETRIES = 10
+
+logger = logging.getLogger(__name__)
+
+
+# 저장소에 기록할 수 있는 레코드 타입 (RECORD_TYPE → 클래스)
+RECORD_TYPES = {record.RECORD_TYPE: record for record in (SearchRecord, ArticleRecord)}
+
+
+class SessionExpired(Exception):
+    """갱신하려는 세션이 없거나 만료됨"""
+
+
+def _encode_object(value):
+    if isinstance(value, tuple(RECORD_TYPES.values())):
+        return {'__record__': value.RECORD_TYPE, 'state': value.to_state()}
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"세션에 저장할 수 없는 값입니다: {type(value).__name__}")
+
+
+def _decode_object(obj):
+    if '__record__' in obj:
+        record = RECORD_TYPES.get(obj['__record__'])
+        if record is None:
+            raise ValueError(f"알 수 없는 레코드 타입: {obj['__record__']}")
+        return record.from_state(obj['state'])
+    if '__datetime__' in obj:
+        return datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+
+def _dumps(value):
+    return json.dumps(value, default=_encode_object, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(data):
+    """저장된 값 복원 (JSON이 아니면 - 예: 이전 버전의 pickle - ValueError)"""
+    return json.loads(data, object_hook=_decode_object)
+
+
+class SessionStore:
+    """세션 저장소 공통 인터페이스
+
+    get()이 반환하는 dict는 복사본이므로, 바꾼 내용은 update()로 다시 저장해야 합니다.
+    """
+
+    backend = 'base'
+
+    def __init__(self, ttl=SESSION_TTL, max_bytes=SESSION_STORE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.expired_total = 0
+        self.evicted_total = 0
+        self._sweeper = None
+        self._stop_sweeper = threading.Event()
+        self._sweep_lock = threading.Lock()
+
+    def create(self, session_id, fields):
+        """세션을 새로 만들고 필드 전체를 저장 (같은 ID가 있으면 덮어씀)"""
+        raise NotImplementedError
+
+    def get(self, session_id, fields=None, touch=True):
+        """세션 필드 dict 반환 (fields를 주면 해당 필드만, 세션이 없으면 None)
+
+        touch=False면 마지막 사용 시각을 갱신하지 않습니다 (작업 큐의 대기열 확인처럼 주기적으로 읽기만 하는
+        경우, 읽기 때문에 만료가 계속 미뤄지지 않도록).
+        """
+        raise NotImplementedError
+
+    def update(self, session_id, fields, expect=None):
+        """필드 여러 개를 한 번에 원자적으로 갱신
+
+        세션이 없거나 만료됐으면 일부 필드만 있는 세션을 새로 만들지 않고 아무것도 쓰지 않은 채 False를 반환합니다.
+        expect({필드: 값})를 주면 같은 원자적 갱신 안에서 현재 값이 모두 일치할 때만 쓰고, 아니면 False를 반환합니다
+        (없는 필드는 None과 일치).
+        """
+        raise NotImplementedError
+
+    def delete(self, session_id):
+        raise NotImplementedError
+
+    def session_ids(self):
+        raise NotImplementedError
+
+    def session_meta(self):
+        """세션별 {'session_id', 'accessed_at', 'size_bytes'} 리스트"""
+        raise NotImplementedError
+
+    def field_sizes(self, session_id):
+        """세션의 필드별 직렬화 크기 (바이트)"""
+        raise NotImplementedError
+
+    def delete_many(self, session_ids):
+        for session_id in session_ids:
+            self.delete(session_id)
+
+    def exists(self, session_id):
+        return bool(session_id) and self.get(session_id, fields=()) is not None
+
+    def get_field(self, session_id, field, default=None):
+        data = self.get(session_id, fields=(field,))
+        if data is None:
+            return default
+        return data.get(field, default)
+
+    def set_field(self, session_id, field, value):
+        return self.update(session_id, {field: value})
+
+    @staticmethod
+    def _matches(current, expect):
+        """current(필드 → 직렬화된 값, 없으면 None)가 expect의 값과 모두 같은지 확인"""
+        return all(
+            (_loads(current[field]) if current.get(field) is not None else None) == value
+            for field, value in expect.items()
+        )
+
+    def _decode(self, session_id, pairs):
+        """(필드, 직렬화된 값) 쌍을 dict로 복원 - 읽을 수 없는 값이 있으면 세션을 지우고 None"""
+        try:
+            return {field: _loads(data) for field, data in pairs}
+        except ValueError as e:
+            logger.warning("⚠️ 읽을 수 없는 세션 값이 있어 세션을 삭제합니다 (이전 저장 형식): %s", e)
+            self.delete(session_id)
+            return None
+
+    def items(self, fields=None, touch=True):
+        """(session_id, 필드 dict) 순회"""
+        for session_id in self.session_ids():
+            data = self.get(session_id, fields=fields, touch=touch)
+            if data is not None:
+                yield session_id, data
+
+    def _is_expired(self, accessed_at, now):
+        return bool(self.ttl) and now - accessed_at > self.ttl
+
+    def sweep(self, now=None):
+        """만료된 세션을 지우고, 전체 크기가 한도를 넘으면 오래 사용하지 않은 세션부터 삭제"""
+        now = now or time.time()
+        with self._sweep_lock:
+            meta = self.session_meta()
+            expired = [item['session_id'] for item in meta if self._is_expired(item['accessed_at'], now)]
+            live = sorted(
+                (item for item in meta if not self._is_expired(item['accessed_at'], now)),
+                key=lambda item: item['accessed_at']
+            )
+            total_bytes = sum(item['size_bytes'] for item in live)
+            evicted = []
+            for item in live:
+                if not self.max_bytes or total_bytes <= self.max_bytes:
+                    break
+                evicted.append(item['session_id'])
+                total_bytes -= item['size_bytes']
+
+            if expired or evicted:
+                self.delete_many(expired + evicted)
+                self.expired_total += len(expired)
+                self.evicted_total += len(evicted)
+                logger.info("🧹 세션 정리: 만료 %d개, 용량 초과 삭제 %d개, 남은 크기 %.1fMB",
+                            len(expired), len(evicted), total_bytes / 1024 / 1024)
+            return {'expired': len(expired), 'evicted': len(evicted), 'total_bytes': total_bytes}
+
+    def start_sweeper(self, interval=SESSION_SWEEP_INTERVAL):
+        """백그라운드 정리 스레드 시작 (프로세스당 한 번)"""
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+
+        def run():
+            while not self._stop_sweeper.wait(interval):
+                try:
+                    self.sweep()
+                except Exception as e:
+                    logger.error("세션 정리 오류: %s", e)
+
+        self._sweeper = threading.Thread(target=run, name='session-sweeper', daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        self._stop_sweeper.set()
+
+    def stats(self, top=5):
+        """세션 수 / 전체·평균 크기 / 가장 큰 세션의 필드별 크기 등 용량 산정용 통계"""
+        meta = self.session_meta()
+        total_bytes = sum(item['size_bytes'] for item in meta)
+        largest = sorted(meta, key=lambda item: item['size_bytes'], reverse=True)[:top]
+        return {
+            'backend': self.backend,
+            'sessions': len(meta),
+            'total_bytes': total_bytes,
+            'avg_bytes': int(total_bytes / len(meta)) if meta else 0,
+            'max_bytes': self.max_bytes,
+            'ttl_seconds': self.ttl,
+            'expired_total': self.expired_total,
+            'evicted_total': self.evicted_total,
+            'largest': [
+                {
+                    'session_id': item['session_id'],
+                    'size_bytes': item['size_bytes'],
+                    'idle_seconds': round(time.time() - item['accessed_at'], 1),
+                    'fields': self.field_sizes(item['session_id'])
+                }
+                for item in largest
+            ]
+        }
+
+
+class MemorySessionStore(SessionStore):
+    """프로세스 내 저장소 (직렬화된 바이트로 보관해 다른 백엔드와 동작을 맞춤)
+
+    쓰기 시점에 바로 전체 크기 한도를 지키도록 LRU 순서(OrderedDict)를 유지합니다.
+    """
+
+    backend = 'memory'
+
+    def __init__(self, ttl=SESSION_TTL, max_bytes=SESSION_STORE_MAX_BYTES):
+        super().__init__(ttl, max_bytes)
+        self._sessions = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def _store_locked(self, session_id, encoded, replace):
+        entry = self._sessions.get(session_id)
+        if entry is None or replace:
+            if entry is not None:
+                self._total_bytes -= entry['size']
+            entry = {'fields': {}, 'size': 0, 'accessed_at': 0.0}
+            self._sessions[session_id] = entry
+        for field, data in encoded.items():
+            previous = entry['fields'].get(field)
+            entry['size'] += len(data) - (len(previous) if previous is not None else 0)
+            self._total_bytes += len(data) - (len(previous) if previous is not None else 0)
+            entry['fields'][field] = data
+        entry['accessed_at'] = time.time()
+        self._sessions.move_to_end(session_id)
+
+        # 한도를 넘으면 가장 오래 사용하지 않은 세션부터 삭제 (방금 쓴 세션은 제외)
+        while self.max_bytes and self._total_bytes > self.max_bytes and len(self._sessions) > 1:
+            oldest_id, oldest = next(iter(self._sessions.items()))
+            if oldest_id == session_id:
+                break
+            del self._sessions[oldest_id]
+            self._total_bytes -= oldest['size']
+            self.evicted_total += 1
+
+    def create(self, session_id, fields):
+        encoded = {field: _dumps(value) for field, value in fields.items()}
+        with self._lock:
+            self._store_locked(session_id, encoded, replace=True)
+
+    def get(self, session_id, fields=None, touch=True):
+        now = time.time()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if self._is_expired(entry['accessed_at'], now):
+                del self._sessions[session_id]
+                self._total_bytes -= entry['size']
+                self.expired_total += 1
+                return None
+            if touch:
+                entry['accessed_at'] = now
+                self._sessions.move_to_end(session_id)
+            encoded = entry['fields']
+            if fields is not None:
+                encoded = {field: encoded[field] for field in fields if field in encoded}
+            else:
+                encoded = dict(encoded)
+        return self._decode(session_id, encoded.items())
+
+    def update(self, session_id, fields, expect=None):
+        encoded = {field: _dumps(value) for field, value in fields.items()}
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None or self._is_expired(entry['accessed_at'], time.time()):
+                return False
+            if expect and not self._matches(entry['fields'], expect):
+                return False
+            self._store_locked(session_id, encoded, replace=False)
+        return True
+
+    def delete(self, session_id):
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is not None:
+                self._total_bytes -= entry['size']
+
+    def session_ids(self):
+        with self._lock:
+            return list(self._sessions)
+
+    def session_meta(self):
+        with self._lock:
+            return [
+                {'session_id': session_id, 'accessed_at': entry['accessed_at'], 'size_bytes': entry['size']}
+                for session_id, entry in self._sessions.items()
+            ]
+
+    def field_sizes(self, session_id):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            return {field: len(data) for field, data in entry['fields'].items()} if entry else {}
+
+
+class SQLiteSessionStore(SessionStore):
+    """WAL 모드 SQLite 저장소 (같은 호스트의 여러 워커 프로세스가 공유)"""
+
+    backend = 'sqlite'
+
+    def __init__(self, path=SESSION_STORE_PATH, ttl=SESSION_TTL, max_bytes=SESSION_STORE_MAX_BYTES):
+        super().__init__(ttl, max_bytes)
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS sessions ('
+                'session_id TEXT PRIMARY KEY, created_at REAL NOT NULL, updated_at REAL NOT NULL)'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS session_fields ('
+                'session_id TEXT NOT NULL, field TEXT NOT NULL, value BLOB NOT NULL, '
+                'PRIMARY KEY (session_id, field)) WITHOUT ROWID'
+            )
+            # 크기/사용 시각 컬럼 (이전 버전 DB에는 없으므로 필요하면 추가)
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(sessions)')}
+            if 'accessed_at' not in columns:
+                conn.execute('ALTER TABLE sessions ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0')
+            if 'size_bytes' not in columns:
+                conn.execute('ALTER TABLE sessions ADD COLUMN size_bytes INTEGER NOT NULL DEFAULT 0')
+            conn.execute('CREATE INDEX IF NOT EXISTS sessions_accessed_at ON sessions (accessed_at)')
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _conn(self):
+        """스레드별 연결 (fork된 워커에서는 새로 연결)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _write(self, statements, require_session=None, expect=None):
+        """문장들을 한 트랜잭션으로 실행
+
+        require_session을 주면 같은 트랜잭션 안에서 그 세션이 있고 만료되지 않았는지(expect를 주면 필드 값도
+        일치하는지) 먼저 확인해, 아니면 아무것도 쓰지 않고 False를 반환합니다.
+        """
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if require_session is not None:
+                row = conn.execute(
+                    'SELECT accessed_at FROM sessions WHERE session_id = ?', (require_session,)
+                ).fetchone()
+                if row is None or self._is_expired(row[0], time.time()):
+                    conn.execute('ROLLBACK')
+                    return False
+                if expect:
+                    placeholders = ', '.join('?' * len(expect))
+                    current = dict(conn.execute(
+                        f'SELECT field, value FROM session_fields WHERE session_id = ? AND field IN ({placeholders})',
+                        [require_session] + list(expect)
+                    ))
+                    if not self._matches(current, expect):
+                        conn.execute('ROLLBACK')
+                        return False
+            for sql, params in statements:
+                if isinstance(params, list):
+                    if params:
+                        conn.executemany(sql, params)
+                else:
+                    conn.execute(sql, params)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return True
+
+    def create(self, session_id, fields):
+        now = time.time()
+        rows = [(session_id, field, _dumps(value)) for field, value in fields.items()]
+        size = sum(len(row[2]) for row in rows)
+        self._write([
+            ('DELETE FROM session_fields WHERE session_id = ?', (session_id,)),
+            ('INSERT OR REPLACE INTO sessions (session_id, created_at, updated_at, accessed_at, size_bytes) '
+             'VALUES (?, ?, ?, ?, ?)',
+             (session_id, now, now, now, size)),
+            ('INSERT INTO session_fields (session_id, field, value) VALUES (?, ?, ?)', rows),
+        ])
+
+    def get(self, session_id, fields=None, touch=True):
+        conn = self._conn()
+        row = conn.execute('SELECT accessed_at FROM sessions WHERE session_id = ?', (session_id,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if self._is_expired(row[0], now):
+            self.delete(session_id)
+            self.expired_total += 1
+            return None
+        if touch and now - row[0] > TOUCH_INTERVAL:
+            conn.execute('UPDATE sessions SET accessed_at = ? WHERE session_id = ?', (now, session_id))
+
+        if fields is None:
+            rows = conn.execute(
+                'SELECT field, value FROM session_fields WHERE session_id = ?', (session_id,)
+            ).fetchall()
+        elif fields:
+            fields = list(fields)
+            placeholders = ', '.join('?' * len(fields))
+            rows = conn.execute(
+                f'SELECT field, value FROM session_fields WHERE session_id = ? AND field IN ({placeholders})',
+                [session_id] + fields
+            ).fetchall()
+        else:
+            rows = []
+        return self._decode(session_id, rows)
+
+    def update(self, session_id, fields, expect=None):
+        now = time.time()
+        return self._write([
+            ('UPDATE sessions SET updated_at = ?, accessed_at = ? WHERE session_id = ?',
+             (now, now, session_id)),
+            ('INSERT OR REPLACE INTO session_fields (session_id, field, value) VALUES (?, ?, ?)',
+             [(session_id, field, _dumps(value)) for field, value in fields.items()]),
+            ('UPDATE sessions SET size_bytes = '
+             '(SELECT COALESCE(SUM(LENGTH(value)), 0) FROM session_fields WHERE session_id = ?) '
+             'WHERE session_id = ?',
+             (session_id, session_id)),
+        ], require_session=session_id, expect=expect)
+
+    def delete(self, session_id):
+        self.delete_many([session_id])
+
+    def delete_many(self, session_ids):
+        rows = [(session_id,) for session_id in session_ids]
+        if not rows:
+            return
+        self._write([
+            ('DELETE FROM session_fields WHERE session_id = ?', rows),
+            ('DELETE FROM sessions WHERE session_id = ?', rows),
+        ])
+
+    def session_ids(self):
+        return [row[0] for row in self._conn().execute('SELECT session_id FROM sessions')]
+
+    def session_meta(self):
+        return [
+            {'session_id': session_id, 'accessed_at': accessed_at, 'size_bytes': size_bytes}
+            for session_id, accessed_at, size_bytes in self._conn().execute(
+                'SELECT session_id, accessed_at, size_bytes FROM sessions'
+            )
+        ]
+
+    def field_sizes(self, session_id):
+        return dict(self._conn().execute(
+            'SELECT field, LENGTH(value) FROM session_fields WHERE session_id = ?', (session_id,)
+        ))
+
+
+class RespError(Exception):
+    """Redis 서버가 반환한 오류 응답"""
+
+
+class RespClient:
+    """Redis 프로토콜(RESP2) 최소 클라이언트 (스레드별 연결)"""
+
+    def __init__(self, url=SESSION_STORE_URL, timeout=5):
+        parsed = urllib.parse.urlparse(url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.password = urllib.parse.unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn = (sock, sock.makefile('rb'))
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            if self.password:
+                self._roundtrip(conn, [('AUTH', self.password)])
+            if self.db:
+                self._roundtrip(conn, [('SELECT', self.db)])
+        return conn
+
+    def _close(self):
+        conn = getattr(self._local, 'conn', None)
+        self._local.conn = None
+        if conn:
+            try:
+                conn[1].close()
+                conn[0].close()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _encode(args):
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            if isinstance(arg, bytes):
+                data = arg
+            else:
+                data = str(arg).encode('utf-8')
+            parts.append(b'$%d\r\n%s\r\n' % (len(data), data))
+        return b''.join(parts)
+
+    def _read_reply(self, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError('Redis 연결이 끊어졌습니다.')
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b'+':
+            return payload.decode('utf-8')
+        if prefix == b'-':
+            return RespError(payload.decode('utf-8'))
+        if prefix == b':':
+            return int(payload)
+        if prefix == b'$':
+            length = int(payload)
+            if length == -1:
+                return None
+            data = reader.read(length + 2)
+            return data[:-2]
+        if prefix == b'*':
+            count = int(payload)
+            if count == -1:
+                return None
+            return [self._read_reply(reader) for _ in range(count)]
+        raise ConnectionError(f'알 수 없는 Redis 응답: {line!r}')
+
+    def _roundtrip(self, conn, commands):
+        sock, reader = conn
+        sock.sendall(b''.join(self._encode(args) for args in commands))
+        replies = [self._read_reply(reader) for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    def pipeline(self, commands, retry=True):
+        """명령 여러 개를 한 번에 보내고 응답 리스트 반환 (연결 오류 시 한 번 재연결)
+
+        retry=False면 재연결 후 다시 보내지 않습니다 (WATCH처럼 끊어진 연결에 묶여 있던 상태에 의존하는 명령).
+        """
+        for attempt in range(2):
+            try:
+                return self._roundtrip(self._connection(), commands)
+            except (ConnectionError, OSError):
+                self._close()
+                if attempt or not retry:
+                    raise
+
+    def execute(self, *args):
+        return self.pipeline([args])[0]
+
+
+class RedisSessionStore(SessionStore):
+    """Redis 해시 기반 저장소 (세션 = 해시 1개, 필드 = 해시 필드)
+
+    만료는 키 TTL(EXPIRE)로 처리하고, 필드별 크기는 별도 해시에, 마지막 사용 시각은
+    정렬 집합(ZSET)에 기록해 용량 한도 초과 시 LRU 순서로 지웁니다.
+    create()가 기록하는 _created_at 필드가 있는 해시만 세션으로 봅니다. update()는 WATCH로 세션 키를 지켜본
+    상태에서 확인하고 MULTI/EXEC로 값과 크기를 함께 기록하며, 그 사이 다른 클라이언트가 키를 바꾸면 다시 시도합니다.
+    """
+
+    backend = 'redis'
+
+    def __init__(self, url=SESSION_STORE_URL, prefix=SESSION_KEY_PREFIX, ttl=SESSION_TTL, max_bytes=SESSION_STORE_MAX_BYTES):
+        super().__init__(ttl, max_bytes)
+        self.client = RespClient(url)
+        self.prefix = prefix
+        self.index_key = f'{prefix}sessions'
+        self.accessed_key = f'{prefix}accessed'
+
+    def _key(self, session_id):
+        return f'{self.prefix}session:{session_id}'
+
+    def _sizes_key(self, session_id):
+        return f'{self.prefix}sizes:{session_id}'
+
+    def _write_commands(self, session_id, encoded):
+        key = self._key(session_id)
+        sizes_key = self._sizes_key(session_id)
+        commands = []
+        if encoded:
+            values = []
+            sizes = []
+            for field, data in encoded.items():
+                values.extend((field, data))
+                sizes.extend((field, len(data)))
+            commands.append(('HSET', key, *values))
+            commands.append(('HSET', sizes_key, *sizes))
+        commands.extend(self._touch_commands(session_id))
+        commands.append(('SADD', self.index_key, session_id))
+        return commands
+
+    def _touch_commands(self, session_id):
+        commands = [('ZADD', self.accessed_key, time.time(), session_id)]
+        if self.ttl:
+            commands.append(('EXPIRE', self._key(session_id), self.ttl))
+            commands.append(('EXPIRE', self._sizes_key(session_id), self.ttl))
+        return commands
+
+    def create(self, session_id, fields):
+        key = self._key(session_id)
+        encoded = {field: _dumps(value) for field, value in fields.items()}
+        # 빈 세션도 존재를 표시할 수 있도록 내부 필드 하나를 항상 기록
+        commands = [('MULTI',), ('DEL', key, self._sizes_key(session_id)),
+                    ('HSET', key, '_created_at', _dumps(time.time()))]
+        commands.extend(self._write_commands(session_id, encoded))
+        commands.append(('EXEC',))
+        self.client.pipeline(commands)
+
+    def get(self, session_id, fields=None, touch=True):
+        key = self._key(session_id)
+        if fields is None:
+            read = ('HGETALL', key)
+        else:
+            fields = list(fields)
+            read = ('HMGET', key, *fields) if fields else ('HLEN', key)
+        exists, values = self.client.pipeline([('HEXISTS', key, '_created_at'), read])
+        if not exists:
+            return None
+        # 사용할 때마다 TTL을 연장 (마지막 사용 기준 만료)
+        if touch:
+            self.client.pipeline(self._touch_commands(session_id))
+
+        if fields is None:
+            pairs = zip(values[::2], values[1::2])
+            return self._decode(session_id, ((field.decode('utf-8'), value) for field, value in pairs if field != b'_created_at'))
+        if not fields:
+            return {}
+        return self._decode(session_id, ((field, value) for field, value in zip(fields, values) if value is not None))
+
+    def update(self, session_id, fields, expect=None):
+        key = self._key(session_id)
+        encoded = {field: _dumps(value) for field, value in fields.items()}
+        expect_fields = list(expect or ())
+        for _ in range(REDIS_UPDATE_RETRIES):
+            # WATCH로 확인한 뒤 다른 클라이언트가 키를 바꾸거나 지우면(만료 포함) EXEC가 취소되므로(None 응답)
+            # 세션 확인부터 다시 시도 - 값과 크기 기록이 다른 쓰기와 섞이거나 지워진 세션이 되살아나지 않음
+            checks = [('WATCH', key), ('HEXISTS', key, '_created_at')]
+            if expect_fields:
+                checks.append(('HMGET', key, *expect_fields))
+            replies = self.client.pipeline(checks)
+            if not replies[1] or (expect_fields and not self._matches(dict(zip(expect_fields, replies[2])), expect)):
+                self.client.execute('UNWATCH')
+                return False
+            if not encoded:
+                self.client.execute('UNWATCH')
+                return True
+            replies = self.client.pipeline(
+                [('MULTI',), *self._write_commands(session_id, encoded), ('EXEC',)], retry=False
+            )
+            if replies[-1] is not None:
+                return True
+        raise RespError(f"다른 쓰기와 계속 겹쳐 세션을 갱신하지 못했습니다 ({REDIS_UPDATE_RETRIES}회 시도)")
+
+    def delete(self, session_id):
+        self.delete_many([session_id])
+
+    def delete_many(self, session_ids):
+        commands = []
+        for session_id in session_ids:
+            commands.append(('DEL', self._key(session_id), self._sizes_key(session_id)))
+            commands.append(('SREM', self.index_key, session_id))
+            commands.append(('ZREM', self.accessed_key, session_id))
+        if commands:
+            self.client.pipeline(commands)
+
+    def session_ids(self):
+        return [member.decode('utf-8') for member in self.client.execute('SMEMBERS', self.index_key) or []]
+
+    def session_meta(self):
+        raw = self.client.execute('ZRANGE', self.accessed_key, 0, -1, 'WITHSCORES') or []
+        accessed = [(member.decode('utf-8'), float(score)) for member, score in zip(raw[::2], raw[1::2])]
+        if not accessed:
+            return []
+        commands = []
+        for session_id, _ in accessed:
+            commands.append(('HEXISTS', self._key(session_id), '_created_at'))
+            commands.append(('HVALS', self._sizes_key(session_id)))
+        replies = self.client.pipeline(commands)
+
+        meta = []
+        missing = []
+        for i, (session_id, accessed_at) in enumerate(accessed):
+            exists, sizes = replies[2 * i], replies[2 * i + 1]
+            if not exists:
+                missing.append(session_id)
+                continue
+            meta.append({
+                'session_id': session_id,
+                'accessed_at': accessed_at,
+                'size_bytes': sum(int(size) for size in sizes or [])
+            })
+        # Redis TTL로 이미 사라진 세션은 색인에서도 정리
+        if missing:
+            self.delete_many(missing)
+            self.expired_total += len(missing)
+        return meta
+
+    def field_sizes(self, session_id):
+        raw = self.client.execute('HGETALL', self._sizes_key(session_id)) or []
+        return {field.decode('utf-8'): int(size) for field, size in zip(raw[::2], raw[1::2])}
+
+
+def create_session_store(backend=None, namespace=None, ttl=None):
+    """환경변수 설정에 맞는 세션 저장소 생성
+
+    namespace를 주면(예: 'jobs') 세션과 같은 백엔드를 쓰되 별도 파일/키 공간에 저장합니다.
+    ttl을 주면 SESSION_TTL 대신 그 보관 시간(초)을 사용합니다.
+    """
+    backend = (backend or SESSION_STORE_BACKEND).lower()
+    ttl = SESSION_TTL if ttl is None else ttl
+    if backend == 'memory':
+        return MemorySessionStore(ttl=ttl)
+    if backend == 'redis':
+        prefix = f"{SESSION_KEY_PREFIX}{namespace}:" if namespace else SESSION_KEY_PREFIX
+        return RedisSessionStore(SESSION_STORE_URL, prefix=prefix, ttl=ttl)
+    path = SESSION_STORE_PATH
+    if namespace:
+        path = os.path.join(os.path.dirname(path), f"{namespace}.db")
+    return SQLiteSessionStore(path, ttl=ttl)
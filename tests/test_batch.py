@@ -0,0 +1,111 @@
+"""batch: 키워드 목록 정리, 항목별 진행 상황, 한 항목의 실패가 나머지를 멈추지 않는지, /api/batch 입력 제한"""
+
+import contextvars
+import threading
+
+import pytest
+
+from batch import BATCH_MAX_KEYWORDS, BatchProgress, folder_name, parse_keywords, run_batch
+
+request_id = contextvars.ContextVar('request_id', default=None)
+
+
+def test_parse_keywords_splits_strips_and_deduplicates_in_order():
+    assert parse_keywords('캠핑\n 등산 ,캠핑,\n\n낚시') == ['캠핑', '등산', '낚시']
+    assert parse_keywords(['캠핑', ' 캠핑 ', '', 3]) == ['캠핑', '3']
+    assert parse_keywords(None) == []
+    assert parse_keywords(' , \n') == []
+
+
+def test_folder_name_is_numbered_and_safe():
+    assert folder_name(0, '캠핑 준비물') == '01_캠핑 준비물'
+    assert folder_name(11, '../etc/passwd') == '12_etcpasswd'
+    assert folder_name(2, '///') == '03_keyword'
+
+
+def test_failed_item_does_not_stop_others():
+    def process(index, keyword, progress):
+        if keyword == 'bad':
+            raise RuntimeError('검색 실패')
+        progress.update(index, stage='search')
+        return {'title': f'{keyword} 제목'}
+
+    summary = run_batch(['a', 'bad', 'c'], process, parallelism=2)
+
+    assert summary['total'] == 3
+    assert summary['completed'] == 2
+    assert summary['failed'] == 1
+    assert summary['running'] == 0
+    assert [item['status'] for item in summary['items']] == ['done', 'failed', 'done']
+    assert summary['items'][1]['error'] == '검색 실패'
+    assert summary['items'][0] == {'keyword': 'a', 'status': 'done', 'stage': None, 'title': 'a 제목'}
+
+
+def test_progress_snapshots_count_statuses():
+    snapshots = []
+    progress = BatchProgress(['a', 'b', 'c'], on_change=snapshots.append)
+
+    progress.update(0, status='running')
+    progress.update(1, status='running')
+    progress.update(0, status='done')
+    progress.update(1, status='failed', error='x')
+
+    assert [(s['completed'], s['failed'], s['running']) for s in snapshots] == [
+        (0, 0, 1), (0, 0, 2), (1, 0, 1), (1, 1, 0)
+    ]
+    snapshot = progress.snapshot()
+    assert snapshot['total'] == 3
+    assert [item['status'] for item in snapshot['items']] == ['done', 'failed', 'queued']
+    # 스냅샷은 복사본
+    snapshot['items'][2]['status'] = 'done'
+    assert progress.snapshot()['items'][2]['status'] == 'queued'
+
+
+def test_run_batch_limits_parallelism_and_passes_context():
+    active = []
+    peak = []
+    seen = []
+    lock = threading.Lock()
+
+    def process(index, keyword, progress):
+        with lock:
+            active.append(index)
+            peak.append(len(active))
+        seen.append(request_id.get())
+        threading.Event().wait(0.02)
+        with lock:
+            active.remove(index)
+        return {}
+
+    token = request_id.set('batch-req')
+    try:
+        summary = run_batch([str(i) for i in range(6)], process, parallelism=2)
+    finally:
+        request_id.reset(token)
+
+    assert summary['completed'] == 6
+    assert max(peak) <= 2
+    assert seen == ['batch-req'] * 6
+
+
+@pytest.fixture
+def logged_in_client():
+    pytest.importorskip('flask')
+    import web_app
+
+    client = web_app.app.test_client()
+    with client.session_transaction() as session:
+        session['authenticated'] = True
+    return client
+
+
+@pytest.mark.parametrize('payload,message', [
+    ({'keywords': ' ,\n'}, '키워드를 입력해주세요'),
+    ({'keywords': [f'k{i}' for i in range(BATCH_MAX_KEYWORDS + 1)]}, f'최대 {BATCH_MAX_KEYWORDS}개'),
+    ({'keywords': ['캠핑'], 'num_articles': 'many'}, 'num_articles'),
+])
+def test_api_batch_rejects_invalid_input(logged_in_client, payload, message):
+    response = logged_in_client.post('/api/batch', json=payload)
+
+    assert response.status_code == 400
+    assert message in response.get_json()['error']
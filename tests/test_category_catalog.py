@@ -0,0 +1,124 @@
+"""category_catalog: 미리 만든 응답 본문(gzip/ETag), 파일 변경 시 다시 읽기, 잘못된 파일이면 이전 내용 유지, 304 응답"""
+
+import gzip
+import json
+import os
+
+import pytest
+
+import category_catalog
+from category_catalog import CategoryCatalog
+
+CATEGORIES = {
+    '🏕️ 캠핑': {'keywords': ['캠핑', '텐트'], 'description': '캠핑 용품', 'color': '#2e7d32'},
+    '🍳 요리': {'keywords': ['레시피'], 'description': '간편 요리', 'color': '#ef6c00'},
+}
+
+
+def write_catalog(path, text, mtime):
+    path.write_text(text, encoding='utf-8')
+    # 같은 초 안에 다시 써도 변경으로 보이도록 mtime을 직접 지정
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def catalog_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(category_catalog, 'RELOAD_CHECK_INTERVAL', 0)
+    path = tmp_path / 'categories.json'
+    write_catalog(path, json.dumps({'version': 3, 'categories': CATEGORIES}, ensure_ascii=False), 1_000_000)
+    return path
+
+
+def test_rendered_views_and_gzip(catalog_path):
+    catalog = CategoryCatalog(str(catalog_path))
+
+    categories = catalog.rendered('categories')
+    keywords = catalog.rendered('category_keywords')
+
+    assert json.loads(categories.body) == {'success': True, 'version': 3, 'categories': CATEGORIES}
+    assert json.loads(keywords.body)[0] == {
+        'name': '🏕️ 캠핑', 'icon': '🏕️', 'description': '캠핑 용품', 'keywords': ['캠핑', '텐트']
+    }
+    assert gzip.decompress(categories.gzip_body) == categories.body
+    assert categories.etag.startswith('v3-') and categories.etag != keywords.etag
+    assert catalog.categories() == CATEGORIES
+
+
+def test_etag_is_stable_and_follows_content(catalog_path):
+    etag = CategoryCatalog(str(catalog_path)).rendered('categories').etag
+    assert CategoryCatalog(str(catalog_path)).rendered('categories').etag == etag
+
+    changed = dict(CATEGORIES, **{'✈️ 여행': {'keywords': ['제주도'], 'description': '여행', 'color': '#1565c0'}})
+    write_catalog(catalog_path, json.dumps({'version': 3, 'categories': changed}, ensure_ascii=False), 1_000_100)
+
+    assert CategoryCatalog(str(catalog_path)).rendered('categories').etag != etag
+
+
+def test_changed_file_is_reloaded(catalog_path):
+    catalog = CategoryCatalog(str(catalog_path))
+    updated = {'✈️ 여행': {'keywords': ['제주도'], 'description': '여행', 'color': '#1565c0'}}
+    write_catalog(catalog_path, json.dumps({'version': 4, 'categories': updated}, ensure_ascii=False), 1_000_100)
+
+    assert catalog.categories() == updated
+    assert catalog.version == 4
+    assert catalog.rendered('categories').etag.startswith('v4-')
+
+
+@pytest.mark.parametrize('text', [
+    '{"version": 5, "categories": ',
+    '{"version": 5}',
+    '{"version": 5, "categories": {"깨진": {"keywords": []}}}',
+    '[]',
+])
+def test_bad_reload_keeps_previous_content(catalog_path, text):
+    catalog = CategoryCatalog(str(catalog_path))
+    before = catalog.rendered('categories')
+    write_catalog(catalog_path, text, 1_000_100)
+
+    assert catalog.reload() is False
+    assert catalog.categories() == CATEGORIES
+    assert catalog.rendered('categories') is before
+    assert catalog.version == 3
+
+
+def test_missing_file_leaves_catalog_empty(tmp_path):
+    catalog = CategoryCatalog(str(tmp_path / 'missing.json'))
+
+    assert catalog.categories() == {}
+    assert catalog.version is None
+
+
+@pytest.fixture
+def client(catalog_path, monkeypatch):
+    pytest.importorskip('flask')
+    import web_app
+
+    monkeypatch.setattr(web_app, 'category_catalog', CategoryCatalog(str(catalog_path)))
+    client = web_app.app.test_client()
+    with client.session_transaction() as session:
+        session['authenticated'] = True
+    return client
+
+
+def test_api_returns_gzip_and_not_modified(client):
+    response = client.get('/api/categories', headers={'Accept-Encoding': 'gzip, br'})
+
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert json.loads(gzip.decompress(response.data))['categories'] == CATEGORIES
+    etag = response.headers['ETag']
+
+    cached = client.get('/api/categories', headers={'If-None-Match': etag})
+
+    assert cached.status_code == 304
+    assert cached.data == b''
+    assert cached.headers['ETag'] == etag
+
+
+def test_api_plain_body_and_stale_etag(client):
+    response = client.get('/api/category-keywords', headers={'If-None-Match': '"v1-outdated"'})
+
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+    assert [item['name'] for item in response.get_json()] == list(CATEGORIES)
@@ -0,0 +1,135 @@
+"""datalab: 기준 키워드 정규화, 요청 나누기, 요청별 실패 분리와 날짜별 캐시"""
+
+import threading
+
+import pytest
+
+from datalab import DATALAB_MAX_GROUPS, DataLabClient, chunk_keywords, normalize_to_anchor, rank_series
+from session_store import MemorySessionStore
+
+
+def group(title, *ratios):
+    return {'title': title, 'data': [{'period': f'2026-10-0{i + 1}', 'ratio': ratio} for i, ratio in enumerate(ratios)]}
+
+
+def test_chunk_keywords_leaves_room_for_anchor():
+    keywords = [f'k{i}' for i in range(10)]
+
+    chunks = chunk_keywords(keywords)
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert all(len(chunk) + 1 <= DATALAB_MAX_GROUPS for chunk in chunks)
+    assert sum(chunks, []) == keywords
+    assert chunk_keywords([]) == []
+
+
+def test_normalize_scales_anchor_mean_to_100():
+    results = [group('날씨', 40, 60), group('캠핑', 100, 50)]
+
+    assert normalize_to_anchor(results, '날씨') == {
+        '캠핑': [{'period': '2026-10-01', 'ratio': 200.0}, {'period': '2026-10-02', 'ratio': 100.0}]
+    }
+
+
+def test_normalized_requests_are_comparable():
+    # 두 요청에서 ratio 100은 서로 다른 검색량이지만, 기준 키워드로 맞추면 같은 척도가 됨
+    first = normalize_to_anchor([group('날씨', 50), group('캠핑', 100)], '날씨')
+    second = normalize_to_anchor([group('날씨', 100), group('등산', 100)], '날씨')
+
+    assert first['캠핑'][0]['ratio'] == 200.0
+    assert second['등산'][0]['ratio'] == 100.0
+
+
+@pytest.mark.parametrize('results', [
+    [group('캠핑', 100)],
+    [group('날씨', 0, 0), group('캠핑', 100)],
+])
+def test_normalize_rejects_missing_or_zero_anchor(results):
+    with pytest.raises(ValueError):
+        normalize_to_anchor(results, '날씨')
+
+
+def test_rank_series_by_recent_points():
+    series = {
+        '캠핑': [{'period': p, 'ratio': r} for p, r in zip('abcd', [300, 10, 10, 10])],
+        '등산': [{'period': p, 'ratio': r} for p, r in zip('abcd', [10, 50, 50, 50])],
+        '낚시': [],
+    }
+
+    ranking = rank_series(series)
+
+    assert [(item['rank'], item['keyword'], item['trend_score']) for item in ranking] == [
+        (1, '등산', 50.0), (2, '캠핑', 10.0), (3, '낚시', 0.0)
+    ]
+    assert len(rank_series(series, limit=1)) == 1
+
+
+class ImmediateLimiter:
+    def acquire(self, timeout=None):
+        return True
+
+
+class FakeDataLab(DataLabClient):
+    """HTTP 대신 키워드별 고정 ratio로 응답 (기준 키워드 ratio는 요청마다 다름)"""
+
+    def __init__(self, ratios, failing=(), **kwargs):
+        super().__init__('id', 'secret', limiter=ImmediateLimiter(), **kwargs)
+        self.ratios = ratios
+        self.failing = set(failing)
+        self.chunks = []
+        self._chunks_lock = threading.Lock()
+
+    def _request(self, keywords, start_date, end_date, time_unit):
+        with self._chunks_lock:
+            self.chunks.append(list(keywords))
+        if self.failing & set(keywords):
+            raise Exception('HTTP 500')
+        anchor_ratio = 10 * len(self.chunks)
+        results = [group(self.anchor, anchor_ratio)]
+        results += [group(keyword, self.ratios[keyword] * anchor_ratio / 100) for keyword in keywords]
+        return normalize_to_anchor(results, self.anchor)
+
+
+def test_trends_splits_requests_and_keeps_one_scale():
+    ratios = {f'k{i}': 10 * (i + 1) for i in range(9)}
+    client = FakeDataLab(ratios)
+
+    series, failed = client.trends(list(ratios) + ['k0', '', client.anchor])
+
+    assert failed == []
+    assert sorted(len(chunk) for chunk in client.chunks) == [1, 4, 4]
+    assert {keyword: data[0]['ratio'] for keyword, data in series.items()} == {
+        keyword: float(ratio) for keyword, ratio in ratios.items()
+    }
+
+
+def test_failed_request_only_loses_its_own_keywords():
+    ratios = {f'k{i}': 50 for i in range(8)}
+    client = FakeDataLab(ratios, failing={'k5'})
+
+    series, failed = client.trends(list(ratios))
+
+    assert sorted(failed) == ['k4', 'k5', 'k6', 'k7']
+    assert sorted(series) == ['k0', 'k1', 'k2', 'k3']
+
+
+def test_cached_keywords_are_not_requested_again():
+    store = MemorySessionStore()
+    ratios = {f'k{i}': 50 for i in range(6)}
+    client = FakeDataLab(ratios, store=store)
+
+    client.trends(['k0', 'k1', 'k2'])
+    client.chunks.clear()
+    series, failed = client.trends(['k0', 'k1', 'k2', 'k3', 'k4', 'k5'])
+
+    assert client.chunks == [['k3', 'k4', 'k5']]
+    assert failed == [] and sorted(series) == sorted(ratios)
+
+    client.chunks.clear()
+    assert sorted(client.trends(['k1', 'k4'])[0]) == ['k1', 'k4']
+    assert client.chunks == []
+
+
+def test_trends_requires_api_keys():
+    with pytest.raises(Exception, match='API 키'):
+        DataLabClient('', '', limiter=ImmediateLimiter()).trends(['캠핑'])
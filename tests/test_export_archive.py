@@ -0,0 +1,119 @@
+"""export_archive: 스트리밍 ZIP 기록, 이미지 동시 내려받기"""
+
+import io
+import threading
+import time
+import zipfile
+
+from export_archive import STREAM_CHUNK_SIZE, fetch_concurrently, stream_zip, summary_entries
+
+PNG_BYTES = b'\x89PNG\r\n\x1a\n' + bytes(range(256)) * 600
+
+
+def read_zip(chunks):
+    return zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+
+
+def test_stream_zip_is_readable_and_keeps_compression_per_entry():
+    entries = [
+        ('image_1.png', PNG_BYTES, False),
+        ('article.txt', '캠핑 준비물. '.encode('utf-8') * 1000, True),
+    ]
+
+    archive = read_zip(stream_zip(entries))
+
+    assert archive.testzip() is None
+    assert archive.read('image_1.png') == PNG_BYTES
+    assert archive.read('article.txt') == '캠핑 준비물. '.encode('utf-8') * 1000
+    assert archive.getinfo('image_1.png').compress_type == zipfile.ZIP_STORED
+    assert archive.getinfo('article.txt').compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_stream_zip_yields_while_writing_large_entries():
+    data = b'x' * (STREAM_CHUNK_SIZE * 3)
+    produced = []
+
+    def entries():
+        yield 'first.bin', data, False
+        # 두 번째 항목을 준비하기 전에 첫 항목 바이트가 이미 나왔어야 함
+        produced.append(len(chunks))
+        yield 'second.bin', [b'a' * 10, b'b' * 10], False
+
+    chunks = []
+    for chunk in stream_zip(entries()):
+        chunks.append(chunk)
+
+    assert produced[0] >= 3
+    archive = read_zip(chunks)
+    assert archive.read('first.bin') == data
+    assert archive.read('second.bin') == b'a' * 10 + b'b' * 10
+
+
+def test_empty_stream_zip_is_valid():
+    assert read_zip(stream_zip([])).namelist() == []
+
+
+def test_summary_entries_sort_images_and_failures():
+    entries = summary_entries(
+        '캠핑', 3, ['image_10.png', 'image_2.png'], [{'index': 3, 'error': 'x'}, {'index': 1, 'error': 'y'}],
+        blog_data={'title': '제목', 'content': '**굵게** 본문'}
+    )
+
+    archive = read_zip(stream_zip(entries))
+    manifest = archive.read('manifest.json').decode('utf-8')
+
+    assert manifest.index('image_2.png') < manifest.index('image_10.png')
+    assert archive.read('article.txt').decode('utf-8').startswith('제목\n\n')
+    assert '<strong>굵게</strong>' in archive.read('article.html').decode('utf-8')
+
+
+def test_fetch_concurrently_reports_results_and_errors_by_index():
+    def fetch(index, item):
+        if item == 'broken':
+            raise IOError('다운로드 실패')
+        time.sleep(0.05 * (3 - index))
+        return item.encode('utf-8')
+
+    results = fetch_concurrently(['a', 'broken', 'c'], fetch, max_workers=3)
+    results = {index: (data, error) for index, data, error in results}
+
+    assert results == {0: (b'a', None), 1: (None, '다운로드 실패'), 2: (b'c', None)}
+
+
+def test_fetch_concurrently_runs_items_in_parallel_up_to_limit():
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fetch(index, item):
+        with lock:
+            active.append(index)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(index)
+        return b''
+
+    assert len(list(fetch_concurrently(range(6), fetch, max_workers=3))) == 6
+    assert max(peak) == 3
+
+
+def test_fetch_concurrently_stops_waiting_at_deadline():
+    release = threading.Event()
+
+    def fetch(index, item):
+        if index == 1:
+            release.wait(5)
+        return b'ok'
+
+    started = time.monotonic()
+    results = list(fetch_concurrently(['fast', 'slow'], fetch, max_workers=2, deadline=0.2))
+    release.set()
+
+    assert time.monotonic() - started < 1
+    assert results[0] == (0, b'ok', None)
+    assert results[1][:2] == (1, None) and '시간 초과' in results[1][2]
+
+
+def test_fetch_concurrently_with_no_items():
+    assert list(fetch_concurrently([], lambda index, item: b'')) == []
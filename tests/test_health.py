@@ -0,0 +1,67 @@
+"""health: 프로브 모니터와 /readyz 판단"""
+
+import threading
+
+from health import HealthMonitor, readiness
+
+JOB_STATS = {'pending': 0, 'running': 0, 'workers': 2, 'max_pending': 20}
+
+
+def test_first_readiness_uses_critical_probe_result():
+    release = threading.Event()
+    monitor = HealthMonitor({
+        'session_store': (lambda: None, True),
+        # 외부 API 프로브는 아직 끝나지 않음
+        'naver_api': (release.wait, False),
+    }, interval=3600)
+
+    status_code, report = readiness(monitor, JOB_STATS)
+    release.set()
+
+    assert status_code == 200
+    assert report['probes']['session_store']['ok'] is True
+    assert report['status'] == 'degraded'
+    assert report['problems'] == ['naver_api: 확인 전']
+
+
+def test_failed_critical_probe_is_not_ready():
+    def broken():
+        raise OSError('database is locked')
+
+    monitor = HealthMonitor({'session_store': (broken, True)}, interval=3600)
+
+    status_code, report = readiness(monitor, JOB_STATS)
+
+    assert status_code == 503
+    assert report['status'] == 'not_ready'
+    assert report['problems'] == ['session_store: database is locked']
+
+
+def test_start_runs_critical_probes_once_for_concurrent_callers():
+    calls = []
+    gate = threading.Event()
+
+    def probe():
+        calls.append(1)
+        gate.wait(1)
+
+    monitor = HealthMonitor({'session_store': (probe, True)}, interval=3600)
+    threads = [threading.Thread(target=monitor.start) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    gate.set()
+    for thread in threads:
+        thread.join()
+
+    # 시작 시 한 번 + 백그라운드 스레드의 첫 확인
+    assert len(calls) <= 2
+    assert monitor.results()['session_store']['ok'] is True
+
+
+def test_saturated_job_queue_is_not_ready():
+    monitor = HealthMonitor({'session_store': (lambda: None, True)}, interval=3600)
+
+    status_code, report = readiness(monitor, dict(JOB_STATS, pending=20))
+
+    assert status_code == 503
+    assert report['workers']['saturated'] is True
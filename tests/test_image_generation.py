@@ -0,0 +1,37 @@
+"""image_generation: 동시 생성, 진행 상황 이벤트, 제한기 대기와 마감시간"""
+
+from llm_client import Deadline
+from image_generation import generate_images_concurrently
+from rate_limiter import RateLimiter
+
+
+def test_results_in_index_order_with_progress_events():
+    events = []
+
+    def generate_one(prompt, index):
+        if prompt == 'bad':
+            raise RuntimeError('실패')
+        return {'prompt': prompt, 'index': index}
+
+    images = generate_images_concurrently(
+        ['a', 'bad', 'c'], generate_one, limiter=RateLimiter(600), on_progress=events.append
+    )
+
+    assert [image['prompt'] for image in images] == ['a', 'c']
+    assert len(events) == 3
+    assert max(event['completed'] for event in events) == 2
+    assert [event['error'] for event in events if event['error']] == ['실패']
+
+
+def test_limiter_wait_is_bounded_by_deadline():
+    limiter = RateLimiter(per_minute=1, burst=1)
+    calls = []
+
+    images = generate_images_concurrently(
+        ['a', 'b'], lambda prompt, index: calls.append(prompt) or {'prompt': prompt},
+        max_workers=1, limiter=limiter, deadline=Deadline(0.2)
+    )
+
+    # 버킷에 토큰이 하나뿐이므로 두 번째 이미지는 1분을 기다리지 않고 마감시간에 실패
+    assert len(images) == 1
+    assert calls == ['a']
@@ -0,0 +1,67 @@
+"""image_slots: 본문 응답의 이미지 프롬프트 슬롯 추출/스트리밍 파서"""
+
+from image_slots import ImagePromptStreamParser, extract_image_prompts, strip_image_prompts
+
+PROMPT_A = 'Bright cafe interior with espresso machine, morning light'
+PROMPT_B = 'Close-up of latte art on a wooden table, soft focus'
+
+
+def test_extract_removes_slot_lines_and_returns_prompts():
+    content = f"## 소제목 1\n[IMAGE_PROMPT: {PROMPT_A}]\n본문 1\n\n\n## 소제목 2\n  [IMAGE_PROMPT: {PROMPT_B}]  \n본문 2"
+
+    article, prompts = extract_image_prompts(content)
+
+    assert prompts == [PROMPT_A, PROMPT_B]
+    assert 'IMAGE_PROMPT' not in article
+    assert '\n\n\n' not in article
+    assert article.startswith('## 소제목 1') and article.endswith('본문 2')
+
+
+def test_extract_skips_too_short_prompts():
+    _, prompts = extract_image_prompts(f"[IMAGE_PROMPT: cafe]\n[IMAGE_PROMPT: {PROMPT_A}]")
+    assert prompts == [PROMPT_A]
+
+
+def test_strip_without_slots_keeps_content():
+    assert strip_image_prompts('본문 [참고] 내용') == '본문 [참고] 내용'
+
+
+def test_stream_parser_emits_slots_split_across_chunks():
+    emitted = []
+    parser = ImagePromptStreamParser(emitted.append)
+    text = f"서론 [참고] 문장\n[IMAGE_PROMPT: {PROMPT_A}]\n본문\n[IMAGE_PROMPT: {PROMPT_B}]\n끝"
+
+    for i in range(0, len(text), 7):
+        parser.feed(text[i:i + 7])
+
+    assert emitted == [PROMPT_A, PROMPT_B]
+    assert parser.prompts == emitted
+
+
+def test_stream_parser_waits_for_closing_bracket():
+    emitted = []
+    parser = ImagePromptStreamParser(emitted.append)
+
+    parser.feed(f"[IMAGE_PROMPT: {PROMPT_A}")
+    assert emitted == []
+    parser.feed("]\n")
+    assert emitted == [PROMPT_A]
+
+
+def test_stream_parser_respects_limit():
+    emitted = []
+    parser = ImagePromptStreamParser(emitted.append, limit=1)
+
+    parser.feed(f"[IMAGE_PROMPT: {PROMPT_A}] [IMAGE_PROMPT: {PROMPT_B}]")
+
+    assert emitted == [PROMPT_A]
+
+
+def test_stream_parser_callback_error_does_not_stop_parsing():
+    def on_prompt(prompt):
+        raise RuntimeError('boom')
+
+    parser = ImagePromptStreamParser(on_prompt)
+    parser.feed(f"[IMAGE_PROMPT: {PROMPT_A}][IMAGE_PROMPT: {PROMPT_B}]")
+
+    assert parser.prompts == [PROMPT_A, PROMPT_B]
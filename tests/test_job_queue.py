@@ -0,0 +1,215 @@
+"""job_queue: 공유 저장소 대기열, 작업 가져가기(claim), 멈춘 작업 되돌리기"""
+
+import subprocess
+import sys
+import time
+
+import pytest
+
+import job_queue
+from job_queue import JobQueue, JobQueueFull
+from session_store import MemorySessionStore, SQLiteSessionStore
+
+
+def wait_for_status(queue, job_id, statuses=('done', 'failed'), timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"작업 상태가 바뀌지 않았습니다: {queue.get(job_id)['status']}")
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def make_running(queue, job_id, **fields):
+    """다른 실행기가 가져간 상태의 작업 기록 (색인 포함)"""
+    now = time.time()
+    job = {
+        'kind': 'echo', 'status': 'running', 'params': {}, 'claim': 'old', 'attempts': 1,
+        'created_at': now, 'updated_at': now, 'heartbeat_at': now, 'host': 'other-host', 'pid': 1
+    }
+    job.update(fields)
+    queue.index.create(job_id, {'created_at': now})
+    queue.store.create(job_id, job)
+
+
+def echo(job, params):
+    job.progress(force=True, stage='echo')
+    return {'success': True, 'value': params['value']}
+
+
+def test_inline_runner_executes_submitted_job():
+    queue = JobQueue(MemorySessionStore(), {'echo': echo}, workers=1, runner='inline')
+
+    job_id = queue.submit('echo', {'value': 3}, session_id='s1')
+    job = wait_for_status(queue, job_id)
+
+    assert job['status'] == 'done'
+    assert job['result'] == {'success': True, 'value': 3}
+    assert job['progress'] == {'stage': 'echo'}
+    assert job['attempts'] == 1
+    assert job['session_id'] == 's1'
+    assert job['claim'] is None
+
+
+def test_failed_handler_records_error():
+    def broken(job, params):
+        raise ValueError('실패')
+
+    queue = JobQueue(MemorySessionStore(), {'broken': broken}, workers=1, runner='inline')
+    job = wait_for_status(queue, queue.submit('broken', {}))
+
+    assert job['status'] == 'failed'
+    assert job['error'] == '실패'
+
+
+def test_submit_rejects_unknown_kind_and_full_queue():
+    queue = JobQueue(MemorySessionStore(), {'echo': echo}, max_pending=2, runner='worker')
+
+    with pytest.raises(ValueError):
+        queue.submit('unknown', {})
+
+    queue.submit('echo', {'value': 1})
+    queue.submit('echo', {'value': 2})
+    with pytest.raises(JobQueueFull):
+        queue.submit('echo', {'value': 3})
+    assert queue.rejected_total == 1
+    assert queue.stats()['pending'] == 2
+
+
+def test_worker_mode_runner_in_other_process_store(tmp_path):
+    # 웹 프로세스(작업만 넣음)와 실행기 프로세스가 같은 SQLite 파일을 보는 구성
+    path = str(tmp_path / 'jobs.db')
+    index_path = str(tmp_path / 'jobs_active.db')
+    web = JobQueue(SQLiteSessionStore(path), {'echo': echo}, runner='worker', index=SQLiteSessionStore(index_path, ttl=0))
+    runner = JobQueue(SQLiteSessionStore(path), {'echo': echo}, workers=1, runner='worker',
+                      index=SQLiteSessionStore(index_path, ttl=0))
+
+    job_id = web.submit('echo', {'value': 7})
+    assert web.get(job_id)['status'] == 'queued'
+
+    runner.start()
+    job = wait_for_status(web, job_id)
+    runner.stop()
+
+    assert job['result']['value'] == 7
+    assert web.stats()['running'] == 0
+
+
+def test_job_is_claimed_only_once():
+    store = MemorySessionStore()
+    first = JobQueue(store, {'echo': echo}, runner='worker')
+    second = JobQueue(store, {'echo': echo}, runner='worker')
+    job_id = first.submit('echo', {'value': 1})
+
+    assert first._claim(job_id, 0) is not None
+    assert second._claim(job_id, 0) is None
+
+
+def test_job_of_dead_runner_is_requeued_not_failed():
+    store = MemorySessionStore()
+    queue = JobQueue(store, {'echo': echo}, runner='worker')
+    make_running(queue, 'job1', host=job_queue.socket.gethostname(), pid=dead_pid())
+
+    queued = queue._scan()
+
+    assert [job_id for _, job_id, _ in queued] == ['job1']
+    job = store.get('job1')
+    assert job['status'] == 'queued'
+    assert job['claim'] is None
+    assert queue.requeued_total == 1
+
+
+def test_job_with_stale_heartbeat_is_requeued():
+    store = MemorySessionStore()
+    queue = JobQueue(store, {'echo': echo}, runner='worker')
+    make_running(queue, 'fresh')
+    make_running(queue, 'stale', heartbeat_at=time.time() - job_queue.JOB_STALE_AFTER - 1)
+
+    queue._scan()
+
+    assert store.get('fresh')['status'] == 'running'
+    assert store.get('stale')['status'] == 'queued'
+
+
+def test_job_out_of_attempts_fails():
+    store = MemorySessionStore()
+    queue = JobQueue(store, {'echo': echo}, runner='worker')
+    make_running(queue, 'job1', attempts=job_queue.JOB_MAX_ATTEMPTS, heartbeat_at=0)
+
+    assert queue._scan() == []
+    job = store.get('job1')
+    assert job['status'] == 'failed'
+    assert '중간에 종료' in job['error']
+    assert queue.index.session_ids() == []
+
+
+def test_requeued_job_ignores_result_from_previous_runner():
+    store = MemorySessionStore()
+    queue = JobQueue(store, {'echo': echo}, runner='worker')
+    make_running(queue, 'job1', heartbeat_at=0)
+    queue._scan()
+    claim = queue._claim('job1', 1)
+
+    # 이전 실행기가 뒤늦게 끝나도 새 실행기의 상태를 덮어쓰지 않음
+    assert queue._finish('job1', 'old', {'status': 'done', 'result': {'stale': True}}) is False
+    assert store.get('job1')['status'] == 'running'
+    assert queue._finish('job1', claim, {'status': 'done', 'result': {}}) is True
+
+
+def test_stop_requeues_running_jobs():
+    started = []
+
+    def slow(job, params):
+        started.append(job.id)
+        time.sleep(1)
+        return {}
+
+    store = MemorySessionStore()
+    queue = JobQueue(store, {'slow': slow}, workers=1, runner='inline')
+    job_id = queue.submit('slow', {})
+    wait_for_status(queue, job_id, statuses=('running',))
+    while not started:
+        time.sleep(0.01)
+
+    queue.stop()
+
+    assert store.get(job_id)['status'] == 'queued'
+    assert queue.requeued_total == 1
+
+
+def test_finished_jobs_leave_index_and_expire_after_retention():
+    store = MemorySessionStore(ttl=2)
+    queue = JobQueue(store, {'echo': echo}, workers=1, runner='inline')
+    job_id = queue.submit('echo', {'value': 1})
+    wait_for_status(queue, job_id)
+    finished_at = store.get(job_id)['finished_at']
+
+    # 대기열 확인과 상태 조회는 마지막 사용 시각을 갱신하지 않음
+    for _ in range(3):
+        queue._scan()
+        queue.get(job_id)
+
+    assert queue.index.session_ids() == []
+    assert store.sweep(now=finished_at + 3)['expired'] == 1
+    assert queue.get(job_id) is None
+
+
+def test_scan_reads_only_unfinished_jobs():
+    store = MemorySessionStore()
+    queue = JobQueue(store, {'echo': echo}, runner='worker')
+    store.create('old', {'kind': 'echo', 'status': 'done', 'created_at': 0})
+    job_id = queue.submit('echo', {'value': 1})
+    # 작업 기록 전에 멈춘 등록, 이미 끝났지만 색인에 남은 작업은 정리
+    queue.index.create('lost', {'created_at': time.time() - job_queue.JOB_STALE_AFTER - 1})
+    queue.index.create('old', {'created_at': 0})
+
+    assert [found for _, found, _ in queue._scan()] == [job_id]
+    assert queue.index.session_ids() == [job_id]
+    assert queue._count_queued() == 1
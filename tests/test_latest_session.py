@@ -0,0 +1,60 @@
+"""web_app.latest_session_for: 레거시 라우트가 쿠키에 기록한 단계별 최신 세션을 찾는지"""
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('flask')
+import web_app  # noqa: E402
+from session_store import MemorySessionStore  # noqa: E402
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    store = MemorySessionStore()
+    # 무거운 앱 초기화 없이 세션 저장소만 있는 인스턴스로 대체
+    monkeypatch.setattr(web_app.blog_app, '_instance', SimpleNamespace(sessions=store))
+    return store
+
+
+def test_latest_session_per_stage(sessions):
+    sessions.create('search-1', {'keyword': '캠핑'})
+    sessions.create('analysis-1', {'keyword': '등산', 'analysis_result': '분석'})
+
+    with web_app.app.test_request_context():
+        web_app.remember_latest_session('search-1', 'search')
+        web_app.remember_latest_session('analysis-1', 'analysis')
+
+        assert web_app.latest_session_for('search', fields=('keyword',)) == ('search-1', {'keyword': '캠핑'})
+        assert web_app.latest_session_for('analysis', fields=('analysis_result',)) == (
+            'analysis-1', {'analysis_result': '분석'}
+        )
+
+
+def test_clients_do_not_see_each_others_sessions(sessions):
+    sessions.create('mine', {'keyword': '캠핑'})
+
+    with web_app.app.test_request_context():
+        web_app.remember_latest_session('mine', 'search')
+    with web_app.app.test_request_context():
+        assert web_app.latest_session_for('search') == (None, None)
+
+
+def test_missing_or_expired_session_is_not_found(sessions):
+    with web_app.app.test_request_context():
+        assert web_app.latest_session_for('search') == (None, None)
+
+        web_app.remember_latest_session('gone', 'search', 'analysis')
+        assert web_app.latest_session_for('search') == (None, None)
+        assert web_app.latest_session_for('analysis', fields=('keyword',)) == (None, None)
+
+
+def test_newer_session_replaces_older_for_same_stage(sessions):
+    sessions.create('old', {'keyword': '캠핑'})
+    sessions.create('new', {'keyword': '등산'})
+
+    with web_app.app.test_request_context():
+        web_app.remember_latest_session('old', 'search')
+        web_app.remember_latest_session('new', 'search')
+
+        assert web_app.latest_session_for('search', fields=('keyword',)) == ('new', {'keyword': '등산'})
@@ -0,0 +1,91 @@
+"""web_app 지연 초기화: import 시 무거운 모듈/웹앱을 만들지 않는지, 첫 사용 때 한 번만 만드는지"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('flask')
+
+from web_app import LazyBlogWebApp
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('openai', 'pytrends', 'pandas', 'requests')
+
+
+class Factory:
+    def __init__(self, delay=0, fail_first=False):
+        self.delay = delay
+        self.fail_first = fail_first
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail_first and self.calls == 1:
+            raise RuntimeError('저장소 연결 실패')
+        return type('App', (), {'name': f'app-{self.calls}'})()
+
+
+def test_instance_is_created_on_first_attribute_access():
+    factory = Factory()
+    lazy = LazyBlogWebApp(factory)
+
+    assert factory.calls == 0
+    assert lazy.name == 'app-1'
+    assert lazy.name == 'app-1'
+    assert lazy.get() is lazy.get()
+    assert factory.calls == 1
+
+
+def test_concurrent_first_access_creates_one_instance():
+    factory = Factory(delay=0.05)
+    lazy = LazyBlogWebApp(factory)
+    start = threading.Barrier(8)
+    seen = []
+
+    def access():
+        start.wait()
+        seen.append(lazy.get())
+
+    threads = [threading.Thread(target=access) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert factory.calls == 1
+    assert len(seen) == 8 and all(instance is seen[0] for instance in seen)
+
+
+def test_failed_initialization_is_retried_on_next_access():
+    factory = Factory(fail_first=True)
+    lazy = LazyBlogWebApp(factory)
+
+    with pytest.raises(RuntimeError):
+        lazy.get()
+
+    assert lazy.name == 'app-2'
+    assert factory.calls == 2
+
+
+def test_import_and_healthz_do_not_initialize_app_or_heavy_modules():
+    # 이미 import된 모듈의 영향을 받지 않도록 새 프로세스에서 확인
+    probe = (
+        'import json, sys, web_app\n'
+        "status = web_app.app.test_client().get('/healthz').status_code\n"
+        'print(json.dumps({'
+        "'heavy': [name for name in %r if name in sys.modules], "
+        "'initialized': web_app.blog_app._instance is not None, "
+        "'status': status}))\n"
+    ) % (HEAVY_MODULES,)
+    result = subprocess.run(
+        [sys.executable, '-c', probe], cwd=BASE_DIR, capture_output=True, text=True, timeout=60
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == {'heavy': [], 'initialized': False, 'status': 200}
@@ -0,0 +1,163 @@
+"""llm_client: 마감시간, 재시도 가능한 오류만 재시도, 헤징(먼저 온 응답 사용, 진 요청 정리)"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import llm_client
+from llm_client import Deadline, DeadlineExceeded, acall_with_policy, call_with_policy
+from metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def fast_policy(monkeypatch):
+    # openai 예외 대신 표준 예외를 재시도 대상으로, 백오프 대기 없이
+    monkeypatch.setattr(llm_client, '_retryable_errors', (TimeoutError, ConnectionError))
+    monkeypatch.setattr(llm_client, '_backoff_seconds', lambda attempt: 0)
+
+
+def abandoned(call_type):
+    return metrics._counters.get(('blog_llm_hedge_abandoned_total', (('call_type', call_type),)), 0)
+
+
+def failing(errors, result='ok'):
+    """errors를 차례로 발생시킨 뒤 result를 반환하는 호출 함수 (호출 시 받은 타임아웃 기록)"""
+    timeouts = []
+
+    def fn(timeout):
+        timeouts.append(timeout)
+        if len(timeouts) <= len(errors):
+            raise errors[len(timeouts) - 1]
+        return result
+    return fn, timeouts
+
+
+def test_expired_deadline_does_not_call():
+    fn, timeouts = failing([])
+
+    with pytest.raises(DeadlineExceeded):
+        call_with_policy(fn, 'test_deadline', deadline=Deadline(llm_client.DEADLINE_SAFETY_MARGIN - 0.5))
+
+    assert timeouts == []
+
+
+def test_attempt_timeout_is_bounded_by_deadline():
+    fn, timeouts = failing([])
+
+    assert call_with_policy(fn, 'test_budget', deadline=Deadline(10), timeout=30) == 'ok'
+
+    assert timeouts[0] <= 10 - llm_client.DEADLINE_SAFETY_MARGIN
+
+
+def test_retryable_errors_are_retried():
+    fn, timeouts = failing([TimeoutError('느림'), ConnectionError('끊김')])
+
+    assert call_with_policy(fn, 'test_retry', max_retries=2) == 'ok'
+    assert len(timeouts) == 3
+
+
+def test_other_errors_are_not_retried():
+    fn, timeouts = failing([ValueError('잘못된 요청')])
+
+    with pytest.raises(ValueError):
+        call_with_policy(fn, 'test_no_retry', max_retries=2)
+    assert len(timeouts) == 1
+
+
+def test_retries_stop_at_max_retries():
+    fn, timeouts = failing([TimeoutError('느림')] * 5)
+
+    with pytest.raises(TimeoutError):
+        call_with_policy(fn, 'test_retry_limit', max_retries=1)
+    assert len(timeouts) == 2
+
+
+def test_no_retry_when_backoff_would_pass_deadline(monkeypatch):
+    monkeypatch.setattr(llm_client, '_backoff_seconds', lambda attempt: 5)
+    fn, timeouts = failing([TimeoutError('느림')])
+
+    with pytest.raises(TimeoutError):
+        call_with_policy(fn, 'test_retry_deadline', deadline=Deadline(6), max_retries=2)
+    assert len(timeouts) == 1
+
+
+def test_async_policy_retries_retryable_errors():
+    fn, timeouts = failing([TimeoutError('느림')])
+
+    async def afn(timeout):
+        return fn(timeout)
+
+    assert asyncio.run(acall_with_policy(afn, 'test_async_retry')) == 'ok'
+    assert len(timeouts) == 2
+
+
+def test_hedge_returns_first_response_without_waiting_for_loser(monkeypatch):
+    monkeypatch.setattr(llm_client, '_hedge_delay', lambda call_type: 0.05)
+    release = threading.Event()
+    loser_done = threading.Event()
+    calls = []
+
+    def fn(timeout):
+        calls.append(timeout)
+        if len(calls) == 1:
+            release.wait(5)
+            loser_done.set()
+            return SimpleNamespace(value='slow', usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5))
+        return SimpleNamespace(value='fast', usage=None)
+
+    started = time.monotonic()
+    result = call_with_policy(fn, 'test_hedge', hedge=True, timeout=10)
+
+    assert result.value == 'fast'
+    assert len(calls) == 2
+    assert time.monotonic() - started < 1
+    assert abandoned('test_hedge') == 1
+
+    # 진 요청은 기다리지 않지만, 끝나면 청구된 토큰은 집계됨
+    release.set()
+    loser_done.wait(1)
+    deadline = time.monotonic() + 1
+    while 'test_hedge' not in llm_client.usage_stats.snapshot() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert llm_client.usage_stats.snapshot()['test_hedge']['prompt_tokens'] == 10
+
+
+def test_fast_first_response_sends_no_hedge(monkeypatch):
+    monkeypatch.setattr(llm_client, '_hedge_delay', lambda call_type: 1)
+    fn, timeouts = failing([])
+
+    assert call_with_policy(fn, 'test_hedge_fast', hedge=True, timeout=10) == 'ok'
+    assert len(timeouts) == 1
+    assert abandoned('test_hedge_fast') == 0
+
+
+def test_async_hedge_cancels_loser(monkeypatch):
+    monkeypatch.setattr(llm_client, '_hedge_delay', lambda call_type: 0.05)
+    calls = []
+    cancelled = []
+
+    async def fn(timeout):
+        calls.append(timeout)
+        if len(calls) == 1:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return 'slow'
+        return 'fast'
+
+    async def run():
+        result = await acall_with_policy(fn, 'test_async_hedge', hedge=True, timeout=10)
+        # 취소가 처리될 기회를 줌
+        await asyncio.sleep(0)
+        return result
+
+    started = time.monotonic()
+    assert asyncio.run(run()) == 'fast'
+    assert time.monotonic() - started < 1
+    assert cancelled == [True]
+    assert abandoned('test_async_hedge') == 1
@@ -0,0 +1,139 @@
+"""metrics: Prometheus 텍스트 출력, 워커 파일 합산, 최근 오류율, /metrics 토큰 확인"""
+
+import json
+import os
+
+import pytest
+
+from metrics import METRIC_HELP, MetricsRegistry
+
+
+def make_registry(tmp_path):
+    return MetricsRegistry(directory=str(tmp_path), buckets=(0.1, 1, 10))
+
+
+def test_render_counters_and_cumulative_histogram(tmp_path):
+    registry = make_registry(tmp_path)
+    for seconds in (0.05, 0.5, 0.7, 30):
+        registry.observe('blog_stage_duration_seconds', seconds, stage='naver_search')
+    registry.inc('blog_stage_calls_total', stage='naver_search', status='ok')
+    registry.inc('blog_stage_calls_total', 2, stage='naver_search', status='error')
+
+    lines = registry.render().splitlines()
+
+    assert lines[:2] == [
+        '# HELP blog_stage_duration_seconds 단계별 소요 시간',
+        '# TYPE blog_stage_duration_seconds histogram',
+    ]
+    assert lines[2:8] == [
+        'blog_stage_duration_seconds_bucket{stage="naver_search",le="0.1"} 1',
+        'blog_stage_duration_seconds_bucket{stage="naver_search",le="1"} 3',
+        'blog_stage_duration_seconds_bucket{stage="naver_search",le="10"} 3',
+        'blog_stage_duration_seconds_bucket{stage="naver_search",le="+Inf"} 4',
+        'blog_stage_duration_seconds_sum{stage="naver_search"} 31.25',
+        'blog_stage_duration_seconds_count{stage="naver_search"} 4',
+    ]
+    assert 'blog_stage_calls_total{stage="naver_search",status="error"} 2' in lines
+    assert 'blog_stage_calls_total{stage="naver_search",status="ok"} 1' in lines
+    # 값이 없는 지표도 HELP/TYPE은 항상 출력
+    assert all(f'# TYPE {name} {metric_type}' in lines for name, (metric_type, _) in METRIC_HELP.items())
+
+
+def test_render_escapes_label_values_and_skips_unknown_metrics(tmp_path):
+    registry = make_registry(tmp_path)
+    registry.inc('blog_http_requests_total', route='a"b\\c\nd', method='GET', status=200)
+    registry.inc('not_registered_total')
+
+    output = registry.render()
+
+    assert 'blog_http_requests_total{method="GET",route="a\\"b\\\\c\\nd",status="200"} 1' in output
+    assert 'not_registered_total' not in output
+
+
+def test_collect_sums_other_worker_files(tmp_path):
+    worker = make_registry(tmp_path)
+    worker._pid = 4242
+    worker.inc('blog_llm_retries_total', 3, call_type='titles')
+    worker.observe('blog_stage_duration_seconds', 0.5, stage='zip_build')
+    (tmp_path / 'metrics-4242.json').write_text(json.dumps(worker._snapshot()), encoding='utf-8')
+    (tmp_path / 'metrics-5151.json').write_text('{"counters": [', encoding='utf-8')
+    (tmp_path / 'metrics-6161.json').write_text(json.dumps({
+        'histograms': [['blog_stage_duration_seconds', [['stage', 'zip_build']], [1, 2], 1.0, 3]]
+    }), encoding='utf-8')
+
+    registry = make_registry(tmp_path)
+    registry.inc('blog_llm_retries_total', call_type='titles')
+    registry.observe('blog_stage_duration_seconds', 5, stage='zip_build')
+    counters, histograms = registry.collect()
+
+    assert counters[('blog_llm_retries_total', (('call_type', 'titles'),))] == 4
+    # 깨진 파일과 구간 수가 다른 파일은 건너뜀
+    assert histograms[('blog_stage_duration_seconds', (('stage', 'zip_build'),))] == {
+        'buckets': [0, 1, 1], 'sum': 5.5, 'count': 2
+    }
+
+
+def test_flush_writes_this_process_file(tmp_path):
+    registry = make_registry(tmp_path)
+    registry.inc('blog_bytes_total', 1024, stage='image_download', direction='in')
+    registry.flush()
+
+    (path,) = tmp_path.glob('metrics-*.json')
+    assert path.name == f'metrics-{os.getpid()}.json'
+    assert json.loads(path.read_text(encoding='utf-8'))['counters'] == [
+        ['blog_bytes_total', [['direction', 'in'], ['stage', 'image_download']], 1024]
+    ]
+
+
+def test_stage_status_reports_in_flight_and_error_rate(tmp_path):
+    registry = make_registry(tmp_path)
+    registry.record_stage('naver_search', 0.1)
+    with pytest.raises(RuntimeError):
+        with registry.timed('naver_search'):
+            raise RuntimeError('실패')
+
+    with registry.timed('dalle'):
+        status = registry.stage_status()
+
+    assert status['dalle'] == {'in_flight': 1, 'recent_calls': 0, 'recent_errors': 0, 'error_rate': 0.0}
+    assert status['naver_search'] == {'in_flight': 0, 'recent_calls': 2, 'recent_errors': 1, 'error_rate': 0.5}
+    assert registry.stage_status()['dalle']['in_flight'] == 0
+
+
+@pytest.fixture
+def web_app(monkeypatch, tmp_path):
+    pytest.importorskip('flask')
+    import web_app
+
+    monkeypatch.setattr(web_app, 'metrics', make_registry(tmp_path))
+    return web_app
+
+
+def test_metrics_endpoint_is_open_without_token(web_app, monkeypatch):
+    monkeypatch.setattr(web_app, 'METRICS_TOKEN', '')
+
+    response = web_app.app.test_client().get('/metrics')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    assert '# TYPE blog_stage_calls_total counter' in response.get_data(as_text=True)
+
+
+@pytest.mark.parametrize('authorization', [None, 'Bearer wrong', 'secret', 'Bearer secret '])
+def test_metrics_endpoint_rejects_missing_or_wrong_token(web_app, monkeypatch, authorization):
+    monkeypatch.setattr(web_app, 'METRICS_TOKEN', 'secret')
+    headers = {'Authorization': authorization} if authorization else {}
+
+    response = web_app.app.test_client().get('/metrics', headers=headers)
+
+    assert response.status_code == 401
+    assert '# HELP' not in response.get_data(as_text=True)
+
+
+def test_metrics_endpoint_accepts_bearer_token(web_app, monkeypatch):
+    monkeypatch.setattr(web_app, 'METRICS_TOKEN', 'secret')
+
+    response = web_app.app.test_client().get('/metrics', headers={'Authorization': 'Bearer secret'})
+
+    assert response.status_code == 200
+    assert '# HELP blog_stage_duration_seconds' in response.get_data(as_text=True)
@@ -0,0 +1,98 @@
+"""model_router: 단계별 모델 선택, 지연 예산 초과 시 대체 모델 전환과 복귀, 단계별 지연 분리"""
+
+from model_router import MIN_SAMPLES, PROBE_EVERY, ModelRouter
+
+ROUTES = {
+    'titles': {'primary': 'gpt-4o-mini', 'fallback': 'gpt-4.1-nano', 'latency_budget': 10, 'cost_budget': 0.002},
+    'long_form': {'primary': 'gpt-4o-mini', 'fallback': 'gpt-4.1-nano', 'latency_budget': 90},
+    'no_fallback': {'primary': 'gpt-4o', 'latency_budget': 10},
+}
+
+
+def make_router():
+    return ModelRouter({stage: dict(config) for stage, config in ROUTES.items()})
+
+
+def test_primary_until_enough_samples():
+    router = make_router()
+    for _ in range(MIN_SAMPLES - 1):
+        router.record('titles', 'gpt-4o-mini', 30)
+
+    assert router.select_model('titles') == 'gpt-4o-mini'
+
+
+def test_falls_back_when_p95_over_budget_and_probes_primary():
+    router = make_router()
+    for _ in range(MIN_SAMPLES):
+        router.record('titles', 'gpt-4o-mini', 30)
+
+    chosen = [router.select_model('titles') for _ in range(PROBE_EVERY * 2)]
+
+    assert chosen.count('gpt-4.1-nano') == PROBE_EVERY * 2 - 2
+    assert chosen[PROBE_EVERY - 1] == chosen[PROBE_EVERY * 2 - 1] == 'gpt-4o-mini'
+
+
+def test_returns_to_primary_once_probes_are_fast_again():
+    router = make_router()
+    for _ in range(MIN_SAMPLES):
+        router.record('titles', 'gpt-4o-mini', 30)
+
+    # 대체 모델 사용 중에도 기본 모델 확인 호출의 지연이 예산 안으로 돌아오면 다시 기본 모델 사용
+    for _ in range(2000):
+        model = router.select_model('titles')
+        router.record('titles', model, 1)
+
+    assert [router.select_model('titles') for _ in range(PROBE_EVERY)] == ['gpt-4o-mini'] * PROBE_EVERY
+    assert not router.snapshot()['stages']['titles']['over_latency_budget']
+
+
+def test_latency_of_one_stage_does_not_move_another_stage():
+    router = make_router()
+    # 같은 모델이라도 장문 본문(예산 90초)의 긴 지연은 제목 단계(예산 10초) 판단에 쓰이지 않음
+    for _ in range(20):
+        router.record('long_form', 'gpt-4o-mini', 40)
+    for _ in range(MIN_SAMPLES):
+        router.record('titles', 'gpt-4o-mini', 2)
+
+    assert router.select_model('titles') == 'gpt-4o-mini'
+    assert router.select_model('long_form') == 'gpt-4o-mini'
+
+    for _ in range(MIN_SAMPLES):
+        router.record('titles', 'gpt-4o-mini', 30)
+
+    assert router.select_model('titles') == 'gpt-4.1-nano'
+    assert router.select_model('long_form') == 'gpt-4o-mini'
+
+    stages = router.snapshot()['stages']
+    assert stages['titles']['over_latency_budget'] and not stages['long_form']['over_latency_budget']
+    assert router.snapshot()['models']['gpt-4o-mini']['calls'] == 20 + MIN_SAMPLES * 2
+
+
+def test_errors_count_towards_latency():
+    router = make_router()
+    for _ in range(MIN_SAMPLES):
+        router.record('titles', 'gpt-4o-mini', 60, error=True)
+
+    assert router.select_model('titles') == 'gpt-4.1-nano'
+    assert router.snapshot()['models']['gpt-4o-mini']['errors'] == MIN_SAMPLES
+
+
+def test_explicit_primary_and_missing_fallback():
+    router = make_router()
+    for _ in range(MIN_SAMPLES):
+        router.record('titles', 'gpt-4o', 30)
+
+    assert router.select_model('no_fallback') == 'gpt-4o'
+    assert router.select_model('titles', primary='gpt-4o') == 'gpt-4.1-nano'
+    assert router.select_model('unknown') == 'gpt-4o-mini'
+
+
+def test_snapshot_reports_cost_and_budget_flags():
+    router = make_router()
+    router.record('titles', 'gpt-4o-mini', 2, prompt_tokens=1000, completion_tokens=5000)
+
+    snapshot = router.snapshot()
+
+    assert snapshot['models']['gpt-4o-mini']['tokens_per_sec'] == 2500.0
+    assert snapshot['models']['gpt-4o-mini']['cost_usd'] == round(0.00015 + 5 * 0.0006, 6)
+    assert snapshot['stages']['titles']['over_cost_budget'] is True
@@ -0,0 +1,100 @@
+"""pipeline: 의존성 그래프 실행 (독립 단계 병렬 실행, 실패 단계의 후속 단계 건너뛰기, 컨텍스트 전달, 소요 시간)"""
+
+import contextvars
+import threading
+import time
+
+import pytest
+
+from pipeline import PipelineRunner
+
+request_id = contextvars.ContextVar('request_id', default=None)
+
+
+def test_independent_stages_overlap():
+    barrier = threading.Barrier(2, timeout=2)
+
+    def meet(results):
+        # 두 단계가 동시에 실행 중이어야 통과
+        barrier.wait()
+        time.sleep(0.05)
+        return len(results)
+
+    runner = PipelineRunner(max_workers=4)
+    runner.add('search', lambda results: 'r')
+    runner.add('blog', meet, deps=('search',))
+    runner.add('images', meet, deps=('search',))
+
+    results, timings, errors = runner.run()
+
+    assert errors == {}
+    assert results == {'search': 'r', 'blog': 1, 'images': 1}
+    assert timings['blog']['start'] < timings['images']['end']
+    assert timings['images']['start'] < timings['blog']['end']
+
+
+def test_dependents_of_failed_stage_are_skipped():
+    def broken(results):
+        raise RuntimeError('분석 실패')
+
+    runner = PipelineRunner()
+    runner.add('search', lambda results: 'r')
+    runner.add('analysis', broken, deps=('search',))
+    runner.add('titles', lambda results: ['t'], deps=('analysis',))
+    runner.add('blog', lambda results: 'b', deps=('titles',))
+    runner.add('images', lambda results: ['i'], deps=('search',))
+
+    results, timings, errors = runner.run()
+
+    assert results == {'search': 'r', 'images': ['i']}
+    assert errors['analysis'] == '분석 실패'
+    assert errors['titles'] == '의존 단계 실패로 건너뜀: analysis'
+    assert errors['blog'] == '의존 단계 실패로 건너뜀: titles'
+    assert timings['analysis']['status'] == 'error'
+    assert timings['titles'] == {'status': 'skipped'}
+    assert timings['blog'] == {'status': 'skipped'}
+
+
+def test_stage_threads_receive_context_and_dependency_results():
+    seen = {}
+
+    def titles(results):
+        seen['request_id'] = request_id.get()
+        seen['results'] = dict(results)
+        return ['t']
+
+    token = request_id.set('req-1')
+    try:
+        runner = PipelineRunner()
+        runner.add('search', lambda results: 'r')
+        runner.add('titles', titles, deps=('search',))
+        runner.run()
+    finally:
+        request_id.reset(token)
+
+    assert seen == {'request_id': 'req-1', 'results': {'search': 'r'}}
+
+
+def test_timings_shape_and_stage_callback():
+    done = []
+    runner = PipelineRunner()
+    runner.add('search', lambda results: time.sleep(0.02) or 'r')
+    runner.add('titles', lambda results: ['t'], deps=('search',))
+
+    results, timings, errors = runner.run(on_stage_done=lambda name, timing: done.append((name, dict(timing))))
+
+    assert set(timings) == {'search', 'titles', 'total'}
+    for name in ('search', 'titles'):
+        assert set(timings[name]) == {'start', 'end', 'duration', 'status'}
+        assert timings[name]['status'] == 'done'
+        assert timings[name]['duration'] == pytest.approx(timings[name]['end'] - timings[name]['start'], abs=0.002)
+    assert timings['titles']['start'] >= timings['search']['end']
+    assert timings['search']['duration'] >= 0.02
+    assert timings['total']['duration'] >= timings['titles']['end']
+    assert [name for name, _ in done] == ['search', 'titles']
+    assert done[0][1]['status'] == 'done'
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError):
+        PipelineRunner().add('titles', lambda results: None, deps=('analysis',))
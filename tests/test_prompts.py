@@ -0,0 +1,32 @@
+"""prompts: 고정된 지침이 앞에 오고 요청별 데이터(키워드, 검색 결과)는 뒤에 오는지 (프롬프트 캐시)"""
+
+import pytest
+
+import prompts
+
+TITLES = ['캠핑 준비물 10가지 총정리', '초보 캠핑 장소 추천?']
+DESCRIPTIONS = ['텐트와 타프 고르는 법', '수도권 오토캠핑장 비교']
+
+
+@pytest.mark.parametrize('analysis_type', ['comprehensive', 'trend', 'seo'])
+def test_analysis_prompt_keeps_request_data_after_instructions(analysis_type):
+    first = prompts.create_content_analysis_prompt('캠핑', TITLES, DESCRIPTIONS, analysis_type)
+    second = prompts.create_content_analysis_prompt('낚시', ['낚시 채비 정리'], ['찌낚시 기본'], analysis_type)
+
+    data_start = first.rindex('[분석 대상]')
+
+    # 데이터 블록 앞부분은 요청마다 같아야 함
+    assert first[:data_start] == second[:second.rindex('[분석 대상]')]
+    assert '캠핑' not in first[:data_start]
+    assert all(title in first for title in TITLES)
+    assert all(description in first for description in DESCRIPTIONS)
+
+
+def test_title_prompt_uses_placeholder_until_trailing_block():
+    prompt = prompts.create_title_generation_prompt('캠핑', '분석 결과', 10)
+    data_start = prompt.rindex('[작성 정보]')
+    other = prompts.create_title_generation_prompt('낚시', None, 5)
+
+    assert prompt[:data_start] == other[:other.rindex('[작성 정보]')]
+    assert '캠핑' not in prompt[:data_start]
+    assert '- 메인 키워드: 캠핑' in prompt[data_start:]
@@ -0,0 +1,73 @@
+"""rate_limiter: 토큰 버킷 (프로세스 내 / 호스트 공유)"""
+
+import multiprocessing
+import time
+
+import pytest
+
+import rate_limiter
+from rate_limiter import RateLimiter, SharedRateLimiter
+
+
+def test_burst_then_timeout():
+    limiter = RateLimiter(per_minute=60, burst=2)
+
+    assert limiter.acquire(timeout=0)
+    assert limiter.acquire(timeout=0)
+    assert not limiter.acquire(timeout=0)
+
+
+def test_refill_rate():
+    limiter = RateLimiter(per_minute=600, burst=1)
+    assert limiter.acquire(timeout=0)
+
+    started = time.monotonic()
+    assert limiter.acquire(timeout=1)
+    # 분당 600개 = 0.1초마다 1개
+    assert 0.05 <= time.monotonic() - started < 0.5
+
+
+def test_shared_limiters_use_one_bucket(tmp_path):
+    first = SharedRateLimiter('dall_e', per_minute=60, burst=2, directory=str(tmp_path))
+    second = SharedRateLimiter('dall_e', per_minute=60, burst=2, directory=str(tmp_path))
+    other = SharedRateLimiter('datalab', per_minute=60, burst=2, directory=str(tmp_path))
+
+    assert first.acquire(timeout=0)
+    assert second.acquire(timeout=0)
+    assert not first.acquire(timeout=0)
+    assert not second.acquire(timeout=0)
+    assert other.acquire(timeout=0)
+
+
+def _take_all(directory, results):
+    limiter = SharedRateLimiter('dall_e', per_minute=1, burst=3, directory=directory)
+    results.put(sum(limiter.acquire(timeout=0) for _ in range(3)))
+
+
+@pytest.mark.skipif(not rate_limiter.FCNTL_AVAILABLE, reason='fcntl 필요')
+def test_shared_bucket_across_processes(tmp_path):
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_take_all, args=(str(tmp_path), results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(10)
+
+    assert sum(results.get(timeout=1) for _ in workers) == 3
+
+
+def test_corrupt_state_file_resets_bucket(tmp_path):
+    (tmp_path / 'dall_e.json').write_text('not json')
+    limiter = SharedRateLimiter('dall_e', per_minute=60, burst=1, directory=str(tmp_path))
+
+    assert limiter.acquire(timeout=0)
+    assert not limiter.acquire(timeout=0)
+
+
+def test_unwritable_directory_falls_back_to_process_bucket(tmp_path):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    limiter = SharedRateLimiter('dall_e', per_minute=60, burst=1, directory=str(blocker / 'sub'))
+
+    assert limiter.acquire(timeout=0)
+    assert not limiter.acquire(timeout=0)
@@ -0,0 +1,209 @@
+"""session_store.RedisSessionStore: WATCH/MULTI 갱신의 원자성 (겹치는 쓰기, 삭제와의 경합)"""
+
+import shutil
+import socket
+import subprocess
+import threading
+import time
+
+import pytest
+
+from session_store import RedisSessionStore
+
+
+class FakeRespClient:
+    """RedisSessionStore가 쓰는 명령만 흉내 내는 인메모리 클라이언트
+
+    연결(스레드)마다 WATCH한 키의 버전을 기억해, 그 사이 키가 바뀌면 EXEC가 None을 반환합니다.
+    before_exec(client)를 주면 EXEC 직전에 한 번 호출해 다른 클라이언트의 쓰기를 끼워 넣을 수 있습니다.
+    """
+
+    def __init__(self):
+        self.hashes = {}
+        self.sets = {}
+        self.versions = {}
+        self.aborted = 0
+        self.before_exec = None
+        self._watched = threading.local()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _bytes(value):
+        return value if isinstance(value, bytes) else str(value).encode('utf-8')
+
+    def _bump(self, key):
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def _run(self, name, *args):
+        name = name.upper()
+        if name == 'WATCH':
+            self._watched.keys = {key: self.versions.get(key, 0) for key in args}
+            return 'OK'
+        if name == 'UNWATCH':
+            self._watched.keys = {}
+            return 'OK'
+        if name == 'HEXISTS':
+            return int(self._bytes(args[1]) in self.hashes.get(args[0], {}))
+        if name == 'HMGET':
+            data = self.hashes.get(args[0], {})
+            return [data.get(self._bytes(field)) for field in args[1:]]
+        if name == 'HGETALL':
+            return [item for pair in self.hashes.get(args[0], {}).items() for item in pair]
+        if name == 'HVALS':
+            return list(self.hashes.get(args[0], {}).values())
+        if name == 'HLEN':
+            return len(self.hashes.get(args[0], {}))
+        if name == 'HSET':
+            data = self.hashes.setdefault(args[0], {})
+            for field, value in zip(args[1::2], args[2::2]):
+                data[self._bytes(field)] = self._bytes(value)
+            self._bump(args[0])
+            return 1
+        if name == 'DEL':
+            for key in args:
+                self.hashes.pop(key, None)
+                self._bump(key)
+            return 1
+        if name in ('SADD', 'ZADD'):
+            self.sets.setdefault(args[0], set()).add(args[-1])
+            return 1
+        if name in ('SREM', 'ZREM'):
+            self.sets.get(args[0], set()).discard(args[1])
+            return 1
+        if name == 'SMEMBERS':
+            return [member.encode('utf-8') for member in self.sets.get(args[0], ())]
+        if name == 'EXPIRE':
+            return 1
+        raise AssertionError(f'지원하지 않는 명령: {name}')
+
+    def pipeline(self, commands, retry=True):
+        replies = []
+        queued = None
+        for command in commands:
+            name = command[0].upper()
+            if name == 'MULTI':
+                queued = []
+                replies.append('OK')
+            elif name == 'EXEC':
+                if self.before_exec:
+                    # 다른 연결에서의 쓰기이므로 별도 스레드에서 실행
+                    hook, self.before_exec = self.before_exec, None
+                    other = threading.Thread(target=hook, args=(self,))
+                    other.start()
+                    other.join()
+                with self._lock:
+                    watched = getattr(self._watched, 'keys', {})
+                    self._watched.keys = {}
+                    if any(self.versions.get(key, 0) != version for key, version in watched.items()):
+                        self.aborted += 1
+                        replies.append(None)
+                    else:
+                        replies.append([self._run(*queued_command) for queued_command in queued])
+                queued = None
+            elif queued is not None:
+                queued.append(command)
+                replies.append('QUEUED')
+            else:
+                with self._lock:
+                    replies.append(self._run(*command))
+        return replies
+
+    def execute(self, *args):
+        return self.pipeline([args])[0]
+
+
+@pytest.fixture
+def store():
+    store = RedisSessionStore(prefix='test:', ttl=3600)
+    store.client = FakeRespClient()
+    return store
+
+
+def test_update_is_retried_after_concurrent_write(store):
+    store.create('s1', {'keyword': '캠핑'})
+    # 확인과 EXEC 사이에 다른 워커가 같은 세션의 다른 필드를 기록
+    store.client.before_exec = lambda client: store.update('s1', {'analysis_result': '분석'})
+
+    assert store.update('s1', {'generated_titles': ['t']}) is True
+
+    assert store.client.aborted == 1
+    assert store.get('s1') == {'keyword': '캠핑', 'analysis_result': '분석', 'generated_titles': ['t']}
+    assert sum(store.field_sizes('s1').values()) == sum(
+        len(value) for field, value in store.client.hashes[store._key('s1')].items() if field != b'_created_at'
+    )
+
+
+def test_update_does_not_revive_session_deleted_before_exec(store):
+    store.create('s1', {'keyword': '캠핑'})
+    store.client.before_exec = lambda client: store.delete('s1')
+
+    assert store.update('s1', {'generated_images': []}) is False
+
+    assert store.get('s1') is None
+    assert store._key('s1') not in store.client.hashes
+    assert store._sizes_key('s1') not in store.client.hashes
+
+
+def test_expect_is_checked_again_after_conflict(store):
+    store.create('job', {'status': 'queued'})
+    # 다른 실행기가 먼저 가져감
+    store.client.before_exec = lambda client: store.update('job', {'status': 'running', 'claim': 'other'})
+
+    assert store.update('job', {'status': 'running', 'claim': 'mine'}, expect={'status': 'queued'}) is False
+    assert store.get('job') == {'status': 'running', 'claim': 'other'}
+
+
+def test_concurrent_updates_keep_every_field(store):
+    store.create('s1', {'keyword': '캠핑'})
+
+    def worker(n):
+        for i in range(20):
+            assert store.update('s1', {f'field_{n}_{i}': i, 'shared': n})
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    data = store.get('s1')
+    assert all(data[f'field_{n}_{i}'] == i for n in range(8) for i in range(20))
+    assert set(store.field_sizes('s1')) == set(data)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.skipif(shutil.which('redis-server') is None, reason='redis-server가 없습니다')
+def test_concurrent_updates_against_redis_server():
+    port = free_port()
+    server = subprocess.Popen(['redis-server', '--port', str(port), '--save', '', '--appendonly', 'no'],
+                              stdout=subprocess.DEVNULL)
+    try:
+        store = RedisSessionStore(f'redis://127.0.0.1:{port}/0', prefix=f'test{port}:', ttl=60)
+        for _ in range(50):
+            try:
+                store.create('s1', {'keyword': '캠핑'})
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        def worker(n):
+            for i in range(20):
+                assert store.update('s1', {f'field_{n}_{i}': i})
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        data = store.get('s1')
+        assert len(data) == 1 + 8 * 20
+        assert set(store.field_sizes('s1')) == set(data)
+    finally:
+        server.terminate()
+        server.wait()
@@ -0,0 +1,37 @@
+"""Flask 라우트와 ASGI 라우트의 인증 확인이 같은지 (로그인하지 않은 요청은 401)"""
+
+import pytest
+
+pytest.importorskip('flask')
+import web_app  # noqa: E402
+
+PROTECTED = [
+    ('GET', '/api/download_images/s1'),
+    ('POST', '/api/search'),
+    ('POST', '/api/generate_blog'),
+]
+
+
+@pytest.mark.parametrize('method,path', PROTECTED)
+def test_flask_routes_require_login(method, path):
+    client = web_app.app.test_client()
+
+    response = client.open(path, method=method, json={})
+
+    assert response.status_code == 401
+    assert response.get_json() == web_app.AUTH_REQUIRED_RESPONSE
+
+
+@pytest.mark.parametrize('method,path', PROTECTED)
+def test_asgi_routes_require_login(method, path):
+    pytest.importorskip('starlette')
+    pytest.importorskip('httpx')
+    pytest.importorskip('a2wsgi')
+    from starlette.testclient import TestClient
+    import asgi_app
+
+    with TestClient(asgi_app.app) as client:
+        response = client.request(method, path, json={})
+
+    assert response.status_code == 401
+    assert response.json() == web_app.AUTH_REQUIRED_RESPONSE
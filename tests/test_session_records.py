@@ -0,0 +1,89 @@
+"""session_records: 검색/글 레코드의 뷰와 to_state/from_state 왕복 (zlib + base64 경로 포함)"""
+
+import json
+
+from session_records import COMPRESS_MIN_CHARS, ArticleRecord, SearchRecord
+
+NAVER_RESULT = {
+    'total': 1234,
+    'items': [
+        {'title': '<b>캠핑</b> 준비물', 'description': '설명 <b>1</b>', 'link': 'l1', 'postdate': '20240101', 'bloggername': '곰'},
+        {'title': '', 'description': '제목 없음', 'link': 'l2', 'postdate': '20240101', 'bloggername': '곰'},
+        {'title': '캠핑 요리', 'description': '설명 3', 'link': 'l3', 'postdate': '20240102', 'bloggername': '여우'},
+    ]
+}
+
+
+def clean_html(text):
+    return text.replace('<b>', '').replace('</b>', '')
+
+
+def json_round_trip(state):
+    return json.loads(json.dumps(state, ensure_ascii=False))
+
+
+def test_search_record_views_from_naver():
+    record = SearchRecord.from_naver('캠핑', NAVER_RESULT, clean_html)
+
+    assert len(record) == 3
+    assert record.total == 1234
+    assert record.titles == ['캠핑 준비물', '캠핑 요리']
+    assert record.descriptions == ['설명 1', '설명 3']
+    assert record.results()[1] == {'title': '', 'description': '제목 없음', 'link': 'l2', 'postdate': '20240101'}
+    # 반복되는 값은 같은 문자열 객체를 공유
+    assert record.postdates[0] is record.postdates[1]
+
+
+def test_search_record_round_trip():
+    record = SearchRecord.from_naver('캠핑', NAVER_RESULT, clean_html)
+
+    restored = SearchRecord.from_state(json_round_trip(record.to_state()))
+
+    assert restored.to_state() == record.to_state()
+    assert restored.titles == record.titles
+    assert restored.results() == record.results()
+
+
+def test_search_record_from_empty_result():
+    record = SearchRecord.from_naver('캠핑', None, clean_html)
+
+    assert len(record) == 0
+    assert record.total == 0
+    assert SearchRecord.from_state(json_round_trip(record.to_state())).titles == []
+
+
+def test_short_article_is_stored_as_text():
+    record = ArticleRecord('제목', '짧은 본문', prompt_type='review', min_chars=500)
+    state = record.to_state()
+
+    assert state['content'] == '짧은 본문'
+    assert 'content_zlib' not in state
+    restored = ArticleRecord.from_state(json_round_trip(state))
+    assert restored.to_dict() == record.to_dict()
+
+
+def test_long_article_round_trips_through_zlib_and_base64():
+    content = '캠핑장 고르는 법과 준비물.\n' * (COMPRESS_MIN_CHARS // 10)
+    record = ArticleRecord('제목', content, image_prompts=['a tent'], max_chars=3000)
+    state = record.to_state()
+
+    assert 'content' not in state
+    assert isinstance(state['content_zlib'], str)
+    assert len(state['content_zlib']) < len(content.encode('utf-8'))
+
+    restored = ArticleRecord.from_state(json_round_trip(state))
+    assert restored.content == content
+    assert restored.to_dict() == record.to_dict()
+    # 압축된 본문은 다시 압축하지 않고 그대로 기록
+    assert restored.to_state() == state
+
+
+def test_article_record_reads_like_dict():
+    record = ArticleRecord('제목', '본문', additional_prompt='')
+
+    assert record['title'] == '제목'
+    assert record.get('content') == '본문'
+    assert record.get('min_chars', 1000) == 1000
+    assert record.get('unknown', 'x') == 'x'
+    assert 'image_prompts' in record and 'unknown' not in record
+    assert ArticleRecord('제목', None).content == ''
@@ -0,0 +1,249 @@
+"""session_store: 메모리/SQLite 백엔드 동작, JSON 직렬화, 만료(TTL)와 용량 한도(LRU)"""
+
+import pickle
+import time
+from datetime import datetime
+
+import pytest
+
+from session_records import SearchRecord, ArticleRecord
+from session_store import MemorySessionStore, SQLiteSessionStore, _dumps, _loads
+
+LONG_CONTENT = '캠핑 준비물 정리. ' * 200
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_store(request, tmp_path):
+    def make(ttl=3600, max_bytes=0):
+        if request.param == 'memory':
+            return MemorySessionStore(ttl=ttl, max_bytes=max_bytes)
+        return SQLiteSessionStore(str(tmp_path / 'sessions.db'), ttl=ttl, max_bytes=max_bytes)
+    return make
+
+
+def search_record():
+    return SearchRecord('캠핑', 2, ['제목 1', ''], ['설명 1', '설명 2'], ['l1', 'l2'], ['20240101'] * 2, ['곰'] * 2)
+
+
+def test_records_round_trip_through_json():
+    article = ArticleRecord('제목', LONG_CONTENT, prompt_type='informative', image_prompts=['a' * 30])
+    value = {'search': search_record(), 'blog_content': article, 'timestamp': datetime(2024, 1, 2, 3, 4, 5)}
+
+    restored = _loads(_dumps(value))
+
+    assert restored['search'].titles == ['제목 1']
+    assert restored['search'].postdates == ('20240101', '20240101')
+    assert restored['blog_content']['content'] == LONG_CONTENT
+    assert restored['blog_content'].get('image_prompts') == ['a' * 30]
+    assert restored['timestamp'] == datetime(2024, 1, 2, 3, 4, 5)
+
+
+def test_compressed_article_is_stored_compressed():
+    encoded = _dumps(ArticleRecord('제목', LONG_CONTENT))
+    assert b'content_zlib' in encoded
+    assert len(encoded) < len(LONG_CONTENT.encode('utf-8'))
+
+
+def test_unsupported_values_are_rejected():
+    with pytest.raises(TypeError):
+        _dumps({'callback': object()})
+
+
+def test_pickle_payload_is_not_loaded():
+    with pytest.raises(ValueError):
+        _loads(pickle.dumps({'keyword': '캠핑'}))
+
+
+def test_create_get_and_field_selection(make_store):
+    store = make_store()
+    store.create('s1', {'keyword': '캠핑', 'search': search_record(), 'generated_titles': ['a', 'b']})
+
+    assert store.get('s1', fields=('keyword',)) == {'keyword': '캠핑'}
+    assert store.get('s1', fields=()) == {}
+    assert store.get('s1')['search'].titles == ['제목 1']
+    assert store.get('missing') is None
+    assert store.exists('s1') and not store.exists('missing')
+
+
+def test_update_existing_session(make_store):
+    store = make_store()
+    store.create('s1', {'keyword': '캠핑'})
+
+    assert store.update('s1', {'analysis_result': '분석', 'analysis_type': 'trend'}) is True
+    assert store.set_field('s1', 'generated_titles', ['t']) is True
+
+    assert store.get('s1') == {
+        'keyword': '캠핑', 'analysis_result': '분석', 'analysis_type': 'trend', 'generated_titles': ['t']
+    }
+
+
+def test_update_does_not_recreate_missing_session(make_store):
+    store = make_store()
+
+    assert store.update('gone', {'generated_images': []}) is False
+    assert store.get('gone') is None
+    assert store.session_ids() == []
+
+
+def test_update_does_not_revive_expired_session(make_store):
+    store = make_store(ttl=60)
+    store.create('s1', {'keyword': '캠핑'})
+    store.sweep(now=time.time())
+
+    # 마지막 사용 시각을 TTL 이전으로 돌려 만료 상태로 만듦
+    if isinstance(store, MemorySessionStore):
+        store._sessions['s1']['accessed_at'] -= 120
+    else:
+        store._conn().execute('UPDATE sessions SET accessed_at = accessed_at - 120')
+
+    assert store.set_field('s1', 'image_progress', {'done': True}) is False
+    assert store.get('s1') is None
+
+
+def test_delete_session(make_store):
+    store = make_store()
+    store.create('s1', {'keyword': '캠핑'})
+    store.delete('s1')
+    assert store.get('s1') is None
+
+
+def test_sweep_expires_idle_sessions(make_store):
+    store = make_store(ttl=60)
+    store.create('old', {'keyword': 'a'})
+    store.create('new', {'keyword': 'b'})
+
+    result = store.sweep(now=time.time() + 61)
+
+    assert result['expired'] == 2
+    assert store.expired_total == 2
+    assert store.session_ids() == []
+
+
+def test_sweep_evicts_least_recently_used_over_limit(make_store):
+    store = make_store(ttl=0)
+    for session_id in ('a', 'b', 'c'):
+        store.create(session_id, {'blob': 'x' * 1000})
+        time.sleep(0.01)
+    store.max_bytes = 2500
+    # 'a'를 가장 최근에 사용한 것으로 만듦
+    store.update('a', {'blob': 'x' * 1000})
+
+    store.sweep()
+
+    # 메모리 저장소는 쓰는 시점에, SQLite는 스위퍼가 지움
+    assert store.evicted_total == 1
+    assert sorted(store.session_ids()) == ['a', 'c']
+
+
+def test_memory_store_enforces_limit_on_write():
+    store = MemorySessionStore(ttl=0, max_bytes=2500)
+    for session_id in ('a', 'b', 'c'):
+        store.create(session_id, {'blob': 'x' * 1000})
+
+    assert store.session_ids() == ['b', 'c']
+    assert store.evicted_total == 1
+
+
+def test_stats_reports_sizes(make_store):
+    store = make_store()
+    store.create('s1', {'keyword': '캠핑', 'blob': 'x' * 500})
+
+    stats = store.stats()
+
+    assert stats['sessions'] == 1
+    assert stats['total_bytes'] == sum(stats['largest'][0]['fields'].values())
+    assert stats['largest'][0]['fields']['blob'] > 500
+
+
+def test_undecodable_legacy_session_is_dropped(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / 'sessions.db'))
+    store.create('s1', {'keyword': '캠핑'})
+    store._conn().execute('UPDATE session_fields SET value = ?', (pickle.dumps('캠핑'),))
+
+    assert store.get('s1') is None
+    assert store.session_ids() == []
+
+
+def test_update_with_expect_is_compare_and_set(make_store):
+    store = make_store()
+    store.create('job', {'status': 'queued', 'attempts': 0})
+
+    assert store.update('job', {'status': 'running', 'claim': 'a'}, expect={'status': 'queued', 'claim': None}) is True
+    assert store.update('job', {'status': 'running', 'claim': 'b'}, expect={'status': 'queued'}) is False
+    assert store.update('job', {'progress': 1}, expect={'claim': 'b'}) is False
+    assert store.update('job', {'progress': 1}, expect={'claim': 'a'}) is True
+
+    assert store.get('job') == {'status': 'running', 'attempts': 0, 'claim': 'a', 'progress': 1}
+    assert store.update('missing', {'status': 'running'}, expect={'status': None}) is False
+
+
+def test_read_without_touch_does_not_extend_expiry(make_store):
+    store = make_store(ttl=60)
+    store.create('s1', {'status': 'done'})
+    created = store.session_meta()[0]['accessed_at']
+
+    time.sleep(0.01)
+    assert store.get('s1', fields=('status',), touch=False) == {'status': 'done'}
+    assert dict(store.items(touch=False)) == {'s1': {'status': 'done'}}
+
+    assert store.session_meta()[0]['accessed_at'] == created
+    assert store.sweep(now=created + 61)['expired'] == 1
+
+
+def test_size_accounting_follows_writes(make_store):
+    store = make_store(ttl=0)
+    store.create('s1', {'keyword': '캠핑', 'blob': 'x' * 300})
+    store.update('s1', {'blob': 'x' * 100, 'titles': ['a', 'b']})
+    store.create('s2', {'blob': 'y' * 50})
+    store.create('s2', {'keyword': '등산'})
+
+    sizes = {item['session_id']: item['size_bytes'] for item in store.session_meta()}
+
+    assert sizes == {session_id: sum(store.field_sizes(session_id).values()) for session_id in ('s1', 's2')}
+    assert store.field_sizes('s1')['blob'] == len(_dumps('x' * 100))
+    assert set(store.field_sizes('s2')) == {'keyword'}
+
+    store.delete('s1')
+    assert store.stats()['total_bytes'] == sizes['s2']
+
+
+def test_memory_store_total_bytes_matches_sessions():
+    store = MemorySessionStore(ttl=0, max_bytes=0)
+    store.create('s1', {'blob': 'x' * 300})
+    store.update('s1', {'blob': 'x' * 10})
+    store.create('s2', {'blob': 'y' * 50})
+    store.delete('s2')
+
+    assert store._total_bytes == sum(item['size_bytes'] for item in store.session_meta())
+
+
+def test_reading_expired_session_counts_as_expired(make_store):
+    store = make_store(ttl=60)
+    store.create('s1', {'keyword': '캠핑'})
+    if isinstance(store, MemorySessionStore):
+        store._sessions['s1']['accessed_at'] -= 120
+    else:
+        store._conn().execute('UPDATE sessions SET accessed_at = accessed_at - 120')
+
+    assert store.get('s1') is None
+    assert store.expired_total == 1
+    assert store.session_ids() == []
+
+
+def test_recently_read_session_is_evicted_last():
+    store = MemorySessionStore(ttl=0, max_bytes=2500)
+    store.create('a', {'blob': 'x' * 1000})
+    store.create('b', {'blob': 'x' * 1000})
+    # 'a'를 읽어 최근 사용으로 만든 뒤 한도를 넘김
+    store.get('a')
+    store.create('c', {'blob': 'x' * 1000})
+
+    assert store.session_ids() == ['a', 'c']
+
+
+def test_zero_ttl_never_expires(make_store):
+    store = make_store(ttl=0)
+    store.create('s1', {'keyword': '캠핑'})
+
+    assert store.sweep(now=time.time() + 10 ** 6)['expired'] == 0
+    assert store.get('s1') == {'keyword': '캠핑'}
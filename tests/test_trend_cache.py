@@ -0,0 +1,147 @@
+"""trend_cache: 실패 시 마지막 결과 유지(stale)와 대체 키워드(fallback), 워커 간 스냅샷 공유와 갱신 잠금"""
+
+import time
+
+import pytest
+
+import trend_cache
+from trend_cache import TrendCache, _FileLock
+
+
+class Source:
+    """호출 횟수를 세고, 지정한 결과나 예외를 돌려주는 소스"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        result = self.results.pop(0) if len(self.results) > 1 else self.results[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def make_cache(tmp_path, source, **kwargs):
+    return TrendCache({'google': (source, lambda: ['대체 키워드'])}, path=str(tmp_path / 'trends.json'), **kwargs)
+
+
+def test_fallback_until_first_success(tmp_path):
+    cache = make_cache(tmp_path, Source(ConnectionError('차단됨')))
+
+    assert cache.get('google') == (['대체 키워드'], {
+        'status': 'fallback', 'update_time': None, 'age_seconds': None, 'stale': True, 'error': None
+    })
+
+    cache.refresh()
+    keywords, meta = cache.get('google')
+
+    assert keywords == ['대체 키워드']
+    assert meta['status'] == 'fallback' and meta['error'] == '차단됨'
+
+
+def test_failure_keeps_last_success_as_stale(tmp_path):
+    source = Source(['캠핑', '등산'], TimeoutError('시간 초과'))
+    cache = make_cache(tmp_path, source)
+
+    cache.refresh()
+    assert cache.get('google')[1]['status'] == 'fresh'
+
+    cache.refresh(force=True)
+    keywords, meta = cache.get('google')
+
+    assert source.calls == 2
+    assert keywords == ['캠핑', '등산']
+    assert meta['status'] == 'stale' and meta['stale'] and meta['error'] == '시간 초과'
+
+
+def test_empty_result_counts_as_failure(tmp_path):
+    cache = make_cache(tmp_path, Source(['캠핑'], []))
+
+    cache.refresh()
+    cache.refresh(force=True)
+    keywords, meta = cache.get('google')
+
+    assert keywords == ['캠핑']
+    assert meta['status'] == 'stale' and meta['error'] == '빈 결과'
+
+
+def test_old_result_is_stale_without_error(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path, Source(['캠핑']), stale_after=60)
+    cache.refresh()
+
+    now = time.time()
+    monkeypatch.setattr(trend_cache.time, 'time', lambda: now + 120)
+    keywords, meta = cache.get('google')
+
+    assert keywords == ['캠핑']
+    assert meta['status'] == 'stale' and meta['error'] is None and meta['age_seconds'] >= 120
+
+
+def test_refresh_only_when_due(tmp_path, monkeypatch):
+    source = Source(['캠핑'])
+    cache = make_cache(tmp_path, source, interval=600)
+
+    assert cache.refresh() is True
+    assert cache.refresh() is False
+    assert source.calls == 1
+
+    now = time.time()
+    monkeypatch.setattr(trend_cache.time, 'time', lambda: now + 601)
+    assert cache.refresh() is True
+    assert source.calls == 2
+
+
+def test_failed_source_is_retried_sooner_than_interval(tmp_path, monkeypatch):
+    source = Source(ConnectionError('차단됨'), ['캠핑'])
+    cache = make_cache(tmp_path, source, interval=3600)
+    cache.refresh()
+
+    now = time.time()
+    monkeypatch.setattr(trend_cache.time, 'time', lambda: now + trend_cache.RETRY_INTERVAL + 1)
+    cache.refresh()
+
+    assert source.calls == 2
+    assert cache.get('google')[0] == ['캠핑']
+
+
+def test_other_worker_reads_snapshot_without_fetching(tmp_path):
+    cache = make_cache(tmp_path, Source(['캠핑', '등산']))
+    cache.refresh()
+
+    other_source = Source(ConnectionError('호출되면 안 됨'))
+    other = make_cache(tmp_path, other_source)
+
+    assert other.refresh() is False
+    assert other_source.calls == 0
+    assert other.get('google')[0] == ['캠핑', '등산']
+
+
+@pytest.mark.skipif(not trend_cache.FCNTL_AVAILABLE, reason='fcntl 없음')
+def test_refresh_skipped_while_another_worker_holds_lock(tmp_path):
+    source = Source(['캠핑'])
+    cache = make_cache(tmp_path, source)
+
+    with _FileLock(f"{cache.path}.lock") as acquired:
+        assert acquired
+        assert cache.refresh() is False
+        assert source.calls == 0
+        assert cache.get('google')[1]['status'] == 'fallback'
+
+    assert cache.refresh() is True
+    assert source.calls == 1
+
+
+def test_snapshot_reports_oldest_update_and_any_stale(tmp_path):
+    cache = TrendCache({
+        'google': (Source(['캠핑']), lambda: ['대체']),
+        'naver': (Source(ConnectionError('차단됨')), lambda: ['네이버 대체']),
+    }, path=str(tmp_path / 'trends.json'))
+    cache.refresh()
+
+    snapshot = cache.snapshot()
+
+    assert snapshot['google'] == ['캠핑'] and snapshot['naver'] == ['네이버 대체']
+    assert snapshot['update_time'] is None and snapshot['stale'] is True
+    assert snapshot['sources']['naver']['status'] == 'fallback'
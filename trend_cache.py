@@ -0,0 +1,246 @@
+"""
+트렌딩 키워드 캐시 (Google Trends / 네이버 DataLab)
+
+추천 키워드 API가 페이지를 열 때마다 pytrends 스크래핑과 DataLab 호출을 기다리지 않도록,
+백그라운드 스레드가 TREND_REFRESH_INTERVAL마다 소스별로 새로 가져와 메모리와 디스크 스냅샷에
+저장하고, API는 저장된 스냅샷을 바로 돌려줍니다.
+
+- 소스 호출이 실패하면 마지막으로 성공한 결과를 계속 제공합니다 (status: 'stale').
+  한 번도 성공한 적이 없을 때만 고정 대체 키워드를 사용합니다 (status: 'fallback').
+- 디스크 스냅샷은 gunicorn 워커들이 공유하며, 재시작 직후에도 바로 제공됩니다.
+  갱신은 파일 잠금을 잡은 워커 하나만 수행하고, 나머지 워커는 스냅샷을 다시 읽습니다.
+
+    TREND_REFRESH_INTERVAL=1800   # 갱신 간격 (초)
+    TREND_STALE_AFTER=5400        # 이 시간보다 오래된 결과는 stale로 표시 (초)
+    TREND_FETCH_TIMEOUT=10        # 소스 호출 제한 시간 (초)
+    TREND_SNAPSHOT_PATH=/app/var/trending_keywords.json
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# 갱신 간격 (초, 기본 30분)
+TREND_REFRESH_INTERVAL = int(os.environ.get('TREND_REFRESH_INTERVAL', '1800'))
+# 이 시간보다 오래된 결과는 stale로 표시 (초)
+TREND_STALE_AFTER = int(os.environ.get('TREND_STALE_AFTER', str(TREND_REFRESH_INTERVAL * 3)))
+# 소스 호출 제한 시간 (초)
+TREND_FETCH_TIMEOUT = float(os.environ.get('TREND_FETCH_TIMEOUT', '10'))
+TREND_SNAPSHOT_PATH = os.environ.get(
+    'TREND_SNAPSHOT_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'var', 'trending_keywords.json')
+)
+# 실패한 소스 재시도 간격 (초) - 갱신 간격보다 짧게
+RETRY_INTERVAL = 120
+
+logger = logging.getLogger(__name__)
+
+
+def _isoformat(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+
+class TrendCache:
+    """소스별 마지막 성공 결과를 보관하는 캐시
+
+    sources는 {이름: (가져오기 함수, 대체 키워드 함수)}이며, 가져오기 함수는
+    실패 시 예외를 발생시키고 성공 시 키워드 리스트를 반환해야 합니다.
+    """
+
+    def __init__(self, sources, path=TREND_SNAPSHOT_PATH, interval=TREND_REFRESH_INTERVAL, stale_after=TREND_STALE_AFTER):
+        self.sources = sources
+        self.path = path
+        self.interval = interval
+        self.stale_after = stale_after
+        # {이름: {'keywords', 'updated_at', 'checked_at', 'error'}}
+        self._entries = {}
+        self._snapshot_mtime = None
+        self._lock = threading.Lock()
+        self._refresher = None
+        self._stop_refresher = threading.Event()
+        self._load_snapshot()
+
+    # --- 디스크 스냅샷 ---
+
+    def _load_snapshot(self):
+        """디스크 스냅샷이 바뀌었으면 다시 읽음 (다른 워커가 갱신한 결과 반영)"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._snapshot_mtime:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("⚠️ 트렌드 스냅샷 읽기 실패: %s", e)
+            return
+        with self._lock:
+            for name, entry in entries.items():
+                current = self._entries.get(name)
+                if current is None or (entry.get('checked_at') or 0) >= (current.get('checked_at') or 0):
+                    self._entries[name] = entry
+            self._snapshot_mtime = mtime
+
+    def _save_snapshot(self):
+        with self._lock:
+            entries = json.dumps(self._entries, ensure_ascii=False)
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(entries)
+        os.replace(tmp_path, self.path)
+        self._snapshot_mtime = os.path.getmtime(self.path)
+
+    # --- 갱신 ---
+
+    def _due(self, name, now):
+        entry = self._entries.get(name)
+        if entry is None:
+            return True
+        if entry.get('error'):
+            return now - (entry.get('checked_at') or 0) >= min(RETRY_INTERVAL, self.interval)
+        return now - (entry.get('updated_at') or 0) >= self.interval
+
+    def refresh(self, force=False):
+        """갱신 시기가 된 소스를 다시 가져와 스냅샷 저장 (실패한 소스는 마지막 성공 결과 유지)"""
+        self._load_snapshot()
+        now = time.time()
+        due = [name for name in self.sources if force or self._due(name, now)]
+        if not due:
+            return False
+
+        with self._refresh_lock() as acquired:
+            if not acquired:
+                # 다른 워커가 갱신 중 - 다음 주기에 스냅샷만 다시 읽음
+                return False
+            self._load_snapshot()
+            now = time.time()
+            due = [name for name in due if force or self._due(name, now)]
+            for name in due:
+                fetch, _ = self.sources[name]
+                started = time.time()
+                try:
+                    keywords = fetch()
+                    if not keywords:
+                        raise ValueError('빈 결과')
+                except Exception as e:
+                    logger.warning("⚠️ 트렌드 갱신 실패 (%s): %s - 마지막 결과 유지", name, e)
+                    with self._lock:
+                        entry = dict(self._entries.get(name) or {})
+                        entry.update({'checked_at': time.time(), 'error': str(e)})
+                        self._entries[name] = entry
+                    continue
+                with self._lock:
+                    self._entries[name] = {
+                        'keywords': keywords,
+                        'updated_at': time.time(),
+                        'checked_at': time.time(),
+                        'error': None
+                    }
+                logger.info("🔄 트렌드 갱신 (%s): %d개, %.1f초", name, len(keywords), time.time() - started)
+            if due:
+                self._save_snapshot()
+        return bool(due)
+
+    def _refresh_lock(self):
+        return _FileLock(f"{self.path}.lock")
+
+    def start_refresher(self):
+        """백그라운드 갱신 스레드 시작 (시작 직후 한 번 갱신)"""
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+
+        def run():
+            # 워커들이 동시에 깨지 않도록 조금씩 어긋나게 시작
+            wait = random.uniform(0, 5)
+            while not self._stop_refresher.wait(wait):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error("⚠️ 트렌드 갱신 스레드 오류: %s", e)
+                wait = min(RETRY_INTERVAL, self.interval)
+
+        self._refresher = threading.Thread(target=run, name='trend-refresher', daemon=True)
+        self._refresher.start()
+
+    def stop_refresher(self):
+        self._stop_refresher.set()
+
+    # --- 조회 ---
+
+    def get(self, name):
+        """(키워드 리스트, 메타데이터) 반환 - 캐시가 없으면 대체 키워드"""
+        self._load_snapshot()
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is None or not entry.get('keywords'):
+            _, fallback = self.sources[name]
+            return fallback(), {
+                'status': 'fallback',
+                'update_time': None,
+                'age_seconds': None,
+                'stale': True,
+                'error': (entry or {}).get('error')
+            }
+        age = now - entry['updated_at']
+        stale = bool(entry.get('error')) or age > self.stale_after
+        return entry['keywords'], {
+            'status': 'stale' if stale else 'fresh',
+            'update_time': _isoformat(entry['updated_at']),
+            'age_seconds': round(age),
+            'stale': stale,
+            'error': entry.get('error')
+        }
+
+    def snapshot(self):
+        """전체 소스의 키워드와 메타데이터 (update_time은 가장 오래된 소스 기준)"""
+        result = {}
+        sources = {}
+        for name in self.sources:
+            result[name], sources[name] = self.get(name)
+        update_times = [meta['update_time'] for meta in sources.values()]
+        result['update_time'] = min(update_times) if all(update_times) else None
+        result['stale'] = any(meta['stale'] for meta in sources.values())
+        result['sources'] = sources
+        return result
+
+
+class _FileLock:
+    """워커 간 갱신 잠금 (잡지 못하면 기다리지 않고 False)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        if not FCNTL_AVAILABLE:
+            return True
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._file = open(self.path, 'a')
+        try:
+            fcntl.flock(self._file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._file.close()
+            self._file = None
+            return False
+        return True
+
+    def __exit__(self, *exc):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        return False
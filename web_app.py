@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, jsonify, session, send_file, send_from_directory, redirect, url_for
+from flask import Flask, render_template, request, jsonify, session, send_file, send_from_directory, redirect, url_for, Response, stream_with_context, g
 from flask_cors import CORS
 import urllib.request
 import urllib.parse
@@ -11,22 +11,23 @@ import os
 import sys
 import tempfile
 import shutil
+import logging
+import importlib.util
 from datetime import datetime
 import uuid
 
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+import app_logging
 
-try:
-    import requests
-    from pytrends.request import TrendReq
-    TRENDS_AVAILABLE = True
-except ImportError:
-    TRENDS_AVAILABLE = False
-    print("⚠️ pytrends가 설치되지 않았습니다. 'pip install pytrends requests' 실행하세요.")
+# 요청 스레드는 로그 레코드를 큐에 넣기만 하고 포맷/출력은 기록 스레드가 처리 (LOG_LEVEL, LOG_FORMAT)
+app_logging.configure_logging()
+logger = logging.getLogger(__name__)
+
+# openai / pytrends(pandas 포함)는 import만으로 워커마다 수 초와 수십 MB가 들므로
+# 설치 여부만 확인해 두고 처음 사용할 때 import (bench_startup.py로 측정)
+OPENAI_AVAILABLE = importlib.util.find_spec('openai') is not None
+TRENDS_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in ('pytrends', 'requests'))
+if not TRENDS_AVAILABLE:
+    logger.warning("⚠️ pytrends가 설치되지 않았습니다. 'pip install pytrends requests' 실행하세요.")
 
 try:
     import prompts
@@ -34,6 +35,27 @@ try:
 except ImportError:
     PROMPTS_AVAILABLE = False
 
+# prompts.py가 없을 때 분석 결과를 잘라 쓸 길이
+FALLBACK_DIGEST_CHARS = 1000
+
+import llm_client
+import model_router
+from pipeline import PipelineRunner
+from image_generation import ImageBatch
+from image_slots import ImagePromptStreamParser, extract_image_prompts, strip_image_prompts
+from image_store import image_store
+from image_derivatives import VARIANTS, schedule_variants, ensure_variant, content_type_for
+from session_store import create_session_store, SessionExpired
+from session_records import SearchRecord, ArticleRecord
+from job_queue import JobQueue, JobQueueFull, JOB_RETENTION, JOB_RUNNER, JOB_TIMEOUT
+from export_archive import stream_zip, fetch_concurrently, summary_entries, archive_filename, article_to_html
+from trend_cache import TrendCache, TREND_FETCH_TIMEOUT
+from datalab import DataLabClient, DATALAB_CACHE_TTL, rank_series
+from category_catalog import category_catalog
+from metrics import metrics, METRICS_TOKEN
+from health import HealthMonitor, http_probe, readiness
+from batch import parse_keywords, run_batch, folder_name, BATCH_MAX_KEYWORDS, BATCH_MAX_ARTICLES
+
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'  # 실제 배포시 변경 필요
 app.config['SESSION_TYPE'] = 'filesystem'
@@ -42,38 +64,122 @@ CORS(app)
 # 패스워드 설정
 ADMIN_PASSWORD = "0225"
 
+# 네이버 API 주소 (벤치마크/테스트에서 로컬 대역 서버로 바꿀 때 사용, OpenAI는 OPENAI_BASE_URL)
+NAVER_API_BASE_URL = os.environ.get('NAVER_API_BASE_URL', 'https://openapi.naver.com').rstrip('/')
+
+# 작업 진행 상황 SSE: 저장소 확인 간격(초) / 한 연결의 최대 유지 시간(초, gunicorn timeout보다 짧게)
+JOB_EVENTS_POLL_INTERVAL = 0.5
+JOB_EVENTS_MAX_SECONDS = 60
+
+# 워커별 지표를 파일로 기록해 /metrics에서 합산
+metrics.start_flusher()
+
+@app.before_request
+def start_llm_deadline():
+    """요청마다 OpenAI 호출 마감시간과 로그용 요청 ID 설정 (gunicorn timeout 이전에 끝나도록)"""
+    llm_client.start_request_deadline()
+    g.request_started = time.monotonic()
+    g.request_id = app_logging.bind_request_id(request.headers.get('X-Request-ID'))
+
+@app.after_request
+def record_request_metrics(response):
+    """라우트(endpoint)별 응답 시간/요청 수 기록 (스트리밍 응답은 첫 응답까지)"""
+    started = g.get('request_started')
+    if started is not None:
+        route = request.endpoint or 'unmatched'
+        metrics.observe('blog_http_request_duration_seconds', time.monotonic() - started, route=route, method=request.method)
+        metrics.inc('blog_http_requests_total', route=route, method=request.method, status=response.status_code)
+    if g.get('request_id'):
+        response.headers['X-Request-ID'] = g.request_id
+    return response
+
+@app.teardown_request
+def clear_llm_deadline(exc=None):
+    """요청 종료 시 마감시간 해제"""
+    llm_client.clear_request_deadline()
+
+class ApiError(Exception):
+    """요청 검증 실패 등 사용자에게 그대로 보여줄 API 오류 (Flask/ASGI 라우트 공통)"""
+
+    def __init__(self, message, status=400, details=None):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+    def to_dict(self):
+        payload = {'error': str(self)}
+        if self.details:
+            payload['details'] = self.details
+        return payload
+
+def request_int(data, name, default, minimum=None, maximum=None):
+    """요청 JSON의 숫자 옵션을 정수로 변환하고 범위를 제한 (형식이 틀리면 ApiError)"""
+    try:
+        value = int(data.get(name, default))
+    except (TypeError, ValueError):
+        raise ApiError(f'{name} 값은 숫자여야 합니다')
+    if minimum is not None:
+        value = max(minimum, value)
+    if maximum is not None:
+        value = min(maximum, value)
+    return value
+
 class BlogWebApp:
     def __init__(self):
         self.client_id = None
         self.client_secret = None
         self.openai_api_key = None
+        self._openai_client = None
         self.load_env_variables()
 
-        # 임시 결과 저장용 (실제 배포시에는 Redis나 DB 사용 권장)
-        self.temp_results = {}
+        # 단계별 결과 저장소 (gunicorn 워커들이 공유, SESSION_STORE_BACKEND로 선택)
+        # 만료/용량 초과 세션은 백그라운드 스위퍼가 정리
+        self.sessions = create_session_store()
+        self.sessions.start_sweeper()
+        # 오래 걸리는 생성 작업 큐 (작업 상태는 같은 백엔드의 'jobs' 공간에 JOB_RETENTION초 보관,
+        # 끝나지 않은 작업 ID 색인은 'jobs_active' 공간에 저장)
+        # JOB_RUNNER=inline이면 이 프로세스 안에서 실행, worker면 job_worker.py 프로세스가 실행
+        self.jobs = JobQueue(
+            create_session_store(namespace='jobs', ttl=JOB_RETENTION), JOB_HANDLERS,
+            index=create_session_store(namespace='jobs_active', ttl=0)
+        )
+        self.jobs.store.start_sweeper()
+        if JOB_RUNNER == 'inline':
+            self.jobs.start()
+        # DataLab 검색량 조회 (키워드 수 제한 없음, 날짜별 결과는 'datalab' 공간에 캐시)
+        self.datalab = DataLabClient(
+            self.client_id, self.client_secret, NAVER_API_BASE_URL,
+            store=create_session_store(namespace='datalab', ttl=DATALAB_CACHE_TTL)
+        )
+        self.datalab.store.start_sweeper()
+        # 추천 키워드 캐시 (백그라운드 갱신, 실패 시 마지막 성공 결과 제공)
+        self.trends = TrendCache({
+            'google_trends': (self.fetch_google_trending_keywords, self.get_fallback_google_keywords),
+            'naver_datalab': (self.fetch_naver_datalab_keywords, self.get_fallback_naver_keywords)
+        })
+        self.trends.start_refresher()
+        # /readyz 프로브 (앱을 만들 때 프로세스별 스레드 시작, 결과만 캐시해서 응답)
+        self.health = HealthMonitor({
+            'session_store': (lambda: self.sessions.get('__readyz__'), True),
+            'naver_api': (http_probe(NAVER_API_BASE_URL), False),
+            'openai_api': (http_probe(os.environ.get('OPENAI_BASE_URL', 'https://api.openai.com/v1')), False)
+        })
+        self.health.start()
 
     def load_env_variables(self):
-        """환경변수 로드"""
-        print("🔧 환경변수 로드 시작...")
-        
+        """환경변수 로드 (키 값은 로그에 남기지 않음)"""
         # 먼저 시스템 환경변수에서 가져오기 (Replit Secrets)
         self.client_id = os.environ.get('NAVER_CLIENT_ID')
         self.client_secret = os.environ.get('NAVER_CLIENT_SECRET_KEY')
         self.openai_api_key = os.environ.get('OPENAI_API_KEY')
 
-        print(f"📋 시스템 환경변수 확인:")
-        print(f"  - NAVER_CLIENT_ID: {'있음 (' + self.client_id[:8] + '...)' if self.client_id else '없음'}")
-        print(f"  - NAVER_CLIENT_SECRET_KEY: {'있음 (' + self.client_secret[:8] + '...)' if self.client_secret else '없음'}")
-        print(f"  - OPENAI_API_KEY: {'있음 (' + self.openai_api_key[:8] + '...)' if self.openai_api_key else '없음'}")
-
         # 환경변수가 없으면 .env 파일에서 시도
         if not all([self.client_id, self.client_secret, self.openai_api_key]):
             env_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
-            print(f"📁 .env 파일 경로: {env_file_path}")
 
             try:
                 with open(env_file_path, 'r', encoding='utf-8') as f:
-                    print("📄 .env 파일에서 환경변수 로드 중...")
+                    logger.debug("📄 .env 파일에서 환경변수 로드 중: %s", env_file_path)
                     for line in f:
                         line = line.strip()
                         if line and not line.startswith('#') and '=' in line:
@@ -83,76 +189,89 @@ class BlogWebApp:
 
                             if key == 'NAVER_CLIENT_ID' and not self.client_id:
                                 self.client_id = value
-                                print(f"  ✓ NAVER_CLIENT_ID 로드됨")
                             elif key == 'NAVER_CLIENT_SECRET_KEY' and not self.client_secret:
                                 self.client_secret = value
-                                print(f"  ✓ NAVER_CLIENT_SECRET_KEY 로드됨")
                             elif key == 'OPENAI_API_KEY' and not self.openai_api_key:
                                 self.openai_api_key = value
-                                print(f"  ✓ OPENAI_API_KEY 로드됨")
             except FileNotFoundError:
-                print(f"❌ .env 파일을 찾을 수 없습니다: {env_file_path}")
-                print("💡 Replit Secrets에 다음 키들을 설정해주세요:")
-                print("   - NAVER_CLIENT_ID")
-                print("   - NAVER_CLIENT_SECRET_KEY") 
-                print("   - OPENAI_API_KEY")
-
-        # 최종 로드된 환경변수 상태 출력
-        print(f"🔍 최종 환경변수 상태:")
-        print(f"  - NAVER_CLIENT_ID: {'✅ 설정됨' if self.client_id else '❌ 설정 필요'}")
-        print(f"  - NAVER_CLIENT_SECRET_KEY: {'✅ 설정됨' if self.client_secret else '❌ 설정 필요'}")
-        print(f"  - OPENAI_API_KEY: {'✅ 설정됨' if self.openai_api_key else '❌ 설정 필요'}")
-        
+                logger.warning("❌ .env 파일을 찾을 수 없습니다: %s "
+                               "(NAVER_CLIENT_ID, NAVER_CLIENT_SECRET_KEY, OPENAI_API_KEY를 환경변수로 설정해주세요)",
+                               env_file_path)
+
+        # 최종 로드된 환경변수 상태 (설정 여부만)
+        logger.info("🔍 환경변수 상태: NAVER_CLIENT_ID %s, NAVER_CLIENT_SECRET_KEY %s, OPENAI_API_KEY %s",
+                    *('설정됨' if value else '설정 필요'
+                      for value in (self.client_id, self.client_secret, self.openai_api_key)))
+
         if not self.client_id or not self.client_secret:
-            print("⚠️ 네이버 API 키가 설정되지 않았습니다. 검색 기능이 작동하지 않습니다.")
+            logger.warning("⚠️ 네이버 API 키가 설정되지 않았습니다. 검색 기능이 작동하지 않습니다.")
         if not self.openai_api_key:
-            print("⚠️ OpenAI API 키가 설정되지 않았습니다. AI 분석 기능이 작동하지 않습니다.")
-
-    def search_naver_blog(self, query, display=50, sort='date'):
-        """네이버 블로그 검색"""
+            logger.warning("⚠️ OpenAI API 키가 설정되지 않았습니다. AI 분석 기능이 작동하지 않습니다.")
+
+    def openai_client(self):
+        """OpenAI 클라이언트 (처음 호출할 때 openai를 import해 만들고 이후 연결 풀과 함께 재사용)"""
+        client = self._openai_client
+        if client is None:
+            from openai import OpenAI
+            client = self._openai_client = OpenAI(api_key=self.openai_api_key)
+        return client
+
+    def build_naver_search_request(self, query, display=50, sort='date'):
+        """네이버 블로그 검색 요청 (URL, 헤더) 생성 (동기/ASGI 모드 공통)"""
         if not self.client_id or not self.client_secret:
             raise Exception("네이버 API 키가 설정되지 않았습니다. Secrets에서 NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET_KEY를 확인해주세요.")
 
-        print(f"🔍 네이버 API 호출 시작: {query}")
-        print(f"📊 Client ID: {self.client_id[:8]}...")
-        print(f"🔐 Client Secret: {self.client_secret[:8]}...")
-
         enc_text = urllib.parse.quote(query)
-        url = f"https://openapi.naver.com/v1/search/blog.json?query={enc_text}&display={display}&sort={sort}"
+        url = f"{NAVER_API_BASE_URL}/v1/search/blog.json?query={enc_text}&display={display}&sort={sort}"
+        headers = {
+            "X-Naver-Client-Id": str(self.client_id),
+            "X-Naver-Client-Secret": str(self.client_secret),
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }
+        return url, headers
+
+    @staticmethod
+    def naver_search_error(status_code, error_body):
+        """네이버 검색 API 오류 응답을 사용자에게 보여줄 예외로 변환 (동기/ASGI 모드 공통)"""
+        logger.error("❌ HTTP 오류: %s - %s", status_code, error_body[:500])
+        if status_code == 401:
+            return Exception("네이버 API 인증 실패. API 키를 확인해주세요.")
+        if status_code == 400:
+            return Exception("잘못된 요청입니다. 검색어를 확인해주세요.")
+        return Exception(f"네이버 API 오류 (HTTP {status_code}): {error_body}")
+
+    def search_naver_blog(self, query, display=50, sort='date'):
+        """네이버 블로그 검색"""
+        url, headers = self.build_naver_search_request(query, display, sort)
 
-        request = urllib.request.Request(url)
-        request.add_header("X-Naver-Client-Id", str(self.client_id))
-        request.add_header("X-Naver-Client-Secret", str(self.client_secret))
-        request.add_header("User-Agent", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+        logger.info("🔍 네이버 API 호출 시작: %s", query)
 
-        try:
-            print(f"🌐 API URL: {url}")
-            response = urllib.request.urlopen(request, timeout=30)
-            if response.getcode() == 200:
-                response_body = response.read()
-                result = json.loads(response_body.decode('utf-8'))
-                print(f"✅ API 호출 성공: {result.get('total', 0)}건 검색됨")
-                return result
-            else:
-                error_body = response.read().decode('utf-8') if response else "응답 없음"
-                print(f"❌ API 응답 오류: HTTP {response.getcode()}")
-                print(f"📝 오류 내용: {error_body}")
-                raise Exception(f"네이버 API 응답 오류: HTTP {response.getcode()}")
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode('utf-8') if hasattr(e, 'read') else str(e)
-            print(f"❌ HTTP 오류: {e.code} - {error_body}")
-            if e.code == 401:
-                raise Exception("네이버 API 인증 실패. API 키를 확인해주세요.")
-            elif e.code == 400:
-                raise Exception("잘못된 요청입니다. 검색어를 확인해주세요.")
-            else:
-                raise Exception(f"네이버 API 오류 (HTTP {e.code}): {error_body}")
-        except urllib.error.URLError as e:
-            print(f"❌ 네트워크 연결 오류: {e}")
-            raise Exception(f"네트워크 연결 오류가 발생했습니다. 인터넷 연결을 확인해주세요.")
-        except Exception as e:
-            print(f"❌ 예상치 못한 오류: {str(e)}")
-            raise Exception(f"API 호출 중 오류 발생: {str(e)}")
+        request = urllib.request.Request(url, headers=headers)
+
+        # 진행 중 호출 수와 최근 오류율은 /readyz에서도 사용
+        with metrics.timed('naver_search'):
+            try:
+                logger.debug("🌐 API URL: %s", url)
+                response = urllib.request.urlopen(request, timeout=30)
+                if response.getcode() == 200:
+                    response_body = response.read()
+                    result = json.loads(response_body.decode('utf-8'))
+                    metrics.add_bytes('naver_search', len(response_body))
+                    logger.info("✅ API 호출 성공: %s건 검색됨", result.get('total', 0))
+                    return result
+                else:
+                    error_body = response.read().decode('utf-8') if response else "응답 없음"
+                    logger.error("❌ API 응답 오류: HTTP %s - %s", response.getcode(), error_body[:500])
+                    raise Exception(f"네이버 API 응답 오류: HTTP {response.getcode()}")
+            except urllib.error.HTTPError as e:
+                error_body = e.read().decode('utf-8') if hasattr(e, 'read') else str(e)
+                raise self.naver_search_error(e.code, error_body)
+            except urllib.error.URLError as e:
+                logger.error("❌ 네트워크 연결 오류: %s", e)
+                raise Exception(f"네트워크 연결 오류가 발생했습니다. 인터넷 연결을 확인해주세요.")
+            except Exception as e:
+                logger.exception("❌ 예상치 못한 오류: %s", e)
+                raise Exception(f"API 호출 중 오류 발생: {str(e)}")
 
     def clean_html_tags(self, text):
         """HTML 태그 제거"""
@@ -177,6 +296,10 @@ class BlogWebApp:
 
         return titles, descriptions
 
+    def build_search_record(self, keyword, search_result):
+        """세션 저장용 검색 레코드 생성 (원본 응답 대신 필요한 열만 한 번씩 저장)"""
+        return SearchRecord.from_naver(keyword, search_result, self.clean_html_tags)
+
     def analyze_with_gpt(self, titles, descriptions, query, analysis_type='comprehensive'):
         """GPT로 블로그 제목과 본문 내용 종합 분석"""
         if not OPENAI_AVAILABLE:
@@ -185,10 +308,26 @@ class BlogWebApp:
         if not self.openai_api_key:
             raise Exception("OpenAI API 키가 설정되지 않았습니다.")
 
-        client = OpenAI(api_key=self.openai_api_key)
+        client = self.openai_client()
+
+        logger.info("🚀 OpenAI API 호출 시작 (제목 + 본문 종합 분석)")
+
+        response = llm_client.create_chat_completion(
+            client,
+            'analysis',
+            messages=self.build_analysis_messages(titles, descriptions, query, analysis_type),
+            max_tokens=4000,
+            temperature=0.7
+        )
+
+        analysis_result = response.choices[0].message.content
+        logger.info("✅ 제목 + 본문 종합 분석 완료 (%d자)", len(analysis_result))
+
+        return analysis_result
 
-        print(f"🔍 분석 시작: 제목 {len(titles)}개, 본문 {len(descriptions)}개")
-        print(f"📊 분석 유형: {analysis_type}")
+    def build_analysis_messages(self, titles, descriptions, query, analysis_type='comprehensive'):
+        """분석 요청 메시지 생성 (동기/ASGI 모드 공통)"""
+        logger.info("🔍 분석 시작: 제목 %d개, 본문 %d개, 유형 %s", len(titles), len(descriptions), analysis_type)
 
         if PROMPTS_AVAILABLE:
             try:
@@ -204,32 +343,28 @@ class BlogWebApp:
 
                 system_prompt = prompts.get_system_prompt(analysis_key)
                 user_prompt = prompts.create_content_analysis_prompt(query, titles, descriptions, analysis_key)
-                print("✅ prompts.py에서 분석 프롬프트 생성 완료")
+                logger.debug("✅ prompts.py에서 분석 프롬프트 생성 완료")
             except Exception as e:
-                print(f"❌ prompts.py 사용 중 오류: {e}")
+                logger.error("❌ prompts.py 사용 중 오류: %s", e)
                 system_prompt = "당신은 블로그 콘텐츠 분석 전문가입니다."
                 user_prompt = self.create_fallback_content_analysis_prompt(query, titles, descriptions)
         else:
-            print("❌ prompts.py 모듈을 사용할 수 없습니다.")
+            logger.warning("❌ prompts.py 모듈을 사용할 수 없습니다.")
             system_prompt = "당신은 블로그 콘텐츠 분석 전문가입니다."
             user_prompt = self.create_fallback_content_analysis_prompt(query, titles, descriptions)
 
-        print("🚀 OpenAI API 호출 시작 (제목 + 본문 종합 분석)")
-
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            max_tokens=4000,
-            temperature=0.7
-        )
-
-        analysis_result = response.choices[0].message.content
-        print(f"✅ 제목 + 본문 종합 분석 완료 ({len(analysis_result)}자)")
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
 
-        return analysis_result
+    def get_analysis_digest(self, analysis_result):
+        """분석 결과 요약(다이제스트) - 제목/본문/이미지 프롬프트에 전체 분석 대신 사용"""
+        if not analysis_result:
+            return ''
+        if PROMPTS_AVAILABLE:
+            return prompts.create_analysis_digest(analysis_result)
+        return analysis_result[:FALLBACK_DIGEST_CHARS]
 
     def create_fallback_content_analysis_prompt(self, query, titles, descriptions):
         """프롬프트 모듈이 없을 때 사용할 기본 분석 프롬프트 - 제목과 본문 종합 분석"""
@@ -239,16 +374,14 @@ class BlogWebApp:
             desc_preview = desc[:500] if desc else "본문 내용 없음"
             content_list.append(f"{i+1}. 제목: {title}\n   본문 내용: {desc_preview}{'...' if len(desc) > 500 else ''}")
 
-        return f"""다음은 '{query}' 키워드로 검색한 네이버 블로그의 제목과 본문 내용입니다. 
+        # 고정된 분석 지침을 앞에, 검색 결과 데이터를 뒤에 두어 프롬프트 캐시가 적중하도록 구성
+        return f"""아래 [분석 대상]은 특정 키워드로 검색한 네이버 블로그의 제목과 본문 내용입니다.
 제목과 본문을 종합적으로 분석하여 깊이 있는 인사이트를 제공해주세요.
 
-=== 블로그 콘텐츠 목록 ({len(titles)}개) ===
-{chr(10).join(content_list)}
-
 === 제목 + 본문 종합 분석 요청 ===
 
 ## 1. 콘텐츠 트렌드 및 방향성 분석
-- 현재 '{query}' 관련 가장 인기 있는 주제와 접근 방식
+- 현재 검색 키워드 관련 가장 인기 있는 주제와 접근 방식
 - 제목에서 드러나는 독자들의 주요 관심사
 - **본문 내용을 통해 파악되는 실제 다뤄지는 세부 주제들**
 - **제목과 본문에서 공통으로 나타나는 핵심 키워드와 패턴**
@@ -287,7 +420,13 @@ class BlogWebApp:
 - **독자 만족도를 높일 수 있는 실용적 팁과 가이드라인**
 
 각 분석 항목에 대해 실제 제목과 본문 내용을 인용하며 구체적인 예시와 함께 실용적인 인사이트를 제공해주세요. 
-특히 본문 내용 분석을 통해 얻은 깊이 있는 통찰을 강조해주세요."""
+특히 본문 내용 분석을 통해 얻은 깊이 있는 통찰을 강조해주세요.
+
+[분석 대상]
+검색 키워드: {query}
+
+=== 블로그 콘텐츠 목록 ({len(titles)}개) ===
+{chr(10).join(content_list)}"""
 
     def generate_titles_with_gpt(self, analysis_result, query, num_titles=10):
         """새로운 블로그 제목 생성 - 숫자와 제목만 출력"""
@@ -297,8 +436,23 @@ class BlogWebApp:
         if not self.openai_api_key:
             raise Exception("OpenAI API 키가 설정되지 않았습니다.")
 
-        client = OpenAI(api_key=self.openai_api_key)
+        client = self.openai_client()
+
+        # 짧은 호출이므로 p95를 넘기면 헤징 요청을 함께 보냄
+        response = llm_client.create_chat_completion(
+            client,
+            'titles',
+            hedge=True,
+            timeout=30,
+            messages=self.build_titles_messages(analysis_result, query, num_titles),
+            max_tokens=1500,
+            temperature=0.8
+        )
+
+        return response.choices[0].message.content
 
+    def build_titles_messages(self, analysis_result, query, num_titles=10):
+        """제목 생성 요청 메시지 생성 (동기/ASGI 모드 공통)"""
         # 현재 시점 정보 추가
         from datetime import datetime
         current_year = datetime.now().year
@@ -309,7 +463,8 @@ class BlogWebApp:
 현재는 {current_year}년이며, 시의성 있는 최신 정보를 반영해야 합니다.
 반드시 숫자와 제목만 출력하고, 다른 설명이나 분류는 절대 포함하지 마세요."""
 
-        user_prompt = f"""키워드 '{query}'에 대해 {num_titles}개의 매력적인 블로그 제목을 생성해주세요.
+        # 고정된 규칙/예시를 앞에, 키워드/제목 수/분석 요약을 뒤에 두어 프롬프트 캐시가 적중하도록 구성
+        user_prompt = f"""아래 [작성 정보]의 키워드로 매력적인 블로그 제목을 생성해주세요.
 
 🕐 **현재 시점 정보 (매우 중요!)**
 - 현재는 {current_year}년입니다
@@ -323,33 +478,148 @@ class BlogWebApp:
 - 오직 제목만 출력하세요
 
 ✅ **올바른 예시:**
-1. {query} 초보자를 위한 완벽 가이드
-2. {query} 실전 활용법 총정리
-3. {query}로 성공하는 3가지 방법
-4. {current_year}년 최신 {query} 트렌드 분석
-5. {next_year}년 {query} 전망과 대비책
+1. [메인 키워드] 초보자를 위한 완벽 가이드
+2. [메인 키워드] 실전 활용법 총정리
+3. [메인 키워드]로 성공하는 3가지 방법
+4. {current_year}년 최신 [메인 키워드] 트렌드 분석
+5. {next_year}년 [메인 키워드] 전망과 대비책
 
 ❌ **절대 금지 예시:**
-1. {query} 초보자를 위한 완벽 가이드
+1. [메인 키워드] 초보자를 위한 완벽 가이드
 **유형:** 정보 제공형
-2. 2024년 {query} 전망 (과거 연도 사용 금지!)
+2. 2024년 [메인 키워드] 전망 (과거 연도 사용 금지!)
 
-지금 바로 {num_titles}개의 제목을 숫자와 제목만으로 생성해주세요."""
+예시의 [메인 키워드]는 아래 메인 키워드로 바꿔 쓰고, 숫자와 제목만으로 생성해주세요.
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            max_tokens=1500,
-            temperature=0.8
-        )
+[작성 정보]
+- 메인 키워드: {query}
+- 제목 수: {num_titles}개"""
 
-        return response.choices[0].message.content
+        # 분석 요약은 요청별 데이터이므로 맨 뒤에 추가
+        analysis_digest = self.get_analysis_digest(analysis_result)
+        if analysis_digest:
+            user_prompt += f"\n\n📊 참고 분석 요약:\n{analysis_digest}"
+
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    def parse_generated_titles(self, generated_titles, keyword, num_titles=10):
+        """GPT 응답에서 "숫자. 제목" 형식의 제목만 추출하고 부족하면 기본 제목으로 채움"""
+        extracted_titles = []
+        
+        if generated_titles and generated_titles.strip():
+            logger.debug("🔍 원본 GPT 응답 (%d자): %.500s", len(generated_titles), generated_titles)
+            
+            # 줄별로 분리
+            lines = [line.strip() for line in generated_titles.split('\n') if line.strip()]
+            
+            import re
+            for line in lines:
+                # 숫자로 시작하는 줄 찾기 (1. 제목, 1) 제목, 1 제목 등)
+                match = re.match(r'^\d+[\.\)\s]\s*(.+)', line)
+                if match:
+                    title = match.group(1).strip()
+                    
+                    # 마크다운 제거
+                    title = re.sub(r'\*\*([^*]+)\*\*', r'\1', title)
+                    title = re.sub(r'\*([^*]+)\*', r'\1', title)
+                    
+                    # 금지된 키워드들이 포함되지 않았는지 확인
+                    forbidden_keywords = ['유형:', '타겟:', '목적:', '키워드:', '특징:', '설명:', 
+                                        '**유형**', '**타겟**', '**목적**', '**키워드**', '**특징**', '**설명**']
+                    
+                    # 제목에 금지된 키워드가 없고, 적절한 길이인 경우만 추가
+                    if (not any(forbidden in title for forbidden in forbidden_keywords) and 
+                        title and len(title) > 5 and len(title) < 200):
+                        extracted_titles.append(title)
+                        logger.debug("✅ 추출된 제목: %s", title)
+                    else:
+                        logger.debug("❌ 제외된 라인: %s", title)
+        
+        # 추출된 제목이 부족하면 fallback 제목 생성
+        if len(extracted_titles) < num_titles:
+            needed = num_titles - len(extracted_titles)
+            logger.warning("⚠️ 제목 부족 (%d/%d), fallback 제목 %d개 추가", len(extracted_titles), num_titles, needed)
+            
+            fallback_titles = [
+                f"{keyword} 완벽 가이드",
+                f"{keyword} 초보자를 위한 안내서", 
+                f"{keyword} 알아야 할 모든 것",
+                f"{keyword} 실전 활용법",
+                f"{keyword} 추천 및 후기",
+                f"{keyword} 성공 사례 분석",
+                f"{keyword} 전문가 노하우",
+                f"{keyword} 단계별 방법론",
+                f"{keyword} 트렌드 분석",
+                f"{keyword} 실무 적용기",
+                f"{keyword} 비교 분석",
+                f"{keyword} 선택 가이드"
+            ]
+            
+            # 기존 제목과 중복되지 않는 fallback 제목만 추가
+            for fallback in fallback_titles:
+                if fallback not in extracted_titles and len(extracted_titles) < num_titles:
+                    extracted_titles.append(fallback)
+
+        # 최종 제목 리스트를 지정된 개수로 제한
+        extracted_titles = extracted_titles[:num_titles]
+        
+        logger.info("🎯 최종 제목 개수: %d", len(extracted_titles))
+
+        return extracted_titles
+
+    def generate_blog_content(self, title, keyword, prompt_type, additional_prompt="", min_chars=6000, max_chars=12000, analysis_result=None, image_slots=0, on_delta=None):
+        """SEO 최적화된 블로그 글 생성
+
+        image_slots가 있으면 섹션마다 [IMAGE_PROMPT: ...] 줄이 포함된 원문을 반환합니다
+        (generate_blog_content_with_image_prompts 참고). on_delta를 주면 응답을 스트리밍으로 받습니다.
+        """
+        if not OPENAI_AVAILABLE:
+            raise Exception("OpenAI 라이브러리가 설치되지 않았습니다.")
+
+        if not self.openai_api_key:
+            raise Exception("OpenAI API 키가 설정되지 않았습니다.")
+
+        client = self.openai_client()
+
+        try:
+            messages, min_chars = self.build_blog_content_messages(
+                title, keyword, prompt_type, additional_prompt, min_chars, max_chars, analysis_result, image_slots
+            )
 
-    def generate_blog_content(self, title, keyword, prompt_type, additional_prompt="", min_chars=6000, max_chars=12000, analysis_result=None):
-        """SEO 최적화된 블로그 글 생성"""
+            logger.info("🚀 OpenAI API 호출 시작 (초기 생성)")
+
+            # 구조화된 긴 블로그 글 한 번에 생성 (이어쓰기 없음)
+            if on_delta:
+                generated_content = llm_client.stream_chat_completion(
+                    client,
+                    'long_form',
+                    on_delta,
+                    messages=messages,
+                    max_tokens=15000,
+                    temperature=0.7
+                )
+            else:
+                response = llm_client.create_chat_completion(
+                    client,
+                    'long_form',
+                    messages=messages,
+                    max_tokens=15000,  # 토큰 수 증가로 긴 글 생성 지원
+                    temperature=0.7
+                )
+                generated_content = response.choices[0].message.content
+
+            self.report_blog_content(generated_content, keyword, min_chars, image_slots)
+            return generated_content
+
+        except Exception as e:
+            logger.error("❌ 블로그 글 생성 실패: %s", e)
+            raise e
+
+    def build_blog_content_messages(self, title, keyword, prompt_type, additional_prompt="", min_chars=6000, max_chars=12000, analysis_result=None, image_slots=0):
+        """블로그 글 생성 요청 메시지와 보정된 최소 글자수 반환 (동기/ASGI 모드 공통)"""
         # min_chars와 max_chars를 정수로 변환 (문자열로 들어올 경우 대비)
         try:
             min_chars = int(min_chars) if min_chars else 6000
@@ -361,118 +631,111 @@ class BlogWebApp:
         # SEO 최적화를 위한 최소 글자수 설정 (문단별 1500자 × 5문단)
         if min_chars < 7500:  # 5문단 × 1500자 = 7500자 최소
             min_chars = 7500
-            print(f"🔍 문단별 1500자 구조를 위해 최소 글자수를 7500자로 설정했습니다.")
+            logger.debug("🔍 문단별 1500자 구조를 위해 최소 글자수를 7500자로 설정했습니다.")
         
         # 키워드 밀도 분석을 위한 예상 키워드 개수 계산
         target_keyword_count = max(8, min_chars // 300)  # 300자당 1개 키워드 목표
         
-        print(f"🔍 SEO 최적화 목표:")
-        print(f"  - 메인 키워드 '{keyword}': {target_keyword_count}회 이상")
-        print(f"  - 키워드 밀도: 2-3% 목표")
-        print(f"  - LSI 키워드: 15-20개 포함")
-        print(f"  - 구조: 도입부(1500자) + 본문3단락(각1500자) + 결론부(1500자) = 최소 7500자")
-
-        print(f"🎯 블로그 글 생성 시작")
-        print(f"📝 제목: {title}")
-        print(f"🔑 키워드: {keyword}")
-        print(f"📊 프롬프트 유형: {prompt_type}")
-        print(f"📏 글자수 범위: {min_chars}-{max_chars}자")
-        print(f"➕ 추가 프롬프트: {additional_prompt[:100] if additional_prompt else '없음'}")
-        print(f"🧠 분석 결과 포함: {'예' if analysis_result else '아니오'}")
-
-        if not OPENAI_AVAILABLE:
-            raise Exception("OpenAI 라이브러리가 설치되지 않았습니다.")
-
-        if not self.openai_api_key:
-            raise Exception("OpenAI API 키가 설정되지 않았습니다.")
-
-        client = OpenAI(api_key=self.openai_api_key)
-
-        try:
-            # 초기 프롬프트 생성
-            if PROMPTS_AVAILABLE:
-                print("✅ prompts.py 모듈이 사용 가능합니다.")
-                try:
-                    # 사용 가능한 프롬프트 타입 확인
-                    available_prompts = prompts.get_blog_content_prompts()
-                    print(f"📋 사용 가능한 프롬프트 타입: {list(available_prompts.keys())}")
-
-                    if prompt_type not in available_prompts:
-                        print(f"⚠️ 요청된 프롬프트 타입 '{prompt_type}'이 없습니다. 'informative'로 변경합니다.")
-                        prompt_type = 'informative'
-
-                    print(f"🎯 사용할 프롬프트 타입: {prompt_type}")
-
-                    prompt_data = prompts.create_blog_content_prompt(
-                        title=title,
-                        keyword=keyword,
-                        prompt_type=prompt_type,
-                        additional_prompt=additional_prompt,
-                        min_chars=min_chars,
-                        max_chars=max_chars,
-                        analysis_result=analysis_result
-                    )
+        logger.info("🎯 블로그 글 생성 시작: 키워드 '%s', 유형 %s, 글자수 %s-%s자, 분석 결과 %s",
+                    keyword, prompt_type, min_chars, max_chars, '포함' if analysis_result else '없음')
+        logger.debug("📝 제목: %s / 키워드 목표 %d회 이상 / 추가 프롬프트: %.100s",
+                     title, target_keyword_count, additional_prompt or '없음')
 
-                    system_prompt = prompt_data['system_prompt']
-                    user_prompt = prompt_data['user_prompt']
+        # 초기 프롬프트 생성
+        if PROMPTS_AVAILABLE:
+            try:
+                # 사용 가능한 프롬프트 타입 확인
+                available_prompts = prompts.get_blog_content_prompts()
+                if prompt_type not in available_prompts:
+                    logger.warning("⚠️ 요청된 프롬프트 타입 '%s'이 없습니다. 'informative'로 변경합니다.", prompt_type)
+                    prompt_type = 'informative'
+
+                prompt_data = prompts.create_blog_content_prompt(
+                    title=title,
+                    keyword=keyword,
+                    prompt_type=prompt_type,
+                    additional_prompt=additional_prompt,
+                    min_chars=min_chars,
+                    max_chars=max_chars,
+                    analysis_result=analysis_result,
+                    image_slots=image_slots
+                )
 
-                    print("✅ prompts.py에서 프롬프트 생성 완료")
-                    print(f"📝 시스템 프롬프트 길이: {len(system_prompt)}자")
-                    print(f"📝 사용자 프롬프트 길이: {len(user_prompt)}자")
+                system_prompt = prompt_data['system_prompt']
+                user_prompt = prompt_data['user_prompt']
 
-                except Exception as e:
-                    print(f"❌ prompts.py 사용 중 오류 발생: {e}")
-                    # Fallback 프롬프트
-                    system_prompt, user_prompt = self._create_fallback_prompts(title, keyword, min_chars, max_chars, additional_prompt)
+                logger.debug("✅ 프롬프트 생성 완료: 시스템 %d자, 사용자 %d자", len(system_prompt), len(user_prompt))
 
-            else:
-                print("❌ prompts.py 모듈을 사용할 수 없습니다.")
+            except Exception as e:
+                logger.error("❌ prompts.py 사용 중 오류 발생: %s", e)
                 # Fallback 프롬프트
                 system_prompt, user_prompt = self._create_fallback_prompts(title, keyword, min_chars, max_chars, additional_prompt)
 
-            print("🚀 OpenAI API 호출 시작 (초기 생성)")
-
-            # 구조화된 긴 블로그 글 한 번에 생성 (이어쓰기 없음)
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=15000,  # 토큰 수 증가로 긴 글 생성 지원
-                temperature=0.7
-            )
-
-            generated_content = response.choices[0].message.content
-            char_count = len(generated_content)
-
-            print(f"✅ 구조화된 블로그 글 생성 완료")
-            print(f"📏 생성된 글자수: {char_count}자")
-            print(f"🎯 목표 달성: {'✅' if char_count >= min_chars else '❌'}")
-            
-            if char_count >= min_chars:
-                print(f"🎉 성공: {char_count}자로 목표 {min_chars}자를 달성했습니다!")
-                print(f"📝 구조: 도입부 + 본문3단락 + 결론부 = 총 5문단 구성")
-            else:
-                print(f"⚠️ 목표 글자수에 미달하였지만 구조화된 글이 완성되었습니다: {char_count}자")
-                print(f"💡 다음 번에는 더 상세한 프롬프트를 사용해보세요.")
-
-            # SEO 분석 수행
-            seo_analysis = self._analyze_seo_content(generated_content, keyword)
-            
-            print(f"📊 SEO 분석 결과:")
-            print(f"  - 키워드 '{keyword}' 출현 빈도: {seo_analysis['keyword_count']}회")
-            print(f"  - 키워드 밀도: {seo_analysis['keyword_density']:.1f}%")
-            print(f"  - SEO 점수: {seo_analysis['seo_score']}/100점")
-            
-            return generated_content
+        else:
+            logger.warning("❌ prompts.py 모듈을 사용할 수 없습니다.")
+            # Fallback 프롬프트
+            system_prompt, user_prompt = self._create_fallback_prompts(title, keyword, min_chars, max_chars, additional_prompt)
 
-        except Exception as e:
-            print(f"❌ 블로그 글 생성 실패: {str(e)}")
-            raise e
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ], min_chars
+
+    def report_blog_content(self, generated_content, keyword, min_chars, image_slots=0):
+        """생성된 글의 글자수/SEO 결과 로그 기록 (INFO 미만이면 SEO 분석도 생략)"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        article_text = strip_image_prompts(generated_content) if image_slots else generated_content
+        char_count = len(article_text)
+        seo_analysis = self._analyze_seo_content(article_text, keyword)
+
+        logger.info("✅ 블로그 글 생성 완료: %d자 (목표 %d자 %s), 키워드 '%s' %d회, 밀도 %.1f%%, SEO 점수 %s/100",
+                    char_count, min_chars, '달성' if char_count >= min_chars else '미달',
+                    keyword, seo_analysis['keyword_count'], seo_analysis['keyword_density'], seo_analysis['seo_score'])
 
     
 
+    def generate_blog_content_with_image_prompts(self, title, keyword, prompt_type, additional_prompt="", min_chars=6000, max_chars=12000, analysis_result=None, num_images=4, on_image_prompt=None, on_delta=None):
+        """본문과 섹션별 이미지 프롬프트를 한 번의 호출로 생성해 (본문, 프롬프트 리스트) 반환
+
+        별도의 이미지 프롬프트 요청(create_image_prompts)이 필요 없습니다.
+        on_image_prompt(prompt)를 주면 응답을 스트리밍으로 받으며 슬롯이 완성될 때마다 호출하므로,
+        본문이 끝나기 전에 이미지 생성을 시작할 수 있습니다. on_delta(text)는 응답 조각마다 호출됩니다.
+        """
+        parser = ImagePromptStreamParser(on_image_prompt, limit=num_images) if on_image_prompt else None
+        stream_delta = None
+        if parser or on_delta:
+            def stream_delta(text):
+                if parser:
+                    parser.feed(text)
+                if on_delta:
+                    on_delta(text)
+
+        raw_content = self.generate_blog_content(
+            title, keyword, prompt_type, additional_prompt, min_chars, max_chars, analysis_result,
+            image_slots=num_images,
+            on_delta=stream_delta
+        )
+        return self.split_image_prompts(raw_content, title, keyword, num_images, on_image_prompt)
+
+    def split_image_prompts(self, raw_content, title, keyword, num_images, on_image_prompt=None):
+        """[IMAGE_PROMPT: ...] 슬롯이 든 원문을 (본문, 프롬프트 num_images개)로 분리 (동기/ASGI 모드 공통)
+
+        슬롯이 부족하면 백업 프롬프트로 채우며, 채운 프롬프트마다 on_image_prompt를 호출합니다
+        (스트리밍 중 이미 시작한 슬롯 뒤로 이어서 이미지 생성).
+        """
+        content, image_prompts = extract_image_prompts(raw_content)
+        image_prompts = image_prompts[:num_images]
+        logger.info("🖼️ 본문에서 이미지 프롬프트 %d/%d개 추출", len(image_prompts), num_images)
+
+        if len(image_prompts) < num_images:
+            backup_prompts = self.get_backup_professional_prompts(title, keyword, num_images)
+            for prompt in backup_prompts[len(image_prompts):]:
+                image_prompts.append(prompt)
+                if on_image_prompt:
+                    on_image_prompt(prompt)
+        return content, image_prompts
+
     def _analyze_seo_content(self, content, keyword):
         """생성된 콘텐츠의 SEO 요소 분석"""
         import re
@@ -618,65 +881,118 @@ class BlogWebApp:
 - "유형:", "타겟:", "목적:" 등의 추가 정보는 포함하지 말 것
 - 오직 제목만 출력할 것
 
-{f'📊 분석 결과 참고:{chr(10)}{analysis_result[:500]}...' if analysis_result else ''}
+{f'📊 분석 결과 참고:{chr(10)}{self.get_analysis_digest(analysis_result)}' if analysis_result else ''}
 
 지금 바로 {num_titles}개의 제목을 위 형식으로만 생성해주세요."""
 
-    def generate_dall_e_images(self, title, content, keyword, num_images=4):
-        """DALL-E 이미지 생성"""
+    def generate_dall_e_images(self, title, content, keyword, num_images=4, image_prompts=None, on_progress=None, session_id=None):
+        """DALL-E 이미지 동시 생성 (image_prompts가 주어지면 프롬프트 생성 호출 생략)
+
+        on_progress는 이미지가 하나씩 끝날 때마다 image_generation의 진행 이벤트로 호출됩니다.
+        생성된 이미지는 URL이 만료되기 전에 바로 로컬 이미지 저장소에 내려받습니다.
+        """
+        # 이미지 프롬프트 생성
+        if image_prompts:
+            prompts_text = image_prompts
+        else:
+            prompts_text = self.create_image_prompts(title, content, keyword, num_images)
+
+        batch = self.create_image_batch(title, keyword, num_images, on_progress=on_progress, session_id=session_id)
+        for prompt in prompts_text[:num_images]:
+            batch.submit(prompt)
+        return batch.wait()
+
+    def track_image_progress(self, session_id, total):
+        """세션에 이미지 진행 상황을 기록하는 (on_progress, finish) 콜백 반환
+
+        진행 상황은 공유 저장소에 저장되므로 /api/image_progress 요청이 다른 워커로 가도 조회됩니다.
+        """
+        progress = {'total': total, 'completed': 0, 'failed': 0, 'images': [], 'done': False}
+        lock = threading.Lock()
+
+        def save():
+            if session_id:
+                self.sessions.set_field(session_id, 'image_progress', progress)
+
+        def on_progress(event):
+            with lock:
+                progress['completed'] = event['completed']
+                progress['failed'] = event['failed']
+                if event['image']:
+                    progress['images'].append(event['image'])
+                save()
+
+        def finish():
+            with lock:
+                progress['done'] = True
+                save()
+
+        save()
+        return on_progress, finish
+
+    def create_image_batch(self, title, keyword, num_images=4, on_progress=None, session_id=None):
+        """프롬프트를 submit()하는 즉시 DALL-E 생성을 시작하는 ImageBatch 반환
+
+        본문 스트리밍 중 이미지 프롬프트 슬롯이 나올 때마다 바로 이미지를 만들 때 사용합니다.
+        """
         if not OPENAI_AVAILABLE:
             raise Exception("OpenAI 라이브러리가 설치되지 않았습니다.")
 
         if not self.openai_api_key:
             raise Exception("OpenAI API 키가 설정되지 않았습니다.")
 
-        client = OpenAI(api_key=self.openai_api_key)
-
-        # 이미지 프롬프트 생성
-        prompts_text = self.create_image_prompts(title, content, keyword, num_images)
-
-        generated_images = []
+        client = self.openai_client()
 
-        for i, prompt in enumerate(prompts_text[:num_images]):
-            try:
-                response = client.images.generate(
-                    model="dall-e-3",
-                    prompt=prompt,
-                    size="1024x1024",
-                    quality="standard",
-                    n=1
-                )
+        # 작업 스레드에는 요청 컨텍스트가 없으므로 마감시간을 직접 전달
+        deadline = llm_client.get_request_deadline()
 
-                if response and response.data and len(response.data) > 0:
-                    image_url = response.data[0].url
-                    generated_images.append({
-                        'prompt': prompt,
-                        'url': image_url,
-                        'index': i+1
-                    })
+        def generate_one(prompt, index):
+            response = llm_client.generate_image(
+                client,
+                deadline=deadline,
+                model="dall-e-3",
+                prompt=prompt,
+                size="1024x1024",
+                quality="standard",
+                n=1
+            )
 
-                time.sleep(1)  # API 호출 간격 조절
+            if not (response and response.data and len(response.data) > 0):
+                return None
 
+            image = {
+                'prompt': prompt,
+                'url': response.data[0].url,
+                'index': index
+            }
+            try:
+                digest = image_store.save_from_url(image['url'], {
+                    'prompt': prompt,
+                    'session_id': session_id,
+                    'keyword': keyword,
+                    'title': title,
+                    'index': index
+                })
+                image['hash'] = digest
+                image['local_url'] = f"/images/{digest}.png"
+                # 미리보기용 썸네일 / 블로그용 축소본은 별도 프로세스에서 미리 만들어 둠
+                if schedule_variants(image_store.path_for(digest)) is not None:
+                    image['variants'] = {name: f"/images/{digest}/{name}" for name in VARIANTS}
             except Exception as e:
-                print(f"이미지 {i+1} 생성 오류: {str(e)}")
-                continue
+                logger.warning("이미지 %s 로컬 저장 오류 (원본 URL 사용): %s", index, e)
+            return image
 
-        return generated_images
+        return ImageBatch(generate_one, total=num_images, on_progress=on_progress, deadline=deadline)
 
     def create_image_prompts(self, title, content, keyword, num_images=4):
         """블로그 내용 기반으로 이미지 생성 프롬프트 생성"""
         try:
             # GPT로 콘텐츠 분류 및 이미지 프롬프트 생성
-            client = OpenAI(api_key=self.openai_api_key)
+            client = self.openai_client()
 
+            # 고정 지침을 앞에, 글 데이터를 뒤에 두어 프롬프트 캐시가 적중하도록 구성
             prompt_request = f"""
-다음 블로그 글을 분석하여 이미지 유형을 분류하고, 전문적인 사진 스타일의 DALL-E 프롬프트 {num_images}개를 생성해주세요.
-
-제목: {title}
-키워드: {keyword}
-
-블로그 내용:
-{content[:2000]}
+아래 [블로그 글]을 분석하여 이미지 유형을 분류하고, 전문적인 사진 스타일의 DALL-E 프롬프트를 생성해주세요.
 
 === 작업 순서 ===
 1단계: 글 내용을 분석하여 주요 이미지 유형을 "인물", "자연", "제품/사물" 중에서 분류
@@ -701,10 +1017,20 @@ class BlogWebApp:
 2. [완성된 프롬프트]
 3. [완성된 프롬프트]
 4. [완성된 프롬프트]
+
+[블로그 글]
+생성할 프롬프트 개수: {num_images}개
+제목: {title}
+키워드: {keyword}
+
+블로그 내용:
+{content[:2000]}
 """
 
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
+            response = llm_client.create_chat_completion(
+                client,
+                'image_prompts',
+                timeout=45,
                 messages=[
                     {"role": "system", "content": "당신은 전문 사진작가이자 DALL-E 프롬프트 전문가입니다. 블로그 내용을 분석하여 적절한 유형을 분류하고, 고품질의 전문적인 사진 스타일 프롬프트를 생성합니다."},
                     {"role": "user", "content": prompt_request}
@@ -714,7 +1040,7 @@ class BlogWebApp:
             )
 
             prompts_text = response.choices[0].message.content
-            print(f"Generated prompts text: {prompts_text}")
+            logger.debug("Generated prompts text: %s", prompts_text)
 
             # 프롬프트 파싱
             prompts = []
@@ -736,7 +1062,7 @@ class BlogWebApp:
             return prompts[:num_images]
 
         except Exception as e:
-            print(f"이미지 프롬프트 생성 오류: {str(e)}")
+            logger.error("이미지 프롬프트 생성 오류: %s", e)
             return self.get_backup_professional_prompts(title, keyword, num_images)
 
     def get_backup_professional_prompts(self, title, keyword, num_images=4):
@@ -778,13 +1104,125 @@ class BlogWebApp:
                 f"Professional product photography of innovative {keyword} concept, minimalist background, subtle studio lighting, Nikon D850, macro lens, sharp details, realistic textures, ultra-detailed, 4K quality"
             ][:num_images]
 
+    def run_full_pipeline(self, keyword, options=None, session_id=None, on_stage_done=None):
+        """키워드 하나로 검색부터 이미지까지 전체 글 생성 (의존성 그래프로 단계 병렬 실행)
+
+        search → analysis → titles 이후 본문 생성과 이미지 프롬프트/이미지 생성이 동시에 진행됩니다.
+        이미지 프롬프트는 완성된 본문 대신 제목과 분석 요약(글 개요)을 기반으로 만듭니다.
+        inline_image_prompts 옵션을 켜면 본문 생성 응답에 섹션별 이미지 프롬프트를 함께 받아
+        별도 프롬프트 호출 없이, 본문이 스트리밍되는 동안 슬롯이 나오는 대로 이미지를 만듭니다.
+        num_articles가 2 이상이면 다음 순위 제목들로 추가 글(more_articles)을 함께 작성하며,
+        이미지는 첫 번째 글에만 만듭니다. 0이면 제목까지만 생성합니다.
+        on_stage_done(name, timing)은 단계가 끝날 때마다 호출됩니다 (진행 상황 보고용).
+        """
+        options = options or {}
+        search_count = options.get('search_count', 50)
+        sort_type = options.get('sort_type', 'date')
+        analysis_type = options.get('analysis_type', 'comprehensive')
+        num_titles = options.get('num_titles', 10)
+        prompt_type = options.get('prompt_type', 'informative')
+        additional_prompt = options.get('additional_prompt', '')
+        min_chars = options.get('min_chars', 4000)
+        max_chars = options.get('max_chars', 8000)
+        num_images = options.get('num_images', 4)
+        num_articles = min(options.get('num_articles', 1), num_titles)
+        inline_image_prompts = bool(options.get('inline_image_prompts')) and num_images > 0 and num_articles > 0
+
+        def search_stage(results):
+            search_result = self.search_naver_blog(keyword, search_count, sort_type)
+            record = self.build_search_record(keyword, search_result)
+            if not record.titles:
+                raise Exception("검색된 블로그 제목이 없습니다.")
+            return record
+
+        def analysis_stage(results):
+            search = results['search']
+            return self.analyze_with_gpt(search.titles, search.descriptions, keyword, analysis_type)
+
+        def digest_stage(results):
+            return self.get_analysis_digest(results['analysis'])
+
+        def titles_stage(results):
+            generated = self.generate_titles_with_gpt(results['analysis_digest'], keyword, num_titles)
+            return self.parse_generated_titles(generated, keyword, num_titles)
+
+        def content_stage(results):
+            return self.generate_blog_content(
+                results['titles'][0], keyword, prompt_type, additional_prompt,
+                min_chars, max_chars, results['analysis_digest']
+            )
+
+        def more_articles_stage(results):
+            # 본문과 동시에 진행 (추가 글끼리는 순서대로 작성해 호출 수가 한꺼번에 늘지 않도록 함)
+            return [
+                {
+                    'title': title,
+                    'content': self.generate_blog_content(
+                        title, keyword, prompt_type, additional_prompt,
+                        min_chars, max_chars, results['analysis_digest']
+                    )
+                }
+                for title in results['titles'][1:num_articles]
+            ]
+
+        def image_prompts_stage(results):
+            # 본문 완성을 기다리지 않고 제목 + 분석 요약을 개요로 사용
+            return self.create_image_prompts(results['titles'][0], results['analysis_digest'], keyword, num_images)
+
+        def images_stage(results):
+            return self.generate_dall_e_images(
+                results['titles'][0], '', keyword, num_images,
+                image_prompts=results['image_prompts'],
+                session_id=session_id
+            )
+
+        def article_stage(results):
+            # 본문 스트리밍 중 이미지 프롬프트 슬롯이 나오는 즉시 이미지 생성 시작
+            batch = self.create_image_batch(results['titles'][0], keyword, num_images, session_id=session_id)
+            content, image_prompts = self.generate_blog_content_with_image_prompts(
+                results['titles'][0], keyword, prompt_type, additional_prompt,
+                min_chars, max_chars, results['analysis_digest'],
+                num_images=num_images,
+                on_image_prompt=batch.submit
+            )
+            return {'content': content, 'image_prompts': image_prompts, 'batch': batch}
+
+        runner = PipelineRunner(max_workers=4)
+        runner.add('search', search_stage)
+        runner.add('analysis', analysis_stage, deps=['search'])
+        runner.add('analysis_digest', digest_stage, deps=['analysis'])
+        runner.add('titles', titles_stage, deps=['analysis_digest'])
+        if inline_image_prompts:
+            runner.add('article', article_stage, deps=['titles', 'analysis_digest'])
+            runner.add('content', lambda results: results['article']['content'], deps=['article'])
+            runner.add('image_prompts', lambda results: results['article']['image_prompts'], deps=['article'])
+            runner.add('images', lambda results: results['article']['batch'].wait(), deps=['article'])
+        elif num_articles > 0:
+            runner.add('content', content_stage, deps=['titles', 'analysis_digest'])
+        if num_articles > 1:
+            runner.add('more_articles', more_articles_stage, deps=['titles', 'analysis_digest'])
+        if num_images and not inline_image_prompts:
+            runner.add('image_prompts', image_prompts_stage, deps=['titles', 'analysis_digest'])
+            runner.add('images', images_stage, deps=['image_prompts'])
+
+        logger.info("🚀 파이프라인 시작: '%s'", keyword)
+        def stage_done(name, timing):
+            logger.info("⏱️ %s: %s초 (%s)", name, timing.get('duration'), timing.get('status'))
+            if on_stage_done:
+                on_stage_done(name, timing)
+
+        results, timings, errors = runner.run(on_stage_done=stage_done)
+        logger.info("✅ 파이프라인 완료: 총 %s초", timings['total']['duration'])
+        results.pop('article', None)
+        return results, timings, errors
+
     def get_realtime_popular_keywords(self):
         """네이버 실시간 인기검색어 가져오기 (대체 방법)"""
         try:
             # DataLab API 대신 블로그 검색 기반으로 인기도 측정
             return self.get_naver_realtime_search()
         except Exception as e:
-            print(f"실시간 인기검색어 조회 오류: {e}")
+            logger.error("실시간 인기검색어 조회 오류: %s", e)
             return self.get_fallback_trending_keywords()
 
     def process_datalab_result(self, result):
@@ -842,97 +1280,77 @@ class BlogWebApp:
             #return response.json()
             return None #Returning None as the request part is commented out
         except Exception as e:
-            print(f"네이버 API 호출 오류: {str(e)}")
+            logger.error("네이버 API 호출 오류: %s", e)
             return None
 
     def get_google_trending_keywords(self):
-        """Google Trends에서 실시간 트렌딩 키워드 가져오기"""
+        """Google Trends에서 실시간 트렌딩 키워드 가져오기 (실패 시 대체 키워드)"""
         try:
-            if not TRENDS_AVAILABLE:
-                return self.get_fallback_google_keywords()
-            
-            pytrends = TrendReq(hl='ko', tz=540)  # 한국 시간대
-            
-            # 실시간 트렌드 가져오기
-            trending_searches_df = pytrends.trending_searches(pn='south_korea')
-            
-            if trending_searches_df is not None and not trending_searches_df.empty:
-                trending_keywords = []
-                for i, keyword in enumerate(trending_searches_df[0].head(10)):
-                    trending_keywords.append({
-                        'rank': i + 1,
-                        'keyword': keyword,
-                        'source': 'Google Trends',
-                        'category': '🔥 실시간 인기'
-                    })
-                
-                print(f"✅ Google Trends에서 {len(trending_keywords)}개 키워드 수집")
-                return trending_keywords
-            else:
-                return self.get_fallback_google_keywords()
-                
+            return self.fetch_google_trending_keywords()
         except Exception as e:
-            print(f"Google Trends API 오류: {str(e)}")
+            logger.error("Google Trends API 오류: %s", e)
             return self.get_fallback_google_keywords()
-    
+
+    def fetch_google_trending_keywords(self):
+        """Google Trends 실시간 트렌드 조회 (실패 시 예외 - trend_cache가 마지막 결과 유지)"""
+        if not TRENDS_AVAILABLE:
+            raise Exception("pytrends가 설치되지 않았습니다.")
+
+        from pytrends.request import TrendReq
+
+        pytrends = TrendReq(hl='ko', tz=540, timeout=(3, TREND_FETCH_TIMEOUT))  # 한국 시간대
+
+        # 실시간 트렌드 가져오기
+        trending_searches_df = pytrends.trending_searches(pn='south_korea')
+        if trending_searches_df is None or trending_searches_df.empty:
+            raise Exception("Google Trends 결과가 비어 있습니다.")
+
+        trending_keywords = []
+        for i, keyword in enumerate(trending_searches_df[0].head(10)):
+            trending_keywords.append({
+                'rank': i + 1,
+                'keyword': keyword,
+                'source': 'Google Trends',
+                'category': '🔥 실시간 인기'
+            })
+
+        logger.info("✅ Google Trends에서 %d개 키워드 수집", len(trending_keywords))
+        return trending_keywords
+
     def get_naver_datalab_keywords(self):
-        """네이버 DataLab에서 실시간 트렌드 키워드 가져오기"""
+        """네이버 DataLab에서 실시간 트렌드 키워드 가져오기 (실패 시 대체 키워드)"""
         try:
-            if not self.client_id or not self.client_secret:
-                return self.get_fallback_naver_keywords()
-            
-            # 네이버 DataLab API 호출
-            url = "https://openapi.naver.com/v1/datalab/search"
-            headers = {
-                "X-Naver-Client-Id": self.client_id,
-                "X-Naver-Client-Secret": self.client_secret,
-                "Content-Type": "application/json"
-            }
-            
-            # 최근 1주일 인기 키워드 검색
-            from datetime import datetime, timedelta
-            end_date = datetime.now().strftime('%Y-%m-%d')
-            start_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-            
-            # 인기 키워드들로 검색량 비교
-            popular_keywords = ['ChatGPT', '다이어트', '부동산', '주식', '여행', '요리', '운동', '영화', '게임', '쇼핑']
-            
-            body = {
-                "startDate": start_date,
-                "endDate": end_date,
-                "timeUnit": "date",
-                "keywordGroups": [{"groupName": keyword, "keywords": [keyword]} for keyword in popular_keywords[:5]]
-            }
-            
-            response = requests.post(url, headers=headers, json=body)
-            
-            if response.status_code == 200:
-                data = response.json()
-                naver_keywords = []
-                
-                for i, group in enumerate(data.get('results', [])):
-                    keyword = group.get('title', '')
-                    # 최근 검색량 계산
-                    recent_data = group.get('data', [])
-                    if recent_data:
-                        avg_ratio = sum(item['ratio'] for item in recent_data[-3:]) / len(recent_data[-3:])
-                        naver_keywords.append({
-                            'rank': i + 1,
-                            'keyword': keyword,
-                            'source': 'Naver DataLab',
-                            'category': '📊 검색량 상위',
-                            'trend_score': round(avg_ratio, 1)
-                        })
-                
-                print(f"✅ 네이버 DataLab에서 {len(naver_keywords)}개 키워드 수집")
-                return naver_keywords
-            else:
-                print(f"네이버 DataLab API 오류: {response.status_code}")
-                return self.get_fallback_naver_keywords()
-                
+            return self.fetch_naver_datalab_keywords()
         except Exception as e:
-            print(f"네이버 DataLab API 오류: {str(e)}")
+            logger.error("네이버 DataLab API 오류: %s", e)
             return self.get_fallback_naver_keywords()
+
+    def fetch_naver_datalab_keywords(self, limit=10):
+        """네이버 DataLab 검색량 상위 키워드 (실패 시 예외 - trend_cache가 마지막 결과 유지)
+
+        미리 정의된 카테고리의 키워드 전체를 최근 1주일 검색량으로 비교합니다.
+        """
+        categories = {}
+        for category, data in self.get_predefined_categories().items():
+            for keyword in data['keywords']:
+                categories.setdefault(keyword, category)
+
+        series, failed = self.datalab.trends(list(categories), days=7)
+        if not series:
+            raise Exception(f"DataLab 조회 실패 (키워드 {len(failed)}개)")
+
+        naver_keywords = []
+        for item in rank_series(series, limit=limit):
+            naver_keywords.append({
+                'rank': item['rank'],
+                'keyword': item['keyword'],
+                'source': 'Naver DataLab',
+                'category': categories.get(item['keyword'], '📊 검색량 상위'),
+                'trend_score': item['trend_score']
+            })
+
+        logger.info("✅ 네이버 DataLab에서 %d개 키워드 수집 (비교 %d개, 실패 %d개)", len(naver_keywords), len(series), len(failed))
+        return naver_keywords
     
     def get_fallback_google_keywords(self):
         """Google Trends 실패시 대체 키워드"""
@@ -972,82 +1390,279 @@ class BlogWebApp:
         ]
 
     def get_predefined_categories(self):
-        """미리 정의된 카테고리들 반환"""
-        return {
-            "🔥 트렌드/핫이슈": {
-                "keywords": ["ChatGPT", "인공지능", "메타버스", "NFT", "가상화폐", "전기차", "ESG", "구독경제", "MZ세대", "클린뷰티", "비건", "제로웨이스트", "틱톡", "릴스", "숏폼", "AI그림"],
-                "description": "최신 화제, 뉴스, 사회적 이슈",
-                "color": "linear-gradient(135deg, #ff6b6b, #ee5a24)"
-            },
-            "💰 재테크/투자": {
-                "keywords": ["주식", "부동산", "가상화폐", "비트코인", "투자", "펀드", "적금", "연금", "세금", "절세", "파이어족", "경제독립", "코인", "ETF", "채권", "배당주"],
-                "description": "주식, 부동산, 투자 관련 정보",
-                "color": "linear-gradient(135deg, #2ecc71, #27ae60)"
-            },
-            "🏃‍♀️ 건강/피트니스": {
-                "keywords": ["다이어트", "홈트레이닝", "요가", "필라테스", "러닝", "헬스", "단백질", "비타민", "수면", "스트레칭", "마라톤", "크로스핏", "PT", "체중감량", "근력운동", "유산소"],
-                "description": "운동, 다이어트, 건강관리",
-                "color": "linear-gradient(135deg, #3498db, #2980b9)"
-            },
-            "🍳 요리/레시피": {
-                "keywords": ["에어프라이어", "홈쿡", "다이어트식단", "간편요리", "베이킹", "비건요리", "키토식단", "도시락", "브런치", "디저트", "발효음식", "한식", "양식", "중식", "일식", "분식"],
-                "description": "음식, 요리법, 맛집 정보",
-                "color": "linear-gradient(135deg, #f39c12, #e67e22)"
-            },
-            "✈️ 여행/관광": {
-                "keywords": ["제주도", "부산", "강릉", "경주", "전주", "해외여행", "캠핑", "글램핑", "호텔", "펜션", "배낭여행", "패키지여행", "일본여행", "유럽여행", "동남아여행", "국내여행"],
-                "description": "국내외 여행, 명소, 숙박",
-                "color": "linear-gradient(135deg, #9b59b6, #8e44ad)"
-            },
-            "🎮 취미/엔터": {
-                "keywords": ["독서", "영화", "게임", "드라마", "웹툰", "음악", "그림", "사진", "넷플릭스", "유튜브", "스트리밍", "OTT", "애니메이션", "K팝", "드라마추천", "영화추천"],
-                "description": "게임, 영화, 드라마, 음악",
-                "color": "linear-gradient(135deg, #e74c3c, #c0392b)"
-            },
-            "👔 비즈니스/마케팅": {
-                "keywords": ["창업", "부업", "마케팅", "브랜딩", "SNS마케팅", "유튜브", "블로그", "온라인쇼핑", "이커머스", "스타트업", "프리랜서", "사이드잡", "디지털마케팅", "광고", "콘텐츠마케팅", "인플루언서"],
-                "description": "창업, 마케팅, 온라인 사업",
-                "color": "linear-gradient(135deg, #34495e, #2c3e50)"
-            },
-            "🏠 라이프스타일": {
-                "keywords": ["인테리어", "정리정돈", "미니멀라이프", "가드닝", "반려동물", "육아", "교육", "패션", "뷰티", "스킨케어", "홈데코", "살림", "청소", "수납", "홈카페", "플랜테리어"],
-                "description": "인테리어, 패션, 일상",
-                "color": "linear-gradient(135deg, #1abc9c, #16a085)"
-            },
-            "💻 IT/테크": {
-                "keywords": ["프로그래밍", "앱개발", "웹개발", "코딩", "개발자", "IT트렌드", "스마트폰", "갤럭시", "아이폰", "노트북", "태블릿", "AI", "빅데이터", "클라우드", "보안", "블록체인"],
-                "description": "프로그래밍, IT, 테크 정보",
-                "color": "linear-gradient(135deg, #6c5ce7, #5f3dc4)"
-            },
-            "📚 교육/학습": {
-                "keywords": ["영어공부", "토익", "토플", "자격증", "공무원", "취업", "면접", "자기계발", "온라인강의", "독학", "스터디", "시험", "학원", "인강", "어학연수", "유학"],
-                "description": "교육, 학습, 자기계발",
-                "color": "linear-gradient(135deg, #fd79a8, #e84393)"
-            },
-            "🚗 자동차/모빌리티": {
-                "keywords": ["자동차", "전기차", "하이브리드", "중고차", "신차", "자동차리뷰", "카페", "드라이브", "캠핑카", "모터사이클", "자전거", "킥보드", "대중교통", "택시", "카셰어링", "렌터카"],
-                "description": "자동차, 모빌리티, 교통",
-                "color": "linear-gradient(135deg, #00b894, #00a085)"
-            },
-            "🏥 의료/건강정보": {
-                "keywords": ["건강검진", "병원", "의료정보", "건강관리", "약물", "질병", "예방접종", "한의학", "치과", "성형", "피부과", "내과", "정신건강", "스트레스", "우울증", "불안"],
-                "description": "의료, 건강, 질병 정보",
-                "color": "linear-gradient(135deg, #00cec9, #00b894)"
-            }
-        }
-
-# 웹앱 인스턴스 생성
-blog_app = BlogWebApp()
+        """미리 정의된 카테고리들 반환 (data/categories.json, 데스크톱 앱과 공유)"""
+        return category_catalog.categories()
+
+    # --- 단계별 API의 요청 검증 / 세션 저장 (Flask 라우트, 작업 큐, ASGI 라우트 공통) ---
+    # 라우트는 parse_*_request로 입력을 검증하고, 외부 호출(동기 또는 코루틴)만 직접 한 뒤 save_*로 세션에 저장해
+    # 응답 dict를 받습니다. 검증 실패는 ApiError, 그 사이 만료된 세션은 SessionExpired로 알립니다.
+
+    def save_session_fields(self, session_id, fields):
+        """세션에 단계 결과 저장 - 그 사이 만료/삭제된 세션은 되살리지 않고 SessionExpired 발생"""
+        if not self.sessions.update(session_id, fields):
+            raise SessionExpired('세션이 만료되었습니다. 처음부터 다시 검색해주세요.')
+
+    def load_session_fields(self, session_id, fields, required=()):
+        """작업 실행 시 세션 필드 읽기 - 세션이 없거나 required 필드가 없으면 SessionExpired"""
+        data = self.sessions.get(session_id, fields=fields) if session_id else None
+        if data is None or any(data.get(field) is None for field in required):
+            raise SessionExpired('세션이 만료되었습니다. 처음부터 다시 검색해주세요.')
+        return data
+
+    def require_session(self, data, fields=(), required=(), missing_message=None):
+        """요청의 session_id로 세션 필드를 읽어 (session_id, 필드 dict) 반환 - 없으면 ApiError"""
+        session_id = data.get('session_id')
+        result_data = self.sessions.get(session_id, fields=fields) if session_id else None
+        if result_data is None:
+            raise ApiError('유효하지 않은 세션입니다')
+        if any(result_data.get(field) is None for field in required):
+            raise ApiError(missing_message or '유효하지 않은 세션입니다')
+        return session_id, result_data
+
+    def parse_search_request(self, data):
+        """검색 요청 → (키워드, 검색 결과 수, 정렬)"""
+        keyword = str(data.get('keyword') or '').strip()
+        if not keyword:
+            raise ApiError('키워드를 입력해주세요')
+        if not self.client_id or not self.client_secret:
+            raise ApiError(
+                '네이버 API 키가 설정되지 않았습니다. Secrets에서 NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET_KEY를 설정해주세요.',
+                details={'client_id_set': bool(self.client_id), 'client_secret_set': bool(self.client_secret)}
+            )
+        search_count = request_int(data, 'search_count', 50, 1, 100)
+        sort_type = data.get('sort_type') if data.get('sort_type') in ('date', 'sim') else 'date'
+        return keyword, search_count, sort_type
 
-def require_auth(f):
-    """인증 필요 데코레이터"""
-    from functools import wraps
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not session.get('authenticated'):
-            return jsonify({'error': '인증이 필요합니다.', 'redirect': '/login'}), 401
-        return f(*args, **kwargs)
-    return decorated_function
+    def save_search(self, keyword, search_result):
+        """검색 결과를 새 세션에 저장하고 (session_id, 응답 dict) 반환 (검색 레코드 하나에 제목/설명을 함께 보관)"""
+        if not search_result:
+            raise ApiError('검색 결과를 가져올 수 없습니다.', status=500)
+        search = self.build_search_record(keyword, search_result)
+        titles = search.titles
+        if not titles:
+            raise ApiError('검색된 블로그 제목이 없습니다. 다른 키워드를 시도해보세요.', status=404)
+
+        session_id = str(uuid.uuid4())
+        self.sessions.create(session_id, {
+            'keyword': keyword,
+            'search': search,
+            'timestamp': datetime.now()
+        })
+        logger.info("✅ 검색 완료: %d개 제목 수집됨", len(titles))
+        return session_id, {
+            'success': True,
+            'session_id': session_id,
+            'total_results': search.total,
+            'collected_titles': len(titles),
+            'titles': titles,  # 전체 검색 결과 반환
+            'average_length': sum(len(t) for t in titles) / len(titles)
+        }
+
+    def parse_analyze_request(self, data):
+        """분석 요청 → 작업 params (session_id, analysis_type)"""
+        session_id, _ = self.require_session(data, fields=('search',), required=('search',))
+        return {
+            'session_id': session_id,
+            'analysis_type': str(data.get('analysis_type') or 'comprehensive')
+        }
+
+    def save_analysis(self, session_id, analysis_type, analysis_result):
+        """분석 결과 저장 (이후 프롬프트에서 재사용할 요약도 한 번만 만들어 함께 저장) 후 응답 dict"""
+        self.save_session_fields(session_id, {
+            'analysis_result': analysis_result,
+            'analysis_digest': self.get_analysis_digest(analysis_result),
+            'analysis_type': analysis_type
+        })
+        return {
+            'success': True,
+            'analysis_result': analysis_result
+        }
+
+    def parse_titles_request(self, data):
+        """제목 생성 요청 → (params, 세션 필드) - 분석 요약이 있으면 요약을 analysis로 전달"""
+        session_id, result_data = self.require_session(
+            data, fields=('keyword', 'analysis_result', 'analysis_digest'),
+            required=('analysis_result',), missing_message='먼저 분석을 실행해주세요'
+        )
+        params = {'session_id': session_id, 'num_titles': request_int(data, 'num_titles', 10, 1)}
+        return params, {
+            'keyword': result_data['keyword'],
+            'analysis': result_data.get('analysis_digest') or result_data['analysis_result']
+        }
+
+    def save_titles(self, session_id, keyword, generated_titles, num_titles):
+        """생성된 제목 응답을 파싱해 저장하고 응답 dict 반환"""
+        extracted_titles = self.parse_generated_titles(generated_titles, keyword, num_titles)
+        self.save_session_fields(session_id, {'generated_titles': extracted_titles})
+        return {
+            'success': True,
+            'titles': extracted_titles
+        }
+
+    def parse_blog_request(self, data):
+        """본문 생성 요청 → 작업 params"""
+        session_id, _ = self.require_session(data)
+        selected_title = str(data.get('title') or '').strip()
+        if not selected_title:
+            raise ApiError('제목을 선택해주세요')
+        return {
+            'session_id': session_id,
+            'title': selected_title,
+            'prompt_type': data.get('prompt_type', 'informative'),
+            'additional_prompt': data.get('additional_prompt', ''),
+            'min_chars': request_int(data, 'min_chars', 4000),
+            'max_chars': request_int(data, 'max_chars', 8000),
+            # 본문과 함께 섹션별 이미지 프롬프트를 받아 두면 이미지 생성 시 프롬프트 호출을 생략
+            'inline_image_prompts': bool(data.get('inline_image_prompts')),
+            'num_images': request_int(data, 'num_images', 4, 0, 10)
+        }
+
+    def save_blog_content(self, params, keyword, blog_content, image_prompts=None):
+        """생성된 본문 저장 후 응답 dict (SEO 분석 포함)"""
+        self.save_session_fields(params['session_id'], {'blog_content': ArticleRecord(
+            params['title'],
+            blog_content,
+            prompt_type=params['prompt_type'],
+            additional_prompt=params['additional_prompt'],
+            min_chars=params['min_chars'],
+            max_chars=params['max_chars'],
+            image_prompts=image_prompts
+        )})
+        return {
+            'success': True,
+            'title': params['title'],
+            'content': blog_content,
+            'char_count': len(blog_content),
+            'seo_analysis': self._analyze_seo_content(blog_content, keyword),
+            'keyword': keyword
+        }
+
+class LazyBlogWebApp:
+    """처음 사용할 때 BlogWebApp을 만드는 대리 객체
+
+    환경변수/.env 로드, 저장소 연결, 스위퍼와 트렌드 갱신 스레드 시작을 워커 import 시점이 아니라
+    첫 요청 시점으로 미룹니다. 속성 접근은 모두 실제 인스턴스로 전달됩니다.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    started = time.monotonic()
+                    self._instance = self._factory()
+                    logger.info("🚀 웹앱 초기화 완료 (%.2f초)", time.monotonic() - started)
+                instance = self._instance
+        return instance
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+# 웹앱 인스턴스 (첫 요청 때 생성)
+blog_app = LazyBlogWebApp(BlogWebApp)
+
+# 인증되지 않은 API 요청의 응답 본문 (Flask 라우트와 ASGI 라우트 공통)
+AUTH_REQUIRED_RESPONSE = {'error': '인증이 필요합니다.', 'redirect': '/login'}
+
+def is_authenticated(session_data):
+    """쿠키 세션(Flask session 또는 ASGI에서 복원한 dict)이 로그인된 상태인지 확인"""
+    return bool(session_data.get('authenticated'))
+
+def require_auth(f):
+    """인증 필요 데코레이터"""
+    from functools import wraps
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not is_authenticated(session):
+            return jsonify(AUTH_REQUIRED_RESPONSE), 401
+        return f(*args, **kwargs)
+    return decorated_function
+
+def remember_latest_session(session_id, *stages):
+    """이 클라이언트(Flask 쿠키 세션)의 단계별 최신 세션 ID 기록
+
+    레거시 라우트는 세션 ID를 주고받지 않으므로, 전체 세션을 훑는 대신
+    'search' / 'analysis' 단계마다 마지막 세션을 쿠키에 기록해 두고 바로 찾습니다.
+    """
+    latest = dict(session.get('latest_sessions') or {})
+    for stage in stages:
+        latest[stage] = session_id
+    session['latest_sessions'] = latest
+
+# 작업 종류별 처리 함수 (kind → handler(job, params), 응답 dict 반환)
+# 작업 큐 실행기는 다른 프로세스(job_worker.py)에서도 저장된 params만으로 이 함수들을 실행합니다.
+JOB_HANDLERS = {}
+
+def job_handler(kind):
+    """작업 처리 함수 등록 데코레이터 (바로 실행할 때 job은 None)"""
+    def register(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return register
+
+def run_or_enqueue(kind, params, data, session_id=None):
+    """요청에 async: true가 있으면 작업 큐에 넣고 202로 job_id 반환, 없으면 바로 실행해 결과 반환
+
+    params는 JSON으로 저장할 수 있는 값만 담아야 합니다 (다른 프로세스에서 다시 실행할 수 있도록).
+    """
+    if not data.get('async'):
+        return jsonify(JOB_HANDLERS[kind](None, params))
+    try:
+        job_id = blog_app.jobs.submit(kind, params, session_id=session_id)
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503
+    return jsonify(job_accepted(job_id, request.script_root)), 202
+
+def api_error_response(error):
+    """ApiError / SessionExpired를 JSON 오류 응답으로 변환"""
+    if isinstance(error, ApiError):
+        return jsonify(error.to_dict()), error.status
+    return jsonify({'error': str(error)}), 400
+
+def job_accepted(job_id, script_root=''):
+    """작업을 큐에 넣었을 때의 202 응답 본문 (Flask/ASGI 공통, script_root는 앱이 마운트된 경로)"""
+    return {
+        'success': True,
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': f"{script_root}/api/jobs/{job_id}",
+        'events_url': f"{script_root}/api/jobs/{job_id}/events"
+    }
+
+def job_payload(job_id, job):
+    """작업 상태 응답 (결과는 완료된 경우에만 포함)"""
+    payload = {
+        'success': job['status'] != 'failed',
+        'job_id': job_id,
+        'kind': job.get('kind'),
+        'status': job['status'],
+        'session_id': job.get('session_id'),
+        'progress': job.get('progress') or {},
+        'attempts': job.get('attempts'),
+        'created_at': job.get('created_at'),
+        'started_at': job.get('started_at'),
+        'finished_at': job.get('finished_at'),
+        'updated_at': job.get('updated_at')
+    }
+    if job['status'] == 'done':
+        payload['result'] = job.get('result')
+    elif job['status'] == 'failed':
+        payload['error'] = job.get('error')
+    return payload
+
+def latest_session_for(stage, fields=()):
+    """이 클라이언트의 stage 단계 최신 세션 (session_id, 필드 dict) - 없거나 만료됐으면 (None, None)"""
+    session_id = (session.get('latest_sessions') or {}).get(stage)
+    data = blog_app.sessions.get(session_id, fields=fields) if session_id else None
+    if data is None:
+        return None, None
+    return session_id, data
 
 @app.route('/')
 def index():
@@ -1086,62 +1701,24 @@ def attached_assets(filename):
 def api_search():
     """네이버 블로그 검색 API"""
     try:
-        data = request.get_json()
-        keyword = data.get('keyword', '').strip()
-        search_count = data.get('search_count', 50)
-        sort_type = data.get('sort_type', 'date')
-
-        print(f"🔍 검색 요청 받음: '{keyword}' (개수: {search_count}, 정렬: {sort_type})")
+        data = request.get_json() or {}
+        keyword, search_count, sort_type = blog_app.parse_search_request(data)
 
-        if not keyword:
-            return jsonify({'error': '키워드를 입력해주세요'}), 400
-
-        # 환경변수 체크
-        if not blog_app.client_id or not blog_app.client_secret:
-            return jsonify({
-                'error': '네이버 API 키가 설정되지 않았습니다. Secrets에서 NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET_KEY를 설정해주세요.',
-                'details': {
-                    'client_id_set': bool(blog_app.client_id),
-                    'client_secret_set': bool(blog_app.client_secret)
-                }
-            }), 400
+        logger.info("🔍 검색 요청 받음: '%s' (개수: %s, 정렬: %s)", keyword, search_count, sort_type)
 
         # 네이버 블로그 검색
         search_result = blog_app.search_naver_blog(keyword, search_count, sort_type)
-        
-        if not search_result:
-            return jsonify({'error': '검색 결과를 가져올 수 없습니다.'}), 500
-            
-        titles, descriptions = blog_app.extract_blog_data(search_result)
-
-        if not titles:
-            return jsonify({'error': '검색된 블로그 제목이 없습니다. 다른 키워드를 시도해보세요.'}), 404
 
         # 결과를 세션에 저장
-        session_id = str(uuid.uuid4())
-        blog_app.temp_results[session_id] = {
-            'keyword': keyword,
-            'search_result': search_result,
-            'titles': titles,
-            'descriptions': descriptions,
-            'timestamp': datetime.now()
-        }
+        session_id, payload = blog_app.save_search(keyword, search_result)
+        remember_latest_session(session_id, 'search')
 
-        print(f"✅ 검색 완료: {len(titles)}개 제목 수집됨")
-
-        return jsonify({
-            'success': True,
-            'session_id': session_id,
-            'total_results': search_result.get('total', 0),
-            'collected_titles': len(titles),
-            'titles': titles,  # 전체 검색 결과 반환
-            'average_length': sum(len(t) for t in titles)/len(titles) if titles else 0
-        })
+        return jsonify(payload)
 
+    except ApiError as e:
+        return api_error_response(e)
     except Exception as e:
-        print(f"❌ 검색 API 오류: {str(e)}")
-        import traceback
-        print(f"📝 오류 상세: {traceback.format_exc()}")
+        logger.exception("❌ 검색 API 오류: %s", e)
         
         return jsonify({
             'error': str(e),
@@ -1149,37 +1726,39 @@ def api_search():
             'suggestion': '네이버 API 키 설정을 확인하거나 다른 키워드를 시도해보세요.'
         }), 500
 
+@job_handler('analyze')
+def analyze_job(job, params):
+    """AI 분석 작업 (params: session_id, analysis_type)"""
+    result_data = blog_app.load_session_fields(params['session_id'], ('keyword', 'search'), required=('search',))
+    if job:
+        job.progress(force=True, stage='analysis')
+
+    # AI 분석 실행
+    search = result_data['search']
+    analysis_result = blog_app.analyze_with_gpt(
+        search.titles, 
+        search.descriptions, 
+        result_data['keyword'], 
+        params['analysis_type']
+    )
+
+    return blog_app.save_analysis(params['session_id'], params['analysis_type'], analysis_result)
+
 @app.route('/api/analyze', methods=['POST'])
 @require_auth
 def api_analyze():
     """AI 분석 API"""
     try:
-        data = request.get_json()
-        session_id = data.get('session_id')
-        analysis_type = data.get('analysis_type', 'comprehensive')
-
-        if not session_id or session_id not in blog_app.temp_results:
-            return jsonify({'error': '유효하지 않은 세션입니다'}), 400
-
-        result_data = blog_app.temp_results[session_id]
-
-        # AI 분석 실행
-        analysis_result = blog_app.analyze_with_gpt(
-            result_data['titles'], 
-            result_data['descriptions'], 
-            result_data['keyword'], 
-            analysis_type
-        )
+        data = request.get_json() or {}
+        params = blog_app.parse_analyze_request(data)
 
-        # 분석 결과 저장
-        blog_app.temp_results[session_id]['analysis_result'] = analysis_result
-        blog_app.temp_results[session_id]['analysis_type'] = analysis_type
+        # 작업 큐에서 실행될 수 있으므로 쿠키 기록은 요청 안에서 먼저 처리
+        remember_latest_session(params['session_id'], 'analysis')
 
-        return jsonify({
-            'success': True,
-            'analysis_result': analysis_result
-        })
+        return run_or_enqueue('analyze', params, data, params['session_id'])
 
+    except (ApiError, SessionExpired) as e:
+        return api_error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1188,208 +1767,470 @@ def api_analyze():
 def api_generate_titles():
     """새로운 제목 생성 API"""
     try:
-        data = request.get_json()
-        session_id = data.get('session_id')
-        num_titles = data.get('num_titles', 10)
-
-        if not session_id or session_id not in blog_app.temp_results:
-            return jsonify({'error': '유효하지 않은 세션입니다'}), 400
-
-        result_data = blog_app.temp_results[session_id]
-
-        if 'analysis_result' not in result_data:
-            return jsonify({'error': '먼저 분석을 실행해주세요'}), 400
+        data = request.get_json() or {}
+        params, result_data = blog_app.parse_titles_request(data)
 
         # 새로운 제목 생성
         generated_titles = blog_app.generate_titles_with_gpt(
-            result_data['analysis_result'],
+            result_data['analysis'],
             result_data['keyword'],
-            num_titles
+            params['num_titles']
         )
 
-        # 제목 파싱 - 숫자로 시작하는 제목만 추출
-        extracted_titles = []
-        
-        if generated_titles and generated_titles.strip():
-            print(f"🔍 원본 GPT 응답: {generated_titles[:500]}...")
-            
-            # 줄별로 분리
-            lines = [line.strip() for line in generated_titles.split('\n') if line.strip()]
-            
-            import re
-            for line in lines:
-                # 숫자로 시작하는 줄 찾기 (1. 제목, 1) 제목, 1 제목 등)
-                match = re.match(r'^\d+[\.\)\s]\s*(.+)', line)
-                if match:
-                    title = match.group(1).strip()
-                    
-                    # 마크다운 제거
-                    title = re.sub(r'\*\*([^*]+)\*\*', r'\1', title)
-                    title = re.sub(r'\*([^*]+)\*', r'\1', title)
-                    
-                    # 금지된 키워드들이 포함되지 않았는지 확인
-                    forbidden_keywords = ['유형:', '타겟:', '목적:', '키워드:', '특징:', '설명:', 
-                                        '**유형**', '**타겟**', '**목적**', '**키워드**', '**특징**', '**설명**']
-                    
-                    # 제목에 금지된 키워드가 없고, 적절한 길이인 경우만 추가
-                    if (not any(keyword in title for keyword in forbidden_keywords) and 
-                        title and len(title) > 5 and len(title) < 200):
-                        extracted_titles.append(title)
-                        print(f"✅ 추출된 제목: {title}")
-                    else:
-                        print(f"❌ 제외된 라인: {title}")
-        
-        # 추출된 제목이 부족하면 fallback 제목 생성
-        if len(extracted_titles) < num_titles:
-            needed = num_titles - len(extracted_titles)
-            print(f"⚠️ 제목 부족 ({len(extracted_titles)}/{num_titles}), fallback 제목 {needed}개 추가")
-            
-            fallback_titles = [
-                f"{result_data['keyword']} 완벽 가이드",
-                f"{result_data['keyword']} 초보자를 위한 안내서", 
-                f"{result_data['keyword']} 알아야 할 모든 것",
-                f"{result_data['keyword']} 실전 활용법",
-                f"{result_data['keyword']} 추천 및 후기",
-                f"{result_data['keyword']} 성공 사례 분석",
-                f"{result_data['keyword']} 전문가 노하우",
-                f"{result_data['keyword']} 단계별 방법론",
-                f"{result_data['keyword']} 트렌드 분석",
-                f"{result_data['keyword']} 실무 적용기",
-                f"{result_data['keyword']} 비교 분석",
-                f"{result_data['keyword']} 선택 가이드"
-            ]
-            
-            # 기존 제목과 중복되지 않는 fallback 제목만 추가
-            for fallback in fallback_titles:
-                if fallback not in extracted_titles and len(extracted_titles) < num_titles:
-                    extracted_titles.append(fallback)
-
-        # 최종 제목 리스트를 지정된 개수로 제한
-        extracted_titles = extracted_titles[:num_titles]
-        
-        print(f"🎯 최종 제목 개수: {len(extracted_titles)}")
-        for i, title in enumerate(extracted_titles):
-            print(f"  {i+1}. {title}")
-
-        # 생성된 제목 저장
-        blog_app.temp_results[session_id]['generated_titles'] = extracted_titles
-
-        return jsonify({
-            'success': True,
-            'titles': extracted_titles
-        })
+        return jsonify(blog_app.save_titles(params['session_id'], result_data['keyword'], generated_titles, params['num_titles']))
 
+    except (ApiError, SessionExpired) as e:
+        return api_error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@job_handler('generate_blog')
+def generate_blog_job(job, params):
+    """블로그 글 생성 작업 (params: BlogWebApp.parse_blog_request 참고)"""
+    result_data = blog_app.load_session_fields(params['session_id'], ('keyword', 'analysis_result', 'analysis_digest'))
+    keyword = result_data['keyword']
+
+    # 분석 결과가 있으면 요약본을 함께 전달
+    analysis_result = result_data.get('analysis_digest') or result_data.get('analysis_result')
+
+    on_delta = None
+    if job:
+        # 작업으로 실행할 때는 스트리밍으로 받으며 생성된 글자수를 진행 상황으로 보고
+        job.progress(force=True, stage='content', chars=0, target_chars=params['min_chars'])
+        received = [0]
+
+        def on_delta(text):
+            received[0] += len(text)
+            job.progress(chars=received[0])
+
+    # 블로그 글 생성 (글자수 설정 및 분석 결과 포함)
+    image_prompts = None
+    if params['inline_image_prompts']:
+        blog_content, image_prompts = blog_app.generate_blog_content_with_image_prompts(
+            params['title'],
+            keyword,
+            params['prompt_type'],
+            params['additional_prompt'],
+            params['min_chars'],
+            params['max_chars'],
+            analysis_result,
+            num_images=params['num_images'],
+            on_delta=on_delta
+        )
+    else:
+        blog_content = blog_app.generate_blog_content(
+            params['title'],
+            keyword,
+            params['prompt_type'],
+            params['additional_prompt'],
+            params['min_chars'],
+            params['max_chars'],
+            analysis_result,
+            on_delta=on_delta
+        )
+
+    # 생성된 블로그 글 저장 (SEO 분석 포함 응답)
+    return blog_app.save_blog_content(params, keyword, blog_content, image_prompts)
+
 @app.route('/api/generate_blog', methods=['POST'])
 @require_auth
 def api_generate_blog():
     """블로그 글 생성 API"""
     try:
-        data = request.get_json()
-        session_id = data.get('session_id')
-        selected_title = data.get('title')
-        prompt_type = data.get('prompt_type', 'informative')
-        additional_prompt = data.get('additional_prompt', '')
-        min_chars = data.get('min_chars', 4000)
-        max_chars = data.get('max_chars', 8000)
+        data = request.get_json() or {}
+        params = blog_app.parse_blog_request(data)
+        return run_or_enqueue('generate_blog', params, data, params['session_id'])
 
-        if not session_id or session_id not in blog_app.temp_results:
-            return jsonify({'error': '유효하지 않은 세션입니다'}), 400
+    except (ApiError, SessionExpired) as e:
+        return api_error_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        if not selected_title:
-            return jsonify({'error': '제목을 선택해주세요'}), 400
+@job_handler('generate_images')
+def generate_images_job(job, params):
+    """이미지 생성 작업 (params: session_id, num_images)"""
+    session_id = params['session_id']
+    num_images = params['num_images']
+    result_data = blog_app.load_session_fields(session_id, ('keyword', 'blog_content'), required=('blog_content',))
+    blog_data = result_data['blog_content']
+
+    # 진행 상황 초기화 (/api/image_progress 에서 조회)
+    track_progress, finish_progress = blog_app.track_image_progress(session_id, num_images)
+    on_progress = track_progress
+    if job:
+        job.progress(force=True, stage='images', total=num_images, completed=0, failed=0)
+
+        def on_progress(event):
+            track_progress(event)
+            job.progress(completed=event['completed'], failed=event['failed'])
+
+    # 이미지 생성 (본문과 함께 받은 프롬프트가 충분하면 프롬프트 생성 호출 생략)
+    image_prompts = blog_data.get('image_prompts')
+    if image_prompts and len(image_prompts) < num_images:
+        image_prompts = None
+    try:
+        generated_images = blog_app.generate_dall_e_images(
+            blog_data['title'],
+            blog_data['content'],
+            result_data['keyword'],
+            num_images,
+            image_prompts=image_prompts,
+            on_progress=on_progress,
+            session_id=session_id
+        )
+    finally:
+        finish_progress()
 
-        result_data = blog_app.temp_results[session_id]
+    # 생성된 이미지 저장
+    blog_app.save_session_fields(session_id, {'generated_images': generated_images})
 
-        # 분석 결과가 있으면 함께 전달
-        analysis_result = result_data.get('analysis_result')
+    return {
+        'success': True,
+        'images': generated_images
+    }
 
-        # 블로그 글 생성 (글자수 설정 및 분석 결과 포함)
-        blog_content = blog_app.generate_blog_content(
-            selected_title,
-            result_data['keyword'],
-            prompt_type,
-            additional_prompt,
-            min_chars,
-            max_chars,
-            analysis_result
+@app.route('/api/generate_images', methods=['POST'])
+@require_auth
+def api_generate_images():
+    """이미지 생성 API"""
+    try:
+        data = request.get_json() or {}
+        session_id, _ = blog_app.require_session(
+            data, fields=('blog_content',), required=('blog_content',), missing_message='먼저 블로그 글을 생성해주세요'
         )
 
-        # 생성된 블로그 글 저장
-        blog_app.temp_results[session_id]['blog_content'] = {
-            'title': selected_title,
-            'content': blog_content,
-            'prompt_type': prompt_type,
-            'additional_prompt': additional_prompt,
-            'min_chars': min_chars,
-            'max_chars': max_chars
-        }
-
-        # SEO 분석 수행
-        seo_analysis = blog_app._analyze_seo_content(blog_content, result_data['keyword'])
-        
-        return jsonify({
-            'success': True,
-            'title': selected_title,
-            'content': blog_content,
-            'char_count': len(blog_content),
-            'seo_analysis': seo_analysis,
-            'keyword': result_data['keyword']
-        })
+        return run_or_enqueue('generate_images', {
+            'session_id': session_id,
+            'num_images': request_int(data, 'num_images', 4, 0, 10)
+        }, data, session_id)
 
+    except (ApiError, SessionExpired) as e:
+        return api_error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/generate_images', methods=['POST'])
+def save_pipeline_session(session_id, keyword, options, results):
+    """run_full_pipeline 결과를 단계별 API와 같은 형식으로 세션에 저장 (결과 조회/다운로드 재사용)"""
+    session_data = {
+        'keyword': keyword,
+        'search': results['search'],
+        'timestamp': datetime.now()
+    }
+    if 'analysis' in results:
+        session_data['analysis_result'] = results['analysis']
+        session_data['analysis_digest'] = results.get('analysis_digest', '')
+        session_data['analysis_type'] = options.get('analysis_type', 'comprehensive')
+    if 'titles' in results:
+        session_data['generated_titles'] = results['titles']
+
+    def article(title, content, image_prompts=None):
+        return ArticleRecord(
+            title,
+            content,
+            prompt_type=options.get('prompt_type', 'informative'),
+            additional_prompt=options.get('additional_prompt', ''),
+            min_chars=options.get('min_chars', 4000),
+            max_chars=options.get('max_chars', 8000),
+            image_prompts=image_prompts
+        )
+
+    if 'content' in results:
+        session_data['blog_content'] = article(results['titles'][0], results['content'], results.get('image_prompts'))
+    if results.get('more_articles'):
+        session_data['extra_articles'] = [article(item['title'], item['content']) for item in results['more_articles']]
+    if 'images' in results:
+        session_data['generated_images'] = results['images']
+    blog_app.sessions.create(session_id, session_data)
+    return session_data
+
+def parse_pipeline_options(data, max_articles=None):
+    """파이프라인 옵션의 숫자 값을 정수로 바꾸고 범위를 제한한 옵션 dict 반환 (형식이 틀리면 ApiError)"""
+    return dict(
+        data,
+        num_titles=request_int(data, 'num_titles', 10, 1),
+        num_articles=request_int(data, 'num_articles', 1, 0, max_articles),
+        num_images=request_int(data, 'num_images', 4, 0, 10),
+        search_count=request_int(data, 'search_count', 50, 1, 100),
+        min_chars=request_int(data, 'min_chars', 4000),
+        max_chars=request_int(data, 'max_chars', 8000)
+    )
+
+@job_handler('pipeline')
+def pipeline_job(job, params):
+    """전체 파이프라인 작업 (params: keyword, options, session_id) - 끝난 단계를 진행 상황으로 보고"""
+    keyword = params['keyword']
+    options = params['options']
+    session_id = params['session_id']
+
+    on_stage_done = None
+    if job:
+        job.progress(force=True, stage='search', completed_stages=[])
+        completed = []
+
+        def on_stage_done(name, timing):
+            completed.append(name)
+            job.progress(force=True, stage=name, completed_stages=list(completed))
+
+    results, timings, errors = blog_app.run_full_pipeline(
+        keyword, options, session_id=session_id, on_stage_done=on_stage_done
+    )
+    if 'search' not in results:
+        raise Exception(errors.get('search', '검색에 실패했습니다.'))
+
+    session_data = save_pipeline_session(session_id, keyword, options, results)
+
+    return {
+        'success': not errors,
+        'session_id': session_id,
+        'keyword': keyword,
+        'analysis_result': results.get('analysis'),
+        'titles': results.get('titles', []),
+        'title': session_data.get('blog_content', {}).get('title'),
+        'content': results.get('content'),
+        'extra_articles': results.get('more_articles', []),
+        'images': results.get('images', []),
+        'timings': timings,
+        'errors': errors
+    }
+
+@app.route('/api/pipeline', methods=['POST'])
 @require_auth
-def api_generate_images():
-    """이미지 생성 API"""
+def api_pipeline():
+    """키워드 하나로 검색 → 분석 → 제목 → 본문/이미지 전체 생성 API
+
+    async: true면 작업 큐에 넣고 202로 job_id를 반환합니다 (진행 상황의 stage는 마지막으로 끝난 단계).
+    """
     try:
-        data = request.get_json()
-        session_id = data.get('session_id')
-        num_images = data.get('num_images', 4)
+        data = request.get_json() or {}
+        keyword = str(data.get('keyword') or '').strip()
 
-        if not session_id or session_id not in blog_app.temp_results:
-            return jsonify({'error': '유효하지 않은 세션입니다'}), 400
+        if not keyword:
+            return jsonify({'error': '키워드를 입력해주세요'}), 400
+
+        try:
+            options = parse_pipeline_options(data)
+        except ApiError as e:
+            return api_error_response(e)
 
-        result_data = blog_app.temp_results[session_id]
+        # 작업 큐에서 실행될 수 있으므로 쿠키 기록은 요청 안에서 먼저 처리
+        session_id = str(uuid.uuid4())
+        remember_latest_session(session_id, 'search', 'analysis')
 
-        if 'blog_content' not in result_data:
-            return jsonify({'error': '먼저 블로그 글을 생성해주세요'}), 400
+        return run_or_enqueue('pipeline', {
+            'keyword': keyword,
+            'options': options,
+            'session_id': session_id
+        }, data, session_id)
 
-        blog_data = result_data['blog_content']
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        # 이미지 생성
-        generated_images = blog_app.generate_dall_e_images(
-            blog_data['title'],
-            blog_data['content'],
-            result_data['keyword'],
-            num_images
+@job_handler('batch')
+def batch_job(job, params):
+    """여러 키워드 일괄 생성 작업 (params: keywords, options) - 항목별 진행 상황을 작업 진행 상황으로 기록"""
+    keywords = params['keywords']
+    options = params['options']
+
+    def process(index, keyword, progress):
+        # 작업 전체가 아니라 키워드마다 마감시간 적용 (키워드 수에 비례해 작업이 길어짐)
+        llm_client.start_request_deadline(JOB_TIMEOUT)
+        session_id = str(uuid.uuid4())
+        progress.update(index, session_id=session_id)
+        results, timings, errors = blog_app.run_full_pipeline(
+            keyword, options, session_id=session_id,
+            on_stage_done=lambda name, timing: progress.update(index, stage=name)
         )
+        if 'search' not in results:
+            raise Exception(errors.get('search', '검색에 실패했습니다.'))
+        save_pipeline_session(session_id, keyword, options, results)
+        return {
+            'title': (results.get('titles') or [None])[0],
+            'articles': int('content' in results) + len(results.get('more_articles', [])),
+            'images': len(results.get('images', [])),
+            'duration': timings['total']['duration'],
+            'errors': errors
+        }
 
-        # 생성된 이미지 저장
-        blog_app.temp_results[session_id]['generated_images'] = generated_images
+    logger.info("📚 일괄 생성 시작: 키워드 %d개", len(keywords))
+    summary = run_batch(keywords, process, on_change=(lambda snapshot: job.progress(**snapshot)) if job else None)
+    logger.info("📚 일괄 생성 완료: 성공 %d개, 실패 %d개", summary['completed'], summary['failed'])
+    return dict(summary, success=summary['completed'] > 0)
 
-        return jsonify({
-            'success': True,
-            'images': generated_images
-        })
+@app.route('/api/batch', methods=['POST'])
+@require_auth
+def api_batch():
+    """여러 키워드 일괄 생성 API - 항상 작업 큐로 실행하고 202로 job_id 반환
+
+    키워드마다 /api/pipeline과 같은 전체 파이프라인을 실행해 각자 세션에 저장합니다.
+    항목별 진행 상황은 /api/jobs/<id>(/events)의 progress.items로, 결과는 download_url의 ZIP으로 받습니다.
+    """
+    try:
+        data = request.get_json() or {}
+        keywords = parse_keywords(data.get('keywords'))
+
+        if not keywords:
+            return jsonify({'error': '키워드를 입력해주세요'}), 400
+        if len(keywords) > BATCH_MAX_KEYWORDS:
+            return jsonify({'error': f'키워드는 한 번에 최대 {BATCH_MAX_KEYWORDS}개까지 요청할 수 있습니다.'}), 400
+
+        try:
+            options = parse_pipeline_options(data, max_articles=BATCH_MAX_ARTICLES)
+        except ApiError as e:
+            return api_error_response(e)
+        options.pop('keywords', None)
+
+        try:
+            job_id = blog_app.jobs.submit('batch', {'keywords': keywords, 'options': options})
+        except JobQueueFull as e:
+            return jsonify({'error': str(e)}), 503
+        return jsonify(dict(
+            job_accepted(job_id, request.script_root),
+            total=len(keywords),
+            keywords=keywords,
+            download_url=url_for('api_batch_download', job_id=job_id)
+        )), 202
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/image_progress/<session_id>')
+@require_auth
+def api_image_progress(session_id):
+    """이미지 생성 진행 상황 API (완료된 이미지부터 부분 결과 반환)"""
+    session_data = blog_app.sessions.get(session_id, fields=('image_progress',))
+    if session_data is None:
+        return jsonify({'error': '유효하지 않은 세션입니다'}), 400
+
+    progress = session_data.get('image_progress')
+    if not progress:
+        return jsonify({'error': '진행 중인 이미지 생성이 없습니다'}), 404
+
+    return jsonify({
+        'success': True,
+        'total': progress['total'],
+        'completed': progress['completed'],
+        'failed': progress['failed'],
+        'done': progress['done'],
+        'images': sorted(progress['images'], key=lambda image: image['index'])
+    })
+
+@app.route('/api/jobs/<job_id>')
+@require_auth
+def api_job_status(job_id):
+    """작업 상태 조회 API (status: queued / running / done / failed)"""
+    job = blog_app.jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
+    return jsonify(job_payload(job_id, job))
+
+@app.route('/api/jobs/<job_id>/events')
+@require_auth
+def api_job_events(job_id):
+    """작업 진행 상황 Server-Sent Events 스트림
+
+    sync 워커를 오래 붙잡지 않도록 JOB_EVENTS_MAX_SECONDS가 지나면 스트림을 닫으며,
+    EventSource는 retry 간격 뒤에 자동으로 다시 연결합니다.
+    """
+    if blog_app.jobs.get(job_id) is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
+
+    def events():
+        yield 'retry: 1000\n\n'
+        started = time.time()
+        last_sent = None
+        last_beat = started
+        while time.time() - started < JOB_EVENTS_MAX_SECONDS:
+            job = blog_app.jobs.get(job_id)
+            if job is None:
+                yield 'event: error\ndata: {"error": "작업을 찾을 수 없습니다"}\n\n'
+                return
+            payload = job_payload(job_id, job)
+            finished = payload['status'] in ('done', 'failed')
+            state = (payload['status'], payload.get('updated_at'))
+            if state != last_sent:
+                last_sent = state
+                last_beat = time.time()
+                event = payload['status'] if finished else 'progress'
+                yield f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False, default=str)}\n\n"
+            if finished:
+                return
+            if time.time() - last_beat > 15:
+                last_beat = time.time()
+                yield ': keep-alive\n\n'
+            time.sleep(JOB_EVENTS_POLL_INTERVAL)
+
+    response = Response(stream_with_context(events()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/llm-stats')
+@require_auth
+def api_llm_stats():
+    """OpenAI 호출 유형별 토큰 사용량 / 프롬프트 캐시 적중률 / 모델별 지연시간 API"""
+    return jsonify({
+        'success': True,
+        'stats': llm_client.usage_stats.snapshot(),
+        'routing': model_router.router.snapshot()
+    })
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus 지표 (모든 gunicorn 워커 합산, METRICS_TOKEN을 설정하면 Bearer 토큰 필요)"""
+    if METRICS_TOKEN:
+        import hmac
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {METRICS_TOKEN}'):
+            return Response('unauthorized\n', status=401, mimetype='text/plain')
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/healthz')
+def healthz():
+    """생존 확인 (템플릿/저장소/외부 호출 없음 - Docker HEALTHCHECK용)"""
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz')
+def readyz():
+    """준비 상태 (캐시된 프로브 결과, 작업 큐 포화, 외부 호출 진행 중 수/최근 오류율)"""
+    status_code, report = readiness(blog_app.health, blog_app.jobs.stats())
+    return jsonify(report), status_code
+
+@app.route('/api/job-stats')
+@require_auth
+def api_job_stats():
+    """이 워커 프로세스의 작업 큐 상태 API (대기/실행 중 작업 수, 거절 수)"""
+    return jsonify({'success': True, 'stats': blog_app.jobs.stats()})
+
+@app.route('/api/session-stats')
+@require_auth
+def api_session_stats():
+    """세션 저장소 통계 API (세션 수, 전체/평균 크기, 큰 세션의 필드별 크기, 만료/삭제 수)"""
+    try:
+        return jsonify({'success': True, 'stats': blog_app.sessions.stats()})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def catalog_response(view):
+    """미리 직렬화한 카테고리 응답 (If-None-Match가 맞으면 304, gzip 지원 클라이언트에는 압축본)"""
+    rendered = category_catalog.rendered(view)
+    if request.if_none_match.contains(rendered.etag):
+        response = Response(status=304)
+    elif 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = Response(rendered.gzip_body, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(rendered.body, mimetype='application/json')
+    response.set_etag(rendered.etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    # 카탈로그 파일이 바뀌면 바로 반영되도록 매번 ETag로 재검증
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 @app.route('/api/categories')
 @require_auth
 def api_categories():
     """카테고리 목록 API"""
     try:
-        categories = blog_app.get_predefined_categories()
-        return jsonify({
-            'success': True,
-            'categories': categories
-        })
+        return catalog_response('categories')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1398,43 +2239,20 @@ def api_categories():
 def api_category_keywords():
     """카테고리별 키워드 API"""
     try:
-        categories = blog_app.get_predefined_categories()
-        category_list = []
-        
-        for name, data in categories.items():
-            category_list.append({
-                'name': name,
-                'icon': name.split()[0],
-                'description': data['description'],
-                'keywords': data['keywords']
-            })
-        
-        return jsonify(category_list)
+        return catalog_response('category_keywords')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/recommended-keywords')
 @require_auth
 def api_recommended_keywords_route():
-    """추천 키워드 API"""
+    """추천 키워드 API (캐시된 스냅샷을 바로 반환)"""
     try:
-        # Google 트렌드 키워드 가져오기
-        google_keywords = blog_app.get_google_trending_keywords()
-        
-        # 네이버 DataLab 트렌드 키워드 가져오기  
-        naver_keywords = blog_app.get_naver_datalab_keywords()
-        
-        # 결과 조합
-        trending_data = {
-            'google_trends': google_keywords,
-            'naver_datalab': naver_keywords,
-            'update_time': datetime.now().isoformat()
-        }
-        
-        return jsonify(trending_data)
+        # Google 트렌드 / 네이버 DataLab 키워드와 소스별 갱신 시각, stale 여부
+        return jsonify(blog_app.trends.snapshot())
         
     except Exception as e:
-        print(f"트렌드 키워드 API 오류: {str(e)}")
+        logger.error("트렌드 키워드 API 오류: %s", e)
         # Fallback 데이터 반환
         fallback_data = {
             'google_trends': [
@@ -1445,31 +2263,26 @@ def api_recommended_keywords_route():
                 {'rank': 1, 'keyword': '요리레시피', 'category': '🍳 요리', 'source': 'Fallback'},
                 {'rank': 2, 'keyword': '홈트레이닝', 'category': '💪 운동', 'source': 'Fallback'}
             ],
-            'update_time': datetime.now().isoformat()
+            'update_time': datetime.now().isoformat(),
+            'stale': True
         }
         return jsonify(fallback_data)
 
 @app.route('/api/recommended_keywords')
 def api_recommended_keywords():
-    """실시간 트렌드 키워드 API (Google + Naver)"""
+    """실시간 트렌드 키워드 API (Google + Naver, 캐시된 스냅샷 사용)"""
     try:
-        import random
-        from datetime import datetime
-        
         current_hour = datetime.now().hour
-        
-        # Google 트렌드 키워드 가져오기
-        google_keywords = blog_app.get_google_trending_keywords()
-        
-        # 네이버 DataLab 트렌드 키워드 가져오기  
-        naver_keywords = blog_app.get_naver_datalab_keywords()
+        snapshot = blog_app.trends.snapshot()
         
         # 결과 조합
         trending_data = {
-            'google_trends': google_keywords,
-            'naver_trends': naver_keywords,
+            'google_trends': snapshot['google_trends'],
+            'naver_trends': snapshot['naver_datalab'],
             'time_period': f"🕐 {current_hour}시",
-            'update_time': datetime.now().isoformat()
+            'update_time': snapshot['update_time'],
+            'stale': snapshot['stale'],
+            'sources': snapshot['sources']
         }
         
         return jsonify({
@@ -1478,7 +2291,7 @@ def api_recommended_keywords():
         })
         
     except Exception as e:
-        print(f"트렌드 키워드 API 오류: {str(e)}")
+        logger.error("트렌드 키워드 API 오류: %s", e)
         # Fallback으로 기존 방식 사용
         return api_recommended_keywords_fallback()
 
@@ -1546,19 +2359,22 @@ def api_recommended_keywords_fallback():
 def api_get_results(session_id):
     """결과 조회 API"""
     try:
-        if session_id not in blog_app.temp_results:
+        result_data = blog_app.sessions.get(session_id, fields=(
+            'keyword', 'search', 'analysis_result', 'generated_titles', 'blog_content', 'generated_images'
+        ))
+        if result_data is None:
             return jsonify({'error': '유효하지 않은 세션입니다'}), 400
 
-        result_data = blog_app.temp_results[session_id]
-
+        search = result_data.get('search')
+        blog_content = result_data.get('blog_content')
         return jsonify({
             'success': True,
             'data': {
                 'keyword': result_data.get('keyword'),
-                'titles': result_data.get('titles', []),
+                'titles': search.titles if search else [],
                 'analysis_result': result_data.get('analysis_result'),
                 'generated_titles': result_data.get('generated_titles', []),
-                'blog_content': result_data.get('blog_content'),
+                'blog_content': blog_content.to_dict() if blog_content else None,
                 'generated_images': result_data.get('generated_images', [])
             }
         })
@@ -1584,53 +2400,41 @@ def search():
         if not search_result or 'items' not in search_result:
             return jsonify({'error': '검색 결과가 없습니다'}), 400
 
-        # 결과 가공
-        results = []
-        for item in search_result['items']:
-            results.append({
-                'title': blog_app.clean_html_tags(item.get('title', '')),
-                'description': blog_app.clean_html_tags(item.get('description', '')),
-                'link': item.get('link', ''),
-                'postdate': item.get('postdate', '')
-            })
+        # 결과 가공 (세션에는 검색 레코드만 저장하고 응답용 목록은 레코드에서 생성)
+        search = blog_app.build_search_record(keyword, search_result)
 
         # 세션에 결과 저장
         session_id = str(uuid.uuid4())
-        blog_app.temp_results[session_id] = {
+        blog_app.sessions.create(session_id, {
             'keyword': keyword,
-            'search_result': search_result,
-            'results': results,
+            'search': search,
             'timestamp': datetime.now()
-        }
+        })
+        remember_latest_session(session_id, 'search')
 
         return jsonify({
             'success': True,
             'keyword': keyword,
-            'results': results,
+            'results': search.results(),
             'session_id': session_id,
-            'total': search_result.get('total', 0)
+            'total': search.total
         })
 
     except Exception as e:
-        print(f"검색 오류: {str(e)}")
+        logger.error("검색 오류: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/analyze', methods=['POST'])
 def analyze():
     """AI 분석"""
     try:
-        # 세션에서 마지막 검색 결과 가져오기
-        latest_session = None
-        for session_id, data in blog_app.temp_results.items():
-            if latest_session is None or data['timestamp'] > blog_app.temp_results[latest_session]['timestamp']:
-                latest_session = session_id
-
-        if not latest_session:
+        # 이 클라이언트의 마지막 검색 결과 가져오기
+        latest_session, result_data = latest_session_for('search', fields=('keyword', 'search'))
+        if result_data is None or result_data.get('search') is None:
             return jsonify({'error': '먼저 검색을 실행해주세요'}), 400
-
-        result_data = blog_app.temp_results[latest_session]
-        titles = [item['title'] for item in result_data['results']]
-        descriptions = [item['description'] for item in result_data['results']]
+        search = result_data['search']
+        titles = list(search.item_titles)
+        descriptions = list(search.item_descriptions)
 
         # AI 분석 실행
         analysis_result = blog_app.analyze_with_gpt(
@@ -1638,7 +2442,11 @@ def analyze():
         )
 
         # 분석 결과 저장
-        blog_app.temp_results[latest_session]['analysis_result'] = analysis_result
+        blog_app.save_session_fields(latest_session, {
+            'analysis_result': analysis_result,
+            'analysis_digest': blog_app.get_analysis_digest(analysis_result)
+        })
+        remember_latest_session(latest_session, 'analysis')
 
         return jsonify({
             'success': True,
@@ -1646,29 +2454,24 @@ def analyze():
             'session_id': latest_session
         })
 
+    except SessionExpired as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        print(f"분석 오류: {str(e)}")
+        logger.error("분석 오류: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/generate-titles', methods=['POST'])
 def generate_titles():
     """제목 생성"""
     try:
-        # 세션에서 마지막 분석 결과 가져오기
-        latest_session = None
-        for session_id, data in blog_app.temp_results.items():
-            if 'analysis_result' in data:
-                if latest_session is None or data['timestamp'] > blog_app.temp_results[latest_session]['timestamp']:
-                    latest_session = session_id
-
-        if not latest_session:
+        # 이 클라이언트의 마지막 분석 결과 가져오기
+        latest_session, result_data = latest_session_for('analysis', fields=('keyword', 'analysis_result', 'analysis_digest'))
+        if result_data is None or 'analysis_result' not in result_data:
             return jsonify({'error': '먼저 분석을 실행해주세요'}), 400
 
-        result_data = blog_app.temp_results[latest_session]
-
         # 제목 생성
         generated_titles = blog_app.generate_titles_with_gpt(
-            result_data['analysis_result'],
+            result_data.get('analysis_digest') or result_data['analysis_result'],
             result_data['keyword'],
             10
         )
@@ -1687,7 +2490,7 @@ def generate_titles():
                         titles.append(cleaned)
 
         # 생성된 제목 저장
-        blog_app.temp_results[latest_session]['generated_titles'] = titles
+        blog_app.save_session_fields(latest_session, {'generated_titles': titles})
 
         return jsonify({
             'success': True,
@@ -1695,8 +2498,10 @@ def generate_titles():
             'session_id': latest_session
         })
 
+    except SessionExpired as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        print(f"제목 생성 오류: {str(e)}")
+        logger.error("제목 생성 오류: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/generate-blog', methods=['POST'])
@@ -1711,14 +2516,13 @@ def generate_blog():
         if not title:
             return jsonify({'error': '제목을 선택해주세요'}), 400
 
-        # 세션에서 키워드 찾기
+        # 이 클라이언트의 마지막 검색 세션에서 키워드/분석 결과 찾기
         keyword = None
         analysis_result = None
-        for session_id, session_data in blog_app.temp_results.items():
-            if 'keyword' in session_data:
-                keyword = session_data['keyword']
-                analysis_result = session_data.get('analysis_result')
-                break
+        _, session_data = latest_session_for('search', fields=('keyword', 'analysis_result', 'analysis_digest'))
+        if session_data is not None:
+            keyword = session_data.get('keyword')
+            analysis_result = session_data.get('analysis_digest') or session_data.get('analysis_result')
 
         if not keyword:
             return jsonify({'error': '키워드 정보를 찾을 수 없습니다'}), 400
@@ -1736,7 +2540,7 @@ def generate_blog():
         })
 
     except Exception as e:
-        print(f"블로그 생성 오류: {str(e)}")
+        logger.error("블로그 생성 오류: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @app.route('/generate-images', methods=['POST'])
@@ -1751,27 +2555,45 @@ def generate_images():
         if not title or not content:
             return jsonify({'error': '제목과 내용이 필요합니다'}), 400
 
-        # 키워드와 세션 ID 찾기
+        # 키워드와 세션 ID 찾기 (클라이언트가 세션 ID를 보내면 우선 사용)
         keyword = None
         target_session_id = None
-        for session_id, session_data in blog_app.temp_results.items():
-            if 'keyword' in session_data:
-                keyword = session_data['keyword']
-                target_session_id = session_id
-                break
+        requested_session_id = data.get('session_id')
+        requested_data = blog_app.sessions.get(requested_session_id, fields=('keyword', 'blog_content')) if requested_session_id else None
+        if requested_data is not None:
+            target_session_id = requested_session_id
+            session_data = requested_data
+        else:
+            target_session_id, session_data = latest_session_for('search', fields=('keyword', 'blog_content'))
+        session_data = session_data or {}
+        keyword = session_data.get('keyword')
 
         if not keyword:
             keyword = title  # 키워드가 없으면 제목 사용
 
+        # 같은 글을 생성할 때 본문과 함께 받은 프롬프트가 충분하면 프롬프트 생성 호출 생략
+        blog_data = session_data.get('blog_content')
+        image_prompts = blog_data.get('image_prompts') if blog_data and blog_data.get('title') == title else None
+        if image_prompts and len(image_prompts) < count:
+            image_prompts = None
+
+        # 진행 상황 초기화 (/api/image_progress 에서 조회)
+        on_progress, finish_progress = blog_app.track_image_progress(target_session_id, count)
+
         # 이미지 생성
         generated_images = blog_app.generate_dall_e_images(
-            title, content, keyword, count
+            title, content, keyword, count, image_prompts=image_prompts, on_progress=on_progress,
+            session_id=target_session_id
         )
+        finish_progress()
 
         # 세션에 이미지 저장 (세션 ID가 있는 경우)
-        if target_session_id and target_session_id in blog_app.temp_results:
-            blog_app.temp_results[target_session_id]['generated_images'] = generated_images
-            print(f"✅ 이미지가 세션 {target_session_id}에 저장되었습니다.")
+        if target_session_id:
+            if blog_app.sessions.set_field(target_session_id, 'generated_images', generated_images):
+                logger.info("✅ 이미지 %d개가 세션에 저장되었습니다.", len(generated_images))
+            else:
+                logger.warning("⚠️ 세션이 만료되어 이미지를 세션에 저장하지 못했습니다.")
+                target_session_id = None
         
         return jsonify({
             'success': True,
@@ -1780,86 +2602,205 @@ def generate_images():
         })
 
     except Exception as e:
-        print(f"이미지 생성 오류: {str(e)}")
+        logger.error("이미지 생성 오류: %s", e)
         return jsonify({'error': str(e)}), 500
 
+@app.route('/images/<digest>.png')
+def serve_stored_image(digest):
+    """로컬 이미지 저장소의 이미지 서빙 (내용 해시 기반이므로 영구 캐시)"""
+    if not image_store.exists(digest):
+        return jsonify({'error': '이미지를 찾을 수 없습니다'}), 404
+
+    response = send_file(
+        image_store.path_for(digest),
+        mimetype='image/png',
+        etag=digest,
+        conditional=True,
+        max_age=31536000
+    )
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+@app.route('/images/<digest>/<variant>')
+def serve_image_variant(digest, variant):
+    """이미지 파생본(thumb / web / blog) 서빙 - 아직 없으면 만들어서 응답"""
+    if variant not in VARIANTS or not image_store.exists(digest):
+        return jsonify({'error': '이미지를 찾을 수 없습니다'}), 404
+
+    path = ensure_variant(image_store.path_for(digest), variant)
+    if path is None:
+        # Pillow가 없거나 변환에 실패하면 원본으로 대체
+        return redirect(url_for('serve_stored_image', digest=digest))
+
+    response = send_file(
+        path,
+        mimetype=content_type_for(variant),
+        etag=f"{digest}-{variant}",
+        conditional=True,
+        max_age=31536000
+    )
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+def load_session_image(i, image):
+    """ZIP에 담을 생성 이미지 bytes (생성 시 저장해 둔 로컬 이미지가 있으면 다시 내려받지 않음)"""
+    image_data = image_store.read_bytes(image.get('hash'))
+    if image_data is None:
+        logger.debug("📥 이미지 %d 다운로드 시작: %.50s", i + 1, image['url'])
+        download_request = urllib.request.Request(image['url'])
+        download_request.add_header('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+        with metrics.timed('image_download'):
+            with urllib.request.urlopen(download_request, timeout=30) as response:
+                image_data = response.read()
+        metrics.add_bytes('image_download', len(image_data))
+    return image_data
+
 @app.route('/api/download_images/<session_id>')
+@require_auth
 def api_download_images(session_id):
-    """이미지 ZIP 다운로드 API"""
+    """이미지 ZIP 다운로드 API (스트리밍)
+
+    ?include=article 을 붙이면 글 본문(txt)과 HTML 내보내기 파일도 함께 담습니다.
+    """
     try:
-        print(f"🔍 다운로드 요청 세션 ID: {session_id}")
-        print(f"📋 사용 가능한 세션들: {list(blog_app.temp_results.keys())}")
-        
-        if session_id not in blog_app.temp_results:
-            print(f"❌ 유효하지 않은 세션 ID: {session_id}")
+        result_data = blog_app.sessions.get(session_id, fields=('keyword', 'generated_images', 'blog_content'))
+        if result_data is None:
+            logger.warning("❌ 유효하지 않은 다운로드 세션")
             return jsonify({'error': '유효하지 않은 세션입니다'}), 400
-
-        result_data = blog_app.temp_results[session_id]
-        generated_images = result_data.get('generated_images', [])
+        generated_images = list(result_data.get('generated_images', []))
+        include_article = 'article' in request.args.get('include', '').split(',')
+        blog_data = result_data.get('blog_content') if include_article else None
         
-        print(f"📸 찾은 이미지 개수: {len(generated_images)}")
+        logger.info("📸 다운로드 요청: 이미지 %d개%s", len(generated_images), ' + 본문' if blog_data else '')
 
-        if not generated_images:
-            print("❌ 다운로드할 이미지가 없습니다.")
+        if not generated_images and not blog_data:
             return jsonify({'error': '다운로드할 이미지가 없습니다. 먼저 이미지를 생성해주세요.'}), 400
 
-        import zipfile
-        import io
-        import urllib.request
-        import urllib.error
+        def archive_entries():
+            # 이미지를 동시에 내려받아 끝나는 순서대로 바로 ZIP에 기록
+            image_files = []
+            failures = []
+            for i, image_data, error in fetch_concurrently(generated_images, load_session_image):
+                if error:
+                    logger.warning("❌ 이미지 %d 다운로드 오류: %s", i + 1, error)
+                    failures.append({
+                        'index': i + 1,
+                        'url': generated_images[i].get('url'),
+                        'error': error
+                    })
+                    continue
+                filename = f"generated_image_{i+1}.png"
+                image_files.append(filename)
+                # PNG는 이미 압축되어 있으므로 무압축(stored)으로 저장
+                yield filename, image_data, False
 
-        # 메모리에서 ZIP 파일 생성
-        zip_buffer = io.BytesIO()
-        successful_downloads = 0
+            yield from summary_entries(result_data.get('keyword'), len(generated_images), image_files, failures, blog_data)
 
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for i, image in enumerate(generated_images):
-                try:
-                    print(f"📥 이미지 {i+1} 다운로드 시작: {image['url'][:50]}...")
-                    
-                    # urllib을 사용하여 이미지 다운로드 (requests 대신)
-                    request = urllib.request.Request(image['url'])
-                    request.add_header('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-                    
-                    with urllib.request.urlopen(request, timeout=30) as response:
-                        image_data = response.read()
+            logger.info("📦 ZIP 스트리밍 완료: %d개 이미지, 실패 %d개", len(image_files), len(failures))
 
-                    # ZIP 파일에 이미지 추가
-                    filename = f"generated_image_{i+1}.png"
-                    zip_file.writestr(filename, image_data)
-                    successful_downloads += 1
-                    
-                    print(f"✅ 이미지 {i+1} 다운로드 완료")
+        # 키워드나 제목을 사용한 파일명 생성
+        filename = archive_filename(result_data.get('keyword', 'images'))
 
-                except Exception as e:
-                    print(f"❌ 이미지 {i+1} 다운로드 오류: {e}")
-                    continue
+        response = Response(
+            stream_with_context(metrics.count_stream('zip_build', stream_zip(archive_entries()))),
+            mimetype='application/zip'
+        )
+        response.headers['Content-Disposition'] = (
+            f"attachment; filename=\"generated_images.zip\"; filename*=UTF-8''{urllib.parse.quote(filename)}"
+        )
+        # 프록시가 응답을 모아두지 않고 바로 전달하도록 설정
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
 
-        if successful_downloads == 0:
-            return jsonify({'error': '모든 이미지 다운로드에 실패했습니다.'}), 500
+    except Exception as e:
+        logger.exception("❌ ZIP 파일 생성 오류: %s", e)
+        return jsonify({'error': f'ZIP 파일 생성 중 오류 발생: {str(e)}'}), 500
 
-        zip_buffer.seek(0)
+@app.route('/api/batch/<job_id>/download')
+@require_auth
+def api_batch_download(job_id):
+    """일괄 생성 결과 ZIP 다운로드 API (스트리밍)
 
-        # 키워드나 제목을 사용한 파일명 생성
-        keyword = result_data.get('keyword', 'images')
-        safe_keyword = "".join(c for c in keyword if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        if not safe_keyword:
-            safe_keyword = 'generated_images'
-        filename = f"{safe_keyword}_images.zip"
-        
-        print(f"📦 ZIP 파일 생성 완료: {filename} ({successful_downloads}개 이미지)")
+    완료된 키워드마다 01_키워드/ 폴더에 이미지, manifest.json, 글 본문(txt/html)과 추가 글을 담고,
+    최상위 batch.json에 항목별 상태를 기록합니다. 작업이 진행 중이면 지금까지 완료된 키워드만 담습니다.
+    """
+    try:
+        job = blog_app.jobs.get(job_id)
+        if job is None or job.get('kind') != 'batch':
+            return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
+        items = (job.get('result') or job.get('progress') or {}).get('items', [])
+        finished = [(i, item) for i, item in enumerate(items) if item['status'] == 'done' and item.get('session_id')]
+        if not finished:
+            return jsonify({'error': '아직 완료된 키워드가 없습니다', 'status': job['status']}), 400
+
+        logger.info("📚 일괄 다운로드 요청: 키워드 %d/%d개", len(finished), len(items))
+
+        def item_entries(index, item):
+            result_data = blog_app.sessions.get(
+                item['session_id'], fields=('keyword', 'generated_images', 'blog_content', 'extra_articles')
+            )
+            if result_data is None:
+                return None, []
+            folder = folder_name(index, item['keyword'])
+            generated_images = list(result_data.get('generated_images', []))
+            image_files = []
+            failures = []
+            entries = []
+            for i, image_data, error in fetch_concurrently(generated_images, load_session_image):
+                if error:
+                    logger.warning("❌ 이미지 %d 다운로드 오류: %s", i + 1, error)
+                    failures.append({'index': i + 1, 'url': generated_images[i].get('url'), 'error': error})
+                    continue
+                filename = f"generated_image_{i+1}.png"
+                image_files.append(filename)
+                entries.append((f"{folder}/{filename}", image_data, False))
+            for name, data, compress in summary_entries(
+                item['keyword'], len(generated_images), image_files, failures, result_data.get('blog_content')
+            ):
+                entries.append((f"{folder}/{name}", data, compress))
+            for n, article in enumerate(result_data.get('extra_articles') or [], start=2):
+                entries.append((f"{folder}/article_{n}.txt", f"{article['title']}\n\n{article['content']}\n".encode('utf-8'), True))
+                entries.append((f"{folder}/article_{n}.html", article_to_html(article['title'], article['content']).encode('utf-8'), True))
+            return folder, entries
+
+        def archive_entries():
+            # 키워드 폴더를 하나씩 만들어 바로 ZIP에 기록 (한 번에 한 키워드의 이미지만 메모리에 둠)
+            folders = {}
+            for index, item in finished:
+                folder, entries = item_entries(index, item)
+                if folder is None:
+                    continue
+                folders[index] = folder
+                yield from entries
+            summary = {
+                'job_id': job_id,
+                'status': job['status'],
+                'items': [
+                    {
+                        'keyword': item['keyword'],
+                        'status': item['status'] if item['status'] != 'done' or i in folders else 'expired',
+                        'folder': folders.get(i),
+                        'title': item.get('title'),
+                        'error': item.get('error')
+                    }
+                    for i, item in enumerate(items)
+                ]
+            }
+            yield 'batch.json', json.dumps(summary, ensure_ascii=False, indent=2).encode('utf-8'), True
+            logger.info("📦 일괄 ZIP 스트리밍 완료: 키워드 %d개", len(folders))
 
-        return send_file(
-            zip_buffer,
-            mimetype='application/zip',
-            as_attachment=True,
-            download_name=filename
+        response = Response(
+            stream_with_context(metrics.count_stream('zip_build', stream_zip(archive_entries()))),
+            mimetype='application/zip'
         )
+        filename = f"batch_{job_id[:8]}.zip"
+        response.headers['Content-Disposition'] = f"attachment; filename=\"{filename}\""
+        # 프록시가 응답을 모아두지 않고 바로 전달하도록 설정
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
 
     except Exception as e:
-        print(f"❌ ZIP 파일 생성 오류: {str(e)}")
-        import traceback
-        print(f"📝 오류 상세: {traceback.format_exc()}")
+        logger.exception("❌ 일괄 ZIP 생성 오류: %s", e)
         return jsonify({'error': f'ZIP 파일 생성 중 오류 발생: {str(e)}'}), 500
 
 if __name__ == '__main__':